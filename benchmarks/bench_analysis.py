@@ -0,0 +1,47 @@
+"""
+Repetition analysis with disk partitions against an in-memory dictionary.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.analysis import analyze, normalize
+import lxml.etree as let
+
+UNITS = 100_000
+
+
+def partitioned() -> Callable[[], object]:
+  document = make_document(UNITS)
+
+  def run_analysis() -> object:
+    with analyze([document]) as analysis:
+      return analysis.totals()
+
+  return run_analysis
+
+
+def in_memory() -> Callable[[], object]:
+  document = make_document(UNITS)
+
+  def count() -> tuple[int, int]:
+    seen: set[str] = set()
+    total = repetition = 0
+    for source in let.fromstring(document).iter("source"):
+      text = normalize(source.text or "")
+      words = len(text.split())
+      total += words
+      if text in seen:
+        repetition += words
+      seen.add(text)
+    return total, repetition
+
+  return count
+
+
+SCENARIOS = {
+  "analysis/partitioned": partitioned,
+  "analysis/in-memory": in_memory,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
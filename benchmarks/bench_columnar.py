@@ -0,0 +1,62 @@
+"""
+Columnar count groups against lists of `Count` objects.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable
+from common import run
+from xliff.constants import COUNT_TYPE, UNIT
+from xliff.named_groups import ColumnarCountGroup, Count, CountGroup
+
+COUNTS = 200_000
+TYPES = (COUNT_TYPE.TOTAL, COUNT_TYPE.REPETITION, COUNT_TYPE.NUM_USAGE)
+UNITS = (UNIT.WORD, UNIT.CHARACTER, UNIT.SEGMENT)
+
+
+def _make_counts() -> list[Count]:
+  return [
+    Count(value=index % 97, count_type=TYPES[index % 3], unit=UNITS[index % 7 % 3])
+    for index in range(COUNTS)
+  ]
+
+
+def objects_sum_by_type() -> Callable[[], object]:
+  group = CountGroup(name="stats", counts=_make_counts())
+
+  def aggregate() -> dict:
+    totals: defaultdict = defaultdict(int)
+    for count in group.counts:
+      totals[count.count_type] += count.value
+    return totals
+
+  return aggregate
+
+
+def columnar_sum_by_type() -> Callable[[], object]:
+  group = ColumnarCountGroup(name="stats", counts=_make_counts())
+  return group.sum_by_count_type
+
+
+def objects_filtered_total() -> Callable[[], object]:
+  group = CountGroup(name="stats", counts=_make_counts())
+  return lambda: sum(
+    count.value
+    for count in group.counts
+    if count.count_type is COUNT_TYPE.TOTAL and count.unit is UNIT.WORD
+  )
+
+
+def columnar_filtered_total() -> Callable[[], object]:
+  group = ColumnarCountGroup(name="stats", counts=_make_counts())
+  return lambda: group.total(count_type=COUNT_TYPE.TOTAL, unit=UNIT.WORD)
+
+
+SCENARIOS = {
+  "columnar/sum-by-type/objects": objects_sum_by_type,
+  "columnar/sum-by-type/columnar": columnar_sum_by_type,
+  "columnar/filtered-total/objects": objects_filtered_total,
+  "columnar/filtered-total/columnar": columnar_filtered_total,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS)
@@ -0,0 +1,44 @@
+"""
+Streaming consolidation against loading every document and appending its sections.
+"""
+
+from collections.abc import Callable
+from io import BytesIO
+from common import make_document, run
+from xliff.consolidate import consolidate
+import lxml.etree as let
+
+
+def _make_inputs(count: int = 20, units: int = 1_000) -> list[bytes]:
+  return [make_document(units, seed=seed) for seed in range(count)]
+
+
+def streaming() -> Callable[[], object]:
+  inputs = _make_inputs()
+  return lambda: consolidate(inputs, BytesIO())
+
+
+def loaded() -> Callable[[], object]:
+  inputs = _make_inputs()
+
+  def load() -> bytes:
+    root = let.fromstring(inputs[0])
+    body = root.find("file/body")
+    seen = {section.get("id") for section in body}
+    for document in inputs[1:]:
+      for section in let.fromstring(document).find("file/body"):
+        if section.get("id") not in seen:
+          seen.add(section.get("id"))
+          body.append(section)
+    return let.tostring(root, xml_declaration=True, encoding="UTF-8")
+
+  return load
+
+
+SCENARIOS = {
+  "consolidate/streaming": streaming,
+  "consolidate/loaded": loaded,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
@@ -0,0 +1,93 @@
+"""
+The core operations of the library, for both element backends.
+
+Building objects from parsed elements, validating them, serializing them and a full
+round trip from bytes to bytes, with lxml and with the standard library's
+`xml.etree.ElementTree`. `harness.py` runs these scenarios by default and compares
+them, and the memory report of `memory_report`, with `baselines/bench_core.json`.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.footprint import MemoryReport, footprint
+from xliff.named_groups import ContextGroup
+from xliff.streaming import load
+import lxml.etree as let
+import xml.etree.ElementTree as pet
+
+UNITS = 2_000
+
+BACKENDS = {
+  "lxml": (let.fromstring, let.Element),
+  "etree": (pet.fromstring, pet.Element),
+}
+
+
+def _groups(backend: str) -> list[ContextGroup]:
+  parse, _ = BACKENDS[backend]
+  return [
+    ContextGroup(source_element=element)
+    for element in parse(make_document(UNITS)).iter("context-group")
+  ]
+
+
+def construct(backend: str) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    parse, _ = BACKENDS[backend]
+    elements = list(parse(make_document(UNITS)).iter("context-group"))
+    return lambda: [ContextGroup(source_element=element) for element in elements]
+
+  return setup
+
+
+def validate() -> Callable[[], object]:
+  groups = _groups("lxml")
+
+  def validate_all() -> None:
+    for group in groups:
+      group.validate()
+
+  return validate_all
+
+
+def serialize(backend: str) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    _, factory = BACKENDS[backend]
+    groups = _groups(backend)
+    return lambda: [group.to_element(factory) for group in groups]
+
+  return setup
+
+
+def round_trip(backend: str) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    parse, factory = BACKENDS[backend]
+    tostring = let.tostring if backend == "lxml" else pet.tostring
+    document = make_document(UNITS)
+
+    def convert() -> list[bytes]:
+      return [
+        tostring(ContextGroup(source_element=element).to_element(factory))
+        for element in parse(document).iter("context-group")
+      ]
+
+    return convert
+
+  return setup
+
+
+SCENARIOS = {
+  **{f"core/construct/{backend}": construct(backend) for backend in BACKENDS},
+  "core/validate": validate,
+  **{f"core/serialize/{backend}": serialize(backend) for backend in BACKENDS},
+  **{f"core/round-trip/{backend}": round_trip(backend) for backend in BACKENDS},
+}
+
+
+def memory_report() -> MemoryReport:
+  """The memory report checked by `harness.py`."""
+  return footprint(load(make_document(UNITS)))
+
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=5)
@@ -0,0 +1,59 @@
+"""
+Cached checksums against hashing every context one by one.
+"""
+
+from collections.abc import Callable
+from zlib import crc32
+from common import run
+from xliff.crc import CrcCache, fill_crcs, verify_crcs
+from xliff.named_groups import Context, ContextGroup
+
+GROUPS = 50_000
+
+
+def _make_groups() -> list[ContextGroup]:
+  return [
+    ContextGroup(
+      contexts=[
+        Context(value=f"src/file{index % 50}.rc", context_type="sourcefile"),
+        Context(value=str(index % 400), context_type="linenumber"),
+      ]
+    )
+    for index in range(GROUPS)
+  ]
+
+
+def naive() -> Callable[[], object]:
+  groups = _make_groups()
+
+  def fill() -> None:
+    for group in groups:
+      parts = []
+      for context in group.contexts:
+        data = f"{context.context_type.value}\x1f{context.value}\x1e".encode()
+        context.crc = f"{crc32(data):08X}"
+        parts.append(data)
+      group.crc = f"{crc32(b''.join(parts)):08X}"
+
+  return fill
+
+
+def fill() -> Callable[[], object]:
+  groups = _make_groups()
+  return lambda: fill_crcs(groups, overwrite=True)
+
+
+def verify_warm_cache() -> Callable[[], object]:
+  groups, cache = _make_groups(), CrcCache()
+  fill_crcs(groups, cache=cache)
+  return lambda: verify_crcs(groups, cache=cache)
+
+
+SCENARIOS = {
+  "crc/fill/naive": naive,
+  "crc/fill/cached": fill,
+  "crc/verify/warm-cache": verify_warm_cache,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS)
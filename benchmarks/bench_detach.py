@@ -0,0 +1,64 @@
+"""
+Loading a document with and without keeping the source elements.
+
+`retained` keeps the elements, and the document, alive. `released` drops them as
+objects are built and `detached` calls `detach` once everything is built. The
+memory printed afterwards is the `xliff.footprint` estimate, including the
+libxml2 documents kept alive.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.footprint import footprint
+from xliff.streaming import load
+import warnings
+
+UNITS = 10_000
+
+
+def _load(document: bytes, retain_source: bool) -> list:
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    return load(document, retain_source=retain_source)
+
+
+def retained() -> Callable[[], object]:
+  document = make_document(UNITS)
+  return lambda: _load(document, True)
+
+
+def released() -> Callable[[], object]:
+  document = make_document(UNITS)
+  return lambda: _load(document, False)
+
+
+def detached() -> Callable[[], object]:
+  document = make_document(UNITS)
+
+  def load_and_detach() -> list:
+    objects = _load(document, True)
+    for obj in objects:
+      obj.detach()
+    return objects
+
+  return load_and_detach
+
+
+SCENARIOS = {
+  "detach/retained": retained,
+  "detach/released": released,
+  "detach/detached": detached,
+}
+
+
+def memory() -> None:
+  """Prints the memory held by the objects of every scenario."""
+  print(f"{'scenario':<18}  {'memory (KiB)':>12}")
+  for name, setup in SCENARIOS.items():
+    objects = setup()()
+    print(f"{name:<18}  {footprint(objects).total / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
+  memory()
@@ -0,0 +1,52 @@
+"""
+Row extraction from the parse events against building objects from the whole tree.
+
+Rows come out about 3.5 to 4 times faster than objects, not the 5 times the
+extraction was meant to reach: iterating the parse events alone takes more than half
+of the time of `rows`, and longer than `let.fromstring` takes for the whole document.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from io import StringIO
+from xliff.extraction import iter_rows, write_jsonl
+from xliff.named_groups import ContextGroup
+import lxml.etree as let
+
+UNITS = 50_000
+
+
+def rows() -> Callable[[], object]:
+  document = make_document(UNITS)
+  return lambda: list(iter_rows(document, contexts=["sourcefile"]))
+
+
+def jsonl() -> Callable[[], object]:
+  document = make_document(UNITS)
+  return lambda: write_jsonl(document, StringIO(), contexts=["sourcefile"])
+
+
+def objects() -> Callable[[], object]:
+  document = make_document(UNITS)
+
+  # Units have no class, only their context groups can be built
+  def build() -> list:
+    found = []
+    for unit in let.fromstring(document).iter("trans-unit"):
+      group = ContextGroup(source_element=unit.find("context-group"))
+      found.append(
+        (unit.get("id"), unit.findtext("source"), unit.findtext("target"), group)
+      )
+    return found
+
+  return build
+
+
+SCENARIOS = {
+  "extraction/rows": rows,
+  "extraction/jsonl": jsonl,
+  "extraction/objects": objects,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
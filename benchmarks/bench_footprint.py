@@ -0,0 +1,58 @@
+"""
+The cost of measuring the memory of loaded documents, and the reports themselves.
+
+`walk` measures objects already built, `profile-load` loads the document with
+`tracemalloc` snapshots around its phases. The reports printed afterwards show where
+the memory goes with and without interning, and can be stored with
+`MemoryReport.to_dict` to catch regressions.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.footprint import footprint, profile_load
+from xliff.interning import interning
+from xliff.streaming import load
+import warnings
+
+UNITS = 10_000
+
+
+def walk() -> Callable[[], object]:
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    objects = load(make_document(UNITS))
+  return lambda: footprint(objects)
+
+
+def profiled_load() -> Callable[[], object]:
+  document = make_document(UNITS)
+
+  def profile() -> None:
+    with warnings.catch_warnings():
+      warnings.simplefilter("ignore")
+      profile_load(document)
+
+  return profile
+
+
+SCENARIOS = {
+  "footprint/walk": walk,
+  "footprint/profile-load": profiled_load,
+}
+
+
+def report() -> None:
+  """Prints the memory report of the document, with and without interning."""
+  document = make_document(UNITS)
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    print("\nplain")
+    print(profile_load(document)[1].format())
+    with interning():
+      print("\ninterned")
+      print(profile_load(document)[1].format())
+
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
+  report()
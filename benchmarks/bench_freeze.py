@@ -0,0 +1,78 @@
+"""
+Reading one shared, frozen tree from several threads.
+
+The traversal and query scenarios run the same total amount of work split across 1
+and 4 threads. On the default build the GIL serializes the threads, so more threads
+bring no speedup. On the free-threaded build (`python3.13t`) the threads run in
+parallel, and as a frozen tree is never written no lock is needed. Run this script
+with both interpreters to compare. The build in use is printed first.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from concurrent.futures import ThreadPoolExecutor
+from xliff.named_groups import ContextGroup
+from xliff.query import compile
+import lxml.etree as let
+import sys
+import warnings
+
+UNITS = 10_000
+ROUNDS = 8
+
+
+def _groups() -> list[ContextGroup]:
+  root = let.fromstring(make_document(UNITS))
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    groups = [ContextGroup(source_element=e) for e in root.iter("context-group")]
+  for group in groups:
+    group.freeze()
+  return groups
+
+
+def _traverse(groups: list[ContextGroup]) -> int:
+  total = 0
+  for group in groups:
+    total += len(group.by_type["sourcefile"].value)
+    total += sum(hash(context) & 1 for context in group.contexts)
+  return total
+
+
+def _threaded(threads: int, work: Callable[[], object]) -> Callable[[], object]:
+  def run_all() -> None:
+    with ThreadPoolExecutor(threads) as executor:
+      for future in [executor.submit(work) for _ in range(ROUNDS)]:
+        future.result()
+
+  return run_all
+
+
+def traversal(threads: int) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    groups = _groups()
+    return _threaded(threads, lambda: _traverse(groups))
+
+  return setup
+
+
+def query(threads: int) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    groups = _groups()
+    selector = compile("context[context_type=linenumber]")
+    return _threaded(threads, lambda: sum(1 for _ in selector.select(groups)))
+
+  return setup
+
+
+SCENARIOS = {
+  "freeze/traversal/1-thread": traversal(1),
+  "freeze/traversal/4-threads": traversal(4),
+  "freeze/query/1-thread": query(1),
+  "freeze/query/4-threads": query(4),
+}
+
+if __name__ == "__main__":
+  gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+  print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+  run(SCENARIOS, repeat=3)
@@ -0,0 +1,112 @@
+"""
+Fuzzy matching through the n-gram index against scoring every segment.
+
+The shared synthetic documents draw from a vocabulary of a few dozen words, where
+every segment shares most of its n-grams with every other one. The memory built here
+uses a larger vocabulary with a skewed distribution, closer to real text, and the
+queries are memory segments with a few edits, as when leveraging a new version of a
+document.
+"""
+
+from collections.abc import Callable
+from common import run
+from itertools import accumulate
+from xliff.fuzzy import FuzzyIndex, bounded_distance
+import random
+import string
+
+SEGMENTS = 50_000
+QUERIES = 200
+
+
+def _vocabulary(rng: random.Random) -> list[str]:
+  return [
+    "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+    for _ in range(5_000)
+  ]
+
+
+def _sentence(rng: random.Random, vocabulary: list[str], weights: list[float]) -> str:
+  words = rng.choices(vocabulary, cum_weights=weights, k=rng.randint(3, 15))
+  return " ".join(words).capitalize()
+
+
+def _data() -> tuple[list[str], list[str]]:
+  rng = random.Random(0)
+  vocabulary = _vocabulary(rng)
+  # Zipf's law, the frequency of a word is inversely proportional to its rank
+  weights = list(accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+  sources = [_sentence(rng, vocabulary, weights) for _ in range(SEGMENTS)]
+  queries = []
+  for _ in range(QUERIES):
+    words = rng.choice(sources).split()
+    if rng.random() < 0.8:
+      words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    else:
+      words = _sentence(rng, vocabulary, weights).split()
+    queries.append(" ".join(words))
+  return sources, queries
+
+
+def _index(sources: list[str]) -> FuzzyIndex:
+  index = FuzzyIndex()
+  for source in sources:
+    index.add(source, source[::-1])
+  return index
+
+
+def build() -> Callable[[], object]:
+  sources, _ = _data()
+  return lambda: _index(sources)
+
+
+def indexed() -> Callable[[], object]:
+  sources, queries = _data()
+  index = _index(sources)
+  return lambda: index.search_many(queries, processes=1)
+
+
+def exhaustive() -> Callable[[], object]:
+  sources, queries = _data()
+  index = _index(sources)
+  queries = queries[:20]
+  return lambda: index.search_many(queries, candidates=None, processes=1)
+
+
+def parallel() -> Callable[[], object]:
+  sources, queries = _data()
+  index = _index(sources)
+  queries *= 4
+  return lambda: index.search_many(queries)
+
+
+def scanned() -> Callable[[], object]:
+  sources, queries = _data()
+  queries = queries[:1]
+
+  def search() -> list:
+    found = []
+    for query in queries:
+      scores = []
+      for source in sources:
+        longer = max(len(query), len(source))
+        bound = int(0.25 * longer)
+        distance = bounded_distance(query, source, bound)
+        if distance <= bound:
+          scores.append(1 - distance / longer)
+      found.append(sorted(scores, reverse=True)[:5])
+    return found
+
+  return search
+
+
+SCENARIOS = {
+  "fuzzy/build": build,
+  "fuzzy/search/indexed": indexed,
+  "fuzzy/search/exhaustive-20": exhaustive,
+  "fuzzy/search/parallel-x4": parallel,
+  "fuzzy/search/scan-1": scanned,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
@@ -0,0 +1,58 @@
+"""
+The cost of instrumentation when building and serializing context groups.
+
+`never-enabled` is the baseline, `disabled` must match it as the original functions
+are put back, `enabled` shows the overhead of counting every call.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff import instrumentation
+from xliff.named_groups import ContextGroup
+import lxml.etree as let
+import warnings
+
+UNITS = 10_000
+
+
+def _elements() -> list[let._Element]:
+  return list(let.fromstring(make_document(UNITS)).iter("context-group"))
+
+
+def _build_and_serialize(elements: list[let._Element]) -> None:
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    for element in elements:
+      ContextGroup(source_element=element).to_element()
+
+
+def never_enabled() -> Callable[[], object]:
+  elements = _elements()
+  return lambda: _build_and_serialize(elements)
+
+
+def disabled() -> Callable[[], object]:
+  elements = _elements()
+  instrumentation.enable()
+  instrumentation.disable()
+  return lambda: _build_and_serialize(elements)
+
+
+def enabled() -> Callable[[], object]:
+  elements = _elements()
+
+  def run_instrumented() -> None:
+    with instrumentation.instrumented():
+      _build_and_serialize(elements)
+
+  return run_instrumented
+
+
+SCENARIOS = {
+  "instrumentation/never-enabled": never_enabled,
+  "instrumentation/disabled": disabled,
+  "instrumentation/enabled": enabled,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=5)
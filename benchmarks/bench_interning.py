@@ -0,0 +1,74 @@
+"""
+Memory used by the objects built from a document, with and without interning.
+
+The synthetic document repeats 50 source file paths across its context groups. The
+lxml tree is parsed before measuring, so only the memory of the library objects is
+counted.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.interning import interning
+from xliff.named_groups import ContextGroup
+import lxml.etree as let
+import tracemalloc
+
+UNITS = 20_000
+
+
+def _elements() -> list[let._Element]:
+  return list(let.fromstring(make_document(UNITS)).iter("context-group"))
+
+
+def _build(elements: list[let._Element]) -> list[ContextGroup]:
+  return [ContextGroup(source_element=element) for element in elements]
+
+
+def plain() -> Callable[[], object]:
+  elements = _elements()
+  return lambda: _build(elements)
+
+
+def interned() -> Callable[[], object]:
+  elements = _elements()
+
+  def build() -> list[ContextGroup]:
+    with interning():
+      return _build(elements)
+
+  return build
+
+
+def shared() -> Callable[[], object]:
+  elements = _elements()
+
+  def build() -> list[ContextGroup]:
+    with interning(share_objects=True):
+      return _build(elements)
+
+  return build
+
+
+SCENARIOS = {
+  "interning/build/plain": plain,
+  "interning/build/strings": interned,
+  "interning/build/objects": shared,
+}
+
+
+def memory() -> None:
+  """Prints the memory held by the built objects of every scenario."""
+  print(f"{'scenario':<24}  {'memory (KiB)':>12}")
+  for name, setup in SCENARIOS.items():
+    build = setup()
+    tracemalloc.start()
+    groups = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del groups
+    print(f"{name:<24}  {size / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
+  memory()
@@ -0,0 +1,45 @@
+"""
+Looking up group members by type through `by_type` against scanning the members.
+"""
+
+from collections.abc import Callable
+from common import run
+from xliff.named_groups import Prop, PropGroup
+
+GROUPS = 2_000
+PROPS = 30
+
+
+def _groups() -> list[PropGroup]:
+  return [
+    PropGroup(
+      name=f"group{index}",
+      props=[Prop(value=str(j), prop_type=f"x-type{j}") for j in range(PROPS)],
+    )
+    for index in range(GROUPS)
+  ]
+
+
+def keyed() -> Callable[[], object]:
+  groups = _groups()
+  return lambda: [
+    group.by_type[f"x-type{j}"] for group in groups for j in range(0, PROPS, 3)
+  ]
+
+
+def scanned() -> Callable[[], object]:
+  groups = _groups()
+  return lambda: [
+    next(prop for prop in group.props if prop.prop_type == f"x-type{j}")
+    for group in groups
+    for j in range(0, PROPS, 3)
+  ]
+
+
+SCENARIOS = {
+  "keyed/lookup/by-type": keyed,
+  "keyed/lookup/scan": scanned,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
@@ -0,0 +1,63 @@
+"""
+Translation memory lookups against scanning the translated units.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.analysis import normalize
+from xliff.memory import TranslationMemory
+import lxml.etree as let
+
+UNITS = 50_000
+QUERIES = 2_000
+
+
+def _queries(document: bytes) -> list[str]:
+  sources = [source.text for source in let.fromstring(document).iter("source")]
+  return sources[:: UNITS // QUERIES]
+
+
+def indexed() -> Callable[[], object]:
+  document = make_document(UNITS)
+  memory = TranslationMemory()
+  memory.add_document(document)
+  queries = _queries(document)
+  return lambda: [memory.lookup(query) for query in queries]
+
+
+def build() -> Callable[[], object]:
+  document = make_document(UNITS)
+
+  def add() -> None:
+    with TranslationMemory() as memory:
+      memory.add_document(document)
+
+  return add
+
+
+def scanned() -> Callable[[], object]:
+  document = make_document(UNITS)
+  units = [
+    (normalize(unit.findtext("source")), unit.findtext("target"))
+    for unit in let.fromstring(document).iter("trans-unit")
+  ]
+  queries = _queries(document)[-100:]
+
+  def lookup() -> list:
+    found = []
+    for query in queries:
+      query = normalize(query)
+      found.append(next(target for source, target in units if source == query))
+    return found
+
+  return lookup
+
+
+SCENARIOS = {
+  "memory/build": build,
+  "memory/lookup/indexed": indexed,
+  "memory/lookup/scan-100": scanned,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
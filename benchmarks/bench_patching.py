@@ -0,0 +1,33 @@
+"""
+Streaming translation patches against a raw lxml parse and serialize.
+"""
+
+from collections.abc import Callable
+from io import BytesIO
+from common import make_document, run
+from xliff.patching import apply_translations
+import lxml.etree as let
+
+UNITS = 50_000
+
+
+def streaming() -> Callable[[], object]:
+  document = make_document(UNITS, with_targets=False)
+  translations = {f"u{index}": f"Traduction {index}" for index in range(0, UNITS, 15)}
+  return lambda: apply_translations(document, BytesIO(), translations)
+
+
+def raw_lxml() -> Callable[[], object]:
+  document = make_document(UNITS, with_targets=False)
+  return lambda: let.tostring(
+    let.fromstring(document), xml_declaration=True, encoding="UTF-8"
+  )
+
+
+SCENARIOS = {
+  "patching/streaming": streaming,
+  "patching/raw-lxml": raw_lxml,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
@@ -0,0 +1,38 @@
+"""
+Building and serializing the context groups of a document at each validation level.
+
+`strict` is the default and the baseline, `construct-only` and `serialize-only`
+skip one of its two passes, `lazy` validates each object once while serializing
+it and `off` skips validation entirely.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.constants import VALIDATION_LEVEL
+from xliff.named_groups import ContextGroup
+from xliff.policy import validation_policy
+import lxml.etree as let
+import warnings
+
+UNITS = 20_000
+
+
+def level(level: VALIDATION_LEVEL) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    elements = list(let.fromstring(make_document(UNITS)).iter("context-group"))
+
+    def build_and_serialize() -> None:
+      with validation_policy(level), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for element in elements:
+          ContextGroup(source_element=element).to_element()
+
+    return build_and_serialize
+
+  return setup
+
+
+SCENARIOS = {f"policy/{member.value}": level(member) for member in VALIDATION_LEVEL}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
@@ -0,0 +1,91 @@
+"""
+Compiled selectors against the equivalent hand-written loops.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.constants import CONTEXT_TYPE, PURPOSE
+from xliff.named_groups import Context, ContextGroup
+from xliff.query import compile
+from xliff.streaming import iterparse, local_name, release
+
+TREE_SELECTOR = "context-group[purpose=location]/context[context_type=sourcefile]"
+STREAM_SELECTOR = "//group[restype=dialog]//context[context_type=sourcefile]"
+
+
+def _make_tree(groups: int = 5_000) -> list[ContextGroup]:
+  return [
+    ContextGroup(
+      name=f"g{index}",
+      purpose="location" if index % 2 else "information",
+      contexts=[
+        Context(value=f"file{index}.c", context_type="sourcefile"),
+        Context(value=str(index), context_type="linenumber"),
+        Context(value="Main", context_type="element"),
+      ],
+    )
+    for index in range(groups)
+  ]
+
+
+def tree_selector() -> Callable[[], object]:
+  tree, selector = _make_tree(), compile(TREE_SELECTOR)
+  return lambda: list(selector.select(tree))
+
+
+def tree_hand_written() -> Callable[[], object]:
+  tree = _make_tree()
+
+  def loop() -> list[Context]:
+    found = []
+    for group in tree:
+      if group.purpose is PURPOSE.LOCATION:
+        for context in group.contexts:
+          if context.context_type is CONTEXT_TYPE.SOURCEFILE:
+            found.append(context)
+    return found
+
+  return loop
+
+
+def stream_selector() -> Callable[[], object]:
+  document, selector = make_document(), compile(STREAM_SELECTOR)
+  return lambda: list(selector.iterselect(document, materialize_results=False))
+
+
+def stream_hand_written() -> Callable[[], object]:
+  document = make_document()
+
+  def loop() -> list:
+    found, dialogs = [], []
+    for event, element in iterparse(document):
+      tag = local_name(element.tag)
+      if event == "start":
+        if tag == "group":
+          dialogs.append(element.get("restype") == "dialog")
+        continue
+      if tag == "group":
+        dialogs.pop()
+      elif (
+        tag == "context"
+        and any(dialogs)
+        and element.get("context-type") == "sourcefile"
+      ):
+        found.append(element.text)
+        continue
+      if tag in ("trans-unit", "group"):
+        release(element)
+    return found
+
+  return loop
+
+
+SCENARIOS = {
+  "query/tree/selector": tree_selector,
+  "query/tree/hand-written": tree_hand_written,
+  "query/stream/selector": stream_selector,
+  "query/stream/hand-written": stream_hand_written,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS)
@@ -0,0 +1,65 @@
+"""
+Validating a valid and an invalid document with the bundled schema or the validators.
+
+A valid document is accepted by the schema alone, the validators only run when the
+schema finds a problem with `schema_first`.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.schema import is_schema_valid
+from xliff.validation import is_valid_document, iter_document_errors
+
+UNITS = 20_000
+
+
+def _documents() -> dict[str, bytes]:
+  valid = make_document(UNITS)
+  return {"valid": valid, "invalid": valid.replace(b'"location"', b'"nowhere"', 50)}
+
+
+def schema(name: str) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    document = _documents()[name]
+    return lambda: is_schema_valid(document)
+
+  return setup
+
+
+def validators(name: str) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    document = _documents()[name]
+    return lambda: is_valid_document(document)
+
+  return setup
+
+
+def schema_first(name: str) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    document = _documents()[name]
+    return lambda: list(iter_document_errors(document, schema_first=True))
+
+  return setup
+
+
+def without_schema(name: str) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    document = _documents()[name]
+    return lambda: list(iter_document_errors(document))
+
+  return setup
+
+
+SCENARIOS = {
+  f"schema/{name}/{label}": scenario(name)
+  for name in ("valid", "invalid")
+  for label, scenario in (
+    ("is-schema-valid", schema),
+    ("is-valid-document", validators),
+    ("errors-schema-first", schema_first),
+    ("errors", without_schema),
+  )
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
@@ -0,0 +1,39 @@
+"""
+Serializing a large group with a growing number of threads.
+
+On the default build the GIL serializes most of the work and threads mostly add
+overhead, the free-threaded build (`python3.13t`) is where the workers scale.
+"""
+
+from collections.abc import Callable
+from common import run
+from xliff.named_groups import Context, ContextGroup
+from xliff.serialization import to_bytes
+
+CONTEXTS = 50_000
+
+
+def _group() -> ContextGroup:
+  return ContextGroup(
+    name="location",
+    contexts=[
+      Context(value=f"src/file{index}.c", context_type="sourcefile")
+      for index in range(CONTEXTS)
+    ],
+  )
+
+
+def workers(count: int) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    group = _group()
+    return lambda: to_bytes(group, workers=count)
+
+  return setup
+
+
+SCENARIOS = {
+  f"serialization/to-bytes/{count}-workers": workers(count) for count in (1, 2, 4, 8)
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
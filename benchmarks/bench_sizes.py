@@ -0,0 +1,42 @@
+"""
+Batched size checks against checking every target as it is parsed.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.sizes import check_sizes
+import lxml.etree as let
+
+UNITS = 100_000
+ENCODINGS = ("utf-8", "utf-16-le", "cp1252")
+
+
+def batched() -> Callable[[], object]:
+  document = make_document(UNITS)
+  return lambda: check_sizes(document, encodings=ENCODINGS)
+
+
+def per_target() -> Callable[[], object]:
+  document = make_document(UNITS)
+
+  def check() -> list:
+    violations = []
+    for group in let.fromstring(document).iter("group"):
+      maxbytes = int(group.get("maxbytes"))
+      for target in group.iter("target"):
+        for encoding in ENCODINGS:
+          size = len(target.text.encode(encoding))
+          if size > maxbytes:
+            violations.append((target.getparent().get("id"), size, encoding))
+    return violations
+
+  return check
+
+
+SCENARIOS = {
+  "sizes/batched": batched,
+  "sizes/per-target": per_target,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=3)
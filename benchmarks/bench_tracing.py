@@ -0,0 +1,46 @@
+"""
+The cost of tracing when loading and serializing a document.
+
+`default` uses the tracer ignoring spans, which must cost close to nothing.
+`json-lines` writes every span to memory, two for each object serialized here.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.streaming import load
+from xliff.tracing import JsonLinesTracer, tracing
+import io
+import warnings
+
+UNITS = 10_000
+
+
+def _load_and_serialize(document: bytes) -> None:
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    for obj in load(document):
+      obj.to_element()
+
+
+def default() -> Callable[[], object]:
+  document = make_document(UNITS)
+  return lambda: _load_and_serialize(document)
+
+
+def json_lines() -> Callable[[], object]:
+  document = make_document(UNITS)
+
+  def run_traced() -> None:
+    with tracing(JsonLinesTracer(io.StringIO())):
+      _load_and_serialize(document)
+
+  return run_traced
+
+
+SCENARIOS = {
+  "tracing/default": default,
+  "tracing/json-lines": json_lines,
+}
+
+if __name__ == "__main__":
+  run(SCENARIOS, repeat=5)
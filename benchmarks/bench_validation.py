@@ -0,0 +1,109 @@
+"""
+Validating a large tree and a large document with a growing number of processes.
+
+The serial scenarios are the baselines. Worker processes only pay off with several
+CPUs, the number available is printed first.
+
+The dirty scenarios compare gathering all the errors of an invalid tree as
+exceptions with `validate`, as a result with `check`, and answering yes or no with
+`is_valid`. The document scenario validates the parse events directly, without
+building any object.
+"""
+
+from collections.abc import Callable
+from common import make_document, run
+from xliff.errors import ValidationErrorGroup
+from xliff.named_groups import ContextGroup
+from xliff.validation import (
+  collect_errors,
+  iter_document_errors,
+  validate_parallel,
+  validate_stream,
+)
+import io
+import lxml.etree as let
+import os
+import warnings
+
+UNITS = 20_000
+
+
+def _groups() -> list[ContextGroup]:
+  root = let.fromstring(make_document(UNITS))
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    return [ContextGroup(source_element=e) for e in root.iter("context-group")]
+
+
+def _dirty_groups() -> list[ContextGroup]:
+  document = make_document(UNITS).replace(b"sourcefile", b"bogus")
+  root = let.fromstring(document.replace(b'"location"', b'"nowhere"'))
+  with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    return [ContextGroup(source_element=e) for e in root.iter("context-group")]
+
+
+def _validate_all(groups: list[ContextGroup]) -> int:
+  errors = 0
+  for group in groups:
+    try:
+      group.validate(gather_all_errors=True)
+    except ValidationErrorGroup as e:
+      errors += len(e.errors)
+  return errors
+
+
+def dirty_validate() -> Callable[[], object]:
+  groups = _dirty_groups()
+  return lambda: _validate_all(groups)
+
+
+def dirty_check() -> Callable[[], object]:
+  groups = _dirty_groups()
+  return lambda: sum(len(group.check()) for group in groups)
+
+
+def dirty_is_valid() -> Callable[[], object]:
+  groups = _dirty_groups()
+  return lambda: sum(group.is_valid() for group in groups)
+
+
+def tree_serial() -> Callable[[], object]:
+  groups = _groups()
+  return lambda: collect_errors(groups)
+
+
+def tree(workers: int) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    groups = _groups()
+    return lambda: validate_parallel(groups, workers=workers)
+
+  return setup
+
+
+def stream(workers: int) -> Callable[[], Callable[[], object]]:
+  def setup() -> Callable[[], object]:
+    document = make_document(UNITS)
+    return lambda: validate_stream(io.BytesIO(document), workers=workers)
+
+  return setup
+
+
+def document() -> Callable[[], object]:
+  document = make_document(UNITS)
+  return lambda: sum(1 for _ in iter_document_errors(io.BytesIO(document)))
+
+
+SCENARIOS = {
+  "validation/dirty/validate": dirty_validate,
+  "validation/dirty/check": dirty_check,
+  "validation/dirty/is-valid": dirty_is_valid,
+  "validation/tree/serial": tree_serial,
+  **{f"validation/tree/{count}-workers": tree(count) for count in (2, 4)},
+  **{f"validation/stream/{count}-workers": stream(count) for count in (1, 2, 4)},
+  "validation/document/without-objects": document,
+}
+
+if __name__ == "__main__":
+  print(f"{os.process_cpu_count()} CPUs available")
+  run(SCENARIOS, repeat=3)
@@ -0,0 +1,100 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Each `bench_*.py` script defines a `SCENARIOS` dict mapping a scenario name to a setup
+function. Setup functions build their input data and return the zero argument
+callable that is timed, so that building the data is never part of the measure.
+
+Run any script directly to print its timings:
+
+  python benchmarks/bench_query.py
+
+`harness.py` runs them against the baselines stored in `baselines/` to catch
+regressions.
+"""
+
+from collections.abc import Callable
+import random
+import time
+
+type Scenario = Callable[[], Callable[[], object]]
+
+WORDS = (
+  "open save close file edit view help cancel print export import settings about "
+  "window tools format insert delete copy paste undo redo search replace select"
+).split()
+
+
+def make_sentence(rng: random.Random, words: int) -> str:
+  return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def make_document(
+  units: int = 10_000,
+  *,
+  units_per_group: int = 20,
+  seed: int = 0,
+  repetition_rate: float = 0.2,
+  with_targets: bool = True,
+) -> bytes:
+  """
+  Builds a synthetic XLIFF document.
+
+  Units are spread in groups alternating between the `dialog` and `menu` restypes,
+  each unit having a context group and about a fifth of the sources repeating an
+  earlier one.
+  """
+  rng = random.Random(seed)
+  sources: list[str] = []
+  parts = [
+    '<?xml version="1.0" encoding="UTF-8"?>\n<xliff version="1.2">\n',
+    '<file original="app.rc" source-language="en" target-language="fr"'
+    ' datatype="winres">\n<body>\n',
+  ]
+  for index in range(units):
+    if index % units_per_group == 0:
+      if index:
+        parts.append("</group>\n")
+      restype = "dialog" if index // units_per_group % 2 == 0 else "menu"
+      parts.append(
+        f'<group id="g{index // units_per_group}" restype="{restype}"'
+        f' maxbytes="64" size-unit="byte">\n'
+      )
+    if sources and rng.random() < repetition_rate:
+      source = rng.choice(sources)
+    else:
+      source = make_sentence(rng, rng.randint(2, 12))
+      sources.append(source)
+    target = (
+      f'<target state="translated">{source[::-1]}</target>' if with_targets else ""
+    )
+    parts.append(
+      f'<trans-unit id="u{index}" resname="IDS_{index}">'
+      f"<source>{source}</source>{target}"
+      f'<context-group name="ctx" purpose="location">'
+      f'<context context-type="sourcefile">src/file{index % 50}.rc</context>'
+      f'<context context-type="linenumber">{index}</context>'
+      f"</context-group></trans-unit>\n"
+    )
+  parts.append("</group>\n</body>\n</file>\n</xliff>\n")
+  return "".join(parts).encode()
+
+
+def measure(function: Callable[[], object], repeat: int = 5) -> list[float]:
+  """Times `repeat` calls of `function`, returning the durations in seconds."""
+  durations = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    function()
+    durations.append(time.perf_counter() - start)
+  return durations
+
+
+def run(scenarios: dict[str, Scenario], repeat: int = 5) -> None:
+  """Runs all the scenarios and prints the best and median timings."""
+  width = max(map(len, scenarios))
+  print(f"{'scenario':<{width}}  {'best (ms)':>10}  {'median (ms)':>12}")
+  for name, setup in scenarios.items():
+    durations = sorted(measure(setup(), repeat))
+    best, median = durations[0] * 1000, durations[len(durations) // 2] * 1000
+    print(f"{name:<{width}}  {best:>10.2f}  {median:>12.2f}")
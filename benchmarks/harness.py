@@ -0,0 +1,205 @@
+"""
+Runs benchmark scripts and compares them with the baselines stored in the repo.
+
+Each script is run scenario by scenario, a warm-up call then `--repeat` timed calls,
+and compared with `baselines/<script>.json`. A scenario regresses when it is slower
+by more than `--threshold` and the difference is significant, according to a
+one-sided Mann-Whitney U test at `--alpha`. Scripts defining a `memory_report`
+function also have the `xliff.footprint` report compared, failing when a value grew
+by more than `--memory-tolerance`.
+
+  python benchmarks/harness.py                    # bench_core against its baseline
+  python benchmarks/harness.py bench_query --repeat 20
+  python benchmarks/harness.py --save             # stores new baselines
+
+The exit code is 1 if anything regressed. Baselines only compare with runs on the
+same machine: store them again after changing machines, and after an intended
+slowdown.
+"""
+
+from collections.abc import Sequence
+from common import measure
+from pathlib import Path
+from statistics import median
+from typing import Any, Optional
+from xliff.footprint import MemoryReport
+import argparse
+import importlib
+import json
+import math
+import platform
+import sys
+
+BASELINES = Path(__file__).parent / "baselines"
+
+
+def mann_whitney(baseline: Sequence[float], current: Sequence[float]) -> float:
+  """
+  The one-sided p-value of `current` being larger than `baseline`.
+
+  Uses the normal approximation of the U statistic, with a continuity and ties
+  correction, which holds from about 8 samples per side.
+  """
+  n1, n2 = len(baseline), len(current)
+  values = sorted(
+    [(value, 0) for value in baseline] + [(value, 1) for value in current]
+  )
+  rank_sum, ties, index = 0.0, 0.0, 0
+  while index < len(values):
+    end = index
+    while end + 1 < len(values) and values[end + 1][0] == values[index][0]:
+      end += 1
+    # Tied values share the average of their ranks
+    rank = (index + end + 2) / 2
+    rank_sum += rank * sum(group for _, group in values[index : end + 1])
+    count = end - index + 1
+    ties += count**3 - count
+    index = end + 1
+  u = rank_sum - n2 * (n2 + 1) / 2
+  n = n1 + n2
+  variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+  if variance <= 0:
+    return 0.5
+  z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+  return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def run_script(name: str, repeat: int) -> dict[str, Any]:
+  """Runs the scenarios and the memory report of a script."""
+  module = importlib.import_module(name)
+  timings = {}
+  for scenario, setup in module.SCENARIOS.items():
+    function = setup()
+    function()
+    timings[scenario] = measure(function, repeat)
+    print(f"  {scenario}", file=sys.stderr)
+  report = getattr(module, "memory_report", None)
+  return {
+    "python": platform.python_version(),
+    "machine": f"{platform.system()} {platform.machine()}",
+    "repeat": repeat,
+    "timings": timings,
+    "memory": None if report is None else report().to_dict(),
+  }
+
+
+def compare(
+  baseline: dict[str, Any],
+  current: dict[str, Any],
+  *,
+  threshold: float,
+  alpha: float,
+) -> tuple[list[tuple[str, ...]], bool]:
+  """
+  Compares the timings of a run with a baseline.
+
+  Returns:
+      tuple[list[tuple[str, ...]], bool]: The rows of the comparison table, and
+      whether a scenario regressed.
+  """
+  rows, regressed = [], False
+  for scenario, durations in current["timings"].items():
+    now = median(durations)
+    stored: Optional[list[float]] = baseline["timings"].get(scenario)
+    if stored is None:
+      rows.append((scenario, "-", f"{now * 1000:.2f}", "-", "-", "new"))
+      continue
+    before = median(stored)
+    change = now / before - 1
+    slower = mann_whitney(stored, durations)
+    faster = mann_whitney(durations, stored)
+    if slower < alpha and change > threshold:
+      verdict, regressed = "REGRESSION", True
+    elif faster < alpha and change < -threshold:
+      verdict = "faster"
+    else:
+      verdict = "ok"
+    rows.append(
+      (
+        scenario,
+        f"{before * 1000:.2f}",
+        f"{now * 1000:.2f}",
+        f"{change:+.1%}",
+        f"{min(slower, faster):.3f}",
+        verdict,
+      )
+    )
+  return rows, regressed
+
+
+def format_table(rows: list[tuple[str, ...]]) -> str:
+  """The comparison table, scenario names aligned left and values right."""
+  header = ("scenario", "baseline (ms)", "current (ms)", "change", "p-value", "")
+  table = [header, *rows]
+  widths = [max(len(row[column]) for row in table) for column in range(len(header))]
+  return "\n".join(
+    "  ".join(
+      cell.ljust(width) if column in (0, 5) else cell.rjust(width)
+      for column, (cell, width) in enumerate(zip(row, widths))
+    ).rstrip()
+    for row in table
+  )
+
+
+def memory_regressions(
+  baseline: dict[str, Any], current: dict[str, Any], tolerance: float
+) -> list[str]:
+  """The memory values that grew by more than `tolerance` since the baseline."""
+  if baseline.get("memory") is None or current["memory"] is None:
+    return []
+  report = MemoryReport.from_dict(current["memory"])
+  return report.regressions(baseline["memory"], tolerance=tolerance)
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+  parser.add_argument(
+    "scripts", nargs="*", default=["bench_core"], help="the bench_* modules to run"
+  )
+  parser.add_argument("--repeat", type=int, default=10, help="timed calls")
+  parser.add_argument(
+    "--threshold", type=float, default=0.10, help="slowdown tolerated, 0.10 is 10%%"
+  )
+  parser.add_argument("--alpha", type=float, default=0.05, help="significance level")
+  parser.add_argument(
+    "--memory-tolerance", type=float, default=0.05, help="memory growth tolerated"
+  )
+  parser.add_argument(
+    "--save", action="store_true", help="store the results as the new baselines"
+  )
+  options = parser.parse_args(arguments)
+  failed = False
+  for script in options.scripts:
+    print(f"{script}:", file=sys.stderr)
+    current = run_script(script, options.repeat)
+    path = BASELINES / f"{script}.json"
+    if options.save:
+      BASELINES.mkdir(exist_ok=True)
+      path.write_text(json.dumps(current, indent=2) + "\n")
+      print(f"{script}: baseline stored in {path}")
+      continue
+    if not path.exists():
+      print(f"{script}: no baseline, run with --save to store one")
+      continue
+    baseline = json.loads(path.read_text())
+    if (baseline["python"], baseline["machine"]) != (
+      current["python"],
+      current["machine"],
+    ):
+      print(
+        f"{script}: baseline recorded with Python {baseline['python']} on "
+        f"{baseline['machine']}, timings may not compare"
+      )
+    rows, regressed = compare(
+      baseline, current, threshold=options.threshold, alpha=options.alpha
+    )
+    print(f"\n{script}\n{format_table(rows)}")
+    grown = memory_regressions(baseline, current, options.memory_tolerance)
+    for message in grown:
+      print(f"memory: {message}")
+    failed = failed or regressed or bool(grown)
+  return 1 if failed else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Word count and repetition analysis of one or many documents.
+
+Every `<trans-unit>` source is normalized and hashed, then classified as:
+
+- new: its source was not seen before,
+- a repetition: the same source was seen before in any of the documents,
+- in context: the same source was seen before between the same previous and next
+  sources, counted with the "x-in-context" count type.
+
+The documents are parsed only once. Hashes are spilled to disk partitions chosen by
+their first byte, so that the hash tables only ever hold one partition and memory use
+stays bounded for any number of segments.
+"""
+
+from __future__ import annotations
+from array import array
+from collections.abc import Iterator, Sequence
+from hashlib import blake2b
+from os import PathLike
+from pathlib import Path
+from struct import Struct
+from tempfile import TemporaryDirectory
+from typing import BinaryIO, Optional
+from xliff.constants import COUNT_TYPE, UNIT
+from xliff.named_groups import Count, CountGroup
+from xliff.streaming import XmlSource, element_text, iterparse, local_name, release
+
+IN_CONTEXT = "x-in-context"
+"""
+The count type of the words of units found in the same context as a previous unit.
+"""
+NEW, REPETITION, CONTEXT = 0, 1, 2
+"""
+The classification of a unit, as stored by the analysis.
+"""
+
+_HASH = 8
+_EMPTY = bytes(_HASH)
+# hash, context hash, index of the unit
+_PARTITION_RECORD = Struct(f"<{_HASH}s{_HASH}sQ")
+# file index, words, id length, followed by the id
+_UNIT_RECORD = Struct("<IIH")
+
+
+def normalize(text: str) -> str:
+  """
+  Normalizes a segment before hashing it: whitespace runs become a single space and
+  leading and trailing whitespace is removed.
+  """
+  return " ".join(text.split())
+
+
+def segment_hash(text: str) -> bytes:
+  """Returns the hash identifying a normalized segment."""
+  return blake2b(text.encode(), digest_size=_HASH).digest()
+
+
+def _context_hash(previous: bytes, current: bytes, following: bytes) -> bytes:
+  return blake2b(previous + current + following, digest_size=_HASH).digest()
+
+
+def _count_group(name: str, words: Sequence[int], units: Optional[int]) -> CountGroup:
+  count_types: tuple[COUNT_TYPE | str, ...] = (
+    COUNT_TYPE.TOTAL,
+    COUNT_TYPE.REPETITION,
+    IN_CONTEXT,
+  )
+  counts = [
+    Count(value=value, count_type=count_type, unit=UNIT.WORD)
+    for value, count_type in zip(words, count_types)
+  ]
+  if units is not None:
+    counts.append(Count(value=units, count_type=COUNT_TYPE.TOTAL, unit=UNIT.TRANS_UNIT))
+  return CountGroup(name=name, counts=counts)
+
+
+class FileAnalysis:
+  """The counts of a `<file>`."""
+
+  source_index: int
+  """The index of the document the file comes from"""
+  original: Optional[str]
+  """The `original` attribute of the file"""
+  units: int
+  """The number of `<trans-unit>` elements in the file"""
+  words: array
+  """The total, repetition and in context word counts of the file"""
+
+  __slots__ = ("source_index", "original", "units", "words")
+
+  def __init__(self, source_index: int, original: Optional[str]) -> None:
+    self.source_index = source_index
+    self.original = original
+    self.units = 0
+    self.words = array("q", (0, 0, 0))
+
+  def count_group(self, name: str = "analysis") -> CountGroup:
+    """
+    Builds the `CountGroup` of the file.
+
+    Returns:
+        CountGroup: The total, repetition and "x-in-context" word counts, and the
+        total number of units.
+    """
+    return _count_group(name, self.words, self.units)
+
+
+class Analysis:
+  """
+  The result of `analyze`.
+
+  The per-unit results are kept on disk until the analysis is closed, use it as a
+  context manager or call `close` once done.
+  """
+
+  files: list[FileAnalysis]
+  """The counts of every file, in document order"""
+  units: int
+  """The total number of units analyzed"""
+
+  __slots__ = ("files", "units", "_statuses", "_units_path", "_directory")
+
+  def __init__(
+    self,
+    files: list[FileAnalysis],
+    statuses: bytearray,
+    units_path: Path,
+    directory: Optional[TemporaryDirectory],
+  ) -> None:
+    self.files = files
+    self.units = len(statuses)
+    self._statuses = statuses
+    self._units_path = units_path
+    self._directory = directory
+
+  def __enter__(self) -> Analysis:
+    return self
+
+  def __exit__(self, *exc_info: object) -> None:
+    self.close()
+
+  def close(self) -> None:
+    """Removes the files of the analysis."""
+    if self._directory is not None:
+      self._directory.cleanup()
+      self._directory = None
+
+  def totals(self, name: str = "analysis") -> CountGroup:
+    """Builds the `CountGroup` summing the counts of all the files."""
+    words = [sum(file.words[index] for file in self.files) for index in range(3)]
+    return _count_group(name, words, self.units)
+
+  def iter_units(
+    self, name: str = "analysis"
+  ) -> Iterator[tuple[FileAnalysis, str, int, CountGroup]]:
+    """
+    Iterates over the results of every unit, in document order.
+
+    Yields:
+        tuple[FileAnalysis, str, int, CountGroup]: The file of the unit, its `id`, its
+        classification (`NEW`, `REPETITION` or `CONTEXT`) and a `CountGroup` with its
+        total, repetition and "x-in-context" word counts.
+    """
+    with open(self._units_path, "rb") as file:
+      for status in self._statuses:
+        file_index, words, size = _UNIT_RECORD.unpack(file.read(_UNIT_RECORD.size))
+        id = file.read(size).decode()
+        counts = [words, 0, 0]
+        if status:
+          counts[status] = words
+        yield self.files[file_index], id, status, _count_group(name, counts, None)
+
+
+class _Partitions:
+  """Writes hash records to a file per partition."""
+
+  def __init__(self, directory: Path, count: int) -> None:
+    self.paths = [directory / f"partition-{index}" for index in range(count)]
+    self.files: list[BinaryIO] = [open(path, "wb") for path in self.paths]
+
+  def add(self, current: bytes, context: bytes, index: int) -> None:
+    file = self.files[current[0] % len(self.files)]
+    file.write(_PARTITION_RECORD.pack(current, context, index))
+
+  def close(self) -> None:
+    for file in self.files:
+      file.close()
+
+  def classify(self, statuses: bytearray) -> None:
+    """Sets the classification of every unit, one partition at a time."""
+    for path in self.paths:
+      seen: set[bytes] = set()
+      contexts: set[bytes] = set()
+      with open(path, "rb") as file:
+        data = file.read()
+      # Records of a partition are in document order
+      for current, context, index in _PARTITION_RECORD.iter_unpack(data):
+        if context in contexts:
+          statuses[index] = CONTEXT
+        elif current in seen:
+          statuses[index] = REPETITION
+          contexts.add(context)
+        else:
+          seen.add(current)
+          contexts.add(context)
+      path.unlink()
+
+
+def analyze(
+  sources: Sequence[XmlSource],
+  *,
+  partitions: int = 64,
+  directory: Optional[str | PathLike[str]] = None,
+) -> Analysis:
+  """
+  Analyzes the `<trans-unit>` elements of one or many documents.
+
+  Repetitions are looked for across all the documents, in order. A unit is counted
+  in context when a previous unit has the same source and the same previous and
+  next sources in its file, and as a repetition when a previous unit only has the
+  same source. Those are exclusive, the first unit with a given source is neither.
+
+  Memory use is about one byte per unit plus the hash tables of one partition,
+  raise `partitions` to lower the latter.
+
+  Args:
+      sources (Sequence[XmlSource]): The documents to analyze.
+      partitions (int): The number of disk partitions of the hashes, up to 256.
+      directory (Optional[str | PathLike[str]]): Where to write the files of the
+      analysis, a temporary directory removed by `Analysis.close` by default.
+
+  Returns:
+      Analysis: The counts of every file and access to the counts of every unit.
+
+  Raises:
+      ValueError: If `partitions` is not between 1 and 256, or a `<trans-unit>` is
+      outside a `<file>`.
+  """
+  if not 1 <= partitions <= 256:
+    raise ValueError(f"partitions must be between 1 and 256, got {partitions}")
+  temporary = TemporaryDirectory() if directory is None else None
+  root = Path(temporary.name if temporary is not None else directory)  # type: ignore
+  root.mkdir(parents=True, exist_ok=True)
+  spill = _Partitions(root, partitions)
+  files: list[FileAnalysis] = []
+  units_path = root / "units"
+  index = 0
+  with open(units_path, "wb") as units:
+    for source_index, source in enumerate(sources):
+      # The previous unit's hash and the one before that, waiting for the next one
+      pending: Optional[tuple[bytes, bytes, int]] = None
+      file: Optional[FileAnalysis] = None
+      for event, element in iterparse(
+        source, tag=("{*}file", "{*}group", "{*}trans-unit")
+      ):
+        name = local_name(element.tag)
+        if name == "group":
+          # Their units are released already, the empty groups still pile up
+          if event == "end":
+            release(element)
+          continue
+        if name == "file":
+          if event == "start":
+            file = FileAnalysis(source_index, element.get("original"))
+            files.append(file)
+          else:
+            file = None
+            if pending is not None:
+              spill.add(pending[1], _context_hash(*pending[:2], _EMPTY), pending[2])
+              pending = None
+            release(element)
+          continue
+        if event == "start":
+          continue
+        if file is None:
+          raise ValueError(f"<trans-unit> {element.get('id')!r} is outside a <file>")
+        source_element = element.find("{*}source")
+        text = (
+          normalize(element_text(source_element)) if source_element is not None else ""
+        )
+        current = segment_hash(text)
+        if pending is not None:
+          spill.add(pending[1], _context_hash(*pending[:2], current), pending[2])
+          pending = (pending[1], current, index)
+        else:
+          pending = (_EMPTY, current, index)
+        count = len(text.split())
+        file.units += 1
+        file.words[0] += count
+        id = (element.get("id") or "").encode()
+        units.write(_UNIT_RECORD.pack(len(files) - 1, count, len(id)))
+        units.write(id)
+        index += 1
+        release(element)
+  spill.close()
+  statuses = bytearray(index)
+  spill.classify(statuses)
+  with open(units_path, "rb") as units:
+    for status in statuses:
+      file_index, count, size = _UNIT_RECORD.unpack(units.read(_UNIT_RECORD.size))
+      units.seek(size, 1)
+      if status:
+        files[file_index].words[status] += count
+  return Analysis(files, statuses, units_path, temporary)
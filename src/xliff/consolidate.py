@@ -0,0 +1,333 @@
+"""
+Streaming k-way merge of many XLIFF documents into one.
+
+Every `<file>` of the inputs is identified by its `original`, `source-language`,
+`target-language` and `datatype` attributes. All the files with the same identity are
+merged into a single `<file>` of the output, holding the `<body>` sections (groups,
+trans-units and bin-units) of all of them.
+
+The output lists files in the order of their identity, and the sections of a file by
+`section_key` (if given), then input order, then document order. Like any k-way
+merge, this requires the files of each input to already be in that order, which is
+always the case for inputs holding a single `<file>`. Only one section per input is
+held in memory at any time.
+
+Sections of a same file sharing an `id` are conflicts, handled by a resolver which is
+the only place where sections are converted to `BaseXliffElement` objects, and only
+if it asks for it.
+"""
+
+from __future__ import annotations
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+from copy import deepcopy
+from heapq import merge
+from itertools import repeat
+from os import PathLike
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import IO, Any, Literal, Optional
+from xliff.objects import BaseXliffElement
+from xliff.streaming import (
+  ELEMENT_CLASSES,
+  XliffWriter,
+  XmlSource,
+  iter_sections,
+  local_name,
+)
+import lxml.etree as let
+
+type FileKey = tuple[str, str, str, str]
+type Resolver = Callable[[Conflict], Optional[let._Element]]
+
+_CONTAINERS = frozenset(("xliff", "file", "body"))
+
+
+def file_key(element: let._Element) -> FileKey:
+  """
+  Returns the identity of a `<file>` element used to merge files together.
+
+  Args:
+      element (lxml.etree._Element): The `<file>` element.
+
+  Returns:
+      FileKey: Its `original`, `source-language`, `target-language` and `datatype`.
+  """
+  return (
+    element.get("original", ""),
+    element.get("source-language", ""),
+    element.get("target-language", ""),
+    element.get("datatype", ""),
+  )
+
+
+class Conflict:
+  """
+  A section whose `id` was already used by a previous section of the same file.
+  """
+
+  file: FileKey
+  id: str
+  element: let._Element
+  input_index: int
+  previous_input_index: int
+
+  __slots__ = ("file", "id", "element", "input_index", "previous_input_index")
+
+  def __init__(
+    self,
+    file: FileKey,
+    id: str,
+    element: let._Element,
+    input_index: int,
+    previous_input_index: int,
+  ) -> None:
+    self.file = file
+    self.id = id
+    self.element = element
+    self.input_index = input_index
+    self.previous_input_index = previous_input_index
+
+  def materialize(self) -> list[BaseXliffElement]:
+    """
+    Builds the objects of the named groups found directly in the section.
+
+    Returns:
+        list[BaseXliffElement]: The `ContextGroup`, `CountGroup` and `PropGroup` of the
+        section, in document order.
+    """
+    return [
+      ELEMENT_CLASSES[local_name(child.tag)](source_element=child)
+      for child in self.element
+      if local_name(child.tag) in ELEMENT_CLASSES
+    ]
+
+
+def keep_first(conflict: Conflict) -> None:
+  """Resolver dropping all but the first section with a given `id`."""
+  return None
+
+
+def raise_error(conflict: Conflict) -> None:
+  """Resolver raising a `ValueError` on the first conflict."""
+  raise ValueError(
+    f"Duplicate id {conflict.id!r} in file {conflict.file[0]!r} from inputs "
+    f"{conflict.previous_input_index} and {conflict.input_index}"
+  )
+
+
+_RESOLVERS: dict[str, Resolver] = {"first": keep_first, "error": raise_error}
+
+
+class ConsolidationReport:
+  """What `consolidate` did."""
+
+  files: int
+  """The number of `<file>` elements written"""
+  sections: int
+  """The number of sections written"""
+  conflicts: list[tuple[FileKey, str, int, int]]
+  """The file, id, input index and previous input index of each conflict"""
+  dropped: int
+  """The number of sections the resolver dropped"""
+
+  __slots__ = ("files", "sections", "conflicts", "dropped")
+
+  def __init__(self) -> None:
+    self.files = 0
+    self.sections = 0
+    self.conflicts = []
+    self.dropped = 0
+
+
+type _Start = tuple[str, dict[str, str], dict[Optional[str], str]]
+
+
+def _start(element: let._Element) -> _Start:
+  """The tag, attributes and namespaces of an element, to open it again later."""
+  return str(element.tag), dict(element.attrib), dict(element.nsmap)
+
+
+def _body_tag(file_tag: str) -> str:
+  """The tag of the `<body>` of a `<file>`, in the same namespace."""
+  return let.QName(let.QName(file_tag).namespace, "body").text
+
+
+class _File:
+  """The parts of a `<file>` that are written once per output file."""
+
+  __slots__ = ("start", "root", "header", "body")
+
+  def __init__(self, start: _Start, root: _Start) -> None:
+    self.start = start
+    self.root = root
+    self.header: Optional[let._Element] = None
+    self.body: Optional[str] = None
+
+
+type _Item = tuple[FileKey, Any, int, int, _File, Optional[let._Element]]
+
+
+def _items(
+  source: XmlSource,
+  index: int,
+  section_key: Optional[Callable[[let._Element], Any]],
+) -> Iterator[_Item]:
+  root: _Start = ("xliff", {}, {})
+  file: Optional[_File] = None
+  key: FileKey = ("", "", "", "")
+  empty = in_body = False
+  position = 0
+  for event, value in iter_sections(source, containers=_CONTAINERS):
+    if isinstance(value, str):
+      continue
+    if event == "open":
+      name = local_name(value.tag)
+      if name == "xliff":
+        root = _start(value)
+      elif name == "file":
+        file = _File(_start(value), root)
+        key, empty = file_key(value), True
+      elif name == "body" and file is not None:
+        file.body, in_body = str(value.tag), True
+    elif event == "close":
+      name = local_name(value.tag)
+      if name == "body":
+        in_body = False
+      elif name == "file" and empty and file is not None:
+        # Still yielded so that the file appears in the output, the sort key must
+        # compare with the ones of sections
+        yield key, () if section_key is None else (0,), index, position, file, None
+        position += 1
+    elif event == "leaf" and file is not None:
+      if in_body and isinstance(value.tag, str):
+        sort = () if section_key is None else (1, section_key(value))
+        yield key, sort, index, position, file, value
+        position, empty = position + 1, False
+      elif local_name(value.tag) == "header":
+        file.header = deepcopy(value)
+
+
+def consolidate(
+  inputs: Sequence[XmlSource],
+  output: str | PathLike[str] | IO[bytes],
+  *,
+  section_key: Optional[Callable[[let._Element], Any]] = None,
+  resolve: Literal["first", "error"] | Resolver = "first",
+  fan_in: int = 256,
+) -> ConsolidationReport:
+  """
+  Merges many documents into one, in streaming mode.
+
+  The root `<xliff>` element of the output is the one of the input the first file
+  written comes from and each output `<file>` takes the attributes and `<header>` of
+  the first input file with its identity.
+
+  When a section has the same `id` as a previous section of the same file, `resolve`
+  is called with a `Conflict`. It returns the element to write instead, possibly
+  modified, or `None` to drop the section.
+
+  Args:
+      inputs (Sequence[XmlSource]): The documents to merge.
+      output (str | PathLike[str] | IO[bytes]): Where to write the merged document.
+      section_key (Optional[Callable[[lxml.etree._Element], Any]]): The key to order
+      the sections of a file by, computed from their element. Defaults to input order.
+      resolve ("first" | "error" | Resolver): How to resolve conflicts. "first" keeps
+      the first section, "error" raises a `ValueError`. Defaults to "first".
+      fan_in (int): The maximum number of inputs read at the same time. Larger input
+      sequences are merged in several passes through temporary files, which keeps the
+      number of open files under control. Conflicts are all resolved in the last
+      pass, so the report is the one of a single pass.
+
+  Returns:
+      ConsolidationReport: The number of files and sections written and the
+      conflicts found.
+
+  Raises:
+      ValueError: If `fan_in` is lower than 2 or `resolve` is "error" and there is a
+      conflict.
+  """
+  if fan_in < 2:
+    raise ValueError(f"fan_in must be at least 2, got {fan_in}")
+  resolver = _RESOLVERS[resolve] if isinstance(resolve, str) else resolve
+  origins = [repeat(index) for index in range(len(inputs))]
+  return _consolidate(inputs, output, section_key, resolver, fan_in, origins)[0]
+
+
+def _consolidate(
+  inputs: Sequence[XmlSource],
+  output: str | PathLike[str] | IO[bytes],
+  section_key: Optional[Callable[[let._Element], Any]],
+  resolver: Optional[Resolver],
+  fan_in: int,
+  origins: Sequence[Iterator[int]],
+) -> tuple[ConsolidationReport, array]:
+  """
+  Merges documents, `origins` giving the original input index of the sections of
+  each input in order. Without `resolver`, conflicts are left for a later pass.
+
+  Returns the report and the original input index of every section written.
+  """
+  if len(inputs) > fan_in:
+    with TemporaryDirectory() as directory:
+      size = -(-len(inputs) // fan_in)
+      passes, written = [], []
+      for start in range(0, len(inputs), size):
+        path = Path(directory) / f"{start}.xlf"
+        _, indices = _consolidate(
+          inputs[start : start + size],
+          path,
+          section_key,
+          None,
+          fan_in,
+          origins[start : start + size],
+        )
+        passes.append(path)
+        written.append(iter(indices))
+      # Sections are read back in the order of a single pass, conflicts included
+      return _consolidate(passes, output, section_key, resolver, fan_in, written)
+  report = ConsolidationReport()
+  indices = array("q")
+  current: Optional[FileKey] = None
+  seen: dict[str, int] = {}
+  items = merge(*(_items(source, i, section_key) for i, source in enumerate(inputs)))
+  with XliffWriter(output) as writer:
+    for key, _, index, _, file, element in items:
+      if key != current or not writer.depth:
+        if not writer.depth:
+          writer.open(*file.root)
+          writer.text("\n")
+        else:
+          writer.close()
+          writer.close()
+          writer.text("\n")
+        writer.open(*file.start)
+        if file.header is not None:
+          writer.leaf(file.header)
+        writer.open(file.body or _body_tag(file.start[0]))
+        writer.text("\n")
+        current, seen = key, {}
+        report.files += 1
+      if element is None:
+        continue
+      origin = next(origins[index])
+      id = element.get("id")
+      if id is not None and resolver is not None:
+        if id in seen:
+          report.conflicts.append((key, id, origin, seen[id]))
+          resolved = resolver(Conflict(key, id, element, origin, seen[id]))
+          if resolved is None:
+            report.dropped += 1
+            continue
+          element = resolved
+        else:
+          seen[id] = origin
+      writer.leaf(element)
+      writer.text("\n")
+      indices.append(origin)
+      report.sections += 1
+    if writer.depth:
+      writer.close()
+      writer.close()
+      writer.text("\n")
+  return report, indices
@@ -824,3 +824,30 @@ class SIZE_UNIT(Enum):
   """
   Indicates a size in rows. Used for HTML text area.
   """
+
+
+class VALIDATION_LEVEL(Enum):
+  OFF = "off"
+  """
+  Objects are never validated, not even when `validate` is called.
+  """
+  CONSTRUCT_ONLY = "construct-only"
+  """
+  Objects warn about invalid attributes when built, but are not validated when
+  serialized.
+  """
+  SERIALIZE_ONLY = "serialize-only"
+  """
+  Objects are validated with all their descendants when serialized, but not when
+  built.
+  """
+  STRICT = "strict"
+  """
+  Objects warn about invalid attributes when built and are validated with all their
+  descendants when serialized. The default.
+  """
+  LAZY = "lazy"
+  """
+  Objects are only validated when serialized, each one on its own when it is
+  reached, so that nothing is validated twice.
+  """
@@ -0,0 +1,262 @@
+"""
+Computing and verifying the `crc` of contexts and context groups.
+
+XLIFF leaves the checksum algorithm to the tools, this library uses CRC-32 written as
+8 uppercase hexadecimal digits:
+
+- the CRC of a `<context>` is the `zlib.crc32` of its encoded context type and value,
+- the CRC of a `<context-group>` is the `zlib.crc32` of the encoded context types
+  and values of all its contexts, in order.
+
+Checksums only depend on those values, so they are cached by value in a `CrcCache`:
+identical contexts found all over a corpus are only hashed once, and passing the same
+cache to successive calls skips the objects that didn't change in between.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from enum import Enum
+from typing import Any, NamedTuple, Optional
+from zlib import crc32
+from xliff.named_groups import Context, ContextGroup
+from xliff.objects import BaseXliffElement
+from xliff.streaming import XmlSource, iterparse, local_name, release
+import lxml.etree as let
+
+type _ContextKey = tuple[str, str]
+
+
+def _key(context_type: Any, value: Any) -> _ContextKey:
+  if isinstance(context_type, Enum):
+    return context_type.value, value or ""
+  return context_type or "", value or ""
+
+
+def _encode(key: _ContextKey) -> bytes:
+  return f"{key[0]}\x1f{key[1]}\x1e".encode()
+
+
+class CrcCache:
+  """
+  Checksums already computed, by the values they were computed from.
+
+  A cache can be shared between calls and is safe to keep across runs of the same
+  corpus. Call `clear` to free it.
+  """
+
+  __slots__ = ("_contexts", "_groups")
+
+  def __init__(self) -> None:
+    self._contexts: dict[_ContextKey, str] = {}
+    self._groups: dict[tuple[_ContextKey, ...], str] = {}
+
+  def __len__(self) -> int:
+    return len(self._contexts) + len(self._groups)
+
+  def clear(self) -> None:
+    """Removes all the cached checksums."""
+    self._contexts.clear()
+    self._groups.clear()
+
+  def context(self, key: _ContextKey) -> str:
+    """The checksum of a context, from its context type and value."""
+    crc = self._contexts.get(key)
+    if crc is None:
+      crc = self._contexts[key] = f"{crc32(_encode(key)):08X}"
+    return crc
+
+  def group(self, keys: tuple[_ContextKey, ...]) -> str:
+    """The checksum of a context group, from the keys of its contexts."""
+    crc = self._groups.get(keys)
+    if crc is None:
+      crc = self._groups[keys] = f"{crc32(b''.join(map(_encode, keys))):08X}"
+    return crc
+
+
+def context_crc(context: Context, *, cache: Optional[CrcCache] = None) -> str:
+  """
+  Returns the checksum of a context.
+
+  Args:
+      context (Context): The context.
+      cache (Optional[CrcCache]): The cache to use, to share it between calls.
+
+  Returns:
+      str: The CRC-32 of the context, as 8 uppercase hexadecimal digits.
+  """
+  cache = CrcCache() if cache is None else cache
+  return cache.context(_key(context.context_type, context.value))
+
+
+def context_group_crc(group: ContextGroup, *, cache: Optional[CrcCache] = None) -> str:
+  """
+  Returns the checksum of a context group.
+
+  Args:
+      group (ContextGroup): The context group.
+      cache (Optional[CrcCache]): The cache to use, to share it between calls.
+
+  Returns:
+      str: The CRC-32 of the contexts of the group, as 8 uppercase hexadecimal
+      digits.
+  """
+  cache = CrcCache() if cache is None else cache
+  return cache.group(tuple(_key(c.context_type, c.value) for c in group.contexts))
+
+
+def _checksums(
+  roots: BaseXliffElement | Iterable[BaseXliffElement], cache: CrcCache
+) -> Iterator[tuple[Context | ContextGroup, str]]:
+  """
+  Yields every context and context group found in `roots` with its checksum, depth
+  first, the contexts of a group coming before the group.
+  """
+  contexts = cache._contexts
+  stack = [roots] if isinstance(roots, BaseXliffElement) else list(roots)[::-1]
+  while stack:
+    node = stack.pop()
+    if isinstance(node, ContextGroup):
+      keys = []
+      for context in node.contexts:
+        key = _key(context.context_type, context.value)
+        keys.append(key)
+        yield context, contexts.get(key) or cache.context(key)
+      yield node, cache.group(tuple(keys))
+    elif isinstance(node, Context):
+      yield node, cache.context(_key(node.context_type, node.value))
+    else:
+      stack.extend(reversed(tuple(node._children)))
+
+
+def fill_crcs(
+  roots: BaseXliffElement | Iterable[BaseXliffElement],
+  *,
+  overwrite: bool = False,
+  cache: Optional[CrcCache] = None,
+) -> int:
+  """
+  Sets the `crc` of every context and context group found in `roots`.
+
+  Args:
+      roots (BaseXliffElement | Iterable[BaseXliffElement]): The objects to look for
+      contexts and context groups in, recursively.
+      overwrite (bool): Whether to replace checksums that are already set.
+      cache (Optional[CrcCache]): The cache to use, to share it between calls.
+
+  Returns:
+      int: The number of checksums set.
+  """
+  filled = 0
+  for node, crc in _checksums(roots, CrcCache() if cache is None else cache):
+    if overwrite or node.crc is None:
+      node.crc = crc
+      filled += 1
+  return filled
+
+
+def verify_crcs(
+  roots: BaseXliffElement | Iterable[BaseXliffElement],
+  *,
+  cache: Optional[CrcCache] = None,
+) -> list[Context | ContextGroup]:
+  """
+  Checks the `crc` of every context and context group found in `roots`.
+
+  Objects without a checksum are not checked.
+
+  Args:
+      roots (BaseXliffElement | Iterable[BaseXliffElement]): The objects to look for
+      contexts and context groups in, recursively.
+      cache (Optional[CrcCache]): The cache to use, to share it between calls.
+
+  Returns:
+      list[Context | ContextGroup]: The objects whose checksum is wrong, in depth
+      first order with the contexts of a group before the group.
+  """
+  return [
+    node
+    for node, crc in _checksums(roots, CrcCache() if cache is None else cache)
+    if node.crc is not None and node.crc.upper() != crc
+  ]
+
+
+_STREAM_TAGS = ("{*}context", "{*}context-group", "{*}trans-unit", "{*}group")
+
+
+class CrcMismatch(NamedTuple):
+  """A wrong checksum found by `verify_stream`."""
+
+  tag: str
+  """The local name of the element, either context or context-group"""
+  line: Optional[int]
+  """The line of the element in the document"""
+  expected: str
+  """The checksum computed from the element"""
+  found: str
+  """The checksum of the element"""
+
+
+def verify_stream(
+  source: XmlSource, *, cache: Optional[CrcCache] = None
+) -> list[CrcMismatch]:
+  """
+  Checks the `crc` of every `<context>` and `<context-group>` of a document, in
+  streaming mode.
+
+  Args:
+      source (XmlSource): The document to check.
+      cache (Optional[CrcCache]): The cache to use, to share it between calls.
+
+  Returns:
+      list[CrcMismatch]: The wrong checksums, in document order.
+  """
+  cache = CrcCache() if cache is None else cache
+  wrong = []
+  keys: list[_ContextKey] = []
+  for _, element in iterparse(source, events=("end",), tag=_STREAM_TAGS):
+    name = local_name(element.tag)
+    if name in ("trans-unit", "group"):
+      release(element)
+      continue
+    if name == "context":
+      key = _key(element.get("context-type"), element.text)
+      keys.append(key)
+      crc = element.get("crc")
+      if crc is not None and crc.upper() != (expected := cache.context(key)):
+        wrong.append(CrcMismatch("context", element.sourceline, expected, crc))
+      continue
+    crc = element.get("crc")
+    if crc is not None and crc.upper() != (expected := cache.group(tuple(keys))):
+      wrong.append(CrcMismatch("context-group", element.sourceline, expected, crc))
+    keys.clear()
+    release(element)
+  return wrong
+
+
+def element_crc(element: let._Element, *, cache: Optional[CrcCache] = None) -> str:
+  """
+  Returns the checksum of a `<context>` or `<context-group>` element.
+
+  Args:
+      element (lxml.etree._Element): The element.
+      cache (Optional[CrcCache]): The cache to use, to share it between calls.
+
+  Returns:
+      str: The CRC-32 of the element, as 8 uppercase hexadecimal digits.
+
+  Raises:
+      ValueError: If the element is neither a `<context>` nor a `<context-group>`.
+  """
+  cache = CrcCache() if cache is None else cache
+  name = local_name(element.tag)
+  if name == "context":
+    return cache.context(_key(element.get("context-type"), element.text))
+  if name == "context-group":
+    return cache.group(
+      tuple(
+        _key(child.get("context-type"), child.text)
+        for child in element
+        if local_name(child.tag) == "context"
+      )
+    )
+  raise ValueError(f"Expected <context> or <context-group> but got <{name}>")
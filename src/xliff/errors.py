@@ -1,4 +1,6 @@
-from typing import Any, Optional, TypedDict
+from collections.abc import Iterable, Iterator
+from functools import partial
+from typing import Any, NamedTuple, Optional, TypedDict
 
 
 class ErrorDetails(TypedDict):
@@ -11,6 +13,11 @@ class ErrorDetails(TypedDict):
 class ValidationError(Exception):
   """A Validation Error raised from a Type or ValueError"""
 
+  error: Exception
+  """The error raised by the validator"""
+  details: ErrorDetails
+  """The object, attribute, value and expected type or values that failed"""
+
   def __init__(self, error: Exception, details: ErrorDetails):
     """
     Creates a ValidationError.
@@ -20,6 +27,8 @@ class ValidationError(Exception):
         attribute: The name of the attribute that failed validation.
         value: The value that failed validation
     """
+    self.error = error
+    self.details = details
     match error:
       case TypeError():
         super().__init__(
@@ -55,3 +64,119 @@ class ValidationErrorGroup(Exception):
         for i, (obj, error) in enumerate(self.errors, 1)
       )
     )
+
+
+class ValidationIssue(NamedTuple):
+  """
+  An attribute that failed validation, found without raising any exception.
+
+  Messages and exceptions are only built when asked for.
+  """
+
+  source: object
+  """The object holding the attribute"""
+  attribute: str
+  """The name of the attribute"""
+  value: Any
+  """The invalid value"""
+  validator: partial[None]
+  """The validator that rejected the value"""
+
+  @property
+  def expected(self) -> type | tuple[type, ...] | str:
+    """The expected type, types or enum."""
+    return self.validator.keywords["expected"]
+
+  @property
+  def exception(self) -> Exception:
+    """The TypeError or ValueError the validator raises for the value."""
+    try:
+      self.validator(self.value)
+    except (TypeError, ValueError) as e:
+      return e
+    raise RuntimeError(f"{self.value!r} is valid for {self.attribute!r}")
+
+  @property
+  def details(self) -> ErrorDetails:
+    """The details a `ValidationError` for this issue holds."""
+    return {
+      "attribute": self.attribute,
+      "value": self.value,
+      "expected": self.expected,
+      "source": self.source,
+    }
+
+  @property
+  def error(self) -> ValidationError:
+    """The `ValidationError` `validate` raises for this issue."""
+    return ValidationError(self.exception, self.details)
+
+  @property
+  def message(self) -> str:
+    """The message of the `ValidationError` for this issue."""
+    return str(self.error)
+
+
+class ValidationResult:
+  """
+  The outcome of validating an object, true if the object is valid.
+
+  Issues are kept as found, no exception is created unless asked for with
+  `errors` or `raise_for_errors`.
+  """
+
+  __slots__ = ("_issues",)
+
+  def __init__(self, issues: Iterable[ValidationIssue] = ()) -> None:
+    """
+    Creates a ValidationResult.
+
+    Args:
+        issues (Iterable[ValidationIssue]): The issues found, none if valid.
+    """
+    self._issues = tuple(issues)
+
+  def __bool__(self) -> bool:
+    return not self._issues
+
+  def __len__(self) -> int:
+    return len(self._issues)
+
+  def __iter__(self) -> Iterator[ValidationIssue]:
+    return iter(self._issues)
+
+  def __repr__(self) -> str:
+    return f"ValidationResult(valid={self.valid}, issues={len(self._issues)})"
+
+  @property
+  def valid(self) -> bool:
+    """Whether no issue was found."""
+    return not self._issues
+
+  @property
+  def issues(self) -> tuple[ValidationIssue, ...]:
+    """The issues found, in the order `validate` reports them."""
+    return self._issues
+
+  @property
+  def errors(self) -> list[tuple[object, ValidationError]]:
+    """The issues as the (object, error) tuples of a `ValidationErrorGroup`."""
+    return [(issue.source, issue.error) for issue in self._issues]
+
+  def raise_for_errors(self, *, gather_all_errors: bool = True) -> None:
+    """
+    Raises the exception `validate` raises for the same issues, if any.
+
+    Args:
+        gather_all_errors (bool): If True, raises a ValidationErrorGroup of all the
+        issues, else a ValidationError for the first one. Defaults to True.
+
+    Raises:
+        ValidationError: If there are issues and gather_all_errors is False.
+        ValidationErrorGroup: If there are issues and gather_all_errors is True.
+    """
+    if not self._issues:
+      return
+    if not gather_all_errors:
+      raise self._issues[0].error
+    raise ValidationErrorGroup(self.errors)
@@ -0,0 +1,263 @@
+"""
+Flat extraction of the translatable content of a document.
+
+Each `<trans-unit>` becomes a row of plain strings, read straight from the parse
+events without building any `BaseXliffElement`, which makes it suitable for analytics
+and machine translation pre-processing of large documents.
+
+Extraction is about 3.5 to 4 times faster than parsing the whole tree and building
+the objects of every unit (see `benchmarks/bench_extraction.py`), short of the 5
+times initially aimed at: most of its time is spent in lxml's `iterparse` itself,
+which is already slower than parsing the whole tree at once.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator, Sequence
+from csv import writer as csv_writer
+from json.encoder import encode_basestring
+from os import PathLike
+from typing import IO, Any, Optional
+from xliff.constants import CONTEXT_TYPE
+from xliff.named_groups import Context
+from xliff.streaming import XmlSource, element_text, iterparse, local_name, release
+from xliff.structural import Group
+
+type Row = tuple[Optional[str], ...]
+
+COLUMNS = ("file", "group_path", "id", "resname", "source", "target", "restype")
+"""
+The columns every row starts with.
+"""
+
+# Some entries of the map have stray spaces
+_ATTRIBUTES = {
+  name.strip(): xml_name.strip() for name, xml_name in Group._xml_attribute_map.items()
+}
+_CONTEXT_TYPE = Context._xml_attribute_map["context_type"]
+_TAGS = ("{*}file", "{*}group", "{*}trans-unit")
+
+
+def _xml_names(attributes: Sequence[str]) -> list[str]:
+  names = []
+  for attribute in attributes:
+    if attribute not in _ATTRIBUTES:
+      raise ValueError(f"Unknown attribute {attribute!r}")
+    names.append(_ATTRIBUTES[attribute])
+  return names
+
+
+def _context_types(contexts: Sequence[CONTEXT_TYPE | str]) -> list[str]:
+  return [c.value if isinstance(c, CONTEXT_TYPE) else c for c in contexts]
+
+
+def columns(
+  *,
+  attributes: Sequence[str] = (),
+  contexts: Sequence[CONTEXT_TYPE | str] = (),
+) -> tuple[str, ...]:
+  """
+  Returns the names of the columns of the rows of `iter_rows`.
+
+  Args:
+      attributes (Sequence[str]): The extra unit attributes, by their `Group`
+      attribute name.
+      contexts (Sequence[CONTEXT_TYPE | str]): The extra context types.
+
+  Returns:
+      tuple[str, ...]: `COLUMNS`, then the attribute names, then `context:<type>` for
+      each context type.
+
+  Raises:
+      ValueError: If an attribute is not an attribute of `Group`.
+  """
+  _xml_names(attributes)
+  return (
+    *COLUMNS,
+    *attributes,
+    *(f"context:{context}" for context in _context_types(contexts)),
+  )
+
+
+def iter_rows(
+  source: XmlSource,
+  *,
+  attributes: Sequence[str] = (),
+  contexts: Sequence[CONTEXT_TYPE | str] = (),
+  separator: str = "/",
+) -> Iterator[Row]:
+  """
+  Iterates over the `<trans-unit>` elements of a document as rows.
+
+  The values of a row follow `columns`: the `original` of the file, the ids of the
+  enclosing groups joined by `separator`, the `id`, `resname`, the text of the
+  `<source>` and `<target>` (including the text of inline elements) and `restype` of
+  the unit, then the requested attributes and the value of the first `<context>` of
+  each requested type. Missing values are `None`.
+
+  Args:
+      source (XmlSource): The document to read.
+      attributes (Sequence[str]): Extra unit attributes to extract, by their `Group`
+      attribute name, e.g. "maxbytes" or "size_unit".
+      contexts (Sequence[CONTEXT_TYPE | str]): Context types whose value to extract.
+      separator (str): The separator of the group ids in the group path.
+
+  Returns:
+      Iterator[Row]: One row per unit, in document order.
+
+  Raises:
+      ValueError: If an attribute is not an attribute of `Group`.
+  """
+  xml_names = _xml_names(attributes)
+  context_types = _context_types(contexts)
+  original: Optional[str] = None
+  groups: list[str] = []
+  group_path = ""
+  # The local name of every tag met, the same few tags are on every unit
+  names: dict[Any, str] = {}
+  for event, element in iterparse(source, tag=_TAGS):
+    tag = element.tag
+    name = names.get(tag)
+    if name is None:
+      name = names[tag] = local_name(tag)
+    if name != "trans-unit":
+      if name == "group":
+        if event == "start":
+          groups.append(element.get("id") or "")
+        else:
+          groups.pop()
+          release(element)
+        group_path = separator.join(groups)
+      elif event == "start":
+        original = element.get("original")
+      else:
+        release(element)
+      continue
+    if event == "start":
+      continue
+    source_text = target_text = None
+    found: dict[str, str] = {}
+    for child in element:
+      tag = child.tag
+      name = names.get(tag)
+      if name is None:
+        name = names[tag] = local_name(tag)
+      if name == "source":
+        source_text = element_text(child)
+      elif name == "target":
+        target_text = element_text(child)
+      elif name == "context-group" and context_types:
+        for context in child:
+          context_type = context.get(_CONTEXT_TYPE)
+          if context_type in context_types and context_type not in found:
+            found[context_type] = context.text or ""
+    get = element.get
+    row: Row = (
+      original,
+      group_path,
+      get("id"),
+      get("resname"),
+      source_text,
+      target_text,
+      get("restype"),
+    )
+    # Most extractions ask for no extra column
+    if xml_names or context_types:
+      row += (
+        *[get(xml_name) for xml_name in xml_names],
+        *[found.get(context_type) for context_type in context_types],
+      )
+    yield row
+    release(element)
+
+
+def _open_text(output: str | PathLike[str] | IO[str]) -> tuple[IO[str], bool]:
+  if isinstance(output, (str, PathLike)):
+    return open(output, "w", encoding="utf-8", newline=""), True
+  return output, False
+
+
+def write_csv(
+  source: XmlSource,
+  output: str | PathLike[str] | IO[str],
+  *,
+  attributes: Sequence[str] = (),
+  contexts: Sequence[CONTEXT_TYPE | str] = (),
+  header: bool = True,
+) -> int:
+  """
+  Writes the rows of `iter_rows` as CSV.
+
+  Args:
+      source (XmlSource): The document to read.
+      output (str | PathLike[str] | IO[str]): The path of the file to write or a text
+      file object, which should be opened with `newline=""`.
+      attributes (Sequence[str]): Extra unit attributes to extract.
+      contexts (Sequence[CONTEXT_TYPE | str]): Context types whose value to extract.
+      header (bool): Whether to write the column names first.
+
+  Returns:
+      int: The number of rows written, not counting the header.
+
+  Raises:
+      ValueError: If an attribute is not an attribute of `Group`.
+  """
+  names = columns(attributes=attributes, contexts=contexts)
+  file, owned = _open_text(output)
+  try:
+    writer = csv_writer(file)
+    if header:
+      writer.writerow(names)
+    count = 0
+    for row in iter_rows(source, attributes=attributes, contexts=contexts):
+      writer.writerow(row)
+      count += 1
+    return count
+  finally:
+    if owned:
+      file.close()
+
+
+def write_jsonl(
+  source: XmlSource,
+  output: str | PathLike[str] | IO[str],
+  *,
+  attributes: Sequence[str] = (),
+  contexts: Sequence[CONTEXT_TYPE | str] = (),
+) -> int:
+  """
+  Writes the rows of `iter_rows` as JSON lines, one object per row keyed by column.
+
+  Args:
+      source (XmlSource): The document to read.
+      output (str | PathLike[str] | IO[str]): The path of the file to write or a text
+      file object.
+      attributes (Sequence[str]): Extra unit attributes to extract.
+      contexts (Sequence[CONTEXT_TYPE | str]): Context types whose value to extract.
+
+  Returns:
+      int: The number of rows written.
+
+  Raises:
+      ValueError: If an attribute is not an attribute of `Group`.
+  """
+  names = columns(attributes=attributes, contexts=contexts)
+  # The keys are encoded once, each row only encodes its values, the same way
+  # `json.dumps` would encode the row as a dict
+  line = "{%s}\n" % ", ".join(
+    encode_basestring(name).replace("%", "%%") + ": %s" for name in names
+  )
+  file, owned = _open_text(output)
+  try:
+    count = 0
+    for row in iter_rows(source, attributes=attributes, contexts=contexts):
+      file.write(
+        line
+        % tuple(
+          ["null" if value is None else encode_basestring(value) for value in row]
+        )
+      )
+      count += 1
+    return count
+  finally:
+    if owned:
+      file.close()
@@ -0,0 +1,380 @@
+"""
+Accounting for the memory used by the objects built from documents.
+
+`footprint` walks trees of objects and reports, for each class, the number of
+instances and the bytes used by:
+
+- the objects themselves, with their slots (`object_bytes`),
+- the values of their attributes, strings, containers and arrays, counted once even
+  if shared, like interned strings (`value_bytes`),
+- the lxml element they retain as their `_source_element`, both the Python proxy and
+  an estimate of the libxml2 node with its attributes and text (`source_bytes`).
+
+A retained source element keeps its whole document alive. The documents retained
+are reported on their own, estimated from their number of nodes, as libxml2
+allocates outside of the Python heap.
+
+`profile_load` loads a document as `xliff.streaming.load` does, with `tracemalloc`
+snapshots around the parse and construct phases to attribute the Python
+allocations to each.
+
+Reports can be stored with `MemoryReport.to_dict` and compared with
+`MemoryReport.regressions` to fail benchmarks when memory use grows.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Mapping
+from array import array
+from enum import Enum
+from typing import Any, NamedTuple, Optional
+from xliff.objects import BaseXliffElement, _slot_names
+from xliff.policy import source_retention
+from xliff.streaming import XmlSource, construct, parse_document
+import lxml.etree as let
+import sys
+import tracemalloc
+
+NODE_BYTES = 120
+"""
+The size of a libxml2 node (`xmlNode`) on 64-bit platforms, used for elements,
+comments and text.
+"""
+ATTRIBUTE_BYTES = 96
+"""
+The size of a libxml2 attribute (`xmlAttr`) on 64-bit platforms, whose value is
+stored in a text node.
+"""
+
+
+class ClassFootprint(NamedTuple):
+  """The memory used by the instances of a class."""
+
+  instances: int
+  """The number of objects"""
+  object_bytes: int
+  """The size of the objects and their slots"""
+  value_bytes: int
+  """The size of the values of their attributes"""
+  source_elements: int
+  """The number of objects retaining their source element"""
+  source_bytes: int
+  """The estimated size of the source elements, without their children"""
+
+  @property
+  def total(self) -> int:
+    """All the bytes attributed to the class."""
+    return self.object_bytes + self.value_bytes + self.source_bytes
+
+
+class PhaseMemory(NamedTuple):
+  """The Python allocations of a phase, as traced by `tracemalloc`."""
+
+  allocated: int
+  """The bytes allocated during the phase and still allocated at its end"""
+  peak: int
+  """The highest number of bytes allocated during the phase"""
+  by_file: dict[str, int]
+  """The bytes still allocated at the end, by source file, largest first"""
+
+
+class MemoryReport:
+  """The memory used by trees of objects, by class."""
+
+  classes: dict[str, ClassFootprint]
+  """The footprint of each class, the largest first"""
+  documents: int
+  """The number of documents kept alive by source elements"""
+  document_bytes: int
+  """The estimated size of those documents in libxml2"""
+  phases: dict[str, PhaseMemory]
+  """The allocations of the phases, if the objects were built by `profile_load`"""
+
+  __slots__ = ("classes", "documents", "document_bytes", "phases")
+
+  def __init__(
+    self,
+    classes: Mapping[str, ClassFootprint],
+    documents: int = 0,
+    document_bytes: int = 0,
+    phases: Optional[Mapping[str, PhaseMemory]] = None,
+  ) -> None:
+    self.classes = dict(
+      sorted(classes.items(), key=lambda item: (-item[1].total, item[0]))
+    )
+    self.documents = documents
+    self.document_bytes = document_bytes
+    self.phases = {} if phases is None else dict(phases)
+
+  @property
+  def python_bytes(self) -> int:
+    """The bytes used by the objects and their values in the Python heap."""
+    return sum(
+      footprint.object_bytes + footprint.value_bytes
+      for footprint in self.classes.values()
+    )
+
+  @property
+  def total(self) -> int:
+    """The bytes used by the objects, their values and the documents retained."""
+    if self.documents:
+      # The source elements are part of their document
+      return self.python_bytes + self.document_bytes
+    return sum(footprint.total for footprint in self.classes.values())
+
+  def __repr__(self) -> str:
+    return (
+      f"<MemoryReport {sum(f.instances for f in self.classes.values())} objects, "
+      f"{self.total} bytes>"
+    )
+
+  def to_dict(self) -> dict[str, object]:
+    """The report as json compatible values, to store as a baseline."""
+    return {
+      "classes": {
+        name: footprint._asdict() for name, footprint in self.classes.items()
+      },
+      "documents": self.documents,
+      "document_bytes": self.document_bytes,
+      "total": self.total,
+      "phases": {
+        name: {"allocated": phase.allocated, "peak": phase.peak}
+        for name, phase in self.phases.items()
+      },
+    }
+
+  @classmethod
+  def from_dict(cls, data: Mapping[str, Any]) -> MemoryReport:
+    """
+    Reads a report stored with `to_dict`.
+
+    Phases are read without their allocations by file, which are not stored.
+    """
+    phases = {
+      name: PhaseMemory(phase["allocated"], phase["peak"], {})
+      for name, phase in data.get("phases", {}).items()
+    }
+    return cls(
+      {
+        name: ClassFootprint(**values)
+        for name, values in data.get("classes", {}).items()
+      },
+      data.get("documents", 0),
+      data.get("document_bytes", 0),
+      phases,
+    )
+
+  def regressions(
+    self, baseline: Mapping[str, object], *, tolerance: float = 0.05
+  ) -> list[str]:
+    """
+    Compares the report with a baseline stored with `to_dict`.
+
+    Args:
+        baseline (Mapping[str, object]): The stored report.
+        tolerance (float): The growth allowed, as a fraction of the baseline.
+        Defaults to 5%.
+
+    Returns:
+        list[str]: A message for each value that grew by more than `tolerance`,
+        none if memory use didn't grow.
+    """
+    current = self.to_dict()
+    found = []
+    pairs: list[tuple[str, object, object]] = [
+      (name, baseline.get(name), current[name])
+      for name in ("documents", "document_bytes", "total")
+    ]
+    classes: Mapping = baseline.get("classes", {})  # type: ignore
+    for name, footprint in self.classes.items():
+      stored = classes.get(name, {})
+      for field, value in footprint._asdict().items():
+        pairs.append((f"{name}.{field}", stored.get(field), value))
+    for key, old, new in pairs:
+      if not isinstance(old, int) or not isinstance(new, int):
+        continue
+      if new > old * (1 + tolerance):
+        found.append(f"{key} grew from {old} to {new}")
+    return found
+
+  def format(self) -> str:
+    """The report as a table, one line per class."""
+    rows = [("class", "instances", "objects", "values", "sources", "total")]
+    rows.extend(
+      (
+        name,
+        str(footprint.instances),
+        str(footprint.object_bytes),
+        str(footprint.value_bytes),
+        str(footprint.source_bytes),
+        str(footprint.total),
+      )
+      for name, footprint in self.classes.items()
+    )
+    widths = [max(len(row[column]) for row in rows) for column in range(6)]
+    lines = [
+      "  ".join(
+        cell.ljust(width) if column == 0 else cell.rjust(width)
+        for column, (cell, width) in enumerate(zip(row, widths))
+      )
+      for row in rows
+    ]
+    lines.append(
+      f"{self.documents} documents retained, {self.document_bytes} bytes, "
+      f"{self.total} bytes in total"
+    )
+    for name, phase in self.phases.items():
+      lines.append(f"{name}: {phase.allocated} bytes allocated, {phase.peak} peak")
+    return "\n".join(lines)
+
+
+def _node_bytes(element: let._Element) -> int:
+  """The estimated size of an element in libxml2, without its children."""
+  size = NODE_BYTES
+  for value in element.attrib.values():
+    size += ATTRIBUTE_BYTES + NODE_BYTES + len(value.encode()) + 1
+  for text in (element.text, element.tail):
+    if text:
+      size += NODE_BYTES + len(text.encode()) + 1
+  return size
+
+
+def _value_bytes(value: object, seen: set[int]) -> int:
+  """The size of a value and of what it holds, except objects and elements."""
+  if (
+    value is None
+    or isinstance(value, (bool, Enum, type, BaseXliffElement, let._Element))
+    or callable(value)
+    or id(value) in seen
+  ):
+    return 0
+  seen.add(id(value))
+  size = sys.getsizeof(value)
+  if isinstance(value, (str, bytes, int, float, array)):
+    return size
+  if isinstance(value, dict):
+    items: Iterable[object] = (*value.keys(), *value.values())
+  elif isinstance(value, (list, tuple, set, frozenset)):
+    items = value
+  else:
+    names = [
+      name for klass in type(value).__mro__ for name in getattr(klass, "__slots__", ())
+    ]
+    items = [getattr(value, name, None) for name in names]
+    items.extend(getattr(value, "__dict__", {}).values())
+  return size + sum(_value_bytes(item, seen) for item in items)
+
+
+def footprint(roots: BaseXliffElement | Iterable[BaseXliffElement]) -> MemoryReport:
+  """
+  Measures the memory used by objects and all their descendants.
+
+  Objects and values shared by several parents are counted once, for the first
+  class holding them.
+
+  Args:
+      roots (BaseXliffElement | Iterable[BaseXliffElement]): The objects to measure.
+
+  Returns:
+      MemoryReport: The memory used, by class.
+  """
+  stack = [roots] if isinstance(roots, BaseXliffElement) else list(roots)
+  stack.reverse()
+  counts: dict[str, list[int]] = {}
+  seen_objects: set[int] = set()
+  seen_values: set[int] = set()
+  documents: dict[int, let._Element] = {}
+  while stack:
+    node = stack.pop()
+    if id(node) in seen_objects:
+      continue
+    seen_objects.add(id(node))
+    cls = type(node)
+    values = sum(
+      _value_bytes(getattr(node, name, None), seen_values)
+      for name in (*_slot_names(cls), "_children")
+    )
+    sizes = counts.setdefault(cls.__name__, [0, 0, 0, 0, 0])
+    sizes[0] += 1
+    sizes[1] += sys.getsizeof(node)
+    sizes[2] += values
+    source = node._source_element
+    if isinstance(source, let._Element):
+      sizes[3] += 1
+      sizes[4] += sys.getsizeof(source) + _node_bytes(source)
+      # Keeping the root alive keeps its proxy, so that it is found again
+      root = source.getroottree().getroot()
+      documents.setdefault(id(root), root)
+    stack.extend(reversed(tuple(node._children)))
+  document_bytes = sum(
+    _node_bytes(element) for root in documents.values() for element in root.iter()
+  )
+  return MemoryReport(
+    {name: ClassFootprint(*values) for name, values in counts.items()},
+    len(documents),
+    document_bytes,
+  )
+
+
+def _top_files(
+  before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int = 10
+) -> dict[str, int]:
+  differences = after.compare_to(before, "filename")
+  return {
+    difference.traceback[0].filename: difference.size_diff
+    for difference in differences[:limit]
+    if difference.size_diff > 0
+  }
+
+
+def profile_load(
+  source: XmlSource, *, retain_source: Optional[bool] = None
+) -> tuple[list[BaseXliffElement], MemoryReport]:
+  """
+  Loads a document like `xliff.streaming.load` and reports the memory it uses.
+
+  `tracemalloc` is started for the duration of the load if it isn't already
+  tracing. Only the allocations of the Python heap are traced, the memory libxml2
+  uses for the parsed document is the `document_bytes` estimate.
+
+  Args:
+      source (XmlSource): The document to read.
+      retain_source (Optional[bool]): Whether the objects keep their source
+      element, see `xliff.streaming.load`.
+
+  Returns:
+      tuple[list[BaseXliffElement], MemoryReport]: The objects built, and their
+      footprint with the allocations of the `parse` and `construct` phases.
+  """
+  started = not tracemalloc.is_tracing()
+  if started:
+    tracemalloc.start()
+  try:
+    phases: dict[str, PhaseMemory] = {}
+    snapshot = tracemalloc.take_snapshot()
+    start = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    root = parse_document(source)
+    current, peak = tracemalloc.get_traced_memory()
+    parsed = tracemalloc.take_snapshot()
+    phases["parse"] = PhaseMemory(
+      current - start, peak - start, _top_files(snapshot, parsed)
+    )
+    start = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    if retain_source is None:
+      objects = construct(root)
+    else:
+      with source_retention(retain_source):
+        objects = construct(root)
+    current, peak = tracemalloc.get_traced_memory()
+    phases["construct"] = PhaseMemory(
+      current - start,
+      peak - start,
+      _top_files(parsed, tracemalloc.take_snapshot()),
+    )
+  finally:
+    if started:
+      tracemalloc.stop()
+  report = footprint(objects)
+  report.phases = phases
+  return objects, report
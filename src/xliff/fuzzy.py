@@ -0,0 +1,563 @@
+"""
+Fuzzy matching of segments against a translation memory.
+
+Segments are indexed by their character n-grams in an inverted index, the text
+being padded with boundary markers so that short texts have n-grams too. A query
+only scores the segments sharing enough n-grams with it to possibly reach the
+requested similarity (an edit changes at most `n` n-grams) and whose length is
+compatible, using an edit distance bounded by that similarity. When the similarity
+is low enough for a segment sharing no n-gram to match, as for short queries, the
+segments of a compatible length are scanned as well.
+
+The similarity of two segments is `1 - distance / length of the longest` of their
+normalized forms, so a similarity of 1 means the normalized sources are identical.
+"""
+
+from __future__ import annotations
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from copy import deepcopy
+from heapq import heappush, heappushpop, nsmallest
+from itertools import islice
+from math import ceil, floor
+from multiprocessing import Pool
+from multiprocessing.pool import Pool as ProcessPool
+from os import PathLike
+from typing import IO, Any, NamedTuple, Optional
+from xliff.analysis import normalize
+from xliff.constants import UNIT
+from xliff.named_groups import Count, CountGroup
+from xliff.streaming import (
+  SectionEvent,
+  XliffWriter,
+  XmlSource,
+  element_text,
+  iter_sections,
+  iterparse,
+  local_name,
+  release,
+)
+import lxml.etree as let
+
+
+class FuzzyMatch(NamedTuple):
+  """A segment of a `FuzzyIndex` similar to a query."""
+
+  similarity: float
+  """Between 0 and 1, 1 meaning the normalized sources are identical"""
+  source: str
+  """The source of the segment"""
+  target: str
+  """The translation of the segment"""
+  origin: Optional[str]
+  """Where the segment comes from"""
+
+
+def bounded_distance(first: str, second: str, bound: int) -> int:
+  """
+  Returns the Levenshtein distance between two strings, if it is at most `bound`.
+
+  Uses the bit-parallel algorithm of Myers, as formulated by Hyyrö, which computes a
+  whole column of the dynamic programming table with a few integer operations. The
+  computation stops as soon as the distance is known to be over `bound`.
+
+  Args:
+      first (str): A string.
+      second (str): Another string.
+      bound (int): The largest distance of interest.
+
+  Returns:
+      int: The distance, or `bound + 1` if it is larger than `bound`.
+  """
+  over = bound + 1
+  if abs(len(first) - len(second)) > bound:
+    return over
+  if first == second:
+    return 0
+  if len(first) > len(second):
+    first, second = second, first
+  if not first:
+    return len(second)
+  # The positions of each character of the shorter string, as bits
+  positions: dict[str, int] = {}
+  for position, char in enumerate(first):
+    positions[char] = positions.get(char, 0) | 1 << position
+  mask = (1 << len(first)) - 1
+  last = 1 << (len(first) - 1)
+  positive, negative = mask, 0
+  distance = len(first)
+  remaining = len(second)
+  for char in second:
+    equal = positions.get(char, 0)
+    vertical = equal | negative
+    horizontal = (((equal & positive) + positive) ^ positive) | equal
+    horizontal_positive = negative | ~(horizontal | positive) & mask
+    horizontal_negative = positive & horizontal
+    if horizontal_positive & last:
+      distance += 1
+    elif horizontal_negative & last:
+      distance -= 1
+    remaining -= 1
+    # Every remaining character lowers the distance by one at most
+    if distance - remaining > bound:
+      return over
+    horizontal_positive = (horizontal_positive << 1 | 1) & mask
+    horizontal_negative = horizontal_negative << 1 & mask
+    positive = horizontal_negative | ~(vertical | horizontal_positive) & mask
+    negative = horizontal_positive & vertical
+  return distance if distance <= bound else over
+
+
+# Pad texts before taking their n-grams, control characters can't appear in XML
+_START, _END = "\x02", "\x03"
+
+
+class FuzzyIndex:
+  """An inverted index of the character n-grams of translated segments."""
+
+  __slots__ = (
+    "n",
+    "_sources",
+    "_targets",
+    "_origins",
+    "_lengths",
+    "_postings",
+    "_by_length",
+    "_segments",
+  )
+
+  def __init__(self, n: int = 3) -> None:
+    """
+    Creates an empty index.
+
+    Args:
+        n (int): The length of the n-grams. Defaults to 3.
+
+    Raises:
+        ValueError: If `n` is lower than 1.
+    """
+    if n < 1:
+      raise ValueError(f"n must be at least 1, got {n}")
+    self.n = n
+    self._sources: list[str] = []
+    self._targets: list[str] = []
+    self._origins: list[Optional[str]] = []
+    self._lengths = array("I")
+    self._postings: dict[str, array] = {}
+    self._by_length: dict[int, array] = {}
+    self._segments: set[tuple[str, str]] = set()
+
+  def __len__(self) -> int:
+    return len(self._sources)
+
+  def _grams(self, text: str) -> set[str]:
+    if not text:
+      return set()
+    n = self.n
+    text = f"{_START * (n - 1)}{text}{_END * (n - 1)}"
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+  def add(self, source: str, target: str, origin: Optional[str] = None) -> bool:
+    """
+    Adds a translated segment to the index.
+
+    Args:
+        source (str): The source text, normalized before indexing.
+        target (str): Its translation.
+        origin (Optional[str]): Where the segment comes from.
+
+    Returns:
+        bool: Whether the segment was added, `False` if the same normalized source
+        with the same target was already indexed.
+    """
+    normalized = normalize(source)
+    if (normalized, target) in self._segments:
+      return False
+    self._segments.add((normalized, target))
+    index = len(self._sources)
+    self._sources.append(normalized)
+    self._targets.append(target)
+    self._origins.append(origin)
+    self._lengths.append(len(normalized))
+    by_length = self._by_length.get(len(normalized))
+    if by_length is None:
+      by_length = self._by_length[len(normalized)] = array("I")
+    by_length.append(index)
+    postings = self._postings
+    for gram in self._grams(normalized):
+      posting = postings.get(gram)
+      if posting is None:
+        posting = postings[gram] = array("I")
+      posting.append(index)
+    return True
+
+  def add_document(self, source: XmlSource) -> int:
+    """
+    Adds the translated `<trans-unit>` elements of a document, in streaming mode.
+
+    Units without a `<target>`, or with an empty one, are skipped. The `original` of
+    the file of each unit is stored as its origin.
+
+    Args:
+        source (XmlSource): The document to read.
+
+    Returns:
+        int: The number of segments added, duplicates excluded.
+    """
+    added = 0
+    original: Optional[str] = None
+    tags = ("{*}file", "{*}group", "{*}trans-unit")
+    for event, element in iterparse(source, tag=tags):
+      name = local_name(element.tag)
+      if name == "file" and event == "start":
+        original = element.get("original")
+        continue
+      if name != "trans-unit":
+        # Emptied groups would otherwise stay in the tree until the end of the file
+        if event == "end":
+          release(element)
+        continue
+      if event == "start":
+        continue
+      source_element = element.find("{*}source")
+      target_element = element.find("{*}target")
+      if source_element is not None and target_element is not None:
+        target = element_text(target_element)
+        if target and self.add(element_text(source_element), target, original):
+          added += 1
+      release(element)
+    return added
+
+  def search(
+    self,
+    query: str,
+    *,
+    threshold: float = 0.75,
+    limit: int = 5,
+    candidates: Optional[int] = 100,
+  ) -> list[FuzzyMatch]:
+    """
+    Finds the segments most similar to a query.
+
+    Args:
+        query (str): The source to look for, normalized before searching.
+        threshold (float): The minimum similarity, between 0 (excluded) and 1.
+        limit (int): The maximum number of matches.
+        candidates (Optional[int]): The maximum number of segments scored, the ones
+        sharing the most n-grams with the query. Below a similarity of about 0.8
+        the n-grams only rule out few segments, this keeps the cost of a query
+        bounded at the price of rarely missing a match. `None` scores every
+        segment that can possibly match.
+
+    Returns:
+        list[FuzzyMatch]: The matches, the most similar first. Ties are broken by
+        index order.
+
+    Raises:
+        ValueError: If `threshold` is not in ]0, 1].
+    """
+    if not 0 < threshold <= 1:
+      raise ValueError(f"threshold must be in ]0, 1], got {threshold}")
+    query = normalize(query)
+    grams = self._grams(query)
+    if not grams or limit < 1:
+      return []
+    n, size, length = self.n, len(grams), len(query)
+    shortest, longest = threshold * length - 1e-9, length / threshold + 1e-9
+    shared: Counter[int] = Counter()
+    postings = self._postings
+    for gram in grams:
+      posting = postings.get(gram)
+      if posting is not None:
+        shared.update(posting)
+    # An edit removes at most n of the n-grams of the query
+    lengths = self._lengths
+    ranked = [
+      (-count, index)
+      for index, count in shared.items()
+      if shortest <= lengths[index] <= longest
+      and count
+      >= size - n * floor((1 - threshold) * max(length, lengths[index]) + 1e-9)
+    ]
+    if size - n * floor((1 - threshold) * longest + 1e-9) <= 0:
+      # Ranked after the others, only needed to fill the remaining candidates
+      unshared = self._unshared(shared, size, length, threshold)
+      if candidates is not None:
+        unshared = islice(unshared, max(candidates - len(ranked), 0))
+      ranked.extend(unshared)
+    if candidates is not None and len(ranked) > candidates:
+      ranked = nsmallest(candidates, ranked)
+    else:
+      ranked.sort()
+    # Longer segments can't be closer than this, shorter ones are bounded by length
+    most_edits = floor((1 - threshold) * length / threshold + 1e-9)
+    shared_needed = size - n * most_edits
+    best: list[tuple[float, int]] = []
+    floor_similarity = threshold
+    sources = self._sources
+    for count, index in ranked:
+      if -count < shared_needed:
+        # Candidates are sorted by shared n-grams, none of the others can do better
+        break
+      longer = max(length, lengths[index])
+      bound = floor((1 - floor_similarity) * longer + 1e-9)
+      distance = bounded_distance(query, sources[index], bound)
+      if distance > bound:
+        continue
+      similarity = 1 - distance / longer
+      if len(best) < limit:
+        heappush(best, (similarity, -index))
+      else:
+        heappushpop(best, (similarity, -index))
+      if len(best) == limit and best[0][0] > floor_similarity:
+        floor_similarity = best[0][0]
+        most_edits = floor((1 - floor_similarity) * length / floor_similarity + 1e-9)
+        shared_needed = size - n * most_edits
+    return [
+      FuzzyMatch(
+        similarity, sources[-index], self._targets[-index], self._origins[-index]
+      )
+      for similarity, index in sorted(best, reverse=True)
+    ]
+
+  def _unshared(
+    self, shared: Counter[int], size: int, length: int, threshold: float
+  ) -> Iterator[tuple[int, int]]:
+    """
+    The segments sharing no n-gram with a query of `size` n-grams which can still
+    match it, as candidates. The lengths closest to the query come first.
+    """
+    others = range(
+      ceil(threshold * length - 1e-9), floor(length / threshold + 1e-9) + 1
+    )
+    for other in sorted(others, key=lambda other: abs(other - length)):
+      edits = floor((1 - threshold) * max(length, other) + 1e-9)
+      if size - self.n * edits > 0:
+        continue
+      for index in self._by_length.get(other, ()):
+        if index not in shared:
+          yield 0, index
+
+  def search_many(
+    self,
+    queries: Sequence[str],
+    *,
+    threshold: float = 0.75,
+    limit: int = 5,
+    candidates: Optional[int] = 100,
+    processes: Optional[int] = None,
+    chunk_size: int = 64,
+  ) -> list[list[FuzzyMatch]]:
+    """
+    Runs `search` for many queries, in parallel processes.
+
+    Args:
+        queries (Sequence[str]): The sources to look for.
+        threshold (float): The minimum similarity.
+        limit (int): The maximum number of matches per query.
+        candidates (Optional[int]): The maximum number of segments scored per query.
+        processes (Optional[int]): The number of worker processes, one per CPU by
+        default. With 1, the queries are run in the current process.
+        chunk_size (int): The number of queries sent to a worker at once.
+
+    Returns:
+        list[list[FuzzyMatch]]: The matches of every query, in order.
+    """
+    options = {"threshold": threshold, "limit": limit, "candidates": candidates}
+    with self._search_pool(options, processes, chunk_size) as search_batch:
+      return search_batch(queries)
+
+  @contextmanager
+  def _search_pool(
+    self, options: dict[str, Any], processes: Optional[int], chunk_size: int
+  ) -> Iterator[Callable[[Sequence[str]], list[list[FuzzyMatch]]]]:
+    """
+    Yields a function running `search` for a batch of queries, see `search_many`.
+
+    The worker processes are started for the first batch that needs them and reused
+    for the following ones, the index being copied to each worker only once. It must
+    not be modified until the pool is closed.
+    """
+    pool: Optional[ProcessPool] = None
+
+    def search_batch(queries: Sequence[str]) -> list[list[FuzzyMatch]]:
+      nonlocal pool
+      if processes == 1 or len(queries) <= chunk_size:
+        return [self.search(query, **options) for query in queries]
+      if pool is None:
+        pool = Pool(processes, _init_worker, (self, options))
+      return pool.map(_search_in_worker, queries, chunk_size)
+
+    try:
+      yield search_batch
+    finally:
+      if pool is not None:
+        pool.terminate()
+
+
+# The index and search options of a worker process
+_worker: Optional[tuple[FuzzyIndex, dict[str, Any]]] = None
+
+
+def _init_worker(index: FuzzyIndex, options: dict[str, Any]) -> None:
+  global _worker
+  _worker = (index, options)
+
+
+def _search_in_worker(query: str) -> list[FuzzyMatch]:
+  index, options = _worker  # type: ignore
+  return index.search(query, **options)
+
+
+DEFAULT_BANDS: tuple[tuple[int, str], ...] = (
+  (100, "x-fuzzy-100"),
+  (95, "x-fuzzy-95-99"),
+  (85, "x-fuzzy-85-94"),
+  (75, "x-fuzzy-75-84"),
+)
+"""
+The default match bands, as (lowest similarity percentage, count type) pairs from the
+highest band to the lowest.
+"""
+NO_MATCH = "x-fuzzy-no-match"
+"""
+The count type of the words of units without a match in any band.
+"""
+
+
+def _band(similarity: Optional[float], bands: Sequence[tuple[int, str]]) -> str:
+  if similarity is not None:
+    percentage = floor(similarity * 100 + 1e-9)
+    for lowest, count_type in bands:
+      if percentage >= lowest:
+        return count_type
+  return NO_MATCH
+
+
+def _keep(event: str, value: Any) -> SectionEvent:
+  """Copies what an event needs to be written once the iteration moved on."""
+  if event == "leaf":
+    return event, deepcopy(value)  # type: ignore
+  if event == "open":
+    return event, let.Element(value.tag, value.attrib, value.nsmap)  # type: ignore
+  return event, value  # type: ignore
+
+
+def _add_matches(
+  unit: let._Element,
+  matches: list[FuzzyMatch],
+  band: str,
+  words: int,
+) -> None:
+  uri = let.QName(unit).namespace
+  namespace = "" if uri is None else f"{{{uri}}}"
+  group = CountGroup(
+    name="fuzzy-match",
+    counts=[Count(value=words, count_type=band, unit=UNIT.WORD)],
+  ).to_element()
+  if namespace:
+    for element in group.iter():
+      element.tag = f"{namespace}{local_name(element.tag)}"
+  unit.append(group)
+  for match in matches:
+    alt_trans = let.SubElement(
+      unit,
+      f"{namespace}alt-trans",
+      {"match-quality": str(floor(match.similarity * 100 + 1e-9))},
+    )
+    if match.origin is not None:
+      alt_trans.set("origin", match.origin)
+    let.SubElement(alt_trans, f"{namespace}source").text = match.source
+    let.SubElement(alt_trans, f"{namespace}target").text = match.target
+
+
+def leverage(
+  source: XmlSource,
+  output: str | PathLike[str] | IO[bytes],
+  index: FuzzyIndex,
+  *,
+  threshold: float = 0.75,
+  limit: int = 3,
+  candidates: Optional[int] = 100,
+  bands: Sequence[tuple[int, str]] = DEFAULT_BANDS,
+  processes: Optional[int] = None,
+  batch_size: int = 1024,
+) -> CountGroup:
+  """
+  Writes a copy of a document with the fuzzy matches of its units.
+
+  Every `<trans-unit>` gets an `<alt-trans>` per match, with its similarity
+  percentage as `match-quality`, and a `<count-group name="fuzzy-match">` counting
+  its source words in the band of its best match. The document is streamed and
+  units are searched in batches of `batch_size`, in parallel processes started once
+  for the whole document.
+
+  Args:
+      source (XmlSource): The document to leverage.
+      output (str | PathLike[str] | IO[bytes]): Where to write the new document.
+      index (FuzzyIndex): The segments to match against.
+      threshold (float): The minimum similarity of a match.
+      limit (int): The maximum number of `<alt-trans>` per unit.
+      candidates (Optional[int]): The maximum number of segments scored per unit,
+      see `FuzzyIndex.search`.
+      bands (Sequence[tuple[int, str]]): The match bands, see `DEFAULT_BANDS`.
+      processes (Optional[int]): The number of worker processes, see
+      `FuzzyIndex.search_many`.
+      batch_size (int): The number of units searched at once.
+
+  Returns:
+      CountGroup: The words of the document in each band, `NO_MATCH` included.
+  """
+  totals = dict.fromkeys([count_type for _, count_type in bands] + [NO_MATCH], 0)
+  pending: list[SectionEvent] = []
+  units: list[tuple[let._Element, str]] = []
+
+  options = {"threshold": threshold, "limit": limit, "candidates": candidates}
+
+  def flush(
+    writer: XliffWriter,
+    search_batch: Callable[[Sequence[str]], list[list[FuzzyMatch]]],
+  ) -> None:
+    results = search_batch([text for _, text in units])
+    for (unit, text), matches in zip(units, results):
+      band = _band(matches[0].similarity if matches else None, bands)
+      words = len(normalize(text).split())
+      totals[band] += words
+      _add_matches(unit, matches, band, words)
+    for event in pending:
+      writer.write_event(*event)
+    pending.clear()
+    units.clear()
+
+  with (
+    index._search_pool(options, processes, 64) as search_batch,
+    XliffWriter(output) as writer,
+  ):
+    for event, value in iter_sections(source):
+      if (
+        event == "leaf"
+        and not isinstance(value, str)
+        and local_name(value.tag) == "trans-unit"
+      ):
+        unit = deepcopy(value)
+        source_element = unit.find("{*}source")
+        units.append(
+          (unit, "" if source_element is None else element_text(source_element))
+        )
+        pending.append(("leaf", unit))
+        if len(units) >= batch_size:
+          flush(writer, search_batch)
+      elif units:
+        pending.append(_keep(event, value))
+      else:
+        writer.write_event(event, value)
+    flush(writer, search_batch)
+  return CountGroup(
+    name="fuzzy-match",
+    counts=[
+      Count(value=value, count_type=count_type, unit=UNIT.WORD)
+      for count_type, value in totals.items()
+    ],
+  )
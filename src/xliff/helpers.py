@@ -1,10 +1,10 @@
 from datetime import datetime
 from enum import Enum
+from functools import partial
 from typing import Any, TypeGuard, TypeVar, overload
 from xml.etree.ElementTree import Element
 from lxml.etree import _Element
 from xliff.constants import __FAKE__ELEMENT__, ElementLikeProtocol
-from xliff.objects import Coord
 
 
 def ensure_correct_element(expected_tag: str, element: Any) -> None:
@@ -62,6 +62,9 @@ def stringify(value: Any) -> str:
   Raises:
       NotImplementedError: If the value type is unsupported.
   """
+  # Imported here as xliff.objects itself depends on this module
+  from xliff.objects import Coord
+
   match value:
     case str() | int() | float() | Coord():
       return str(value)
@@ -170,3 +173,34 @@ def validate_enum(
       raise TypeError(
         f"Expected {expected.__name__} or str starting with 'x-' for '{name}' but got {type(value)}"
       )
+
+
+def is_valid_value(validator: partial[None], value: Any) -> bool:
+  """
+  Tells whether `validator` would accept `value`, without raising.
+
+  `validate_type` and `validate_enum` are checked directly, any other validator is
+  called and its TypeError or ValueError caught.
+
+  Args:
+      validator (partial[None]): A validator of a `_validators` dict.
+      value (Any): The value to check.
+
+  Returns:
+      bool: True if the validator accepts the value.
+  """
+  keywords = validator.keywords
+  if value is None:
+    if validator.func is validate_type or validator.func is validate_enum:
+      return keywords["optional"]
+  elif validator.func is validate_type:
+    return isinstance(value, keywords["expected"])
+  elif validator.func is validate_enum:
+    return value in keywords["expected"] or (
+      isinstance(value, str) and value.startswith("x-")
+    )
+  try:
+    validator(value)
+  except (TypeError, ValueError):
+    return False
+  return True
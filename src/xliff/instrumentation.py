@@ -0,0 +1,254 @@
+"""
+Counting and timing what the library does, for diagnosis in production.
+
+While instrumentation is enabled, the hot paths of the library are replaced by
+wrappers that count and time each call:
+
+- `construct:<class>`: building an object, including the objects built inside it.
+- `validate:<class>.<attribute>`: checking the value of an attribute.
+- `enum:<enum>`: converting a value to a member of an enum.
+- `stringify:<type>`: converting a value to its xml form.
+- `to_element:<class>`: serializing an object, including its descendants, and
+  `to_element.depth:<depth>` the serializations at each depth, 1 being the object
+  `to_element` was called on.
+
+The original functions are put back when it is disabled, so that it costs nothing
+otherwise. Only the references held by the modules of the library are replaced,
+functions already bound elsewhere (in a `functools.partial` for example) are not
+counted.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, NamedTuple
+from xliff import helpers
+from xliff.named_groups import ColumnarCountGroup
+from xliff.objects import BaseXliffElement
+from xliff.streaming import ELEMENT_CLASSES
+import sys
+import threading
+import time
+
+type Hook = Callable[[str, float], None]
+"""
+A function called with the key and the duration in seconds of every call counted.
+"""
+
+CLASSES: tuple[type[BaseXliffElement], ...] = (
+  *ELEMENT_CLASSES.values(),
+  ColumnarCountGroup,
+)
+"""
+The classes whose construction is counted.
+"""
+
+
+class Measure(NamedTuple):
+  """The calls counted for a key."""
+
+  calls: int
+  """The number of calls"""
+  seconds: float
+  """The total duration of the calls"""
+
+
+_measures: dict[str, list] = {}
+_hooks: list[Hook] = []
+# The original attributes, to put back, as (owner, name, original, was set on it)
+_patched: list[tuple[Any, str, Any, bool]] = []
+_depth = threading.local()
+_lock = threading.Lock()
+
+
+def _record(key: str, start: int) -> None:
+  seconds = (time.perf_counter_ns() - start) / 1e9
+  # Instrumented code runs in several threads, like the threaded `to_bytes`
+  with _lock:
+    measure = _measures.get(key)
+    if measure is None:
+      measure = _measures[key] = [0, 0.0]
+    measure[0] += 1
+    measure[1] += seconds
+  for hook in _hooks:
+    hook(key, seconds)
+
+
+def _patch(owner: Any, name: str, replacement: Any) -> None:
+  _patched.append((owner, name, getattr(owner, name), name in vars(owner)))
+  setattr(owner, name, replacement)
+
+
+def _patch_function(original: Callable, wrapper: Callable) -> None:
+  """Replaces `original` in every module of the library importing it."""
+  for module_name, module in list(sys.modules.items()):
+    # The module defining it keeps it, for the modules imported later
+    if not module_name.startswith("xliff.") or module_name == original.__module__:
+      continue
+    for name, value in list(vars(module).items()):
+      if value is original:
+        _patch(module, name, wrapper)
+
+
+def _constructor(cls: type[BaseXliffElement]) -> Callable:
+  init, key = cls.__init__, f"construct:{cls.__name__}"
+
+  @wraps(init)
+  def __init__(self, *args, **kwargs) -> None:
+    start = time.perf_counter_ns()
+    try:
+      init(self, *args, **kwargs)
+    finally:
+      _record(key, start)
+
+  return __init__
+
+
+def _validator_check(labels: dict[int, str]) -> Callable:
+  original = helpers.is_valid_value
+
+  @wraps(original)
+  def is_valid_value(validator, value) -> bool:
+    start = time.perf_counter_ns()
+    try:
+      return original(validator, value)
+    finally:
+      label = labels.get(id(validator)) or validator.keywords.get("name", "?")
+      _record(f"validate:{label}", start)
+
+  return is_valid_value
+
+
+def _enum_conversion() -> Callable:
+  original = helpers.try_convert_to_enum
+
+  @wraps(original)
+  def try_convert_to_enum(value, enum):
+    start = time.perf_counter_ns()
+    try:
+      return original(value, enum)
+    finally:
+      _record(f"enum:{enum.__name__}", start)
+
+  return try_convert_to_enum
+
+
+def _stringify() -> Callable:
+  original = helpers.stringify
+
+  @wraps(original)
+  def stringify(value) -> str:
+    start = time.perf_counter_ns()
+    try:
+      return original(value)
+    finally:
+      _record(f"stringify:{type(value).__name__}", start)
+
+  return stringify
+
+
+def _serializer() -> Callable:
+  original = BaseXliffElement._serialize
+
+  @wraps(original)
+  def _serialize(self, element_factory, validation):
+    depth = getattr(_depth, "value", 0) + 1
+    _depth.value = depth
+    start = time.perf_counter_ns()
+    try:
+      return original(self, element_factory, validation)
+    finally:
+      _depth.value = depth - 1
+      _record(f"to_element:{type(self).__name__}", start)
+      _record(f"to_element.depth:{depth}", start)
+
+  return _serialize
+
+
+def enabled() -> bool:
+  """Whether instrumentation is enabled."""
+  return bool(_patched)
+
+
+def enable() -> None:
+  """Starts counting calls, does nothing if instrumentation is already enabled."""
+  with _lock:
+    if _patched:
+      return
+    labels = {
+      id(validator): f"{cls.__name__}.{attribute}"
+      for cls in CLASSES
+      for attribute, validator in cls._validators.items()
+    }
+    for cls in CLASSES:
+      _patch(cls, "__init__", _constructor(cls))
+    _patch_function(helpers.is_valid_value, _validator_check(labels))
+    _patch_function(helpers.try_convert_to_enum, _enum_conversion())
+    _patch_function(helpers.stringify, _stringify())
+    _patch(BaseXliffElement, "_serialize", _serializer())
+
+
+def disable() -> None:
+  """Stops counting calls and puts the original functions back."""
+  with _lock:
+    while _patched:
+      owner, name, original, was_set = _patched.pop()
+      if was_set:
+        setattr(owner, name, original)
+      else:
+        delattr(owner, name)
+
+
+@contextmanager
+def instrumented(*, reset_stats: bool = True) -> Iterator[None]:
+  """
+  Enables instrumentation inside the `with` block.
+
+  Args:
+      reset_stats (bool): Whether to reset the counts first. Defaults to True.
+  """
+  if reset_stats:
+    reset()
+  already_enabled = enabled()
+  enable()
+  try:
+    yield
+  finally:
+    if not already_enabled:
+      disable()
+
+
+def reset() -> None:
+  """Forgets all the calls counted so far."""
+  _measures.clear()
+
+
+def stats() -> dict[str, Measure]:
+  """
+  Returns the calls counted so far.
+
+  Returns:
+      dict[str, Measure]: A copy of the counts, by key, sorted by key.
+  """
+  return {key: Measure(*_measures[key]) for key in sorted(_measures)}
+
+
+def add_hook(hook: Hook) -> None:
+  """
+  Calls `hook` after every call counted.
+
+  Args:
+      hook (Hook): The function to call, with the key and duration of the call.
+  """
+  _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+  """
+  Stops calling a hook added with `add_hook`.
+
+  Raises:
+      ValueError: If `hook` was not added.
+  """
+  _hooks.remove(hook)
@@ -0,0 +1,122 @@
+"""
+Sharing repeated values between the objects built from a document.
+
+Attribute values like `datatype`, `restype`, `prop-type` or `context-type`, and the
+text of contexts like source file paths, repeat across a large number of elements.
+While an `InternPool` is active, every string read from a source element is looked
+up in the pool so that equal strings are the same object.
+
+A pool can also share whole objects: children of a `<context-group>` or
+`<prop-group>` with the same attributes and text are then built once and the same
+`Context` or `Prop` instance is used by every group holding it. Shared objects are
+frozen, see `BaseXliffElement.freeze`, and detached from the element they were built
+from, as it is only one of the elements they stand for. To change a shared object in
+a group, replace it with a new one.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Optional, TypeVar
+
+if TYPE_CHECKING:
+  from xliff.objects import BaseXliffElement
+
+  T = TypeVar("T", bound=BaseXliffElement)
+
+
+class InternPool:
+  """The strings, and optionally objects, shared while the pool is active."""
+
+  share_objects: bool
+  """Whether identical contexts and props are shared too"""
+
+  __slots__ = ("share_objects", "_strings", "_objects")
+
+  def __init__(self, *, share_objects: bool = False) -> None:
+    """
+    Creates an empty pool.
+
+    Args:
+        share_objects (bool): Whether to share identical `Context` and `Prop`
+        objects, frozen, see this module. Defaults to False.
+    """
+    self.share_objects = share_objects
+    self._strings: dict[str, str] = {}
+    self._objects: dict[tuple, Any] = {}
+
+  def __len__(self) -> int:
+    """The number of distinct strings and objects in the pool."""
+    return len(self._strings) + len(self._objects)
+
+  def clear(self) -> None:
+    """Removes everything from the pool, already built objects keep their values."""
+    self._strings.clear()
+    self._objects.clear()
+
+  def string(self, value: str) -> str:
+    """Returns the string of the pool equal to `value`, adding it if needed."""
+    return self._strings.setdefault(value, value)
+
+  def shared(self, cls: type[T], element: Any) -> T:
+    """
+    Returns the object of the pool built from an element like `element`.
+
+    Two elements are alike when they have the same tag, text and attributes. The
+    shared object is frozen and has no source element. If the pool doesn't share
+    objects, a new object is built every time.
+
+    Args:
+        cls (type[T]): The class of the object.
+        element (Any): The xml element to build the object from.
+
+    Returns:
+        T: The shared object.
+    """
+    if not self.share_objects:
+      return cls(source_element=element)
+    key = (cls, element.text, tuple(sorted(element.attrib.items())))
+    shared = self._objects.get(key)
+    if shared is None:
+      shared = cls(source_element=element).detach().freeze()
+      self._objects[key] = shared
+    return shared
+
+
+_active_pool: ContextVar[Optional[InternPool]] = ContextVar(
+  "xliff_intern_pool", default=None
+)
+
+
+def active_pool() -> Optional[InternPool]:
+  """Returns the pool used by objects built now, if any."""
+  return _active_pool.get()
+
+
+@contextmanager
+def interning(
+  pool: Optional[InternPool] = None, *, share_objects: bool = False
+) -> Iterator[InternPool]:
+  """
+  Activates a pool for all the objects built inside the `with` block.
+
+  Pools can be nested, the innermost one being used. The pool is only active in the
+  current thread or task.
+
+  Args:
+      pool (Optional[InternPool]): The pool to activate, to reuse it across blocks. A
+      new pool is created by default.
+      share_objects (bool): Whether the new pool shares objects, ignored if `pool` is
+      given.
+
+  Returns:
+      Iterator[InternPool]: The active pool.
+  """
+  if pool is None:
+    pool = InternPool(share_objects=share_objects)
+  token = _active_pool.set(pool)
+  try:
+    yield pool
+  finally:
+    _active_pool.reset(token)
@@ -0,0 +1,289 @@
+"""
+A translation memory index for exact and in-context lookups.
+
+Segments are keyed by the hash of their normalized source (see `xliff.analysis`) and
+the hash of their sorted mandatory contexts, the `<context>` elements with
+`match-mandatory="yes"`. Every segment is stored twice: once without context for
+exact lookups and once with its context key for in-context lookups, so that both
+are a single primary key seek.
+
+The index is stored in SQLite, in memory by default or in a file to reuse it across
+runs, and can be fed incrementally from any number of documents.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable
+from enum import Enum
+from hashlib import blake2b
+from os import PathLike
+from typing import NamedTuple, Optional
+from xliff.analysis import normalize, segment_hash
+from xliff.named_groups import Context, ContextGroup
+from xliff.streaming import XmlSource, element_text, iterparse, local_name, release
+import sqlite3
+
+NO_CONTEXT = 0
+"""
+The context key of segments without mandatory contexts.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+  source_hash INTEGER NOT NULL,
+  context_hash INTEGER NOT NULL,
+  source TEXT NOT NULL,
+  target TEXT NOT NULL,
+  origin TEXT,
+  PRIMARY KEY (source_hash, context_hash)
+) WITHOUT ROWID
+"""
+_INSERT = "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?)"
+_SELECT = (
+  "SELECT source, target, origin FROM segments"
+  " WHERE source_hash = ? AND context_hash = ?"
+)
+
+
+class Match(NamedTuple):
+  """A translation found in a `TranslationMemory`."""
+
+  source: str
+  """The source of the stored segment"""
+  target: str
+  """The translation of the stored segment"""
+  in_context: bool
+  """Whether the mandatory contexts matched too"""
+  origin: Optional[str]
+  """Where the segment comes from, the `original` of its file when read from a
+  document"""
+
+
+def _as_int(digest: bytes) -> int:
+  return int.from_bytes(digest, "little", signed=True)
+
+
+def source_key(source: str) -> int:
+  """Returns the key of a source text, from its normalized form."""
+  return _as_int(segment_hash(normalize(source)))
+
+
+def context_key(
+  contexts: Iterable[Context | ContextGroup | tuple[str, str]],
+) -> int:
+  """
+  Returns the key of the mandatory contexts among `contexts`.
+
+  Args:
+      contexts (Iterable[Context | ContextGroup | tuple[str, str]]): Contexts, whose
+      `match_mandatory` is checked, context groups, whose mandatory contexts are
+      used, or `(context_type, value)` pairs, which are all considered mandatory.
+
+  Returns:
+      int: The key of the sorted mandatory contexts, `NO_CONTEXT` if there are none.
+  """
+  pairs = []
+  for item in contexts:
+    if isinstance(item, tuple):
+      pairs.append(item)
+      continue
+    for context in item.contexts if isinstance(item, ContextGroup) else (item,):
+      if context.match_mandatory is True:
+        context_type = context.context_type
+        if isinstance(context_type, Enum):
+          context_type = context_type.value
+        pairs.append((context_type or "", context.value or ""))
+  return _pairs_key(pairs)
+
+
+def _pairs_key(pairs: list[tuple[str, str]]) -> int:
+  if not pairs:
+    return NO_CONTEXT
+  data = "\x1e".join(f"{kind}\x1f{value}" for kind, value in sorted(pairs))
+  return _as_int(blake2b(data.encode(), digest_size=8).digest()) or 1
+
+
+class TranslationMemory:
+  """
+  An index of translated segments, backed by SQLite.
+
+  Use it as a context manager, or call `close`, to commit the added segments and
+  release the database.
+  """
+
+  __slots__ = ("_connection",)
+
+  def __init__(self, path: str | PathLike[str] = ":memory:") -> None:
+    """
+    Opens or creates a translation memory.
+
+    Args:
+        path (str | PathLike[str]): The database file, an existing one being
+        reopened as is. Defaults to an in memory database.
+    """
+    self._connection = sqlite3.connect(path)
+    self._connection.execute(_SCHEMA)
+
+  def __enter__(self) -> TranslationMemory:
+    return self
+
+  def __exit__(self, *exc_info: object) -> None:
+    self.close()
+
+  def __len__(self) -> int:
+    """The number of distinct sources."""
+    return self._connection.execute(
+      "SELECT COUNT(*) FROM segments WHERE context_hash = ?", (NO_CONTEXT,)
+    ).fetchone()[0]
+
+  def commit(self) -> None:
+    """Writes the added segments to the database."""
+    self._connection.commit()
+
+  def close(self) -> None:
+    """Commits and closes the database."""
+    self._connection.commit()
+    self._connection.close()
+
+  def add(
+    self,
+    source: str,
+    target: str,
+    *,
+    contexts: Iterable[Context | ContextGroup | tuple[str, str]] = (),
+    origin: Optional[str] = None,
+  ) -> None:
+    """
+    Adds a segment, replacing any previous segment with the same key.
+
+    Args:
+        source (str): The source text.
+        target (str): Its translation.
+        contexts (Iterable[Context | ContextGroup | tuple[str, str]]): The contexts of
+        the segment, see `context_key`.
+        origin (Optional[str]): Where the segment comes from.
+    """
+    source_hash, context_hash = source_key(source), context_key(contexts)
+    rows = [(source_hash, NO_CONTEXT, source, target, origin)]
+    if context_hash != NO_CONTEXT:
+      rows.append((source_hash, context_hash, source, target, origin))
+    self._connection.executemany(_INSERT, rows)
+
+  def add_document(self, source: XmlSource) -> int:
+    """
+    Adds the translated `<trans-unit>` elements of a document, in streaming mode.
+
+    Units without a `<target>`, or with an empty one, are skipped. The `original` of
+    the file of each unit is stored as its origin.
+
+    Args:
+        source (XmlSource): The document to read.
+
+    Returns:
+        int: The number of segments added.
+    """
+    rows = []
+    added = 0
+    original: Optional[str] = None
+    tags = ("{*}file", "{*}group", "{*}trans-unit")
+    for event, element in iterparse(source, tag=tags):
+      name = local_name(element.tag)
+      if name == "file" and event == "start":
+        original = element.get("original")
+        continue
+      if name != "trans-unit":
+        # Emptied groups would otherwise stay in the tree until the end of the file
+        if event == "end":
+          release(element)
+        continue
+      if event == "start":
+        continue
+      source_text = target_text = None
+      pairs = []
+      for child in element:
+        name = local_name(child.tag)
+        if name == "source":
+          source_text = element_text(child)
+        elif name == "target":
+          target_text = element_text(child)
+        elif name == "context-group":
+          for context in child:
+            if context.get("match-mandatory") == "yes":
+              pairs.append((context.get("context-type") or "", context.text or ""))
+      release(element)
+      if source_text is None or not target_text:
+        continue
+      added += 1
+      source_hash = source_key(source_text)
+      rows.append((source_hash, NO_CONTEXT, source_text, target_text, original))
+      context_hash = _pairs_key(pairs)
+      if context_hash != NO_CONTEXT:
+        rows.append((source_hash, context_hash, source_text, target_text, original))
+      if len(rows) >= 10_000:
+        self._connection.executemany(_INSERT, rows)
+        rows.clear()
+    self._connection.executemany(_INSERT, rows)
+    return added
+
+  def _get(self, source_hash: int, context_hash: int) -> Optional[tuple]:
+    return self._connection.execute(_SELECT, (source_hash, context_hash)).fetchone()
+
+  def exact(self, source: str) -> Optional[Match]:
+    """
+    Looks up the translation of a source, ignoring contexts.
+
+    Args:
+        source (str): The source text, normalized before lookup.
+
+    Returns:
+        Optional[Match]: The last segment added with that source, if any.
+    """
+    row = self._get(source_key(source), NO_CONTEXT)
+    return None if row is None else Match(row[0], row[1], False, row[2])
+
+  def in_context(
+    self,
+    source: str,
+    contexts: Iterable[Context | ContextGroup | tuple[str, str]],
+  ) -> Optional[Match]:
+    """
+    Looks up the translation of a source with the same mandatory contexts.
+
+    Args:
+        source (str): The source text, normalized before lookup.
+        contexts (Iterable[Context | ContextGroup | tuple[str, str]]): The contexts to
+        match, see `context_key`.
+
+    Returns:
+        Optional[Match]: The last segment added with that source and contexts, or
+        `None` if there is none or `contexts` holds no mandatory context.
+    """
+    context_hash = context_key(contexts)
+    if context_hash == NO_CONTEXT:
+      return None
+    row = self._get(source_key(source), context_hash)
+    return None if row is None else Match(row[0], row[1], True, row[2])
+
+  def lookup(
+    self,
+    source: str,
+    contexts: Iterable[Context | ContextGroup | tuple[str, str]] = (),
+  ) -> Optional[Match]:
+    """
+    Looks up the best translation of a source: in context if possible, else exact.
+
+    Args:
+        source (str): The source text, normalized before lookup.
+        contexts (Iterable[Context | ContextGroup | tuple[str, str]]): The contexts to
+        match, see `context_key`.
+
+    Returns:
+        Optional[Match]: The best match, if any.
+    """
+    source_hash = source_key(source)
+    context_hash = context_key(contexts)
+    if context_hash != NO_CONTEXT:
+      row = self._get(source_hash, context_hash)
+      if row is not None:
+        return Match(row[0], row[1], True, row[2])
+    row = self._get(source_hash, NO_CONTEXT)
+    return None if row is None else Match(row[0], row[1], False, row[2])
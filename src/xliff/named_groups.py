@@ -1,17 +1,25 @@
-from collections.abc import MutableSequence
+from array import array
+from collections.abc import Iterable, Iterator, MutableSequence
 from functools import partial
+from itertools import compress
 from typing import Optional, overload, override
 from warnings import warn
 from xml.dom import XML_NAMESPACE
 from xliff.constants import CONTEXT_TYPE, COUNT_TYPE, PURPOSE, UNIT, ElementLike
+from xliff.errors import ValidationIssue
 from xliff.helpers import (
+  is_valid_value,
   stringify,
   try_convert_to_boolean,
   try_convert_to_enum,
   validate_enum,
   validate_type,
 )
+from xliff.interning import active_pool
 from xliff.objects import BaseXliffElement
+from xliff.policy import validates_construction
+from xliff.sequences import KeyedSequence, KeyedView
+import lxml.etree as let
 
 
 class Count(BaseXliffElement):
@@ -88,8 +96,7 @@ class Count(BaseXliffElement):
     super().__init__(**kwargs)
     self.count_type = try_convert_to_enum(self.count_type, COUNT_TYPE)
     self.unit = try_convert_to_enum(self.unit, UNIT)
-    for _, e in self._validate_attributes(gather_all_errors=True).errors:
-      warn(str(e))
+    self._warn_invalid()
 
   @override
   def _init_content(self, **kwargs):
@@ -97,7 +104,8 @@ class Count(BaseXliffElement):
       self.value = kwargs["value"]
     elif self._source_element is None or self._source_element.text is None:
       self.value = None
-      warn("Missing a value for attribute 'value'")
+      if validates_construction():
+        warn("Missing a value for attribute 'value'")
     else:
       self.value = int(self._source_element.text)
 
@@ -154,8 +162,7 @@ class CountGroup(BaseXliffElement):
     """
     super().__init__(**kwargs)
     self._children = self.counts
-    for _, e in self._validate_attributes(gather_all_errors=True).errors:
-      warn(str(e))
+    self._warn_invalid()
 
   def _init_content(self, **kwargs):
     if "counts" in kwargs:
@@ -172,6 +179,330 @@ class CountGroup(BaseXliffElement):
     return element
 
 
+class _CodeTable:
+  """Assigns small integer codes to the distinct values of a column."""
+
+  __slots__ = ("values", "codes")
+  values: list
+  codes: dict
+
+  def __init__(self) -> None:
+    self.values = [None]
+    self.codes = {None: 0}
+
+  def encode(self, value) -> int:
+    code = self.codes.get(value)
+    if code is None:
+      if len(self.values) == 256:
+        raise ValueError(f"Cannot store more than 255 distinct values, got {value!r}")
+      code = self.codes[value] = len(self.values)
+      self.values.append(value)
+    return code
+
+
+def _mask(codes: array, code: int) -> bytes:
+  """One byte per code, 1 where it is `code` and 0 elsewhere."""
+  return codes.tobytes().translate(bytes(i == code for i in range(256)))
+
+
+def _and(first: bytes, second: bytes) -> bytes:
+  both = int.from_bytes(first, "little") & int.from_bytes(second, "little")
+  return both.to_bytes(len(first), "little")
+
+
+class ColumnarCountGroup(BaseXliffElement):
+  _xml_tag = "count-group"
+  _xml_attribute_map = {
+    "name": "name",
+  }
+  _has_content = True
+  __slots__ = (
+    "name",
+    "values",
+    "count_type_codes",
+    "phase_name_codes",
+    "unit_codes",
+    "_missing",
+    "_count_types",
+    "_phase_names",
+    "_units",
+  )
+  name: str
+  values: array
+  count_type_codes: array
+  phase_name_codes: array
+  unit_codes: array
+
+  _validators = {
+    "name": partial(validate_type, expected=str, name="name", optional=False),
+  }
+  _mutators = ("append",)
+
+  @overload
+  def __init__(
+    self,
+    *,
+    source_element: ElementLike,
+  ) -> None: ...
+  @overload
+  def __init__(
+    self,
+    *,
+    source_element: ElementLike,
+    name: Optional[str] = None,
+    counts: Optional[Iterable[Count]] = None,
+  ) -> None: ...
+  @overload
+  def __init__(self, *, name: str, counts: Iterable[Count] = ()) -> None: ...
+  def __init__(self, **kwargs):
+    """
+    A `<count-group>` storing its counts as columns instead of `Count` objects.
+
+    `values` holds the value of every count in an `array('q')` while
+    `count_type_codes`, `phase_name_codes` and `unit_codes` hold one byte codes (0
+    meaning the attribute is not set) decoded with `decode_count_type`,
+    `decode_phase_name` and `decode_unit`, which limits each of those attributes to
+    255 distinct values per group. Counts without a value are stored as 0, and
+    serialize without text. Counts are added with `append` and the aggregations run
+    over the columns without building any `Count`. It serializes to the same xml as
+    a `CountGroup` with the same counts, skipping the comments of its source element.
+
+    When initializing using explicit values only, `name` is required.
+
+    Args:
+      source_element (Optional[ElementLike]): An optional xml Element to parse all values from
+      name (str): The name identifier of the count group.
+      counts (Iterable[Count]): `Count` objects to add to the group.
+
+    Raises:
+      TypeError: If `source_element` is not a valid XML element-like object.
+      ValueError: If required attributes are missing.
+    """
+    super().__init__(**kwargs)
+    self._warn_invalid()
+
+  def _init_content(self, **kwargs):
+    self.values = array("q")
+    self.count_type_codes = array("B")
+    self.phase_name_codes = array("B")
+    self.unit_codes = array("B")
+    self._missing = set()
+    self._count_types = _CodeTable()
+    self._phase_names = _CodeTable()
+    self._units = _CodeTable()
+    if "counts" in kwargs:
+      for count in kwargs["counts"]:
+        self.append(count.value, count.count_type, count.phase_name, count.unit)
+    elif self._source_element is not None:
+      for count in self._source_element:
+        # Comments and processing instructions are skipped
+        if count.tag != Count._xml_tag:
+          continue
+        attrib = count.attrib
+        if count.text is None and validates_construction():
+          warn("Missing a value for attribute 'value'")
+        self.append(
+          None if count.text is None else int(count.text),
+          attrib.get("count-type"),
+          attrib.get("phase-name"),
+          attrib.get("unit"),
+        )
+
+  @classmethod
+  def from_count_group(cls, count_group: CountGroup) -> "ColumnarCountGroup":
+    """Builds a `ColumnarCountGroup` with the name and counts of `count_group`."""
+    return cls(name=count_group.name, counts=count_group.counts)
+
+  def to_count_group(self) -> CountGroup:
+    """Builds the equivalent `CountGroup`."""
+    return CountGroup(name=self.name, counts=list(self.counts))
+
+  def append(
+    self,
+    value: Optional[int],
+    count_type: COUNT_TYPE | str,
+    phase_name: Optional[str] = None,
+    unit: Optional[UNIT | str] = None,
+  ) -> None:
+    """
+    Adds a count to the group.
+
+    Args:
+      value (Optional[int]): The value of the count, None if it has none, which the
+      aggregations count as 0 and validation reports.
+      count_type (COUNT_TYPE | str): The type of the count, converted to a `COUNT_TYPE` if possible.
+      phase_name (Optional[str]): The phase the count was produced in.
+      unit (Optional[UNIT | str]): The unit of the count, converted to a `UNIT` if possible.
+
+    Raises:
+      TypeError: If `value` is not an int or None.
+      ValueError: If an attribute already has 255 distinct values in the group.
+      OverflowError: If `value` doesn't fit in a signed 64 bits integer.
+    """
+    if value is None:
+      self._missing.add(len(self.values))
+      value = 0
+    self.values.append(value)
+    self.count_type_codes.append(
+      self._count_types.encode(try_convert_to_enum(count_type, COUNT_TYPE))
+    )
+    self.phase_name_codes.append(self._phase_names.encode(phase_name))
+    self.unit_codes.append(self._units.encode(try_convert_to_enum(unit, UNIT)))
+
+  def __len__(self) -> int:
+    return len(self.values)
+
+  def _freeze_content(self) -> None:
+    # Read-only views keep the array API used by the aggregations
+    for name in ("values", "count_type_codes", "phase_name_codes", "unit_codes"):
+      setattr(self, name, memoryview(getattr(self, name)).toreadonly())
+    self._missing = frozenset(self._missing)
+
+  def _frozen_state(self) -> tuple:
+    return (
+      self.name,
+      tuple((c.value, c.count_type, c.phase_name, c.unit) for c in self.counts),
+    )
+
+  def decode_count_type(self, code: int) -> Optional[COUNT_TYPE | str]:
+    """Returns the count type a code of `count_type_codes` stands for."""
+    return self._count_types.values[code]
+
+  def decode_phase_name(self, code: int) -> Optional[str]:
+    """Returns the phase name a code of `phase_name_codes` stands for."""
+    return self._phase_names.values[code]
+
+  def decode_unit(self, code: int) -> Optional[UNIT | str]:
+    """Returns the unit a code of `unit_codes` stands for."""
+    return self._units.values[code]
+
+  @property
+  def counts(self) -> Iterator[Count]:
+    """Builds a `Count` for every count of the group, in order."""
+    count_types, phase_names = self._count_types.values, self._phase_names.values
+    units = self._units.values
+    for index, (value, count_type, phase_name, unit) in enumerate(
+      zip(self.values, self.count_type_codes, self.phase_name_codes, self.unit_codes)
+    ):
+      if index in self._missing:
+        # Only a count read from an element can be without a value
+        yield Count(
+          source_element=let.Element(Count._xml_tag),
+          value=None,
+          count_type=count_types[count_type],
+          phase_name=phase_names[phase_name],
+          unit=units[unit],
+        )
+        continue
+      yield Count(
+        value=value,
+        count_type=count_types[count_type],
+        phase_name=phase_names[phase_name],
+        unit=units[unit],
+      )
+
+  def total(
+    self,
+    *,
+    count_type: Optional[COUNT_TYPE | str] = None,
+    phase_name: Optional[str] = None,
+    unit: Optional[UNIT | str] = None,
+  ) -> int:
+    """
+    Sums the values of the counts matching all the given attributes.
+
+    Args:
+      count_type (Optional[COUNT_TYPE | str]): Only sum counts of this type.
+      phase_name (Optional[str]): Only sum counts of this phase.
+      unit (Optional[UNIT | str]): Only sum counts in this unit.
+
+    Returns:
+      int: The sum, 0 if no count matches.
+    """
+    mask: Optional[bytes] = None
+    for codes, table, value in (
+      (
+        self.count_type_codes,
+        self._count_types,
+        try_convert_to_enum(count_type, COUNT_TYPE),
+      ),
+      (self.phase_name_codes, self._phase_names, phase_name),
+      (self.unit_codes, self._units, try_convert_to_enum(unit, UNIT)),
+    ):
+      if value is None:
+        continue
+      if value not in table.codes:
+        return 0
+      column = _mask(codes, table.codes[value])
+      mask = column if mask is None else _and(mask, column)
+    if mask is None:
+      return sum(self.values)
+    return sum(compress(self.values, mask))
+
+  def _sum_by(self, codes: array, table: _CodeTable) -> dict:
+    data = codes.tobytes()
+    return {
+      value: sum(compress(self.values, _mask(codes, code)))
+      for code, value in enumerate(table.values)
+      if bytes((code,)) in data
+    }
+
+  def sum_by_count_type(self) -> dict[COUNT_TYPE | str, int]:
+    """Sums the values of the counts by count type."""
+    return self._sum_by(self.count_type_codes, self._count_types)
+
+  def sum_by_unit(self) -> dict[Optional[UNIT | str], int]:
+    """Sums the values of the counts by unit, `None` for the counts without one."""
+    return self._sum_by(self.unit_codes, self._units)
+
+  def sum_by_phase(self) -> dict[Optional[str], int]:
+    """Sums the values of the counts by phase, `None` for the counts without one."""
+    return self._sum_by(self.phase_name_codes, self._phase_names)
+
+  def _children_issues(self, *, recurse: bool = True) -> Iterator[ValidationIssue]:
+    if self._missing:
+      yield ValidationIssue(self, "value", None, Count._validators["value"])
+    # Counts are validated once per distinct value of each column
+    for attribute, codes, table in (
+      ("count_type", self.count_type_codes, self._count_types),
+      ("phase_name", self.phase_name_codes, self._phase_names),
+      ("unit", self.unit_codes, self._units),
+    ):
+      validator = Count._validators[attribute]
+      data = codes.tobytes()
+      for code, value in enumerate(table.values):
+        if bytes((code,)) not in data:
+          continue
+        if not is_valid_value(validator, value):
+          yield ValidationIssue(self, attribute, value, validator)
+
+  def _to_element(self, element_factory):
+    element = super()._to_element(element_factory)
+    factory = let.Element if element_factory is None else element_factory
+    attributes = {}
+    for index, (count_type, phase_name, unit, value) in enumerate(
+      zip(self.count_type_codes, self.phase_name_codes, self.unit_codes, self.values)
+    ):
+      key = (count_type, phase_name, unit)
+      attrib = attributes.get(key)
+      if attrib is None:
+        # Same attributes, in the same order, as Count._attribute_dict
+        attrib = attributes[key] = {
+          xml_name: stringify(decoded)
+          for xml_name, decoded in (
+            ("count-type", self._count_types.values[count_type]),
+            ("phase-name", self._phase_names.values[phase_name]),
+            ("unit", self._units.values[unit]),
+          )
+          if decoded is not None
+        }
+      count = factory(Count._xml_tag, attrib)
+      if index not in self._missing:
+        count.text = stringify(value)
+      element.append(count)
+    return element
+
+
 class Context(BaseXliffElement):
   _xml_tag = "context"
   _xml_attribute_map = {
@@ -248,17 +579,19 @@ class Context(BaseXliffElement):
     self._children = tuple()
     self.context_type = try_convert_to_enum(self.context_type, CONTEXT_TYPE)
     self.match_mandatory = try_convert_to_boolean(self.match_mandatory)
-    for _, e in self._validate_attributes(gather_all_errors=True).errors:
-      warn(str(e))
+    self._warn_invalid()
 
   def _init_content(self, **kwargs):
     if "value" in kwargs:
       self.value = kwargs["value"]
     elif self._source_element is None or self._source_element.text is None:
       self.value = None
-      warn("Missing a value for attribute 'value'")
+      if validates_construction():
+        warn("Missing a value for attribute 'value'")
     else:
-      self.value = self._source_element.text
+      pool = active_pool()
+      text = self._source_element.text
+      self.value = text if pool is None else pool.string(text)
 
   def _to_element(self, element_factory):
     element = super()._to_element(element_factory)
@@ -266,6 +599,10 @@ class Context(BaseXliffElement):
     return element
 
 
+def _context_type(context: Context) -> Optional[str | CONTEXT_TYPE]:
+  return context.context_type
+
+
 class ContextGroup(BaseXliffElement):
   _xml_tag = "context-group"
   _xml_attribute_map = {
@@ -279,11 +616,11 @@ class ContextGroup(BaseXliffElement):
     "name": partial(validate_type, expected=str, name="value", optional=True),
     "purpose": partial(validate_enum, expected=PURPOSE, name="purpose", optional=True),
   }
-  __slots__ = ("crc", "name", "purpose", "contexts")
+  __slots__ = ("crc", "name", "purpose", "_contexts")
   crc: Optional[str]
   name: Optional[str]
   purpose: Optional[PURPOSE]
-  contexts: MutableSequence[Context]
+  _contexts: KeyedSequence[Context]
 
   @overload
   def __init__(
@@ -321,7 +658,7 @@ class ContextGroup(BaseXliffElement):
       name (Optional[str]): Optional name for the context group.
       purpose (Optional[str | PURPOSE]): Optional purpose of the context group. Ideally one of the `PURPOSE` StrEnum. If using a custom value as a str, please ensure it is preppended with 'x-'
       crc (Optional[str]): Optional checksum for the context group.
-      contexts (MutableSequence[Context]): A MutableSequence of `Context` objects contained within the group. Defaults to an empty list.
+      contexts (MutableSequence[Context]): A MutableSequence of `Context` objects contained within the group, copied into a `KeyedSequence`. Defaults to an empty list.
 
     Raises:
       TypeError: If `source_element` is not a valid XML element-like object, or one of the attributes is not the correct type.
@@ -329,10 +666,8 @@ class ContextGroup(BaseXliffElement):
     """
 
     super().__init__(**kwargs)
-    self._children = self.contexts
     self.purpose = try_convert_to_enum(self.purpose, PURPOSE)
-    for _, e in self._validate_attributes(gather_all_errors=True).errors:
-      warn(str(e))
+    self._warn_invalid()
 
   def _init_content(self, **kwargs):
     if "contexts" in kwargs:
@@ -340,9 +675,41 @@ class ContextGroup(BaseXliffElement):
     elif self._source_element is None or not len(self._source_element):
       self.contexts = []
     else:
-      self.contexts = [
-        Context(source_element=context) for context in self._source_element
-      ]
+      pool = active_pool()
+      if pool is None:
+        self.contexts = [
+          Context(source_element=context) for context in self._source_element
+        ]
+      else:
+        self.contexts = [
+          pool.shared(Context, context) for context in self._source_element
+        ]
+
+  @property
+  def contexts(self) -> KeyedSequence[Context]:
+    """
+    The contexts of the group, in document order.
+
+    Assigning any iterable of contexts replaces them with a copy of it.
+    """
+    return self._contexts
+
+  @contexts.setter
+  def contexts(self, contexts: Optional[Iterable[Context]]) -> None:
+    self._contexts = KeyedSequence(
+      () if contexts is None else contexts, key=_context_type
+    )
+    self._children = self._contexts
+
+  @property
+  def by_type(self) -> KeyedView[Context]:
+    """
+    The contexts of the group by `context_type`, the first one for each type.
+
+    Use `by_type.getall` to get all the contexts of a type. Standard types can be
+    looked up either by their `CONTEXT_TYPE` or by its value.
+    """
+    return self._contexts.by_key
 
   def _to_element(self, element_factory=None):
     element = super()._to_element(element_factory)
@@ -390,17 +757,19 @@ class Prop(BaseXliffElement):
   ) -> None: ...
   def __init__(self, **kwargs):
     super().__init__(**kwargs)
-    for _, e in self._validate_attributes(gather_all_errors=True).errors:
-      warn(str(e))
+    self._warn_invalid()
 
   def _init_content(self, **kwargs):
     if "value" in kwargs:
       self.value = kwargs["value"]
     elif self._source_element is None or self._source_element.text is None:
       self.value = None
-      warn("Missing a value for attribute 'value'")
+      if validates_construction():
+        warn("Missing a value for attribute 'value'")
     else:
-      self.value = self._source_element.text
+      pool = active_pool()
+      text = self._source_element.text
+      self.value = text if pool is None else pool.string(text)
 
   def _to_element(self, element_factory):
     element = super()._to_element(element_factory)
@@ -408,15 +777,19 @@ class Prop(BaseXliffElement):
     return element
 
 
+def _prop_type(prop: Prop) -> Optional[str]:
+  return prop.prop_type
+
+
 class PropGroup(BaseXliffElement):
   _xml_tag = "prop-group"
   _xml_attribute_map = {
     "name": "name",
   }
   _has_content = True
-  __slots__ = ("name", "props")
+  __slots__ = ("name", "_props")
   name: str
-  props: MutableSequence[Prop]
+  _props: KeyedSequence[Prop]
 
   _validators = {
     "name": partial(validate_type, expected=str, name="name", optional=False),
@@ -440,9 +813,7 @@ class PropGroup(BaseXliffElement):
   def __init__(self, *, name: str, props: MutableSequence[Prop]) -> None: ...
   def __init__(self, **kwargs):
     super().__init__(**kwargs)
-    self._children = self.props
-    for _, e in self._validate_attributes(gather_all_errors=True).errors:
-      warn(str(e))
+    self._warn_invalid()
 
   def _init_content(self, **kwargs):
     if "props" in kwargs:
@@ -450,7 +821,34 @@ class PropGroup(BaseXliffElement):
     elif self._source_element is None or not len(self._source_element):
       self.props = []
     else:
-      self.props = [Prop(source_element=prop) for prop in self._source_element]
+      pool = active_pool()
+      if pool is None:
+        self.props = [Prop(source_element=prop) for prop in self._source_element]
+      else:
+        self.props = [pool.shared(Prop, prop) for prop in self._source_element]
+
+  @property
+  def props(self) -> KeyedSequence[Prop]:
+    """
+    The props of the group, in document order.
+
+    Assigning any iterable of props replaces them with a copy of it.
+    """
+    return self._props
+
+  @props.setter
+  def props(self, props: Optional[Iterable[Prop]]) -> None:
+    self._props = KeyedSequence(() if props is None else props, key=_prop_type)
+    self._children = self._props
+
+  @property
+  def by_type(self) -> KeyedView[Prop]:
+    """
+    The props of the group by `prop_type`, the first one for each type.
+
+    Use `by_type.getall` to get all the props of a type.
+    """
+    return self._props.by_key
 
   def _to_element(self, element_factory):
     element = super()._to_element(element_factory)
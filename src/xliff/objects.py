@@ -1,23 +1,47 @@
 from __future__ import annotations
-from collections.abc import Callable, Iterable, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableSequence
 from functools import partial
-from typing import ClassVar, Optional, overload
+from contextvars import ContextVar
+from typing import ClassVar, Optional, Self, overload
+from warnings import warn
 from xliff.constants import (
   __FAKE__ELEMENT__,
+  VALIDATION_LEVEL,
   ElementLike,
   Python_ElementFactory,
   ElementLikeProtocol,
 )
-from xliff.errors import ValidationError, ValidationErrorGroup
+from xliff.errors import (
+  ValidationErrorGroup,
+  ValidationIssue,
+  ValidationResult,
+)
 from xliff.helpers import (
   ensure_correct_element,
   ensure_usable_element,
+  is_valid_value,
   stringify,
 )
+from xliff.interning import active_pool
+from xliff.policy import (
+  retains_sources,
+  validates_construction,
+  validates_serialization,
+  validation_level,
+  validation_policy,
+)
+from xliff.sequences import KeyedSequence
+from xliff.tracing import span
 import lxml.etree as let
 import xml.etree.ElementTree as pet
 
 
+# Set while serializing the descendants of an object validated with all of them
+_subtree_validated: ContextVar[bool] = ContextVar(
+  "xliff_subtree_validated", default=False
+)
+
+
 class ElementSerializationMixin:
   """
   Only used as a mixin for simpler type hinting for the `to_element` method.
@@ -28,19 +52,41 @@ class ElementSerializationMixin:
   def _to_element(self, element_factory: Callable) -> ElementLike:
     raise NotImplementedError
 
+  def _serialize(
+    self,
+    element_factory: Callable,
+    validation: Optional[VALIDATION_LEVEL | str],
+  ) -> ElementLike:
+    return self._to_element(element_factory)
+
   @overload
   def to_element(
-    self, element_factory: Callable[[str, Mapping[str, str]], ElementLikeProtocol]
+    self,
+    element_factory: Callable[[str, Mapping[str, str]], ElementLikeProtocol],
+    *,
+    validation: Optional[VALIDATION_LEVEL | str] = None,
   ) -> ElementLikeProtocol: ...
   @overload
-  def to_element(self, element_factory: Python_ElementFactory) -> pet.Element: ...
+  def to_element(
+    self,
+    element_factory: Python_ElementFactory,
+    *,
+    validation: Optional[VALIDATION_LEVEL | str] = None,
+  ) -> pet.Element: ...
   @overload
-  def to_element(self, element_factory: None = None) -> let._Element: ...
+  def to_element(
+    self,
+    element_factory: None = None,
+    *,
+    validation: Optional[VALIDATION_LEVEL | str] = None,
+  ) -> let._Element: ...
   def to_element(
     self,
     element_factory: Optional[
       Python_ElementFactory | Callable[[str, Mapping[str, str]], ElementLikeProtocol]
     ] = None,
+    *,
+    validation: Optional[VALIDATION_LEVEL | str] = None,
   ) -> ElementLike:
     """
     Serializes the object to an XML element using the provided factory.
@@ -53,6 +99,8 @@ class ElementSerializationMixin:
     Args:
         element_factory: A callable that returns an XML element object given a tag name
         and a dictionary of attributes. Defaults to `lxml.etree.Element`.
+        validation: The validation level used for the object and its descendants,
+        see `xliff.policy`. Defaults to the active level.
 
     Returns:
         ElementLike: The resulting XML element, a `lxml.etree._Element`,
@@ -62,7 +110,7 @@ class ElementSerializationMixin:
       # Getting around BOTH lxml and ElementTree typing is a mega mess
       # Just ignoring here until something breaks...
       element_factory = let.Element  # type: ignore
-    return self._to_element(element_factory)  # type: ignore
+    return self._serialize(element_factory, validation)  # type: ignore
 
 
 class BaseXliffElement(ElementSerializationMixin):
@@ -72,7 +120,11 @@ class BaseXliffElement(ElementSerializationMixin):
   _source_element: Optional[ElementLike]
   _children: Iterable[BaseXliffElement]
   _validators: ClassVar[dict[str, partial[None]]]
-  __slots__ = ("_source_element", "_children")
+  # Methods modifying the object other than by setting attributes, see `freeze`
+  _mutators: ClassVar[tuple[str, ...]] = ()
+  _frozen: ClassVar[bool] = False
+  _hash: int
+  __slots__ = ("_source_element", "_children", "_hash")
 
   def __init__(self, **kwargs) -> None:
     # Check if we have a source xml element and ensure it's correct else use a temp
@@ -88,11 +140,16 @@ class BaseXliffElement(ElementSerializationMixin):
     if self.__class__._has_content:
       self._init_content(**kwargs)
     self._init_xml_attributes(source_element, **kwargs)
+    # Every value has been read, the children released theirs already
+    if self._source_element is not None and not retains_sources():
+      self._source_element = None
 
   def _init_content(self, **kwargs) -> None:
     raise NotImplementedError
 
   def _init_xml_attributes(self, source_element: ElementLike, **kwargs) -> None:
+    # Values read from the element share a single string per value if interning
+    pool = active_pool()
     # assign attribute values, prioritizing kwargs over the source_element
     for attribute, xml_name in self._xml_attribute_map.items():
       if attribute in kwargs:  # Explicit value given
@@ -100,10 +157,17 @@ class BaseXliffElement(ElementSerializationMixin):
       elif (
         xml_name in source_element.attrib
       ):  # No explicit value, check the source element
-        setattr(self, attribute, source_element.attrib[xml_name])
+        value = source_element.attrib[xml_name]
+        setattr(self, attribute, value if pool is None else pool.string(value))
       else:
         setattr(self, attribute, None)  # not found anywhere, setting to None
 
+  def _warn_invalid(self) -> None:
+    """Warns about the invalid attributes of a newly built object, if enabled."""
+    if validates_construction():
+      for issue in self._attribute_issues():
+        warn(issue.message)
+
   @property
   def _attribute_dict(self) -> dict[str, str]:
     """
@@ -121,12 +185,102 @@ class BaseXliffElement(ElementSerializationMixin):
       if getattr(self, attribute) is not None
     }
 
+  def _serialize(
+    self,
+    element_factory: Callable[..., ElementLike],
+    validation: Optional[VALIDATION_LEVEL | str],
+  ) -> ElementLike:
+    current = span("serialize", object=type(self).__name__)
+    if not current.recording:
+      # The usual case, called for every descendant
+      return self._serialize_at_level(element_factory, validation)
+    with current:
+      element = self._serialize_at_level(element_factory, validation)
+      current.set("elements", sum(1 for _ in getattr(element, "iter", tuple)()))
+    return element
+
+  def _serialize_at_level(
+    self,
+    element_factory: Callable[..., ElementLike],
+    validation: Optional[VALIDATION_LEVEL | str],
+  ) -> ElementLike:
+    if validation is not None:
+      # The descendants are serialized with the same level
+      with validation_policy(validation):
+        return self._serialize(element_factory, None)
+    if _subtree_validated.get():
+      return self._to_element(element_factory)
+    level = validation_level()
+    if level is VALIDATION_LEVEL.LAZY:
+      # Not traced, as it would add a span per object
+      self._raise_errors(recurse=False, gather_all_errors=False)
+    elif validates_serialization(level):
+      # Validated once for all the descendants, which are then not validated again
+      self.validate(recurse=True)
+      token = _subtree_validated.set(True)
+      try:
+        return self._to_element(element_factory)
+      finally:
+        _subtree_validated.reset(token)
+    return self._to_element(element_factory)
+
   def _to_element(self, element_factory: Callable[..., ElementLike]) -> ElementLike:
-    self.validate(recurse=True)
     element_factory_ = let.Element if element_factory is None else element_factory
     element = element_factory_(self._xml_tag, self._attribute_dict)
     return element
 
+  def _attribute_issues(self) -> Iterator[ValidationIssue]:
+    """Yields the attributes rejected by their validator, without raising."""
+    for attribute, validator in self._validators.items():
+      value = getattr(self, attribute)
+      if not is_valid_value(validator, value):
+        yield ValidationIssue(self, attribute, value, validator)
+
+  def _children_issues(self, *, recurse: bool = True) -> Iterator[ValidationIssue]:
+    """
+    Yields the issues of the children, and of their descendants if `recurse`.
+
+    Classes that store their children in another form than objects override this
+    to check them directly.
+    """
+    for child in self._children:
+      yield from child._issues(recurse=recurse)
+
+  def _issues(self, *, recurse: bool = True) -> Iterator[ValidationIssue]:
+    """Yields the issues of the object then of its descendants, lazily."""
+    yield from self._attribute_issues()
+    if recurse:
+      yield from self._children_issues(recurse=recurse)
+
+  def check(self, *, recurse: bool = True) -> ValidationResult:
+    """
+    Validates this element and optionally its descendants, without raising.
+
+    Performs the same checks as `validate` but returns the issues found instead
+    of raising. No exception or message is created unless asked for.
+
+    Args:
+      recurse (bool): If True, validates all descendants recursively. Defaults to True.
+
+    Returns:
+      ValidationResult: The issues found, true if there are none.
+    """
+    return ValidationResult(self._issues(recurse=recurse))
+
+  def is_valid(self, *, recurse: bool = True) -> bool:
+    """
+    Tells whether this element and optionally its descendants are valid.
+
+    Stops at the first issue found.
+
+    Args:
+      recurse (bool): If True, validates all descendants recursively. Defaults to True.
+
+    Returns:
+      bool: True if `validate` would not raise.
+    """
+    return next(self._issues(recurse=recurse), None) is None
+
   def _validate_attributes(
     self, *, gather_all_errors: bool = False
   ) -> ValidationErrorGroup:
@@ -146,33 +300,7 @@ class BaseXliffElement(ElementSerializationMixin):
     Raises:
       ValidationError: If validation fails for any attribute and gather_all_errors is False.
     """
-    # Initialize our error group
-    validation_error_group = ValidationErrorGroup()
-    for attribute, validator in self._validators.items():
-      try:
-        # Run each validator (subclass dependent)
-        value = getattr(self, attribute)
-        validator(value)
-      except (ValueError, TypeError) as e:
-        # Create the ValidationError with the correct info
-        Error = ValidationError(
-          e,
-          {
-            "attribute": attribute,
-            "value": value,
-            "expected": validator.keywords["expected"],
-            "source": self,
-          },
-        )
-        if not gather_all_errors:
-          # Immediately raise if not gathering.
-          # Since gather_all_errors is passed down from the original validate call
-          # this error will bubble up back to it immediately
-          raise Error
-        # Append our error to our group and move to the next attribute to collect all errors
-        validation_error_group.errors.append((self, Error))
-    # Return all errors
-    return validation_error_group
+    return self._errors(self._attribute_issues(), gather_all_errors)
 
   def _validate_children(
     self,
@@ -195,24 +323,28 @@ class BaseXliffElement(ElementSerializationMixin):
 
     Raises:
       ValidationError: If validation fails for any child and gather_all_errors is False.
-      ValidationErrorGroup: If validation fails for multiple children and gather_all_errors is True.
     """
-    # Initialize the error group
-    validation_error_group = ValidationErrorGroup()
-    for child in self._children:
-      try:
-        # Validate each child, passing down recurse and gather_all_error for consistent behavior
-        child.validate(recurse=recurse, gather_all_errors=gather_all_errors)
-      except ValidationError as e:
-        # Raise directly if not a group since we're not gathering
-        raise e
-      except ValidationErrorGroup as e:
-        # Extend our group with all the errors of that child
-        validation_error_group.errors.extend(e.errors)
-    # Return all the errors
-    return validation_error_group
-
-  def validate(self, *, recurse=True, gather_all_errors=False) -> None:
+    return self._errors(self._children_issues(recurse=recurse), gather_all_errors)
+
+  @staticmethod
+  def _errors(
+    issues: Iterator[ValidationIssue], gather_all_errors: bool
+  ) -> ValidationErrorGroup:
+    # Exceptions are only created here, for the issues actually reported
+    if not gather_all_errors:
+      issue = next(issues, None)
+      if issue is not None:
+        raise issue.error
+      return ValidationErrorGroup()
+    return ValidationErrorGroup([(issue.source, issue.error) for issue in issues])
+
+  def validate(
+    self,
+    *,
+    recurse=True,
+    gather_all_errors=False,
+    validation: Optional[VALIDATION_LEVEL | str] = None,
+  ) -> None:
     """
     Validates this element and optionally its children.
 
@@ -222,37 +354,259 @@ class BaseXliffElement(ElementSerializationMixin):
 
     Following the "lax input, strict output" philosophy, this validation is primarily
     meant to be called before serialization to ensure only valid data is exported.
+    Use `check` or `is_valid` to validate without exceptions.
 
     Args:
       recurse (bool): If True, validates all descendants recursively. If False, only validates this element. Defaults to True.
       gather_all_errors (bool): If True, collects and raises all validation errors together. If False, raises on the first error encountered. Defaults to False.
+      validation (Optional[VALIDATION_LEVEL | str]): The validation level, see `xliff.policy`. Nothing is validated with `VALIDATION_LEVEL.OFF`. Defaults to the active level.
 
     Raises:
       ValidationError: If validation fails for a single attribute or child and gather_all_errors is False.
       ValidationErrorGroup: If validation fails for multiple attributes or children and gather_all_errors is True.
     """
-    # Initialize our error group
-    all_errors = ValidationErrorGroup()
-    # Validate attributes
-    # If not gathering errors, this will simply raise a ValidationError
-    # Else, we collect all the attribute errors
-    all_errors.errors.extend(
-      self._validate_attributes(gather_all_errors=gather_all_errors).errors
-    )
-    # Check all children if needed
-    if recurse:
-      # Validate children
-      # If not gathering error, this will let the first ValidationError bubble up
-      # Else, we'll simply extend our error list with all of the errors in the children
-      all_errors.errors.extend(
-        self._validate_children(
-          recurse=recurse, gather_all_errors=gather_all_errors
-        ).errors
-      )
+    if validation_level(validation) is VALIDATION_LEVEL.OFF:
+      return None
+    with span("validate", object=type(self).__name__, recurse=recurse):
+      self._raise_errors(recurse=recurse, gather_all_errors=gather_all_errors)
+    return None
+
+  def _raise_errors(self, *, recurse: bool, gather_all_errors: bool) -> None:
+    all_errors = self._errors(self._issues(recurse=recurse), gather_all_errors)
     # Raise if we have errors
     if len(all_errors.errors):
       raise all_errors
-    return None
+
+  def __getstate__(self) -> tuple[None, dict[str, object]]:
+    # The source element is an lxml element, which can't be pickled
+    slots: dict[str, object]
+    _, slots = super().__getstate__()  # type: ignore
+    slots["_source_element"] = None
+    return None, slots
+
+  @property
+  def source_element(self) -> Optional[ElementLike]:
+    """The element the object was built from, None if built from values or detached."""
+    return self._source_element
+
+  def detach(self, *, recurse: bool = True) -> Self:
+    """
+    Releases the element the object was built from, and those of its descendants.
+
+    The values of an object are read from its element when it is built, so that it
+    works the same once detached. As an element keeps its whole document alive,
+    detaching every object built from a document lets the document be freed.
+    Frozen objects can be detached too.
+
+    Args:
+        recurse (bool): Whether to detach the descendants too. Defaults to True.
+
+    Returns:
+        Self: The object itself.
+    """
+    stack: list[BaseXliffElement] = [self]
+    while stack:
+      node = stack.pop()
+      # Not part of the value of the object, so frozen objects allow it
+      object.__setattr__(node, "_source_element", None)
+      if recurse:
+        stack.extend(node._children)
+    return self
+
+  def reattach(self, element: ElementLike, *, recurse: bool = True) -> Self:
+    """
+    Binds the object to an element again, usually the one it was detached from.
+
+    The children of the object are bound to the children of `element` with their
+    tag, in order. The values of the objects are not read again, the elements are
+    only kept for code working on the source document, like updating it in place
+    instead of serializing new elements.
+
+    Args:
+        element (ElementLike): The element to bind the object to.
+        recurse (bool): Whether to bind the descendants too. Defaults to True.
+
+    Returns:
+        Self: The object itself.
+
+    Raises:
+        TypeError: If `element` is not a valid XML element-like object.
+        ValueError: If the tag of an element doesn't match its object, or if an
+        object and its element don't have the same number of children. Nothing is
+        bound then.
+    """
+    pairs: list[tuple[BaseXliffElement, ElementLike]] = []
+    stack: list[tuple[BaseXliffElement, ElementLike]] = [(self, element)]
+    while stack:
+      node, source = stack.pop()
+      if not ensure_usable_element(source):
+        raise TypeError(f"{source!r} is not a valid XML Element like object")
+      ensure_correct_element(node._xml_tag, source)
+      pairs.append((node, source))
+      children = tuple(node._children) if recurse else ()
+      if not children:
+        continue
+      tags = {child._xml_tag for child in children}
+      sources = [item for item in source if item.tag in tags]
+      if len(sources) != len(children):
+        raise ValueError(
+          f"{type(node).__name__} has {len(children)} children but its element "
+          f"has {len(sources)}"
+        )
+      stack.extend(zip(children, sources))
+    for node, source in pairs:
+      object.__setattr__(node, "_source_element", source)
+    return self
+
+  @property
+  def frozen(self) -> bool:
+    """Whether the object was frozen with `freeze`."""
+    return self._frozen
+
+  def freeze(self) -> Self:
+    """
+    Makes this object and all its descendants immutable.
+
+    Child sequences are converted to tuples (or to frozen `KeyedSequence`), setting
+    or deleting an attribute raises an `AttributeError` and the hash of every object
+    is computed from its values once and for all. Frozen objects compare equal when
+    they are of the same class with equal values and can be used as dict keys.
+
+    As nothing changes anymore, a frozen tree can be read from any number of threads
+    without locks, including on the free-threaded build of Python.
+
+    Returns:
+        Self: The object itself, frozen.
+    """
+    # Reversed depth first order puts every object after all its descendants, so
+    # that the hashes of the children are known when hashing their parent
+    order: list[BaseXliffElement] = []
+    stack: list[BaseXliffElement] = [self]
+    while stack:
+      node = stack.pop()
+      if not node._frozen:
+        order.append(node)
+        stack.extend(node._children)
+    for node in reversed(order):
+      if node._frozen:  # Shared by several parents
+        continue
+      node._freeze_content()
+      node._hash = hash((type(node).__name__, node._frozen_state()))
+      node.__class__ = _frozen_class(type(node))
+    return self
+
+  def _freeze_content(self) -> None:
+    """Converts the mutable containers of the object to immutable ones."""
+    for name in _slot_names(type(self)):
+      value = getattr(self, name, None)
+      if isinstance(value, KeyedSequence):
+        value.freeze()
+      elif isinstance(value, MutableSequence):
+        setattr(self, name, tuple(value))
+    children = self._children
+    if not isinstance(children, KeyedSequence):
+      self._children = tuple(children)
+
+  def _frozen_state(self) -> tuple:
+    """The values identifying the object once frozen."""
+    return tuple(
+      tuple(value) if isinstance(value, KeyedSequence) else value
+      for value in (getattr(self, name, None) for name in _slot_names(type(self)))
+    )
+
+
+# Slots that are not part of the value of an object
+_INTERNAL_SLOTS = frozenset(("_source_element", "_children", "_hash"))
+_slot_names_cache: dict[type, tuple[str, ...]] = {}
+
+
+def _slot_names(cls: type) -> tuple[str, ...]:
+  names = _slot_names_cache.get(cls)
+  if names is None:
+    names = tuple(
+      name
+      for klass in reversed(cls.__mro__)
+      for name in klass.__dict__.get("__slots__", ())
+      if name not in _INTERNAL_SLOTS
+    )
+    _slot_names_cache[cls] = names
+  return names
+
+
+def _read_only(self: BaseXliffElement, name: str, *args: object) -> None:
+  raise AttributeError(f"Cannot modify {name!r}, the {type(self).__name__} is frozen")
+
+
+def _frozen_method(name: str) -> Callable[..., None]:
+  def method(self: BaseXliffElement, *args: object, **kwargs: object) -> None:
+    raise AttributeError(f"Cannot call {name!r}, the {type(self).__name__} is frozen")
+
+  return method
+
+
+def _frozen_hash(self: BaseXliffElement) -> int:
+  return self._hash
+
+
+def _frozen_eq(self: BaseXliffElement, other: object) -> bool:
+  if self is other:
+    return True
+  if type(other) is not type(self):
+    return NotImplemented
+  return (
+    self._hash == other._hash  # type: ignore
+    and self._frozen_state() == other._frozen_state()  # type: ignore
+  )
+
+
+def _freeze_self(self: BaseXliffElement) -> BaseXliffElement:
+  return self
+
+
+def _reduce_frozen(self: BaseXliffElement) -> tuple:
+  return _unpickle_frozen, (type(self).__mro__[1], self.__getstate__()[1])
+
+
+def _unpickle_frozen(
+  cls: type[BaseXliffElement], slots: dict[str, object]
+) -> BaseXliffElement:
+  obj = cls.__new__(cls)
+  for name, value in slots.items():
+    setattr(obj, name, value)
+  # String hashes differ between processes, the hash has to be computed again
+  obj._hash = hash((cls.__name__, obj._frozen_state()))
+  obj.__class__ = _frozen_class(cls)
+  return obj
+
+
+_frozen_classes: dict[type, type] = {}
+
+
+def _frozen_class(cls: type[BaseXliffElement]) -> type[BaseXliffElement]:
+  """
+  The class frozen objects of `cls` are switched to.
+
+  It has the same name and no slot of its own, so that objects can change class in
+  place, and overrides everything that could modify them.
+  """
+  frozen = _frozen_classes.get(cls)
+  if frozen is None:
+    namespace: dict[str, object] = {
+      "__slots__": (),
+      "__module__": cls.__module__,
+      "__qualname__": cls.__qualname__,
+      "__setattr__": _read_only,
+      "__delattr__": _read_only,
+      "__hash__": _frozen_hash,
+      "__eq__": _frozen_eq,
+      "_frozen": True,
+      "freeze": _freeze_self,
+      "__reduce__": _reduce_frozen,
+    }
+    for name in cls._mutators:
+      namespace[name] = _frozen_method(name)
+    frozen = _frozen_classes[cls] = type(cls.__name__, (cls,), namespace)
+  return frozen
 
 
 class Coord:
@@ -0,0 +1,147 @@
+"""
+Applying translations to a document in streaming mode.
+
+The document is read once and written as it is read: only the `<trans-unit>`
+elements whose `id` has a translation are modified, everything else is copied
+through untouched.
+"""
+
+from __future__ import annotations
+from codecs import lookup
+from collections.abc import Mapping
+from os import PathLike
+from typing import IO, Optional
+from xliff.streaming import XliffWriter, XmlSource, iter_sections, local_name
+import lxml.etree as let
+import re
+
+type Translation = str | tuple[str, Optional[str]]
+
+# The byte order mark, xml declaration and whitespace a document starts with
+_PROLOG = re.compile(rb"(?:\xef\xbb\xbf)?<\?xml[^>]*\?>\s*")
+_ENCODING = re.compile(rb"""encoding\s*=\s*["']([^"']+)["']""")
+_HEAD = 1024
+
+
+class PatchReport:
+  """What `apply_translations` did."""
+
+  units: int
+  """The number of `<trans-unit>` elements read"""
+  patched: int
+  """The number of `<trans-unit>` elements whose target was replaced"""
+  unmatched: set[str]
+  """The ids of the translations that matched no `<trans-unit>`"""
+
+  __slots__ = ("units", "patched", "unmatched")
+
+  def __init__(self, unmatched: set[str]) -> None:
+    self.units = 0
+    self.patched = 0
+    self.unmatched = unmatched
+
+
+def _set_target(unit: let._Element, text: str, state: Optional[str]) -> None:
+  """Replaces the content of the `<target>` of `unit`, creating it if needed."""
+  uri = let.QName(unit).namespace
+  namespace = "" if uri is None else f"{{{uri}}}"
+  target = unit.find(f"{namespace}target")
+  if target is None:
+    # The target comes right after the source and seg-source
+    index, previous = 0, None
+    for position, child in enumerate(unit):
+      if child.tag in (f"{namespace}source", f"{namespace}seg-source"):
+        index, previous = position + 1, child
+    target = let.Element(f"{namespace}target")
+    if previous is not None:
+      target.tail = previous.tail
+    unit.insert(index, target)
+  else:
+    del target[:]
+  target.text = text
+  if state is not None:
+    target.set("state", state)
+
+
+def _prolog(source: XmlSource) -> bool | bytes:
+  """
+  The start of a document, for `XliffWriter` to copy it as is.
+
+  Documents without declaration are written without one. The output being UTF-8,
+  the declaration of documents in another encoding is replaced, as is the one of
+  file objects that can't seek, which can only be read once.
+  """
+  if isinstance(source, bytes):
+    head = source[:_HEAD]
+  elif isinstance(source, (str, PathLike)):
+    with open(source, "rb") as file:
+      head = file.read(_HEAD)
+  elif source.seekable():
+    position = source.tell()
+    head = source.read(_HEAD)
+    source.seek(position)
+  else:
+    return True
+  prolog = _PROLOG.match(head)
+  if prolog is None:
+    return False
+  encoding = _ENCODING.search(prolog[0])
+  if encoding is not None and lookup(encoding[1].decode("ascii")).name != "utf-8":
+    return True
+  return prolog[0]
+
+
+def apply_translations(
+  source: XmlSource,
+  output: str | PathLike[str] | IO[bytes],
+  translations: Mapping[str, Translation],
+  *,
+  state: Optional[str] = "translated",
+) -> PatchReport:
+  """
+  Writes a copy of a document with the targets of some units replaced.
+
+  Every `<trans-unit>` whose `id` is a key of `translations`, including the ones of
+  a `<bin-unit>`, gets its `<target>` content replaced, any inline element it had
+  being removed. A `<target>` is created after the `<source>` if the unit has none.
+  The rest of the document is copied as is, its xml declaration included if it is
+  in UTF-8, and only one unit is held in memory at any time.
+
+  Args:
+      source (XmlSource): The document to patch.
+      output (str | PathLike[str] | IO[bytes]): Where to write the patched document.
+      translations (Mapping[str, Translation]): The new target text of units by id,
+      or a `(text, state)` tuple to give the state of a unit explicitly. A `None`
+      state leaves the `state` attribute of the target untouched.
+      state (Optional[str]): The state of the targets given as plain text. Defaults
+      to "translated", `None` leaves the `state` attribute untouched.
+
+  Returns:
+      PatchReport: The number of units read and patched and the ids of the
+      translations that were not used.
+  """
+  report = PatchReport(set(translations))
+
+  def patch(unit: let._Element) -> None:
+    report.units += 1
+    id = unit.get("id")
+    if id is None or (translation := translations.get(id)) is None:
+      return
+    if isinstance(translation, str):
+      _set_target(unit, translation, state)
+    else:
+      _set_target(unit, *translation)
+    report.patched += 1
+    report.unmatched.discard(id)
+
+  with XliffWriter(output, xml_declaration=_prolog(source)) as writer:
+    for event, value in iter_sections(source):
+      if event == "leaf" and isinstance(value, let._Element):
+        name = local_name(value.tag)
+        if name == "trans-unit":
+          patch(value)
+        elif name == "bin-unit":
+          for unit in value.iter("{*}trans-unit"):
+            patch(unit)
+      writer.write_event(event, value)
+  return report
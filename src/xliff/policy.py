@@ -0,0 +1,152 @@
+"""
+Choosing when objects are validated.
+
+By default objects warn about their invalid attributes when built and are
+validated, with all their descendants, before being serialized. Pipelines working
+on trusted data can skip some of those checks by choosing another
+`VALIDATION_LEVEL`, either globally with `set_validation_level`, for a block with
+`validation_policy`, or for a single call to `validate`, `to_element` or
+`to_bytes` with their `validation` argument.
+
+Objects also keep the element they were built from, which keeps its whole document
+alive. Long running processes can have objects release it once built, globally
+with `set_source_retention` or for a block with `source_retention`.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from xliff.constants import VALIDATION_LEVEL
+
+_CONSTRUCTION = frozenset((VALIDATION_LEVEL.STRICT, VALIDATION_LEVEL.CONSTRUCT_ONLY))
+_SERIALIZATION = frozenset(
+  (VALIDATION_LEVEL.STRICT, VALIDATION_LEVEL.SERIALIZE_ONLY, VALIDATION_LEVEL.LAZY)
+)
+
+_default_level = VALIDATION_LEVEL.STRICT
+_active_level: ContextVar[Optional[VALIDATION_LEVEL]] = ContextVar(
+  "xliff_validation_level", default=None
+)
+_default_retention = True
+_active_retention: ContextVar[Optional[bool]] = ContextVar(
+  "xliff_source_retention", default=None
+)
+
+
+def validation_level(
+  level: Optional[VALIDATION_LEVEL | str] = None,
+) -> VALIDATION_LEVEL:
+  """
+  Returns the level in use.
+
+  Args:
+      level (Optional[VALIDATION_LEVEL | str]): A level given to a single call,
+      which takes precedence over the active one.
+
+  Returns:
+      VALIDATION_LEVEL: `level` if given, else the level of the innermost
+      `validation_policy` block, else the global level.
+
+  Raises:
+      ValueError: If `level` is not a valid level.
+  """
+  if level is not None:
+    return VALIDATION_LEVEL(level)
+  active = _active_level.get()
+  return _default_level if active is None else active
+
+
+def set_validation_level(level: VALIDATION_LEVEL | str) -> None:
+  """
+  Sets the level used in every thread outside of `validation_policy` blocks.
+
+  Args:
+      level (VALIDATION_LEVEL | str): The new global level.
+
+  Raises:
+      ValueError: If `level` is not a valid level.
+  """
+  global _default_level
+  _default_level = VALIDATION_LEVEL(level)
+
+
+@contextmanager
+def validation_policy(level: VALIDATION_LEVEL | str) -> Iterator[VALIDATION_LEVEL]:
+  """
+  Uses a level for everything done inside the `with` block.
+
+  Blocks can be nested, the innermost one being used. The level is only used in
+  the current thread or task.
+
+  Args:
+      level (VALIDATION_LEVEL | str): The level to use.
+
+  Returns:
+      Iterator[VALIDATION_LEVEL]: The level in use.
+
+  Raises:
+      ValueError: If `level` is not a valid level.
+  """
+  token = _active_level.set(VALIDATION_LEVEL(level))
+  try:
+    yield _active_level.get()  # type: ignore
+  finally:
+    _active_level.reset(token)
+
+
+def validates_construction(level: Optional[VALIDATION_LEVEL | str] = None) -> bool:
+  """Whether objects built now check their attributes, see `validation_level`."""
+  return validation_level(level) in _CONSTRUCTION
+
+
+def validates_serialization(level: Optional[VALIDATION_LEVEL | str] = None) -> bool:
+  """Whether objects serialized now are validated, see `validation_level`."""
+  return validation_level(level) in _SERIALIZATION
+
+
+def retains_sources() -> bool:
+  """
+  Whether objects built now keep the element they were built from.
+
+  Returns:
+      bool: The choice of the innermost `source_retention` block, else the global
+      one, True by default.
+  """
+  active = _active_retention.get()
+  return _default_retention if active is None else active
+
+
+def set_source_retention(retain: bool) -> None:
+  """
+  Sets whether objects keep their source element outside of `source_retention`
+  blocks, in every thread.
+
+  Args:
+      retain (bool): False to release the elements once the objects are built.
+  """
+  global _default_retention
+  _default_retention = bool(retain)
+
+
+@contextmanager
+def source_retention(retain: bool) -> Iterator[bool]:
+  """
+  Chooses whether objects built inside the `with` block keep their source element.
+
+  Objects released from their element work the same, see
+  `BaseXliffElement.detach`. Blocks can be nested, the innermost one being used.
+  The choice is only used in the current thread or task.
+
+  Args:
+      retain (bool): False to release the elements once the objects are built.
+
+  Returns:
+      Iterator[bool]: The choice in use.
+  """
+  token = _active_retention.set(bool(retain))
+  try:
+    yield bool(retain)
+  finally:
+    _active_retention.reset(token)
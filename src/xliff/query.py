@@ -0,0 +1,579 @@
+"""
+A small selector language to query XLIFF object trees and documents.
+
+A selector is a path made of steps. Each step names a tag (or `*` for any tag) and
+can be refined by predicates on the attributes of the element, using the python
+attribute names of the classes (`context_type`, not `context-type`):
+
+  //group[restype=dialog]//context[context_type=sourcefile]
+  context-group[purpose=location|x-custom]/context[match_mandatory=yes]
+  count-group/count[unit]
+
+Steps are separated by `/` (direct child) or `//` (any descendant). A selector that
+does not start with a `/` is searched for anywhere, just like `//`. Predicates are
+either `[attribute]` (attribute is set), `[attribute=value]` or `[attribute!=value]`,
+with alternatives separated by `|`. Values can be quoted and enum values can be
+given either by value (`sourcefile`) or by member name (`SOURCEFILE`).
+
+Selectors are compiled once into a traversal plan which is then used to skip any
+subtree that cannot contain a match.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from enum import Enum
+from functools import lru_cache
+import re
+from typing import Any, NamedTuple, Optional
+from xliff.helpers import stringify
+from xliff.objects import BaseXliffElement
+from xliff.streaming import (
+  ELEMENT_CLASSES,
+  XmlSource,
+  iterparse,
+  local_name,
+  materialize,
+  release,
+)
+import lxml.etree as let
+
+_CHILD_TAGS: dict[str, frozenset[str]] = {
+  "xliff": frozenset(("file",)),
+  "file": frozenset(("header", "body")),
+  "header": frozenset(
+    ("skl", "phase-group", "glossary", "reference", "count-group", "tool")
+    + ("prop-group", "note")
+  ),
+  "phase-group": frozenset(("phase",)),
+  "phase": frozenset(("note",)),
+  "body": frozenset(("group", "trans-unit", "bin-unit")),
+  "group": frozenset(
+    ("context-group", "count-group", "prop-group", "note", "group", "trans-unit")
+    + ("bin-unit",)
+  ),
+  "trans-unit": frozenset(
+    ("source", "seg-source", "target", "context-group", "count-group")
+    + ("prop-group", "note", "alt-trans")
+  ),
+  "bin-unit": frozenset(
+    ("bin-source", "bin-target", "context-group", "count-group", "prop-group")
+    + ("note", "trans-unit")
+  ),
+  "alt-trans": frozenset(
+    ("source", "seg-source", "target", "context-group", "prop-group", "note")
+  ),
+  "context-group": frozenset(("context",)),
+  "count-group": frozenset(("count",)),
+  "prop-group": frozenset(("prop",)),
+  "context": frozenset(),
+  "count": frozenset(),
+  "prop": frozenset(),
+  "note": frozenset(),
+}
+"""
+The structural elements each element can contain, as per the XLIFF 1.2 spec.
+
+Inline elements are left out as they can't contain any of the above. Elements that
+are not listed here are assumed to be able to contain anything.
+"""
+
+
+@lru_cache(maxsize=None)
+def _may_contain(tag: str, target: str) -> bool:
+  """Whether an element with `tag` can have a `target` element as a descendant."""
+  if tag not in _CHILD_TAGS:
+    return True
+  seen: set[str] = set()
+  pending = list(_CHILD_TAGS[tag])
+  while pending:
+    child = pending.pop()
+    if child == target or child not in _CHILD_TAGS:
+      return True
+    if child not in seen:
+      seen.add(child)
+      pending.extend(_CHILD_TAGS[child])
+  return False
+
+
+def _expected_type(tag: str, attribute: str) -> Optional[type | tuple[type, ...]]:
+  """The type the validators of the class registered for `tag` expect, if any."""
+  cls = ELEMENT_CLASSES.get(tag)
+  if cls is None or attribute not in cls._validators:
+    return None
+  return cls._validators[attribute].keywords["expected"]
+
+
+class Predicate:
+  """
+  A single `[attribute op values]` test of a step.
+
+  The literal values of the selector are converted once per tag to the python values
+  an object would hold after its construction and to the strings found in the
+  attributes of an xml element, so that testing a node is a single lookup.
+  """
+
+  attribute: str
+  negate: bool
+  literals: Optional[tuple[str, ...]]
+  _typed: dict[str, tuple[Any, ...]]
+  _raw: dict[str, frozenset[str]]
+
+  __slots__ = ("attribute", "negate", "literals", "_typed", "_raw")
+
+  def __init__(
+    self, attribute: str, negate: bool, literals: Optional[tuple[str, ...]]
+  ) -> None:
+    self.attribute = attribute
+    self.negate = negate
+    self.literals = literals
+    self._typed = {}
+    self._raw = {}
+
+  def _convert(self, tag: str) -> None:
+    expected = _expected_type(tag, self.attribute)
+    typed: set[Any] = set()
+    raw: set[str] = set()
+    for literal in self.literals or ():
+      if isinstance(expected, type) and issubclass(expected, Enum):
+        member = expected.__members__.get(literal)
+        if member is None and literal in expected:
+          member = expected(literal)
+        if member is not None:
+          typed.add(member)
+          raw.add(member.value)
+          continue
+      elif expected is bool:
+        flag = {"yes": True, "true": True, "no": False, "false": False}.get(
+          literal.lower()
+        )
+        if flag is not None:
+          typed.add(flag)
+          raw.add("yes" if flag else "no")
+          continue
+      elif expected is int:
+        try:
+          typed.add(int(literal))
+        except ValueError:
+          pass
+      typed.add(literal)
+      raw.add(literal)
+    # A tuple as there are only a few literals and enum members hash slowly
+    self._typed[tag] = tuple(typed)
+    self._raw[tag] = frozenset(raw)
+
+  def test_value(self, tag: str, value: Any) -> bool:
+    """Tests the python value of an attribute of an object."""
+    if self.literals is None:
+      return value is not None
+    if value is None:
+      return self.negate
+    if tag not in self._typed:
+      self._convert(tag)
+    found = value in self._typed[tag]
+    if not found and not isinstance(value, (str, int, Enum)):
+      # Values like a `Coord` are compared using their xml representation
+      try:
+        found = stringify(value) in self._raw[tag]
+      except NotImplementedError:
+        pass
+    return found is not self.negate
+
+  def test_string(self, tag: str, value: Optional[str]) -> bool:
+    """Tests the raw string value of an attribute of an xml element."""
+    if self.literals is None:
+      return value is not None
+    if value is None:
+      return self.negate
+    if tag not in self._raw:
+      self._convert(tag)
+    return (value in self._raw[tag]) is not self.negate
+
+
+class Step(NamedTuple):
+  descendant: bool
+  """`True` for a `//` step, `False` for a `/` step"""
+  tag: str
+  """The tag to match, `*` matches any tag"""
+  predicates: tuple[Predicate, ...]
+
+  def matches_object(self, obj: BaseXliffElement) -> bool:
+    tag = obj._xml_tag
+    if self.tag != "*" and self.tag != tag:
+      return False
+    for predicate in self.predicates:
+      if not predicate.test_value(tag, getattr(obj, predicate.attribute, None)):
+        return False
+    return True
+
+  def matches_element(self, tag: str, element: let._Element) -> bool:
+    if self.tag != "*" and self.tag != tag:
+      return False
+    for predicate in self.predicates:
+      if not predicate.test_string(tag, _element_value(tag, element, predicate)):
+        return False
+    return True
+
+
+def _xml_name(tag: str, attribute: str) -> str:
+  cls = ELEMENT_CLASSES.get(tag)
+  if cls is not None and attribute in cls._xml_attribute_map:
+    return cls._xml_attribute_map[attribute]
+  return attribute.replace("_", "-")
+
+
+def _element_value(
+  tag: str, element: let._Element, predicate: Predicate
+) -> Optional[str]:
+  if predicate.attribute == "value":
+    return element.text
+  return element.get(_xml_name(tag, predicate.attribute))
+
+
+_TOKENS = re.compile(
+  r"""\s*(?:
+    (?P<axis>//|/)
+  | (?P<name>\*|[\w.:-]+)
+  | \[\s*(?P<attribute>\w+)\s*(?:(?P<op>!=|=)\s*(?P<values>(?:"[^"]*"|'[^']*'|[^\]])*))?\]
+  )""",
+  re.VERBOSE,
+)
+
+
+def _split_values(values: str) -> tuple[str, ...]:
+  return tuple(
+    double or single or bare.strip()
+    for double, single, bare in re.findall(
+      r"""\s*(?:"([^"]*)"|'([^']*)'|([^|]+))\s*\|?""", values
+    )
+  )
+
+
+def _parse(selector: str) -> tuple[Step, ...]:
+  steps: list[Step] = []
+  position = 0
+  descendant: Optional[bool] = True if not selector.lstrip().startswith("/") else None
+  tag: Optional[str] = None
+  predicates: list[Predicate] = []
+  selector = selector.rstrip()
+  while position < len(selector):
+    match = _TOKENS.match(selector, position)
+    if match is None or match.end() == position:
+      raise ValueError(f"Invalid selector {selector!r} at position {position}")
+    position = match.end()
+    if match.group("axis") is not None:
+      if tag is not None:
+        steps.append(Step(bool(descendant), tag, tuple(predicates)))
+        tag, predicates = None, []
+      elif descendant is not None:
+        raise ValueError(f"Missing tag before {match.group('axis')!r} in {selector!r}")
+      descendant = match.group("axis") == "//"
+    elif match.group("name") is not None:
+      if tag is not None or descendant is None:
+        raise ValueError(f"Missing '/' before {match.group('name')!r} in {selector!r}")
+      tag = match.group("name")
+    else:
+      if tag is None:
+        raise ValueError(f"Predicate without a tag in {selector!r}")
+      attribute = match.group("attribute")
+      cls = ELEMENT_CLASSES.get(tag)
+      if (
+        cls is not None
+        and attribute not in cls._xml_attribute_map
+        and attribute not in cls._validators
+      ):
+        raise ValueError(f"{cls.__name__} has no attribute {attribute!r}")
+      values = match.group("values")
+      predicates.append(
+        Predicate(
+          attribute,
+          match.group("op") == "!=",
+          None if values is None else _split_values(values),
+        )
+      )
+  if tag is None:
+    raise ValueError(f"Selector {selector!r} does not end with a tag")
+  steps.append(Step(bool(descendant), tag, tuple(predicates)))
+  return tuple(steps)
+
+
+class _State:
+  """
+  A set of steps waiting to be matched by the children of an element.
+
+  States are the nodes of the automaton a selector is compiled into. They are
+  created on demand and cached so that each one is only computed once.
+  """
+
+  steps: tuple[int, ...]
+  plans: dict[str, Optional[_Plan]]
+
+  __slots__ = ("steps", "plans")
+
+  def __init__(self, steps: tuple[int, ...]) -> None:
+    self.steps = steps
+    self.plans = {}
+
+
+class _Plan:
+  """What to do at an element with a given tag reached in a given `_State`."""
+
+  tests: tuple[tuple[int, Step], ...]
+  """The steps with the element's tag, to be tested on the element"""
+  carried: tuple[int, ...]
+  """The `//` steps that still apply to the children of the element"""
+  outcomes: dict[tuple[int, ...], tuple[bool, Optional[_State]]]
+  """Whether the element is a result and the state of its children, per match"""
+  fixed: Optional[tuple[bool, Optional[_State]]]
+  """The only possible outcome when none of the tests has predicates"""
+  single: Optional[
+    tuple[Step, tuple[bool, Optional[_State]], tuple[bool, Optional[_State]]]
+  ]
+  """The step and its outcomes if matched or not, when there is a single test"""
+
+  __slots__ = ("tests", "carried", "outcomes", "fixed", "single")
+
+  def __init__(
+    self, tests: tuple[tuple[int, Step], ...], carried: tuple[int, ...]
+  ) -> None:
+    self.tests = tests
+    self.carried = carried
+    self.outcomes = {}
+    self.fixed = None
+    self.single = None
+
+
+class Selector:
+  """
+  A compiled selector.
+
+  Use `compile` to create one. The same selector can be used any number of times on
+  loaded trees with `select` and on xml documents with `iterselect`.
+  """
+
+  pattern: str
+  steps: tuple[Step, ...]
+
+  __slots__ = ("pattern", "steps", "_states", "_initial")
+
+  def __init__(self, pattern: str) -> None:
+    self.pattern = pattern
+    self.steps = _parse(pattern)
+    self._states: dict[tuple[int, ...], _State] = {}
+    self._initial = self._state((0,))
+
+  def __repr__(self) -> str:
+    return f"{self.__class__.__name__}({self.pattern!r})"
+
+  def _state(self, steps: tuple[int, ...]) -> _State:
+    state = self._states.get(steps)
+    if state is None:
+      state = self._states[steps] = _State(steps)
+    return state
+
+  def _plan(self, state: _State, tag: str) -> Optional[_Plan]:
+    """
+    Computes the plan for an element with `tag` reached in `state`.
+
+    A `/` step can only match the element itself while a `//` step can also match any
+    of its descendants, which is known from the XLIFF content model. `None` means that
+    nothing at or below the element can match and that the whole subtree can be
+    skipped.
+    """
+    steps = self.steps
+    relevant = tuple(
+      index
+      for index in state.steps
+      if steps[index].tag in ("*", tag)
+      or steps[index].descendant
+      and _may_contain(tag, steps[index].tag)
+    )
+    plan = None
+    if relevant:
+      plan = _Plan(
+        tuple(
+          (index, steps[index]) for index in relevant if steps[index].tag in ("*", tag)
+        ),
+        tuple(index for index in relevant if steps[index].descendant),
+      )
+      if not any(step.predicates for _, step in plan.tests):
+        plan.fixed = self._outcome(plan, tuple(index for index, _ in plan.tests))
+      elif len(plan.tests) == 1:
+        index, step = plan.tests[0]
+        plan.single = (step, self._outcome(plan, (index,)), self._outcome(plan, ()))
+    state.plans[tag] = plan
+    return plan
+
+  def _outcome(
+    self, plan: _Plan, matched: tuple[int, ...]
+  ) -> tuple[bool, Optional[_State]]:
+    """
+    Returns whether an element is a result and the state of its children.
+
+    Args:
+        plan: The plan of the element.
+        matched: The steps that matched the element.
+    """
+    outcome = plan.outcomes.get(matched)
+    if outcome is None:
+      last = len(self.steps) - 1
+      next_steps = set(plan.carried)
+      next_steps.update(index + 1 for index in matched if index != last)
+      outcome = plan.outcomes[matched] = (
+        last in matched,
+        self._state(tuple(sorted(next_steps))) if next_steps else None,
+      )
+    return outcome
+
+  def select(
+    self, root: BaseXliffElement | Iterable[BaseXliffElement]
+  ) -> Iterator[BaseXliffElement]:
+    """
+    Finds all the objects matching the selector in an object tree.
+
+    Args:
+        root (BaseXliffElement | Iterable[BaseXliffElement]): The tree(s) to search.
+        The first step of the selector is matched against the root(s) themselves.
+
+    Returns:
+        Iterator[BaseXliffElement]: The matching objects, in document order.
+    """
+    roots = [root] if isinstance(root, BaseXliffElement) else list(root)
+    pending: list[tuple[BaseXliffElement, _Plan]] = []
+    self._push(pending, self._initial, roots)
+    while pending:
+      node, plan = pending.pop()
+      outcome = plan.fixed
+      if outcome is None:
+        if plan.single is not None:
+          step, hit, miss = plan.single
+          outcome = hit if step.matches_object(node) else miss
+        else:
+          outcome = self._outcome(
+            plan,
+            tuple(index for index, step in plan.tests if step.matches_object(node)),
+          )
+      if outcome[0]:
+        yield node
+      if outcome[1] is not None:
+        self._push(pending, outcome[1], node._children)
+
+  def _push(
+    self,
+    pending: list[tuple[BaseXliffElement, _Plan]],
+    state: _State,
+    children: Iterable[BaseXliffElement],
+  ) -> None:
+    plans = state.plans
+    for child in reversed(children):  # type: ignore
+      tag = child._xml_tag
+      plan = plans[tag] if tag in plans else self._plan(state, tag)
+      if plan is not None:
+        pending.append((child, plan))
+
+  def first(
+    self, root: BaseXliffElement | Iterable[BaseXliffElement]
+  ) -> Optional[BaseXliffElement]:
+    """Returns the first object matching the selector or `None`."""
+    return next(self.select(root), None)
+
+  def iterselect(
+    self, source: XmlSource, *, materialize_results: bool = True
+  ) -> Iterator[BaseXliffElement | let._Element]:
+    """
+    Finds all the elements matching the selector in an xml document, in streaming mode.
+
+    The document is parsed incrementally and only the matching elements are kept in
+    memory until they are yielded. Each result is yielded once its closing tag has
+    been parsed, so nested results come before the result that contains them.
+
+    Note:
+        Elements are released as soon as the iteration moves on, except for results
+        which are detached from the document instead.
+
+    Args:
+        source (XmlSource): The document to search.
+        materialize_results (bool): If True, results are converted to the
+        corresponding `BaseXliffElement` subclass, else the raw elements are yielded.
+        Elements with no corresponding class, and `<group>` elements, are always
+        yielded as is. Documents in the XLIFF namespace are supported.
+
+    Returns:
+        Iterator[BaseXliffElement | lxml.etree._Element]: The matching objects or
+        elements.
+    """
+    steps = self.steps
+    last = len(steps) - 1
+    if any(
+      predicate.attribute == "value"
+      for step in steps[:-1]
+      for predicate in step.predicates
+    ):
+      raise ValueError(
+        "Predicates on 'value' are only supported on the last step in streaming mode"
+      )
+    # The state of the children of each open element and if it's a candidate
+    stack: list[tuple[Optional[_State], bool]] = [(self._initial, False)]
+    open_candidates = 0
+    for event, element in iterparse(source):
+      if event == "start":
+        state = stack[-1][0]
+        if state is None:
+          stack.append((None, False))
+          continue
+        tag = local_name(element.tag)
+        plan = state.plans[tag] if tag in state.plans else self._plan(state, tag)
+        if plan is None:
+          stack.append((None, False))
+          continue
+        outcome = plan.fixed
+        if outcome is None:
+          # Predicates of the last step are only checked once the element is
+          # complete since its text is not available yet
+          outcome = self._outcome(
+            plan,
+            tuple(
+              index
+              for index, step in plan.tests
+              if index == last or step.matches_element(tag, element)
+            ),
+          )
+        stack.append((outcome[1], outcome[0]))
+        open_candidates += outcome[0]
+      else:
+        _, found = stack.pop()
+        if found:
+          open_candidates -= 1
+          if steps[last].matches_element(local_name(element.tag), element):
+            yield materialize(element) if materialize_results else element
+        if not open_candidates:
+          if found:
+            # Results are detached from the document so that they stay intact
+            parent = element.getparent()
+            if parent is not None:
+              parent.remove(element)
+          else:
+            release(element)
+
+
+def compile(selector: str) -> Selector:
+  """
+  Compiles a selector.
+
+  Args:
+      selector (str): The selector to compile, see the module documentation for the
+      syntax.
+
+  Returns:
+      Selector: The compiled selector.
+
+  Raises:
+      ValueError: If the selector is malformed or uses an unknown attribute.
+  """
+  return Selector(selector)
+
+
+def select(
+  selector: str, root: BaseXliffElement | Iterable[BaseXliffElement]
+) -> Iterator[BaseXliffElement]:
+  """Shortcut for `compile(selector).select(root)`."""
+  return compile(selector).select(root)
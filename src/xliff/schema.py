@@ -0,0 +1,174 @@
+"""
+Validating documents against the XLIFF 1.2 schema with lxml.
+
+The schema bundled with the library is the subset of the XLIFF 1.2 strict schema
+covering the elements it models, with the rules of their validators, so that
+documents are validated offline and entirely in C by `lxml.etree.XMLSchema`.
+Elements the library doesn't model are not validated.
+
+Errors are mapped back to `ErrorRecord` tuples with the paths used by
+`xliff.validation`. Their kind is the libxml2 error type and their reason its
+message. The schema applies the rules of the validators, only rejecting more
+numbers than `int` does, like `1_000`, so it is a fast first pass: a document it
+accepts has no problem for the validators either, which only need to run for the
+others.
+
+The validators find elements by their local name while the schema only checks the
+ones in the namespace of the root element, so the schema is not enough for documents
+mixing namespaces, like a `<count-group xmlns="">` in a namespaced document.
+"""
+
+from __future__ import annotations
+from copy import deepcopy
+from functools import cache
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+from xliff.streaming import ELEMENT_CLASSES, XLIFF_NAMESPACE, XmlSource, local_name
+from xliff.validation import ErrorRecord, _name
+import lxml.etree as let
+import re
+
+SCHEMA_PATH = Path(__file__).parent / "schemas" / "xliff-core-1.2-subset.xsd"
+"""
+The bundled schema.
+"""
+
+type SchemaTarget = XmlSource | let._Element | let._ElementTree
+
+_MESSAGE = re.compile(
+  r"Element '[^']*'(?:, attribute '(?P<attribute>[^']*)')?: (?P<reason>.*)", re.S
+)
+_MISSING = re.compile(r"The attribute '(?P<attribute>[^']*)' is required")
+
+
+@cache
+def load_schema(*, namespaced: bool = True) -> let.XMLSchema:
+  """
+  Loads the bundled schema, once per process.
+
+  Note:
+      Like every lxml validator, the schema must not be used by several threads at
+      once.
+
+  Args:
+      namespaced (bool): Whether the schema is for documents in the XLIFF
+      namespace. If False, the target namespace of the schema is removed to
+      validate documents without namespace, like the output of `to_element`.
+
+  Returns:
+      lxml.etree.XMLSchema: The schema.
+  """
+  document = let.parse(SCHEMA_PATH)
+  if not namespaced:
+    root = document.getroot()
+    del root.attrib["targetNamespace"]
+    for element in root.iter():
+      for name in ("ref", "type", "base", "memberTypes"):
+        value = element.get(name)
+        if value is not None and "xlf:" in value:
+          element.set(name, value.replace("xlf:", ""))
+  return let.XMLSchema(document)
+
+
+def _tree(target: SchemaTarget) -> let._ElementTree:
+  if isinstance(target, let._ElementTree):
+    return target
+  if isinstance(target, let._Element):
+    # A subelement is validated on its own, as the root of a copy
+    return (target if target.getparent() is None else deepcopy(target)).getroottree()
+  if isinstance(target, bytes):
+    target = BytesIO(target)
+  return let.parse(target, let.XMLParser(huge_tree=True))
+
+
+def _validate(target: SchemaTarget) -> tuple[bool, let.XMLSchema, let._ElementTree]:
+  tree = _tree(target)
+  namespaced = let.QName(tree.getroot()).namespace == XLIFF_NAMESPACE
+  schema = load_schema(namespaced=namespaced)
+  return schema.validate(tree), schema, tree
+
+
+def _accepts(target: SchemaTarget) -> bool:
+  """
+  Tells whether the schema finds no problem in a document and checked all the
+  elements the validators would, which are then known to find no problem either.
+  """
+  valid, _, tree = _validate(target)
+  if not valid:
+    return False
+  namespace = let.QName(tree.getroot()).namespace
+  # "{*}" matches elements with and without a namespace
+  modeled = tree.iter(*(f"{{*}}{tag}" for tag in ELEMENT_CLASSES))
+  return all(let.QName(element).namespace == namespace for element in modeled)
+
+
+def _path(element: let._Element) -> str:
+  parts = []
+  current: Optional[let._Element] = element
+  while current is not None:
+    tag = str(current.tag)
+    position = len(list(current.itersiblings(tag, preceding=True)))
+    parts.append(f"{local_name(tag)}[{position + 1}]")
+    current = current.getparent()
+  return "/".join(reversed(parts))
+
+
+def _record(tree: let._ElementTree, error: let._LogEntry) -> ErrorRecord:
+  element = tree.xpath(error.path)[0]  # type: ignore
+  tag = local_name(element.tag)
+  match = _MESSAGE.match(error.message)
+  reason = error.message if match is None else match["reason"]
+  xml_name: Optional[str] = None if match is None else match["attribute"]
+  value = None
+  if xml_name is not None:
+    value = element.get(xml_name)
+  elif (missing := _MISSING.match(reason)) is not None:
+    xml_name = missing["attribute"]
+  elif "_VALID" in error.type_name:
+    # The text of the element has the wrong type
+    xml_name, value = "", element.text
+  attribute, expected = xml_name or "", ""
+  cls = ELEMENT_CLASSES.get(tag)
+  if cls is not None and xml_name is not None:
+    names = {name: attribute for attribute, name in cls._xml_attribute_map.items()}
+    attribute = names.get(xml_name, "value" if xml_name == "" else xml_name)
+    validator = cls._validators.get(attribute)
+    if validator is not None:
+      expected = _name(validator.keywords["expected"])
+  return ErrorRecord(
+    _path(element), tag, attribute, value, expected, error.type_name, reason
+  )
+
+
+def schema_errors(target: SchemaTarget) -> list[ErrorRecord]:
+  """
+  Validates a document or an element against the bundled schema.
+
+  The schema without namespace is used if the root element isn't in the XLIFF
+  namespace.
+
+  Args:
+      target (SchemaTarget): A document, as a path, a file-like object opened in
+      binary mode or bytes, a parsed tree or an element, like the output of
+      `to_element`.
+
+  Returns:
+      list[ErrorRecord]: The problems found, in document order. The attribute is
+      empty for problems with the children of an element.
+  """
+  valid, schema, tree = _validate(target)
+  return [] if valid else [_record(tree, error) for error in schema.error_log]
+
+
+def is_schema_valid(target: SchemaTarget) -> bool:
+  """
+  Tells whether a document or an element is valid for the bundled schema.
+
+  Args:
+      target (SchemaTarget): The document or element, see `schema_errors`.
+
+  Returns:
+      bool: True if no problem was found.
+  """
+  return _validate(target)[0]
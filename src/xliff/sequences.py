@@ -0,0 +1,191 @@
+"""
+Sequences of child objects that can also be looked up by key.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from collections.abc import MutableSequence
+from enum import Enum
+from typing import Any, Generic, Optional, SupportsIndex, TypeVar, overload
+
+T = TypeVar("T")
+
+
+def _normalized(key: Hashable) -> Hashable:
+  return key.value if isinstance(key, Enum) else key
+
+
+class KeyedSequence(MutableSequence[T], Generic[T]):
+  """
+  A list that also indexes its members by a key computed from each member.
+
+  The order of the members is the order of the list, the index only serves lookups
+  through `by_key`. Keys that are `Enum` members are indexed, and can be looked up,
+  by their value. Appending keeps the index up to date, any other change to the
+  sequence discards it and it is rebuilt on the next lookup.
+
+  Note:
+      Members are indexed by the key they had when the index was built. After
+      changing the key attribute of a member already in the sequence, call
+      `reindex`.
+
+  Once frozen with `freeze`, the sequence and its index can't change anymore and
+  can be read from any number of threads.
+  """
+
+  __slots__ = ("_items", "_key", "_index")
+
+  def __init__(self, items: Iterable[T] = (), *, key: Callable[[T], Hashable]) -> None:
+    """
+    Creates a sequence holding a copy of `items`.
+
+    Args:
+        items (Iterable[T]): The initial members.
+        key (Callable[[T], Hashable]): Returns the key of a member.
+    """
+    self._items: list[T] | tuple[T, ...] = list(items)
+    self._key = key
+    self._index: Optional[dict[Hashable, list[T]]] = None
+
+  def __repr__(self) -> str:
+    return f"{self.__class__.__name__}({self._items!r})"
+
+  def __len__(self) -> int:
+    return len(self._items)
+
+  def __iter__(self) -> Iterator[T]:
+    return iter(self._items)
+
+  def __contains__(self, value: object) -> bool:
+    return value in self._items
+
+  def __eq__(self, other: object) -> bool:
+    if isinstance(other, KeyedSequence):
+      return self._items == other._items
+    if isinstance(other, list):
+      return self._items == other
+    return NotImplemented
+
+  @overload
+  def __getitem__(self, index: SupportsIndex) -> T: ...
+  @overload
+  def __getitem__(self, index: slice) -> list[T]: ...
+  def __getitem__(self, index):
+    return self._items[index]
+
+  @overload
+  def __setitem__(self, index: SupportsIndex, value: T) -> None: ...
+  @overload
+  def __setitem__(self, index: slice, value: Iterable[T]) -> None: ...
+  def __setitem__(self, index, value):
+    self._check_writable()
+    self._items[index] = value  # type: ignore
+    self._index = None
+
+  def __delitem__(self, index: SupportsIndex | slice) -> None:
+    self._check_writable()
+    del self._items[index]  # type: ignore
+    self._index = None
+
+  def insert(self, index: SupportsIndex, value: T) -> None:
+    self._check_writable()
+    self._items.insert(index, value)  # type: ignore
+    self._index = None
+
+  def append(self, value: T) -> None:
+    self._check_writable()
+    self._items.append(value)  # type: ignore
+    if self._index is not None:
+      self._index.setdefault(_normalized(self._key(value)), []).append(value)
+
+  def extend(self, values: Iterable[T]) -> None:
+    for value in values:
+      self.append(value)
+
+  def clear(self) -> None:
+    self._check_writable()
+    self._items.clear()  # type: ignore
+    self._index = None
+
+  def reverse(self) -> None:
+    self._check_writable()
+    self._items.reverse()  # type: ignore
+    self._index = None
+
+  def sort(self, *, key: Optional[Callable[[T], Any]] = None, reverse=False) -> None:
+    """Sorts the members in place, like `list.sort`."""
+    self._check_writable()
+    self._items.sort(key=key, reverse=reverse)  # type: ignore
+    self._index = None
+
+  def reindex(self) -> None:
+    """Discards the index, to account for members whose key changed."""
+    self._check_writable()
+    self._index = None
+
+  @property
+  def frozen(self) -> bool:
+    """Whether the sequence was frozen."""
+    return isinstance(self._items, tuple)
+
+  def _check_writable(self) -> None:
+    if isinstance(self._items, tuple):
+      raise TypeError(f"Cannot modify a frozen {self.__class__.__name__}")
+
+  def freeze(self) -> None:
+    """Makes the sequence immutable, building its index once and for all."""
+    if not isinstance(self._items, tuple):
+      self._items = tuple(self._items)  # type: ignore
+      self._build_index()
+
+  def _build_index(self) -> dict[Hashable, list[T]]:
+    index: dict[Hashable, list[T]] = {}
+    key = self._key
+    for item in self._items:
+      index.setdefault(_normalized(key(item)), []).append(item)
+    self._index = index
+    return index
+
+  @property
+  def by_key(self) -> KeyedView[T]:
+    """A read-only mapping from each key to the first member having it."""
+    return KeyedView(self)
+
+
+class KeyedView(Mapping[Hashable, T], Generic[T]):
+  """The members of a `KeyedSequence` by key, see `KeyedSequence.by_key`."""
+
+  __slots__ = ("_sequence",)
+
+  def __init__(self, sequence: KeyedSequence[T]) -> None:
+    self._sequence = sequence
+
+  def _index(self) -> dict[Hashable, list[T]]:
+    index = self._sequence._index
+    return self._sequence._build_index() if index is None else index
+
+  def __getitem__(self, key: Hashable) -> T:
+    return self._index()[_normalized(key)][0]
+
+  def __iter__(self) -> Iterator[Hashable]:
+    """Iterates over the keys, `Enum` keys being given by their value."""
+    return iter(self._index())
+
+  def __len__(self) -> int:
+    return len(self._index())
+
+  def __contains__(self, key: object) -> bool:
+    return _normalized(key) in self._index()  # type: ignore
+
+  def getall(self, key: Hashable) -> list[T]:
+    """
+    Returns all the members having a key.
+
+    Args:
+        key (Hashable): The key to look up.
+
+    Returns:
+        list[T]: The members with that key in sequence order, empty if there are
+        none.
+    """
+    return list(self._index().get(_normalized(key), ()))
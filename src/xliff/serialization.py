@@ -0,0 +1,136 @@
+"""
+Serializing objects to bytes, optionally in a thread pool.
+
+In parallel mode the direct children of the object are serialized concurrently, in
+chunks, and the resulting text is joined in order between the start and end tags of
+the object, then encoded once. The output is byte for byte the one of the
+sequential mode: encodings Python doesn't encode like libxml2, such as UTF-32 with
+its byte order, are serialized sequentially. It pays
+off on the free-threaded build of Python, where building the elements of each
+chunk runs in parallel, and otherwise only for the part of the work lxml does
+without the GIL.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import cache
+from typing import Optional, Sequence
+from xliff.constants import VALIDATION_LEVEL
+from xliff.objects import BaseXliffElement
+from xliff.policy import validates_serialization, validation_level
+from xliff.tracing import span
+import lxml.etree as let
+
+
+def _serialize(element: let._Element, encoding: str) -> bytes:
+  return let.tostring(element, encoding=encoding, xml_declaration=False)
+
+
+def _serialize_chunk(chunk: Sequence[BaseXliffElement], level: VALIDATION_LEVEL) -> str:
+  return "".join(
+    let.tostring(child.to_element(validation=level), encoding="unicode")
+    for child in chunk
+  )
+
+
+@cache
+def _encodes_like_lxml(encoding: str) -> bool:
+  """Whether Python encodes text like lxml, byte order mark included."""
+  probe = let.Element("probe", value="é €")
+  probe.text = "\U0001f600 & <"
+  try:
+    encoded = let.tostring(probe, encoding="unicode").encode(
+      encoding, "xmlcharrefreplace"
+    )
+  except LookupError:
+    return False
+  return encoded == _serialize(probe, encoding)
+
+
+def to_bytes(
+  obj: BaseXliffElement,
+  *,
+  workers: Optional[int] = None,
+  chunk_size: Optional[int] = None,
+  encoding: str = "UTF-8",
+  validation: Optional[VALIDATION_LEVEL | str] = None,
+) -> bytes:
+  """
+  Serializes an object and all its descendants, without xml declaration.
+
+  The object is validated as with `to_element` and serialized with lxml.
+
+  Args:
+      obj (BaseXliffElement): The object to serialize.
+      workers (Optional[int]): The number of threads serializing the children of
+      `obj`. By default, or with 1, everything is serialized in the current thread.
+      chunk_size (Optional[int]): The number of children serialized at once by a
+      thread. Defaults to splitting the children in 4 chunks per thread.
+      encoding (str): The encoding of the output. Defaults to UTF-8.
+      validation (Optional[VALIDATION_LEVEL | str]): The validation level, see
+      `xliff.policy`. Defaults to the level active in the calling thread, which is
+      also used by the other threads.
+
+  Returns:
+      bytes: The serialized object.
+
+  Raises:
+      ValidationError: If an object is invalid and errors are not gathered.
+      ValidationErrorGroup: If objects are invalid and errors are gathered.
+      ValueError: If `workers` or `chunk_size` is lower than 1, or `validation` is
+      not a valid level.
+  """
+  if workers is not None and workers < 1:
+    raise ValueError(f"workers must be at least 1, got {workers}")
+  if chunk_size is not None and chunk_size < 1:
+    raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+  level = validation_level(validation)
+  with span("serialize", object=type(obj).__name__, workers=workers or 1) as current:
+    serialized = _to_bytes(obj, workers, chunk_size, encoding, level)
+    if current.recording:
+      current.set("bytes", len(serialized))
+  return serialized
+
+
+def _to_bytes(
+  obj: BaseXliffElement,
+  workers: Optional[int],
+  chunk_size: Optional[int],
+  encoding: str,
+  level: VALIDATION_LEVEL,
+) -> bytes:
+  children = list(obj._children)
+  if (
+    workers is None
+    or workers == 1
+    or len(children) < 2
+    or not _encodes_like_lxml(encoding)
+  ):
+    return _serialize(obj.to_element(validation=level), encoding)
+  # The children validate themselves when serialized
+  if validates_serialization(level):
+    obj.validate(recurse=False, validation=level)
+  shell = let.tostring(
+    let.Element(obj._xml_tag, obj._attribute_dict), encoding="unicode"
+  )
+  # An element without children serializes as <tag .../>
+  start, end = shell[:-2] + ">", f"</{obj._xml_tag}>"
+  if chunk_size is None:
+    chunk_size = -(-len(children) // (workers * 4))
+  chunks = [
+    children[index : index + chunk_size]
+    for index in range(0, len(children), chunk_size)
+  ]
+  # Each chunk runs in a copy of the current context, to keep the active span
+  contexts = [copy_context() for _ in chunks]
+  with ThreadPoolExecutor(workers) as executor:
+    parts = list(
+      executor.map(
+        lambda context, chunk: context.run(_serialize_chunk, chunk, level),
+        contexts,
+        chunks,
+      )
+    )
+  # Encoded once, as encoding each part would repeat the byte order mark
+  return "".join((start, *parts, end)).encode(encoding, "xmlcharrefreplace")
@@ -0,0 +1,288 @@
+"""
+Splitting a document into shards balanced by word count and merging them back.
+
+Shards are regular XLIFF documents: every shard contains the `<xliff>`, `<file>`,
+`<body>` and `<group>` elements its units belong to, along with everything found
+before the first unit of those elements (the `<header>`, named groups, notes...), so
+they can be processed independently. Units are distributed in document order, each
+shard receiving a contiguous run of units, which is what allows `merge` to restore
+the original document exactly.
+
+Elements that span several shards are marked with processing instructions:
+`<?xliff-shard continued?>` as the first child of an element that was already opened
+in a previous shard and `<?xliff-shard continues?>` as the last child of an element
+that continues in the next shard. Both are removed by `merge`.
+"""
+
+from __future__ import annotations
+from array import array
+from collections.abc import Iterable, Iterator
+from copy import deepcopy
+from os import PathLike
+from pathlib import Path
+from typing import IO, Optional
+from xliff.constants import COUNT_TYPE, UNIT
+from xliff.streaming import (
+  UNIT_TAGS,
+  SectionEvent,
+  XliffWriter,
+  XmlSource,
+  iter_sections,
+  local_name,
+)
+import lxml.etree as let
+
+SHARD_PI_TARGET = "xliff-shard"
+_CONTINUED = b"<?xliff-shard continued?>"
+_CONTINUES = b"<?xliff-shard continues?>"
+
+
+def unit_word_count(unit: let._Element) -> int:
+  """
+  Returns the number of words of a `<trans-unit>` or `<bin-unit>` element.
+
+  The value of the unit's total word `<count>` is used if there is one, else the
+  words of its `<source>` are counted.
+
+  Args:
+      unit (lxml.etree._Element): The unit to measure.
+
+  Returns:
+      int: The number of words of the unit.
+  """
+  source = None
+  for child in unit:
+    name = local_name(child.tag)
+    if name == "count-group":
+      for count in child:
+        if (
+          local_name(count.tag) == "count"
+          and count.get("count-type") == COUNT_TYPE.TOTAL.value
+          and count.get("unit", UNIT.WORD.value) == UNIT.WORD.value
+        ):
+          try:
+            return int(count.text or "")
+          except ValueError:
+            pass
+    elif name == "source" and source is None:
+      source = child
+  if source is None:
+    return 0
+  return len("".join(source.itertext()).split())
+
+
+def _iter_units(source: XmlSource) -> Iterator[let._Element]:
+  for event, value in iter_sections(source):
+    if (
+      event == "leaf"
+      and isinstance(value, let._Element)
+      and local_name(value.tag) in UNIT_TAGS
+    ):
+      yield value
+
+
+def _rewind(source: XmlSource) -> None:
+  if hasattr(source, "seek"):
+    source.seek(0)  # type: ignore
+  elif hasattr(source, "read"):
+    raise ValueError("File objects must be seekable as they are read twice")
+
+
+class _Container:
+  element: let._Element
+  preamble: list[SectionEvent]
+  shard: Optional[int]
+  started: bool
+
+  __slots__ = ("element", "preamble", "shard", "started")
+
+  def __init__(self, element: let._Element) -> None:
+    self.element = element
+    self.preamble = []
+    self.shard = None  # The last shard the element was opened in
+    self.started = False  # Whether a unit or container was found in the element
+
+
+class _Splitter:
+  """Routes the sections of a document to the writer of each shard."""
+
+  def __init__(self, directory: Path, name: str) -> None:
+    self.directory = directory
+    self.name = name
+    self.paths: list[Path] = []
+    self.writer: Optional[XliffWriter] = None
+    self.current = -1
+    self.stack: list[_Container] = []
+    self.leading: list[SectionEvent] = []
+
+  def switch(self, shard: int) -> XliffWriter:
+    if self.writer is not None:
+      for container in reversed(self.stack):
+        if container.shard == self.current:
+          self.writer.raw(_CONTINUES)
+          self.writer.close()
+      self.writer.__exit__(None, None, None)
+    path = self.directory / self.name.format(index=len(self.paths))
+    self.paths.append(path)
+    self.writer = XliffWriter(path).__enter__()
+    self.current = shard
+    for event in self.leading:
+      self.writer.write_event(*event)
+    self.leading.clear()
+    return self.writer
+
+  def ensure_open(self) -> XliffWriter:
+    writer = self.writer if self.writer is not None else self.switch(0)
+    for container in self.stack:
+      if container.shard != self.current:
+        writer.open_element(container.element)
+        if container.shard is not None:
+          writer.raw(_CONTINUED)
+        for event in container.preamble:
+          writer.write_event(*event)
+        container.shard = self.current
+    return writer
+
+  def other(self, event: SectionEvent) -> None:
+    """Handles any event but units, opening and closing of containers."""
+    if not self.stack:
+      if self.writer is None:
+        self.leading.append(
+          (event[0], deepcopy(event[1])) if event[0] == "leaf" else event  # type: ignore
+        )
+      else:
+        self.writer.write_event(*event)
+    elif not self.stack[-1].started:
+      self.stack[-1].preamble.append(
+        (event[0], deepcopy(event[1])) if event[0] == "leaf" else event  # type: ignore
+      )
+    else:
+      self.ensure_open().write_event(*event)
+
+  def close(self) -> None:
+    self.ensure_open().close()
+    self.stack.pop()
+
+  def finish(self) -> list[Path]:
+    if self.writer is None:
+      self.ensure_open()
+    self.writer.__exit__(None, None, None)  # type: ignore
+    return self.paths
+
+
+def split(
+  source: XmlSource,
+  shards: int,
+  directory: str | PathLike[str],
+  *,
+  name: str = "shard-{index:04d}.xlf",
+) -> list[Path]:
+  """
+  Splits a document into at most `shards` documents balanced by word count.
+
+  The document is read twice, once to measure its units with `unit_word_count` and
+  once to write the shards, and is never fully loaded in memory.
+
+  Args:
+      source (XmlSource): The document to split. File objects must be seekable.
+      shards (int): The maximum number of shards to create. Fewer shards are created
+      if the document doesn't have enough units.
+      directory (str | PathLike[str]): The directory to write the shards in, created
+      if it doesn't exist.
+      name (str): The file name of the shards, formatted with their `index`.
+
+  Returns:
+      list[Path]: The paths of the shards, in order.
+
+  Raises:
+      ValueError: If `shards` is lower than 1 or `source` is a file object that can't
+      be rewound.
+  """
+  if shards < 1:
+    raise ValueError(f"Cannot split into {shards} shards")
+  weights = array("q", (max(unit_word_count(unit), 1) for unit in _iter_units(source)))
+  _rewind(source)
+  total = sum(weights)
+  Path(directory).mkdir(parents=True, exist_ok=True)
+  splitter = _Splitter(Path(directory), name)
+  index = prefix = 0
+  for event in iter_sections(source):
+    kind, value = event
+    if kind == "open":
+      if splitter.stack:
+        splitter.stack[-1].started = True
+      splitter.stack.append(_Container(value))  # type: ignore
+    elif kind == "close":
+      splitter.close()
+    elif kind == "leaf" and local_name(value.tag) in UNIT_TAGS:  # type: ignore
+      weight = weights[index]
+      # The shard the middle of the unit falls into, which keeps shards contiguous
+      shard = min(shards - 1, (2 * prefix + weight) * shards // (2 * total))
+      index, prefix = index + 1, prefix + weight
+      if shard != splitter.current:
+        splitter.switch(shard)
+      splitter.ensure_open().leaf(value)  # type: ignore
+      if splitter.stack:
+        splitter.stack[-1].started = True
+    else:
+      splitter.other(event)
+  return splitter.finish()
+
+
+def _shard_marker(event: SectionEvent) -> Optional[str]:
+  kind, value = event
+  if kind == "leaf" and isinstance(value, let._ProcessingInstruction):
+    if value.target == SHARD_PI_TARGET:
+      return (value.text or "").strip()
+  return None
+
+
+def merge(
+  shards: Iterable[XmlSource],
+  output: str | PathLike[str] | IO[bytes],
+) -> None:
+  """
+  Merges shards created by `split` back into a single document.
+
+  The shards are read one after the other and written to `output` as they are read,
+  so memory use doesn't depend on the size of the shards. Merging all the shards of
+  a document, whose units may have been modified, gives back the original document.
+
+  Args:
+      shards (Iterable[XmlSource]): The shards, in the order returned by `split`.
+      output (str | PathLike[str] | IO[bytes]): The path or binary file object to
+      write the merged document to.
+  """
+  with XliffWriter(output) as writer:
+    for shard in shards:
+      # For each open container: whether it stays open for the next shard
+      stack: list[bool] = []
+      # Set on a continued container until its first unit or container
+      skipping = False
+      pending: Optional[let._Element] = None
+      for event in iter_sections(shard):
+        marker = _shard_marker(event)
+        if pending is not None:
+          if marker == "continued":
+            skipping = True
+            stack.append(False)
+            pending = None
+            continue
+          writer.open_element(pending)
+          stack.append(False)
+          pending = None
+        kind, value = event
+        if marker == "continues":
+          stack[-1] = True
+        elif kind == "open":
+          skipping = False
+          pending = value  # type: ignore
+        elif kind == "close":
+          skipping = False
+          if not stack.pop():
+            writer.close()
+        elif kind == "leaf" and local_name(value.tag) in UNIT_TAGS:  # type: ignore
+          skipping = False
+          writer.leaf(value)  # type: ignore
+        elif not skipping:
+          writer.write_event(kind, value)
@@ -0,0 +1,220 @@
+"""
+Checking targets against the size restrictions of their unit and groups.
+
+The `maxbytes`, `minbytes`, `maxwidth`, `minwidth`, `maxheight`, `minheight` and
+`size-unit` attributes of a `<group>` apply to everything inside it unless a nested
+`<group>` or the `<trans-unit>` itself overrides them. They are resolved once per
+group while streaming the document, then targets are checked in batches.
+
+Byte restrictions are checked in each of the requested encodings. Width and height
+can only be measured for the text based size units: "char", "byte" (in the first
+encoding), "glyph" (characters that aren't combining marks), "col" (characters) and
+"row" (lines). Heights are measured in lines for all of them. Restrictions in other
+units, like the default "pixel", need font metrics and are not checked.
+"""
+
+from __future__ import annotations
+from codecs import lookup
+from collections.abc import Sequence
+from typing import Any, NamedTuple, Optional
+from unicodedata import combining
+from xliff.constants import SIZE_UNIT
+from xliff.streaming import XmlSource, element_text, iterparse, local_name, release
+import lxml.etree as let
+
+LIMITS = ("maxbytes", "minbytes", "maxwidth", "minwidth", "maxheight", "minheight")
+"""
+The size restriction attributes, which are also their xml names.
+"""
+_ATTRIBUTES = frozenset((*LIMITS, "size-unit"))
+# Encodings where ascii text takes one byte per character, by their codecs name
+_ASCII_COMPATIBLE = frozenset(("utf-8", "ascii", "iso8859-1", "cp1252"))
+_TEXT_UNITS = frozenset(
+  (SIZE_UNIT.BYTE, SIZE_UNIT.CHAR, SIZE_UNIT.COL, SIZE_UNIT.GLYPH, SIZE_UNIT.ROW)
+)
+
+
+class Violation(NamedTuple):
+  """A target not respecting a size restriction."""
+
+  file: Optional[str]
+  """The `original` of the file of the unit"""
+  id: Optional[str]
+  """The `id` of the unit"""
+  constraint: str
+  """The restriction, one of `LIMITS`, or "encoding" if the target can't be encoded"""
+  limit: Optional[int]
+  """The value of the restriction"""
+  actual: Optional[int]
+  """The size of the target"""
+  encoding: Optional[str] = None
+  """The encoding of byte restrictions"""
+
+
+# The resolved attributes, by name, with the size unit under "size_unit"
+type Limits = dict[str, Any]
+
+
+def _resolve(element: let._Element, inherited: Limits) -> Limits:
+  """The limits of `element`, overriding the ones inherited from its ancestors."""
+  attrib = element.attrib
+  if _ATTRIBUTES.isdisjoint(attrib.keys()):
+    return inherited
+  limits = None
+  for name in LIMITS:
+    value = attrib.get(name)
+    if value is not None:
+      if limits is None:
+        limits = dict(inherited)
+      try:
+        limits[name] = int(value)
+      except ValueError:
+        limits.pop(name, None)
+  value = attrib.get("size-unit")
+  if value is not None:
+    if limits is None:
+      limits = dict(inherited)
+    limits["size_unit"] = SIZE_UNIT(value) if value in SIZE_UNIT else value
+  return inherited if limits is None else limits
+
+
+def _glyphs(line: str) -> int:
+  if line.isascii():
+    return len(line)
+  return sum(not combining(char) for char in line)
+
+
+def _width(text: str, unit: SIZE_UNIT | str, encoding: str) -> Optional[int]:
+  lines = text.splitlines() or [""]
+  if unit is SIZE_UNIT.CHAR or unit is SIZE_UNIT.COL:
+    return max(map(len, lines))
+  if unit is SIZE_UNIT.GLYPH:
+    return max(map(_glyphs, lines))
+  if unit is SIZE_UNIT.BYTE:
+    try:
+      return max(len(line.encode(encoding)) for line in lines)
+    except UnicodeEncodeError:
+      return None
+  return None
+
+
+def _byte_lengths(texts: list[str], encoding: str) -> list[Optional[int]]:
+  """The encoded length of every text, `None` for those that can't be encoded."""
+  if lookup(encoding).name in _ASCII_COMPATIBLE:
+    try:
+      return [
+        len(text) if text.isascii() else len(text.encode(encoding)) for text in texts
+      ]
+    except UnicodeEncodeError:
+      pass
+  lengths: list[Optional[int]] = []
+  for text in texts:
+    try:
+      lengths.append(len(text.encode(encoding)))
+    except UnicodeEncodeError:
+      lengths.append(None)
+  return lengths
+
+
+def _check_batch(
+  batch: list[tuple[Optional[str], Optional[str], str, Limits]],
+  encodings: Sequence[str],
+  violations: list[Violation],
+) -> None:
+  texts = [text for _, _, text, _ in batch]
+  if any("maxbytes" in limits or "minbytes" in limits for *_, limits in batch):
+    lengths = [_byte_lengths(texts, encoding) for encoding in encodings]
+  else:
+    lengths = []
+  for position, (file, id, text, limits) in enumerate(batch):
+    if "maxbytes" in limits or "minbytes" in limits:
+      for encoding, encoded in zip(encodings, lengths):
+        size = encoded[position]
+        if size is None:
+          violations.append(Violation(file, id, "encoding", None, None, encoding))
+          continue
+        maximum, minimum = limits.get("maxbytes"), limits.get("minbytes")
+        if maximum is not None and size > maximum:
+          violations.append(Violation(file, id, "maxbytes", maximum, size, encoding))
+        if minimum is not None and size < minimum:
+          violations.append(Violation(file, id, "minbytes", minimum, size, encoding))
+    unit = limits.get("size_unit")
+    if unit not in _TEXT_UNITS:
+      continue
+    if unit is not SIZE_UNIT.ROW and ("maxwidth" in limits or "minwidth" in limits):
+      width = _width(text, unit, encodings[0])
+      if width is not None:
+        for name, exceeded in (
+          ("maxwidth", width.__gt__),
+          ("minwidth", width.__lt__),
+        ):
+          if name in limits and exceeded(limits[name]):
+            violations.append(Violation(file, id, name, limits[name], width))
+    if "maxheight" in limits or "minheight" in limits:
+      height = len(text.splitlines()) or 1
+      for name, exceeded in (
+        ("maxheight", height.__gt__),
+        ("minheight", height.__lt__),
+      ):
+        if name in limits and exceeded(limits[name]):
+          violations.append(Violation(file, id, name, limits[name], height))
+
+
+def check_sizes(
+  source: XmlSource,
+  *,
+  encodings: Sequence[str] = ("utf-8",),
+  batch_size: int = 4096,
+) -> list[Violation]:
+  """
+  Checks every `<target>` of a document against its size restrictions.
+
+  Units without a target or without any restriction are skipped. The text of inline
+  elements is part of the target's text.
+
+  Args:
+      source (XmlSource): The document to check.
+      encodings (Sequence[str]): The encodings to check byte restrictions in, the
+      first one is also used for widths in bytes. Defaults to UTF-8.
+      batch_size (int): The number of targets checked at once.
+
+  Returns:
+      list[Violation]: The violations, in document order.
+
+  Raises:
+      ValueError: If `encodings` is empty or `batch_size` is lower than 1.
+  """
+  if not encodings:
+    raise ValueError("At least one encoding is required")
+  if batch_size < 1:
+    raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+  violations: list[Violation] = []
+  batch: list[tuple[Optional[str], Optional[str], str, Limits]] = []
+  original: Optional[str] = None
+  stack: list[Limits] = [{}]
+  for event, element in iterparse(source, tag=("{*}file", "{*}group", "{*}trans-unit")):
+    name = local_name(element.tag)
+    if name == "file":
+      if event == "start":
+        original = element.get("original")
+      else:
+        release(element)
+    elif name == "group":
+      if event == "start":
+        stack.append(_resolve(element, stack[-1]))
+      else:
+        stack.pop()
+        release(element)
+    elif event == "end":
+      limits = _resolve(element, stack[-1])
+      if limits:
+        target = element.find("{*}target")
+        if target is not None:
+          batch.append((original, element.get("id"), element_text(target), limits))
+          if len(batch) >= batch_size:
+            _check_batch(batch, encodings, violations)
+            batch.clear()
+      release(element)
+  if batch:
+    _check_batch(batch, encodings, violations)
+  return violations
@@ -0,0 +1,544 @@
+from __future__ import annotations
+from collections.abc import Iterable, Iterator, Mapping
+from copy import deepcopy
+from io import BytesIO
+from os import PathLike, fspath
+from typing import IO, Any, Literal, Optional
+from xliff.named_groups import Context, ContextGroup, Count, CountGroup, Prop, PropGroup
+from xliff.objects import BaseXliffElement
+from xliff.policy import source_retention
+from xliff.structural import Group
+from xliff.tracing import span
+import lxml.etree as let
+import os
+
+type XmlSource = str | bytes | PathLike[str] | PathLike[bytes] | IO[bytes]
+
+ELEMENT_CLASSES: dict[str, type[BaseXliffElement]] = {
+  cls._xml_tag: cls
+  for cls in (Count, CountGroup, Context, ContextGroup, Prop, PropGroup, Group)
+}
+"""
+Maps each xml tag to the class that represents it.
+"""
+XLIFF_NAMESPACE = "urn:oasis:names:tc:xliff:document:1.2"
+"""
+The namespace of XLIFF 1.2 documents.
+"""
+
+_XLIFF_PREFIX = f"{{{XLIFF_NAMESPACE}}}"
+
+
+def local_name(tag: Any) -> str:
+  """
+  Returns the tag of an element without its namespace.
+
+  Args:
+      tag (Any): The tag of an element. Comments and processing instructions have a
+      function as their tag and will return an empty string.
+
+  Returns:
+      str: The local part of the tag.
+  """
+  if not isinstance(tag, str):
+    return ""
+  if tag[0] == "{":
+    return tag.rpartition("}")[2]
+  return tag
+
+
+def iterparse(
+  source: XmlSource,
+  *,
+  events: Iterable[Literal["start", "end", "comment", "pi"]] = ("start", "end"),
+  tag: Optional[str | Iterable[str]] = None,
+) -> Iterator[tuple[str, let._Element]]:
+  """
+  Incrementally parses an XLIFF document, yielding `(event, element)` tuples.
+
+  A thin wrapper around `lxml.etree.iterparse` with settings suitable for large
+  documents. It is the entry point used by all the streaming APIs of the library.
+
+  Args:
+      source (XmlSource): A path, a file-like object opened in binary mode or the
+      document itself as `bytes`.
+      events (Iterable["start" | "end" | "comment" | "pi"]): The parse events to
+      report. Defaults to start and end.
+      tag (Optional[str | Iterable[str]]): Only report events for these tags.
+
+  Returns:
+      Iterator[tuple[str, lxml.etree._Element]]: The parse events.
+  """
+  if isinstance(source, bytes):
+    source = BytesIO(source)
+  return let.iterparse(source, events=tuple(events), tag=tag, huge_tree=True)
+
+
+def release(element: let._Element) -> None:
+  """
+  Frees an element that was fully processed while streaming.
+
+  Clears the element and removes it, and any already processed previous sibling,
+  from its parent so that memory use stays independent of the document size.
+
+  Args:
+      element (lxml.etree._Element): The element to release.
+  """
+  element.clear(keep_tail=True)
+  parent = element.getparent()
+  if parent is not None:
+    while element.getprevious() is not None:
+      del parent[0]
+
+
+def element_text(element: let._Element) -> str:
+  """
+  Returns the text of an element, including the text of its descendants.
+
+  Args:
+      element (lxml.etree._Element): The element, like a `<source>` or `<target>`.
+
+  Returns:
+      str: Its text and the text of its inline elements, empty if it has none.
+  """
+  if len(element):
+    return "".join(element.itertext())
+  return element.text or ""
+
+
+def strip_xliff_namespace(element: let._Element) -> let._Element:
+  """
+  Removes the XLIFF namespace from the tags of an element and its descendants.
+
+  The classes of the library expect tags without namespace, as written by
+  `to_element`. Tags in other namespaces are left as is.
+
+  Args:
+      element (lxml.etree._Element): The element to modify in place.
+
+  Returns:
+      lxml.etree._Element: The element itself.
+  """
+  for descendant in element.iter():
+    tag = descendant.tag
+    if isinstance(tag, str) and tag.startswith(_XLIFF_PREFIX):
+      descendant.tag = tag[len(_XLIFF_PREFIX) :]
+  return element
+
+
+def _element_class(tag: Any) -> Optional[type[BaseXliffElement]]:
+  """The class built for a tag, without or in the XLIFF namespace."""
+  if isinstance(tag, str) and tag.startswith(_XLIFF_PREFIX):
+    tag = tag[len(_XLIFF_PREFIX) :]
+  cls = ELEMENT_CLASSES.get(tag)
+  # A group can't be built, only its content can
+  return None if cls is Group else cls
+
+
+def materialize(element: let._Element) -> BaseXliffElement | let._Element:
+  """
+  Builds the library object representing `element`.
+
+  Elements in the XLIFF namespace are built from a copy without namespace, see
+  `strip_xliff_namespace`, so that the document is left untouched.
+
+  Args:
+      element (lxml.etree._Element): The element to convert.
+
+  Returns:
+      BaseXliffElement | lxml.etree._Element: An instance of the class registered for
+      the element's tag in `ELEMENT_CLASSES` or the element itself if there is none.
+      `<group>` elements are always returned as is as `Group` can't be built.
+  """
+  cls = _element_class(element.tag)
+  if cls is None:
+    return element
+  if element.tag != cls._xml_tag:
+    element = strip_xliff_namespace(deepcopy(element))
+  return cls(source_element=element)
+
+
+def _size(source: XmlSource) -> Optional[int]:
+  if isinstance(source, bytes):
+    return len(source)
+  if isinstance(source, (str, PathLike)):
+    return os.path.getsize(fspath(source))
+  if not getattr(source, "seekable", lambda: False)():
+    return None
+  # What remains to be read from the current position
+  position = source.tell()
+  size = source.seek(0, os.SEEK_END) - position
+  source.seek(position)
+  return size
+
+
+def _build(element: let._Element, objects: list[BaseXliffElement]) -> None:
+  for child in element.iterchildren():
+    cls = _element_class(child.tag)
+    if cls is None:
+      # A group, or an element the library doesn't model, is looked into instead
+      _build(child, objects)
+    else:
+      objects.append(cls(source_element=strip_xliff_namespace(child)))
+
+
+def parse_document(source: XmlSource) -> let._Element:
+  """
+  Parses a whole document, the first phase of `load`.
+
+  Args:
+      source (XmlSource): The document to read.
+
+  Returns:
+      let._Element: The root element of the document.
+  """
+  parsed = BytesIO(source) if isinstance(source, bytes) else source
+  return let.parse(parsed, let.XMLParser(huge_tree=True)).getroot()
+
+
+def construct(root: let._Element) -> list[BaseXliffElement]:
+  """
+  Builds the objects of the elements the library models, the second phase of
+  `load`.
+
+  Args:
+      root (let._Element): The root element of a document, see `parse_document`.
+
+  Returns:
+      list[BaseXliffElement]: The objects, in document order.
+  """
+  cls = _element_class(root.tag)
+  if cls is not None:
+    return [cls(source_element=strip_xliff_namespace(root))]
+  objects: list[BaseXliffElement] = []
+  _build(root, objects)
+  return objects
+
+
+def load(
+  source: XmlSource, *, retain_source: Optional[bool] = None
+) -> list[BaseXliffElement]:
+  """
+  Parses a document and builds the objects of the elements the library models.
+
+  Only the outermost elements with a class in `ELEMENT_CLASSES` are built, each
+  building its descendants. Documents in the XLIFF namespace are supported, the
+  namespace being removed from the elements built, see `strip_xliff_namespace`.
+  The document is traced as a `load` span made of a
+  `parse` and a `construct` span, see `xliff.tracing`.
+
+  Args:
+      source (XmlSource): The document to read.
+      retain_source (Optional[bool]): Whether the objects keep their source
+      element, and with it the document. Defaults to the choice active, see
+      `xliff.policy.source_retention`.
+
+  Returns:
+      list[BaseXliffElement]: The objects, in document order.
+  """
+  with span("load"):
+    with span("parse") as current:
+      if current.recording:
+        current.set("bytes", _size(source))
+      root = parse_document(source)
+      if current.recording:
+        current.set("elements", sum(1 for _ in root.iter()))
+    with span("construct") as current:
+      if retain_source is None:
+        objects = construct(root)
+      else:
+        with source_retention(retain_source):
+          objects = construct(root)
+      if current.recording:
+        current.set("objects", len(objects))
+  return objects
+
+
+CONTAINER_TAGS = frozenset(("xliff", "file", "body", "group"))
+"""
+The elements `iter_sections` opens and closes instead of reporting them as a whole.
+"""
+UNIT_TAGS = frozenset(("trans-unit", "bin-unit"))
+"""
+The elements holding translatable content.
+"""
+
+type SectionEvent = (
+  tuple[Literal["open", "leaf", "close"], let._Element] | tuple[Literal["text"], str]
+)
+
+
+def iter_sections(
+  source: XmlSource, *, containers: frozenset[str] = CONTAINER_TAGS
+) -> Iterator[SectionEvent]:
+  """
+  Iterates over a document as a flat sequence of sections.
+
+  Container elements (by default `<xliff>`, `<file>`, `<body>` and `<group>`) are
+  reported twice: once when they are opened, with their attributes, and once when
+  they are closed. Any other element directly inside a container (a `<trans-unit>`,
+  a `<header>`, a `<context-group>`, a comment...) is reported once as a complete
+  leaf. The text found between all of those is reported as is so that writing back
+  every event with an `XliffWriter` reproduces the document.
+
+  Events are `("open", element)`, `("leaf", element)`, `("close", element)` and
+  `("text", text)`. The text of an opened element and the tail of leaves and closed
+  elements are only reported through the text events.
+
+  Note:
+      Elements are released as soon as the iteration moves on, a leaf that must be
+      kept has to be copied.
+
+  Args:
+      source (XmlSource): The document to read.
+      containers (frozenset[str]): The tags of the elements to open and close.
+
+  Returns:
+      Iterator[SectionEvent]: The sections of the document, in document order.
+  """
+  depth = 0  # The depth inside the current leaf
+  pending_open: Optional[let._Element] = None
+  done: Optional[let._Element] = None  # Waiting for its tail to be parsed
+  for event, element in iterparse(source, events=("start", "end", "comment", "pi")):
+    if depth:
+      if event == "start":
+        depth += 1
+      elif event == "end":
+        depth -= 1
+        if not depth:
+          yield "leaf", element
+          done = element
+      continue
+    # From here, the event concerns a direct child of the innermost container or
+    # the end of that container, so the text before it has been fully parsed
+    if pending_open is not None:
+      yield "open", pending_open
+      if pending_open.text:
+        yield "text", pending_open.text
+      pending_open = None
+    if done is not None:
+      if done.tail:
+        yield "text", done.tail
+      release(done)
+      done = None
+    if event == "start":
+      if local_name(element.tag) in containers:
+        pending_open = element
+      else:
+        depth = 1
+    elif event == "end":
+      yield "close", element
+      done = element
+    else:
+      yield "leaf", element
+      done = element
+
+
+_XML_PREFIXES = {"http://www.w3.org/XML/1998/namespace": "xml"}
+
+
+def _escape_text(text: str) -> str:
+  if "&" in text:
+    text = text.replace("&", "&amp;")
+  if "<" in text:
+    text = text.replace("<", "&lt;")
+  if ">" in text:
+    text = text.replace(">", "&gt;")
+  if "\r" in text:
+    text = text.replace("\r", "&#13;")
+  return text
+
+
+def _escape_attribute(value: str) -> str:
+  value = _escape_text(value)
+  for char, entity in (('"', "&quot;"), ("\n", "&#10;"), ("\t", "&#9;")):
+    if char in value:
+      value = value.replace(char, entity)
+  return value
+
+
+class XliffWriter:
+  """
+  Writes a document incrementally, section by section.
+
+  It is the counterpart of `iter_sections`: elements can be opened and closed one at
+  a time while complete elements are written as a whole, so that a document of any
+  size can be written with a memory use independent of its size. The output is
+  identical to what `lxml` produces when serializing the whole document at once.
+
+  Namespace declarations are only written when they are not already in scope, even
+  for leaves that come from another document.
+
+  Use it as a context manager::
+
+    with XliffWriter("out.xlf") as writer:
+      for event, value in iter_sections("in.xlf"):
+        writer.write_event(event, value)
+  """
+
+  _file: IO[bytes]
+  _owns_file: bool
+  _stack: list[tuple[str, dict[Optional[str], str]]]
+  _tag_open: bool
+
+  __slots__ = ("_file", "_owns_file", "_stack", "_tag_open", "_output", "_declaration")
+
+  def __init__(
+    self,
+    output: str | PathLike[str] | PathLike[bytes] | IO[bytes],
+    *,
+    xml_declaration: bool | bytes = True,
+  ) -> None:
+    """
+    Creates a writer.
+
+    Args:
+        output (str | PathLike | IO[bytes]): The path of the file to write or a file
+        object opened in binary mode.
+        xml_declaration (bool | bytes): Whether to start the document with an xml
+        declaration, or the bytes to start it with, like the declaration of the
+        document being copied. The output is always encoded in UTF-8.
+    """
+    self._output = output
+    self._declaration = xml_declaration
+    self._stack = []
+    self._tag_open = False
+
+  def __enter__(self) -> XliffWriter:
+    if isinstance(self._output, (str, PathLike)):
+      self._file = open(self._output, "wb")
+      self._owns_file = True
+    else:
+      self._file = self._output
+      self._owns_file = False
+    if isinstance(self._declaration, bytes):
+      self._file.write(self._declaration)
+    elif self._declaration:
+      self._file.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+    return self
+
+  def __exit__(self, *exc_info: object) -> None:
+    if exc_info[0] is None:
+      while self._stack:
+        self.close()
+    if self._owns_file:
+      self._file.close()
+
+  @property
+  def depth(self) -> int:
+    """The number of elements currently open."""
+    return len(self._stack)
+
+  def _end_start_tag(self) -> None:
+    if self._tag_open:
+      self._file.write(b">")
+      self._tag_open = False
+
+  def open(
+    self,
+    tag: str,
+    attrib: Optional[Mapping[str, str]] = None,
+    nsmap: Optional[Mapping[Optional[str], str]] = None,
+  ) -> None:
+    """
+    Opens an element.
+
+    Args:
+        tag (str): The tag of the element, in `{namespace}local` form if namespaced.
+        attrib (Optional[Mapping[str, str]]): The attributes of the element.
+        nsmap (Optional[Mapping[Optional[str], str]]): The namespaces in scope for the
+        element, only the ones not already in scope are declared.
+    """
+    self._end_start_tag()
+    scope = dict(self._stack[-1][1]) if self._stack else {}
+    declarations = []
+    for prefix, uri in (nsmap or {}).items():
+      if scope.get(prefix) != uri:
+        scope[prefix] = uri
+        name = "xmlns" if prefix is None else f"xmlns:{prefix}"
+        declarations.append(f' {name}="{_escape_attribute(uri)}"')
+    name = self._qualified_name(tag, scope, default=True)
+    parts = [f"<{name}", *declarations]
+    for key, value in (attrib or {}).items():
+      parts.append(
+        f' {self._qualified_name(key, scope, default=False)}="{_escape_attribute(value)}"'
+      )
+    self._file.write("".join(parts).encode())
+    self._tag_open = True
+    self._stack.append((name, scope))
+
+  @staticmethod
+  def _qualified_name(
+    tag: str, scope: Mapping[Optional[str], str], *, default: bool
+  ) -> str:
+    if tag[0] != "{":
+      return tag
+    uri, _, local = tag[1:].partition("}")
+    if uri in _XML_PREFIXES:
+      return f"{_XML_PREFIXES[uri]}:{local}"
+    if default and scope.get(None) == uri:
+      return local
+    for prefix, value in scope.items():
+      if value == uri and prefix is not None:
+        return f"{prefix}:{local}"
+    raise ValueError(f"Namespace {uri!r} is not declared")
+
+  def open_element(self, element: let._Element) -> None:
+    """Opens an element with the tag, attributes and namespaces of `element`."""
+    self.open(str(element.tag), dict(element.attrib), element.nsmap)
+
+  def text(self, text: str) -> None:
+    """Writes text content in the current element."""
+    self._end_start_tag()
+    self._file.write(_escape_text(text).encode())
+
+  def leaf(self, element: let._Element) -> None:
+    """
+    Writes a complete element, without its tail.
+
+    Args:
+        element (lxml.etree._Element): The element to write. Comments and processing
+        instructions are supported too.
+    """
+    self._end_start_tag()
+    data = let.tostring(element, encoding="UTF-8", with_tail=False)
+    if self._stack and isinstance(element.tag, str) and element.nsmap:
+      data = self._strip_declarations(data, self._stack[-1][1])
+    self._file.write(data)
+
+  @staticmethod
+  def _strip_declarations(data: bytes, scope: Mapping[Optional[str], str]) -> bytes:
+    """Removes the namespace declarations of `data`'s start tag that are in scope."""
+    end = data.index(b">")
+    start_tag = data[:end]
+    for prefix, uri in scope.items():
+      name = "xmlns" if prefix is None else f"xmlns:{prefix}"
+      start_tag = start_tag.replace(
+        f' {name}="{_escape_attribute(uri)}"'.encode(), b"", 1
+      )
+    return start_tag + data[end:]
+
+  def raw(self, data: bytes) -> None:
+    """Writes already serialized xml as is in the current element."""
+    self._end_start_tag()
+    self._file.write(data)
+
+  def close(self) -> None:
+    """Closes the innermost open element."""
+    name, _ = self._stack.pop()
+    if self._tag_open:
+      self._file.write(b"/>")
+      self._tag_open = False
+    else:
+      self._file.write(f"</{name}>".encode())
+
+  def write_event(self, event: str, value: Any) -> None:
+    """Writes an event as reported by `iter_sections`."""
+    if event == "text":
+      self.text(value)
+    elif event == "leaf":
+      self.leaf(value)
+    elif event == "open":
+      self.open_element(value)
+    else:
+      self.close()
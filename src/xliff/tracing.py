@@ -0,0 +1,258 @@
+"""
+Timing the phases of the work done on documents.
+
+`load`, `validate`, `to_element` and `to_bytes` report what they do as spans:
+`load`, made of `parse` and `construct`, then `validate` and `serialize`. Spans are
+nested like the calls, carry attributes like the size of the document or the
+number of elements, and are passed to the active `Tracer` when they end.
+
+The default tracer ignores spans, which are then not even created. A
+`JsonLinesTracer` writes them to a local file, any other destination can be
+reached by subclassing `Tracer`.
+
+A phase calling itself, like `to_element` for the children of an object, is
+reported once, by its outermost call.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from itertools import count
+from os import PathLike
+from typing import IO, Any, ClassVar, Optional
+import json
+import threading
+import time
+
+
+class Span:
+  """A phase of the work done on a document, with its duration and attributes."""
+
+  name: str
+  """The name of the phase"""
+  attributes: dict[str, Any]
+  """What the phase worked on, like the size of the document"""
+  span_id: int
+  """A number identifying the span in the process"""
+  parent_id: Optional[int]
+  """The id of the span this one is part of, if any"""
+  trace_id: int
+  """The id of the outermost span this one is part of, its own id if none"""
+  start: float
+  """When the span started, in seconds since the epoch"""
+  duration: Optional[float]
+  """How long the span lasted in seconds, None until it ends"""
+  error: Optional[str]
+  """The name of the exception that ended the span, if any"""
+
+  recording: ClassVar[bool] = True
+  """Whether the span is reported, false for the span used when not tracing"""
+
+  __slots__ = (
+    "name",
+    "attributes",
+    "span_id",
+    "parent_id",
+    "trace_id",
+    "start",
+    "duration",
+    "error",
+    "_tracer",
+    "_start_ns",
+    "_token",
+  )
+
+  def __init__(
+    self,
+    name: str,
+    tracer: Tracer,
+    parent: Optional[Span] = None,
+    attributes: Optional[dict[str, Any]] = None,
+  ) -> None:
+    self.name = name
+    self.attributes = {} if attributes is None else attributes
+    self.span_id = next(_ids)
+    self.parent_id = None if parent is None else parent.span_id
+    self.trace_id = self.span_id if parent is None else parent.trace_id
+    self.start = time.time()
+    self.duration = None
+    self.error = None
+    self._tracer = tracer
+    self._start_ns = time.perf_counter_ns()
+    self._token: Optional[Token] = None
+
+  def set(self, key: str, value: Any) -> None:
+    """Sets an attribute of the span."""
+    self.attributes[key] = value
+
+  def __enter__(self) -> Span:
+    self._token = _current_span.set(self)
+    return self
+
+  def __exit__(self, exc_type: Optional[type], *_: object) -> None:
+    self.duration = (time.perf_counter_ns() - self._start_ns) / 1e9
+    if exc_type is not None:
+      self.error = exc_type.__name__
+    _current_span.reset(self._token)  # type: ignore
+    self._tracer.export(self)
+
+  def to_dict(self) -> dict[str, Any]:
+    """The span as a dict of json compatible values."""
+    return {
+      "name": self.name,
+      "trace_id": self.trace_id,
+      "span_id": self.span_id,
+      "parent_id": self.parent_id,
+      "start": self.start,
+      "duration": self.duration,
+      "attributes": self.attributes,
+      "error": self.error,
+    }
+
+
+class _NoSpan:
+  """Stands for a span when nothing is traced, ignoring everything."""
+
+  recording = False
+  __slots__ = ()
+
+  def set(self, key: str, value: Any) -> None:
+    pass
+
+  def __enter__(self) -> _NoSpan:
+    return self
+
+  def __exit__(self, *_: object) -> None:
+    pass
+
+
+class Tracer:
+  """
+  Receives the spans of the library when they end.
+
+  This tracer ignores them and is the default one. Subclasses set `recording` to
+  True and override `export`.
+  """
+
+  recording: ClassVar[bool] = False
+  """Whether spans are created and exported"""
+
+  def export(self, span: Span) -> None:
+    """
+    Called with every span that ended, in the thread that ran it.
+
+    Args:
+        span (Span): The span, whose duration is set.
+    """
+
+
+class JsonLinesTracer(Tracer):
+  """Writes every span as a line of json, see `Span.to_dict`."""
+
+  recording = True
+
+  def __init__(self, output: str | PathLike[str] | IO[str]) -> None:
+    """
+    Creates a tracer writing to a file.
+
+    Args:
+        output (str | PathLike[str] | IO[str]): The path of the file, which spans are
+        appended to, or a file-like object opened in text mode, which is not
+        closed by `close`.
+    """
+    if isinstance(output, (str, PathLike)):
+      self._file: IO[str] = open(output, "a", encoding="utf-8")
+      self._owned = True
+    else:
+      self._file = output
+      self._owned = False
+    self._lock = threading.Lock()
+
+  def export(self, span: Span) -> None:
+    line = json.dumps(span.to_dict(), default=str)
+    with self._lock:
+      self._file.write(line + "\n")
+
+  def close(self) -> None:
+    """Flushes the spans written, closing the file if it was opened here."""
+    with self._lock:
+      if self._owned:
+        self._file.close()
+      else:
+        self._file.flush()
+
+  def __enter__(self) -> JsonLinesTracer:
+    return self
+
+  def __exit__(self, *exc_info: object) -> None:
+    self.close()
+
+
+_ids = count(1)
+_NO_SPAN = _NoSpan()
+_default_tracer = Tracer()
+_active_tracer: ContextVar[Optional[Tracer]] = ContextVar("xliff_tracer", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+  "xliff_current_span", default=None
+)
+
+
+def get_tracer() -> Tracer:
+  """Returns the tracer of the innermost `tracing` block, else the global one."""
+  active = _active_tracer.get()
+  return _default_tracer if active is None else active
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+  """
+  Sets the tracer used in every thread outside of `tracing` blocks.
+
+  Args:
+      tracer (Optional[Tracer]): The new global tracer, None for the default one
+      ignoring spans.
+  """
+  global _default_tracer
+  _default_tracer = Tracer() if tracer is None else tracer
+
+
+@contextmanager
+def tracing(tracer: Tracer) -> Iterator[Tracer]:
+  """
+  Uses a tracer for everything done inside the `with` block.
+
+  Blocks can be nested, the innermost one being used. The tracer is only used in
+  the current thread or task, and in the threads `to_bytes` starts.
+
+  Args:
+      tracer (Tracer): The tracer to use.
+
+  Returns:
+      Iterator[Tracer]: The tracer.
+  """
+  token = _active_tracer.set(tracer)
+  try:
+    yield tracer
+  finally:
+    _active_tracer.reset(token)
+
+
+def span(name: str, **attributes: Any) -> Span | _NoSpan:
+  """
+  Starts a span, to use as a context manager ending it.
+
+  Args:
+      name (str): The name of the phase.
+      **attributes (Any): The first attributes of the span.
+
+  Returns:
+      Span | _NoSpan: The span, or an object ignoring everything if the tracer
+      doesn't record spans or if the phase is already running.
+  """
+  tracer = get_tracer()
+  if not tracer.recording:
+    return _NO_SPAN
+  parent = _current_span.get()
+  if parent is not None and parent.name == name:
+    return _NO_SPAN
+  return Span(name, tracer, parent, attributes)
@@ -0,0 +1,481 @@
+"""
+Validating large trees and documents in parallel processes.
+
+Validation problems are reported as `ErrorRecord` tuples instead of exceptions. They
+only hold strings and plain values, so they are cheap to send between processes
+and to keep around, and they carry the path of the object that failed.
+
+Paths are made of the xml tags of the objects from the root, each followed by its
+position among the siblings with the same tag, starting at 1, like
+`context-group[2]/context[1]`. The roots given to `collect_errors` and
+`validate_parallel` are siblings of each other.
+
+Both the trees and the documents are split into chunks of siblings validated in
+worker processes, the results being merged in document order. They are the same
+as the ones of the serial path.
+
+`iter_document_errors` and `is_valid_document` validate a document without
+building any object, applying the `_validators` of each class to the attributes
+and text of the elements as they are parsed.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from enum import Enum
+from functools import partial
+from multiprocessing import Pool
+from os import PathLike
+from typing import Any, NamedTuple, Optional
+from warnings import catch_warnings, simplefilter
+from xliff.errors import ValidationIssue
+from xliff.helpers import is_valid_value, try_convert_to_boolean, try_convert_to_enum
+from xliff.objects import BaseXliffElement
+from xliff.streaming import (
+  ELEMENT_CLASSES,
+  XmlSource,
+  iter_sections,
+  iterparse,
+  local_name,
+  release,
+)
+import lxml.etree as let
+
+# Plain values are kept as is, anything else is stored as its repr
+_PLAIN = (str, int, float, bool, type(None), Enum)
+
+
+class ErrorRecord(NamedTuple):
+  """A validation problem, detached from the object it was found on."""
+
+  path: str
+  """The path of the object that failed validation"""
+  tag: str
+  """The xml tag of the object"""
+  attribute: str
+  """The attribute that failed validation"""
+  value: Any
+  """The invalid value, or its repr if it is not a plain value"""
+  expected: str
+  """The name of the expected type, types or enum"""
+  kind: str
+  """The kind of error the validator raised, `TypeError` or `ValueError`, or the
+  libxml2 error type for the schema"""
+  reason: str
+  """The message of the validator"""
+
+  @property
+  def message(self) -> str:
+    """A readable description of the problem, built when asked for."""
+    return (
+      f"{self.path}: {self.kind} for attribute {self.attribute!r} with value"
+      f" {self.value!r}, expected {self.expected}. {self.reason}"
+    )
+
+
+def _name(expected: Any) -> str:
+  if isinstance(expected, tuple):
+    return " | ".join(map(_name, expected))
+  return getattr(expected, "__name__", str(expected))
+
+
+def _record(path: str, issue: ValidationIssue, tag: str = "") -> ErrorRecord:
+  value, error = issue.value, issue.exception
+  return ErrorRecord(
+    path,
+    tag or issue.source._xml_tag,  # type: ignore
+    issue.attribute,
+    value if isinstance(value, _PLAIN) else repr(value),
+    _name(issue.expected),
+    type(error).__name__,
+    str(error),
+  )
+
+
+def _records(path: str, issues: Iterable[ValidationIssue]) -> Iterator[ErrorRecord]:
+  for issue in issues:
+    yield _record(path, issue)
+
+
+def _positions(
+  nodes: Iterable[BaseXliffElement], prefix: str = ""
+) -> Iterator[tuple[str, BaseXliffElement]]:
+  """Pairs every node with its path, `prefix` being the path of their parent."""
+  seen: dict[str, int] = {}
+  for node in nodes:
+    tag = node._xml_tag
+    seen[tag] = position = seen.get(tag, 0) + 1
+    yield f"{prefix}{tag}[{position}]", node
+
+
+def _has_default_children(node: BaseXliffElement) -> bool:
+  return type(node)._children_issues is BaseXliffElement._children_issues
+
+
+def _collect(path: str, node: BaseXliffElement, records: list[ErrorRecord]) -> None:
+  """Validates `node` and its descendants like `validate` does, in the same order."""
+  records.extend(_records(path, node._attribute_issues()))
+  if not _has_default_children(node):
+    # Classes validating their children themselves report them as their own
+    records.extend(_records(path, node._children_issues()))
+    return
+  for child_path, child in _positions(node._children, f"{path}/"):
+    _collect(child_path, child, records)
+
+
+def _collect_chunk(items: Sequence[tuple[str, BaseXliffElement]]) -> list[ErrorRecord]:
+  records: list[ErrorRecord] = []
+  for path, node in items:
+    _collect(path, node, records)
+  return records
+
+
+def collect_errors(
+  roots: BaseXliffElement | Iterable[BaseXliffElement],
+) -> list[ErrorRecord]:
+  """
+  Validates objects and all their descendants in the current process.
+
+  This is the same validation as `validate(recurse=True, gather_all_errors=True)`,
+  reporting the same problems in the same order.
+
+  Args:
+      roots (BaseXliffElement | Iterable[BaseXliffElement]): The objects to validate.
+
+  Returns:
+      list[ErrorRecord]: The problems found, empty if everything is valid.
+  """
+  if isinstance(roots, BaseXliffElement):
+    roots = (roots,)
+  return _collect_chunk(list(_positions(roots)))
+
+
+def _run_chunks(
+  chunks: list[Any], function: Any, workers: Optional[int]
+) -> list[ErrorRecord]:
+  records: list[ErrorRecord] = []
+  if workers == 1 or len(chunks) < 2:
+    for chunk in chunks:
+      records.extend(function(chunk))
+    return records
+  with Pool(workers) as pool:
+    for chunk_records in pool.imap(function, chunks):
+      records.extend(chunk_records)
+  return records
+
+
+def _chunked(items: list[Any], chunk_size: int) -> list[list[Any]]:
+  return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def validate_parallel(
+  roots: BaseXliffElement | Iterable[BaseXliffElement],
+  *,
+  workers: Optional[int] = None,
+  chunk_size: Optional[int] = None,
+) -> list[ErrorRecord]:
+  """
+  Validates objects and all their descendants in worker processes.
+
+  A single root is split into its children, several roots are split between them.
+  Chunks of those subtrees are pickled, without their source elements, and
+  validated by the workers.
+
+  Args:
+      roots (BaseXliffElement | Iterable[BaseXliffElement]): The objects to validate.
+      workers (Optional[int]): The number of worker processes, one per CPU by
+      default. With 1, everything is validated in the current process.
+      chunk_size (Optional[int]): The number of subtrees sent to a worker at once.
+      Defaults to splitting the subtrees in 4 chunks per worker.
+
+  Returns:
+      list[ErrorRecord]: The problems found, the same as `collect_errors`.
+
+  Raises:
+      ValueError: If `workers` or `chunk_size` is lower than 1.
+  """
+  if workers is not None and workers < 1:
+    raise ValueError(f"workers must be at least 1, got {workers}")
+  if chunk_size is not None and chunk_size < 1:
+    raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+  records: list[ErrorRecord] = []
+  if isinstance(roots, BaseXliffElement):
+    ((path, root),) = _positions((roots,))
+    if not _has_default_children(root):
+      return collect_errors(root)
+    records.extend(_records(path, root._attribute_issues()))
+    items = list(_positions(root._children, f"{path}/"))
+  else:
+    items = list(_positions(roots))
+  if not items:
+    return records
+  if chunk_size is None:
+    chunk_size = -(-len(items) // ((workers or _cpu_count()) * 4))
+  records.extend(_run_chunks(_chunked(items, chunk_size), _collect_chunk, workers))
+  return records
+
+
+def _cpu_count() -> int:
+  from os import process_cpu_count
+
+  return process_cpu_count() or 1
+
+
+# Group can't be built from an element yet, the objects inside are validated instead
+_MATERIALIZED = {
+  tag: cls for tag, cls in ELEMENT_CLASSES.items() if tag not in ("group",)
+}
+
+
+def _collect_sections(chunk: Sequence[tuple[str, bytes]]) -> list[ErrorRecord]:
+  """Validates the objects found in serialized sections, with their path."""
+  records: list[ErrorRecord] = []
+  with catch_warnings():
+    # Objects warn about invalid values when built, they are reported as records
+    simplefilter("ignore")
+    for path, data in chunk:
+      element = let.fromstring(data)
+      for descendant in element.iter():
+        if isinstance(descendant.tag, str):
+          descendant.tag = local_name(descendant.tag)
+      _collect_element(path, element, records)
+  return records
+
+
+def _collect_element(path: str, element: let._Element, records: list) -> None:
+  cls = _MATERIALIZED.get(local_name(element.tag))
+  if cls is not None:
+    _collect(path, cls(source_element=element), records)
+    return
+  seen: dict[str, int] = {}
+  for child in element:
+    if not isinstance(child.tag, str):
+      continue
+    seen[child.tag] = position = seen.get(child.tag, 0) + 1
+    _collect_element(f"{path}/{child.tag}[{position}]", child, records)
+
+
+def _iter_sections(source: XmlSource) -> Iterator[tuple[str, bytes]]:
+  """The path and serialized form of every leaf section of a document."""
+  # The path of every open container and the positions of the tags inside it
+  stack: list[tuple[str, dict[str, int]]] = [("", {})]
+  for event, value in iter_sections(source):
+    if event == "text":
+      continue
+    if event == "close":
+      stack.pop()
+      continue
+    tag = local_name(value.tag)  # type: ignore
+    if not tag:  # Comments and processing instructions
+      continue
+    prefix, seen = stack[-1]
+    seen[tag] = position = seen.get(tag, 0) + 1
+    path = f"{prefix}{tag}[{position}]"
+    if event == "open":
+      stack.append((f"{path}/", {}))
+    else:
+      yield path, let.tostring(value, with_tail=False)  # type: ignore
+
+
+def validate_stream(
+  source: XmlSource,
+  *,
+  workers: Optional[int] = None,
+  chunk_size: int = 256,
+) -> list[ErrorRecord]:
+  """
+  Validates the objects of a document in worker processes, in streaming mode.
+
+  The document is read once and its sections (units, context groups...) are sent
+  to the workers in chunks, as serialized xml. Every `<count-group>`,
+  `<context-group>`, `<prop-group>` and any standalone `<count>`, `<context>` or
+  `<prop>` is built and validated. Namespaces are ignored, and paths start at the
+  root element of the document.
+
+  Args:
+      source (XmlSource): The document to validate.
+      workers (Optional[int]): The number of worker processes, one per CPU by
+      default. With 1, everything is validated in the current process.
+      chunk_size (int): The number of sections sent to a worker at once.
+
+  Returns:
+      list[ErrorRecord]: The problems found, in document order.
+
+  Raises:
+      ValueError: If `workers` or `chunk_size` is lower than 1.
+  """
+  if workers is not None and workers < 1:
+    raise ValueError(f"workers must be at least 1, got {workers}")
+  if chunk_size < 1:
+    raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+  if workers == 1:
+    records: list[ErrorRecord] = []
+    chunk: list[tuple[str, bytes]] = []
+    for section in _iter_sections(source):
+      chunk.append(section)
+      if len(chunk) >= chunk_size:
+        records.extend(_collect_sections(chunk))
+        chunk.clear()
+    records.extend(_collect_sections(chunk))
+    return records
+  records = []
+  with Pool(workers) as pool:
+    for chunk_records in pool.imap(
+      _collect_sections, _iter_chunks(_iter_sections(source), chunk_size)
+    ):
+      records.extend(chunk_records)
+  return records
+
+
+def _iter_chunks(
+  items: Iterator[tuple[str, bytes]], chunk_size: int
+) -> Iterator[list[tuple[str, bytes]]]:
+  chunk: list[tuple[str, bytes]] = []
+  for item in items:
+    chunk.append(item)
+    if len(chunk) >= chunk_size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
+def _to_int(text: str) -> int | str:
+  # Invalid numbers are kept as text and rejected by the validator
+  try:
+    return int(text)
+  except ValueError:
+    return text
+
+
+def _converter(expected: Any) -> Callable[[str], Any]:
+  """How objects convert the text of an attribute with this expected type."""
+  if expected is bool:
+    return try_convert_to_boolean
+  if expected is int:
+    return _to_int
+  if isinstance(expected, type) and issubclass(expected, Enum):
+    return partial(try_convert_to_enum, enum=expected)
+  return str
+
+
+class _Rule(NamedTuple):
+  attribute: str
+  xml_name: Optional[str]
+  """The xml attribute holding the value, None for the text of the element"""
+  validator: partial[None]
+  convert: Callable[[str], Any]
+
+
+def _rules(cls: type[BaseXliffElement]) -> tuple[_Rule, ...]:
+  # Validated attributes that aren't xml attributes are the text of the element
+  return tuple(
+    _Rule(
+      attribute,
+      cls._xml_attribute_map.get(attribute),
+      validator,
+      _converter(validator.keywords["expected"]),
+    )
+    for attribute, validator in cls._validators.items()
+  )
+
+
+_RULES = {tag: _rules(cls) for tag, cls in _MATERIALIZED.items()}
+"""
+The rules applied to the elements of each tag by `iter_document_errors`.
+"""
+# Elements validating their text are checked once it is parsed, at their end
+_TEXT_TAGS = frozenset(
+  tag for tag, rules in _RULES.items() if any(rule.xml_name is None for rule in rules)
+)
+
+
+def _element_issues(
+  element: let._Element, rules: Sequence[_Rule]
+) -> Iterator[ValidationIssue]:
+  for attribute, xml_name, validator, convert in rules:
+    text = element.text if xml_name is None else element.get(xml_name)
+    value = None if text is None else convert(text)
+    if not is_valid_value(validator, value):
+      yield ValidationIssue(None, attribute, value, validator)
+
+
+def iter_document_errors(
+  source: XmlSource, *, schema_first: bool = False
+) -> Iterator[ErrorRecord]:
+  """
+  Validates a document as it is parsed, without building any object.
+
+  The elements with a class in `ELEMENT_CLASSES` are checked with the validators
+  of that class, after converting their attributes and text the way the class
+  does. The problems are the ones `validate_stream` finds, in the same order, and
+  memory use doesn't depend on the size of the document.
+
+  Note:
+      A `<count>` whose text isn't a number can't be built, here its value is
+      reported as a str that is not an int instead. `<group>` elements are not
+      validated.
+
+  Args:
+      source (XmlSource): The document to validate.
+      schema_first (bool): Whether to validate the document with the bundled XLIFF
+      schema first, see `xliff.schema`, the validators only running if it finds a
+      problem or the document mixes namespaces. The document is then read in
+      memory. Defaults to False.
+
+  Returns:
+      Iterator[ErrorRecord]: The problems found, in document order.
+  """
+  if schema_first:
+    # Imported here as xliff.schema itself depends on this module
+    from xliff.schema import _accepts
+
+    source = _read(source)
+    if _accepts(source):
+      return
+  # The path of every open element and the positions of the tags inside it
+  stack: list[tuple[str, dict[str, int]]] = [("", {})]
+  for event, element in iterparse(source, events=("start", "end")):
+    tag = local_name(element.tag)
+    rules = _RULES.get(tag)
+    if event == "start":
+      prefix, seen = stack[-1]
+      seen[tag] = position = seen.get(tag, 0) + 1
+      path = f"{prefix}{tag}[{position}]"
+      stack.append((f"{path}/", {}))
+      # Like with `validate`, elements are checked before their children
+      if rules is not None and tag not in _TEXT_TAGS:
+        for issue in _element_issues(element, rules):
+          yield _record(path, issue, tag)
+      continue
+    path = stack.pop()[0][:-1]
+    if rules is not None and tag in _TEXT_TAGS:
+      for issue in _element_issues(element, rules):
+        yield _record(path, issue, tag)
+    release(element)
+
+
+def is_valid_document(source: XmlSource, *, schema_first: bool = False) -> bool:
+  """
+  Tells whether a document is valid, without building any object.
+
+  Parsing stops at the first problem found, see `iter_document_errors`.
+
+  Args:
+      source (XmlSource): The document to validate.
+      schema_first (bool): Whether to validate the document with the bundled XLIFF
+      schema first, the validators only running if it finds a problem, as the
+      schema is stricter about some values, like numbers. Defaults to False.
+
+  Returns:
+      bool: True if no problem was found.
+  """
+  return next(iter_document_errors(source, schema_first=schema_first), None) is None
+
+
+def _read(source: XmlSource) -> bytes:
+  if isinstance(source, bytes):
+    return source
+  if isinstance(source, (str, PathLike)):
+    with open(source, "rb") as file:
+      return file.read()
+  return source.read()
@@ -0,0 +1,113 @@
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+from xliff import analysis
+from xliff.analysis import CONTEXT, IN_CONTEXT, NEW, REPETITION, analyze
+from xliff.constants import COUNT_TYPE, UNIT
+
+
+def document(*sources: str, original: str = "app.rc") -> bytes:
+  units = "".join(
+    f'<trans-unit id="{index}"><source>{source}</source></trans-unit>'
+    for index, source in enumerate(sources, 1)
+  )
+  return (
+    f'<xliff version="1.2"><file original="{original}" source-language="en">'
+    f"<body>{units}</body></file></xliff>"
+  ).encode()
+
+
+def counts(group) -> dict:
+  return {(count.count_type, count.unit): count.value for count in group.counts}
+
+
+class TestAnalyze(unittest.TestCase):
+  def test_classification(self) -> None:
+    first = document("Open file", "Save  it", "Close", "Save it", "Quit")
+    second = document("Open file", "Save it", "Close", original="other.rc")
+    with analyze([first, second], partitions=4) as analysis:
+      statuses = [status for _, _, status, _ in analysis.iter_units()]
+    self.assertEqual(
+      statuses,
+      [NEW, NEW, NEW, REPETITION, NEW, CONTEXT, CONTEXT, REPETITION],
+    )
+
+  def test_file_counts(self) -> None:
+    first = document("Open file", "Save it", "Open file")
+    second = document("Open file", original="other.rc")
+    with analyze([first, second]) as analysis:
+      self.assertEqual(
+        [file.original for file in analysis.files], ["app.rc", "other.rc"]
+      )
+      self.assertEqual(
+        counts(analysis.files[0].count_group()),
+        {
+          (COUNT_TYPE.TOTAL, UNIT.WORD): 6,
+          (COUNT_TYPE.REPETITION, UNIT.WORD): 2,
+          (IN_CONTEXT, UNIT.WORD): 0,
+          (COUNT_TYPE.TOTAL, UNIT.TRANS_UNIT): 3,
+        },
+      )
+      totals = counts(analysis.totals())
+      self.assertEqual(totals[(COUNT_TYPE.TOTAL, UNIT.WORD)], 8)
+      self.assertEqual(totals[(COUNT_TYPE.REPETITION, UNIT.WORD)], 4)
+
+  def test_unit_count_groups(self) -> None:
+    with analyze([document("One two", "One two")]) as analysis:
+      units = list(analysis.iter_units(name="stats"))
+    file, id, _, group = units[1]
+    self.assertEqual((file.original, id, group.name), ("app.rc", "2", "stats"))
+    self.assertEqual(counts(group)[(COUNT_TYPE.REPETITION, UNIT.WORD)], 2)
+    group.validate()
+
+  def test_partitions_do_not_change_results(self) -> None:
+    sources = [document(*(f"Segment {index % 7}" for index in range(50)))]
+    results = []
+    for partitions in (1, 3, 256):
+      with analyze(sources, partitions=partitions) as analysis:
+        results.append([status for _, _, status, _ in analysis.iter_units()])
+    self.assertEqual(results[0], results[1])
+    self.assertEqual(results[0], results[2])
+
+  def test_directory(self) -> None:
+    with TemporaryDirectory() as directory:
+      analysis = analyze([document("A")], directory=directory)
+      self.assertEqual(analysis.units, 1)
+      analysis.close()
+
+  def test_groups_are_released(self) -> None:
+    groups = "".join(
+      f'<group id="g{index}"><trans-unit id="{index}"><source>Unit {index}</source>'
+      "</trans-unit></group>"
+      for index in range(200)
+    )
+    source = (
+      '<xliff version="1.2"><file original="a" source-language="en">'
+      f"<body>{groups}</body></file></xliff>"
+    ).encode()
+    sizes, released = [], analysis.release
+
+    def release(element) -> None:
+      # The elements parsed ahead are not held yet, only the previous ones count
+      sizes.append(element.xpath("count(preceding::*)"))
+      released(element)
+
+    with mock.patch.object(analysis, "release", release):
+      analyze([source]).close()
+    self.assertLess(max(sizes), 10)
+
+
+class TestAnalyzeMalformedData(unittest.TestCase):
+  def test_invalid_partitions_raises(self) -> None:
+    for partitions in (0, 257):
+      with self.subTest(partitions=partitions), self.assertRaises(ValueError):
+        analyze([document("A")], partitions=partitions)
+
+  def test_unit_outside_a_file_raises(self) -> None:
+    source = (
+      b'<xliff version="1.2"><trans-unit id="1"><source>A</source></trans-unit></xliff>'
+    )
+    for sources in ([source], [document("A"), source]):
+      with self.subTest(sources=len(sources)):
+        with self.assertRaisesRegex(ValueError, "outside a <file>"):
+          analyze(sources)
@@ -0,0 +1,143 @@
+import unittest
+from io import BytesIO
+from lxml.etree import fromstring
+from xliff.consolidate import Conflict, consolidate
+from xliff.named_groups import CountGroup
+
+
+def document(original: str, *sections: str, header: str = "") -> bytes:
+  return (
+    f'<xliff version="1.2"><file original="{original}" source-language="en">'
+    f"{header}<body>{''.join(sections)}</body></file></xliff>"
+  ).encode()
+
+
+def unit(id: str, text: str = "") -> str:
+  return f'<trans-unit id="{id}"><source>{text or id}</source></trans-unit>'
+
+
+INPUTS = [
+  document("b.rc", unit("b1"), header="<header><note>First</note></header>"),
+  document("a.rc", '<group id="g1">' + unit("a1") + "</group>", unit("a2")),
+  document("b.rc", unit("b2"), unit("b1", "Duplicate"), header="<header/>"),
+]
+
+
+def run(inputs: list[bytes], **kwargs) -> tuple:
+  output = BytesIO()
+  report = consolidate(inputs, output, **kwargs)
+  return fromstring(output.getvalue()), report
+
+
+class TestConsolidate(unittest.TestCase):
+  def test_files_are_merged_and_ordered(self) -> None:
+    root, report = run(INPUTS)
+    files = root.findall("file")
+    self.assertEqual([file.get("original") for file in files], ["a.rc", "b.rc"])
+    self.assertEqual(
+      [section.get("id") for section in files[0].find("body")], ["g1", "a2"]
+    )
+    self.assertEqual(
+      [section.get("id") for section in files[1].find("body")], ["b1", "b2"]
+    )
+    self.assertEqual(files[1].find("header/note").text, "First")
+    self.assertEqual((report.files, report.sections, report.dropped), (2, 4, 1))
+
+  def test_conflicts_keep_first_by_default(self) -> None:
+    root, report = run(INPUTS)
+    self.assertEqual(root.find(".//trans-unit[@id='b1']/source").text, "b1")
+    self.assertEqual(report.conflicts, [(("b.rc", "en", "", ""), "b1", 2, 0)])
+
+  def test_conflicts_can_raise(self) -> None:
+    with self.assertRaises(ValueError):
+      run(INPUTS, resolve="error")
+
+  def test_custom_resolver(self) -> None:
+    def rename(conflict: Conflict):
+      conflict.element.set("id", f"{conflict.id}-{conflict.input_index}")
+      return conflict.element
+
+    root, report = run(INPUTS, resolve=rename)
+    self.assertEqual(root.find(".//trans-unit[@id='b1-2']/source").text, "Duplicate")
+    self.assertEqual(report.dropped, 0)
+
+  def test_conflict_materializes_named_groups(self) -> None:
+    found = []
+
+    def inspect(conflict: Conflict) -> None:
+      found.extend(conflict.materialize())
+
+    inputs = [
+      document("a", unit("1")),
+      document(
+        "a",
+        '<trans-unit id="1"><source>x</source><count-group name="c">'
+        '<count count-type="total">4</count></count-group></trans-unit>',
+      ),
+    ]
+    run(inputs, resolve=inspect)
+    self.assertEqual(len(found), 1)
+    self.assertIsInstance(found[0], CountGroup)
+    self.assertEqual(found[0].counts[0].value, 4)
+
+  def test_section_key(self) -> None:
+    inputs = [document("a", unit("3"), unit("5")), document("a", unit("1"), unit("4"))]
+    root, _ = run(inputs, section_key=lambda element: int(element.get("id")))
+    self.assertEqual(
+      [u.get("id") for u in root.iter("trans-unit")], ["1", "3", "4", "5"]
+    )
+
+  def test_section_key_with_an_empty_file(self) -> None:
+    inputs = [document("a"), document("a", unit("2"), unit("1"))]
+    root, report = run(inputs, section_key=lambda element: element.get("id"))
+    self.assertEqual([u.get("id") for u in root.iter("trans-unit")], ["2", "1"])
+    self.assertEqual((report.files, report.sections), (1, 2))
+
+  def test_file_without_body_in_a_namespace(self) -> None:
+    inputs = [
+      b'<xliff version="1.2" xmlns="urn:x-profile"><file original="a"/></xliff>',
+      b'<xliff version="1.2" xmlns="urn:x-profile"><file original="b"><body>'
+      b'<trans-unit id="1"><source>B</source></trans-unit></body></file></xliff>',
+    ]
+    root, report = run(inputs)
+    bodies = root.findall("{urn:x-profile}file/{urn:x-profile}body")
+    self.assertEqual(len(bodies), 2)
+    self.assertEqual((report.files, report.sections), (2, 1))
+
+  def test_fan_in_gives_the_same_output(self) -> None:
+    inputs = INPUTS * 3 + [document("c", unit("c1")), document("", header="")]
+    direct, expected = BytesIO(), BytesIO()
+    consolidate(inputs, expected)
+    report = consolidate(inputs, direct, fan_in=2)
+    self.assertEqual(direct.getvalue(), expected.getvalue())
+    self.assertEqual(report.dropped, 11)
+
+  def test_fan_in_reports_the_input_indices(self) -> None:
+    inputs = [
+      document("a", unit(str(index % 2)), unit(f"u{index}"), unit("shared"))
+      for index in range(5)
+    ] + [document("b", unit("shared"))] * 2
+    calls = []
+
+    def record(conflict: Conflict) -> None:
+      calls.append((conflict.id, conflict.input_index, conflict.previous_input_index))
+
+    expected = consolidate(inputs, BytesIO(), resolve=record)
+    expected_calls, calls[:] = calls[:], []
+    for fan_in in (2, 3):
+      with self.subTest(fan_in=fan_in):
+        report = consolidate(inputs, BytesIO(), resolve=record, fan_in=fan_in)
+        self.assertEqual(report.conflicts, expected.conflicts)
+        self.assertEqual(
+          (report.files, report.sections, report.dropped),
+          (expected.files, expected.sections, expected.dropped),
+        )
+        self.assertEqual(calls, expected_calls)
+        calls.clear()
+    self.assertIn((("a", "en", "", ""), "shared", 4, 0), expected.conflicts)
+    self.assertIn((("b", "en", "", ""), "shared", 6, 5), expected.conflicts)
+    self.assertEqual(len(expected.conflicts), 3 + 4 + 1)
+
+  def test_empty_files_are_kept(self) -> None:
+    root, _ = run([document("empty"), document("a", unit("1"))])
+    self.assertEqual([file.get("original") for file in root], ["a", "empty"])
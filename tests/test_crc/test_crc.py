@@ -0,0 +1,77 @@
+import unittest
+from zlib import crc32
+from lxml.etree import fromstring, tostring
+from xliff.crc import (
+  CrcCache,
+  context_crc,
+  context_group_crc,
+  element_crc,
+  fill_crcs,
+  verify_crcs,
+  verify_stream,
+)
+from xliff.named_groups import Context, ContextGroup
+
+
+def make_group() -> ContextGroup:
+  return ContextGroup(
+    name="location",
+    contexts=[
+      Context(value="main.c", context_type="sourcefile"),
+      Context(value="42", context_type="linenumber"),
+    ],
+  )
+
+
+class TestCrc(unittest.TestCase):
+  def test_context_crc(self) -> None:
+    context = Context(value="main.c", context_type="sourcefile")
+    self.assertEqual(context_crc(context), f"{crc32(b'sourcefile\x1fmain.c\x1e'):08X}")
+
+  def test_context_group_crc_depends_on_order(self) -> None:
+    group = make_group()
+    crc = context_group_crc(group)
+    group.contexts.reverse()
+    self.assertNotEqual(context_group_crc(group), crc)
+
+  def test_fill_and_verify(self) -> None:
+    groups = [make_group(), make_group()]
+    groups[1].contexts[0].crc = "00000000"
+    self.assertEqual(fill_crcs(groups), 5)
+    self.assertEqual(groups[0].crc, groups[1].crc)
+    self.assertEqual(verify_crcs(groups), [groups[1].contexts[0]])
+    self.assertEqual(fill_crcs(groups, overwrite=True), 6)
+    self.assertEqual(verify_crcs(groups), [])
+    groups[0].contexts[1].value = "43"
+    self.assertEqual(verify_crcs(groups), [groups[0].contexts[1], groups[0]])
+
+  def test_cache_is_shared_by_value(self) -> None:
+    cache = CrcCache()
+    fill_crcs([make_group() for _ in range(10)], cache=cache)
+    self.assertEqual(len(cache), 3)
+    cache.clear()
+    self.assertEqual(len(cache), 0)
+
+  def test_stream_matches_objects(self) -> None:
+    group = make_group()
+    fill_crcs(group)
+    element = group.to_element()
+    self.assertEqual(element_crc(element), group.crc)
+    self.assertEqual(element_crc(element[0]), group.contexts[0].crc)
+    element[1].text = "7"
+    document = (
+      b"<xliff><file><body><trans-unit id='1'><source>a</source>"
+      + tostring(element)
+      + b"</trans-unit></body></file></xliff>"
+    )
+    mismatches = verify_stream(document)
+    self.assertEqual(
+      [(m.tag, m.found) for m in mismatches],
+      [("context", group.contexts[1].crc), ("context-group", group.crc)],
+    )
+
+
+class TestCrcMalformedData(unittest.TestCase):
+  def test_element_crc_of_other_element_raises(self) -> None:
+    with self.assertRaises(ValueError):
+      element_crc(fromstring("<note/>"))
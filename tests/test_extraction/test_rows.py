@@ -0,0 +1,87 @@
+import json
+import unittest
+from io import StringIO
+from xliff.constants import CONTEXT_TYPE
+from xliff.extraction import columns, iter_rows, write_csv, write_jsonl
+
+DOCUMENT = b"""<xliff version="1.2">
+  <file original="app.rc" source-language="en">
+    <body>
+      <group id="dlg" restype="dialog">
+        <group id="buttons">
+          <trans-unit id="1" resname="IDOK" restype="button" maxbytes="10">
+            <source>OK</source>
+            <target>D'accord</target>
+            <context-group>
+              <context context-type="sourcefile">app.rc</context>
+              <context context-type="linenumber">12</context>
+            </context-group>
+          </trans-unit>
+        </group>
+      </group>
+      <trans-unit id="2"><source>Save <g id="1">all</g></source></trans-unit>
+    </body>
+  </file>
+  <file original="other.rc" source-language="en">
+    <body><trans-unit id="1"><source>Other</source></trans-unit></body>
+  </file>
+</xliff>"""
+
+
+class TestIterRows(unittest.TestCase):
+  def test_rows(self) -> None:
+    self.assertEqual(
+      list(iter_rows(DOCUMENT)),
+      [
+        ("app.rc", "dlg/buttons", "1", "IDOK", "OK", "D'accord", "button"),
+        ("app.rc", "", "2", None, "Save all", None, None),
+        ("other.rc", "", "1", None, "Other", None, None),
+      ],
+    )
+
+  def test_extra_columns(self) -> None:
+    contexts = [CONTEXT_TYPE.LINENUMBER, "sourcefile"]
+    self.assertEqual(
+      columns(attributes=["maxbytes"], contexts=contexts)[-3:],
+      ("maxbytes", "context:linenumber", "context:sourcefile"),
+    )
+    rows = list(iter_rows(DOCUMENT, attributes=["maxbytes"], contexts=contexts))
+    self.assertEqual(rows[0][-3:], ("10", "12", "app.rc"))
+    self.assertEqual(rows[1][-3:], (None, None, None))
+
+  def test_unknown_attribute_raises(self) -> None:
+    with self.assertRaises(ValueError):
+      list(iter_rows(DOCUMENT, attributes=["source"]))
+
+  def test_write_csv(self) -> None:
+    output = StringIO(newline="")
+    self.assertEqual(write_csv(DOCUMENT, output), 3)
+    lines = output.getvalue().splitlines()
+    self.assertEqual(lines[0], "file,group_path,id,resname,source,target,restype")
+    self.assertEqual(lines[1], "app.rc,dlg/buttons,1,IDOK,OK,D'accord,button")
+
+  def test_write_jsonl(self) -> None:
+    output = StringIO()
+    self.assertEqual(write_jsonl(DOCUMENT, output, contexts=["sourcefile"]), 3)
+    first = json.loads(output.getvalue().splitlines()[0])
+    self.assertEqual(first["resname"], "IDOK")
+    self.assertEqual(first["context:sourcefile"], "app.rc")
+
+  def test_write_jsonl_matches_json_dumps(self) -> None:
+    document = (
+      '<xliff version="1.2"><file original="a&quot;b\\c.rc"><body>'
+      '<trans-unit id="1"><source>Caf\u00e9 \u201cx\u201d\t%s</source>'
+      '<context-group><context context-type="x-100%">\u2603</context>'
+      "</context-group></trans-unit></body></file></xliff>"
+    ).encode()
+    contexts = ["x-100%"]
+    output = StringIO()
+    write_jsonl(document, output, attributes=["maxbytes"], contexts=contexts)
+    names = columns(attributes=["maxbytes"], contexts=contexts)
+    self.assertEqual(
+      output.getvalue(),
+      "".join(
+        json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+        for row in iter_rows(document, attributes=["maxbytes"], contexts=contexts)
+      ),
+    )
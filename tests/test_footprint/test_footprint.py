@@ -0,0 +1,129 @@
+import json
+import sys
+import tracemalloc
+import unittest
+from xliff.footprint import (
+  ClassFootprint,
+  MemoryReport,
+  PhaseMemory,
+  footprint,
+  profile_load,
+)
+from xliff.named_groups import Context, ContextGroup, CountGroup
+from xliff.streaming import load
+
+_DOCUMENT = (
+  b'<xliff version="1.2"><file original="a" datatype="plaintext"><body>'
+  b'<group id="g"><trans-unit id="1"><source>Open</source>'
+  b'<context-group name="a"><context context-type="sourcefile">a.c</context>'
+  b'<context context-type="linenumber">3</context></context-group></trans-unit>'
+  b"</group>"
+  b'<count-group name="c"><count count-type="total">1</count></count-group>'
+  b"</body></file></xliff>"
+)
+
+
+def _group(values: list[str]) -> ContextGroup:
+  return ContextGroup(
+    name="g",
+    contexts=[Context(value=value, context_type="sourcefile") for value in values],
+  )
+
+
+class TestFootprint(unittest.TestCase):
+  def test_built_objects(self) -> None:
+    group = _group(["a.c", "b.c"])
+    report = footprint(group)
+    self.assertEqual(set(report.classes), {"ContextGroup", "Context"})
+    totals = [class_footprint.total for class_footprint in report.classes.values()]
+    self.assertEqual(totals, sorted(totals, reverse=True))
+    contexts = report.classes["Context"]
+    self.assertEqual(contexts.instances, 2)
+    self.assertEqual(
+      contexts.object_bytes, sum(sys.getsizeof(context) for context in group.contexts)
+    )
+    self.assertGreater(contexts.value_bytes, 0)
+    self.assertEqual((contexts.source_elements, contexts.source_bytes), (0, 0))
+    self.assertEqual((report.documents, report.document_bytes), (0, 0))
+    self.assertEqual(report.total, report.python_bytes)
+
+  def test_shared_values_are_counted_once(self) -> None:
+    shared = "x" * 1000
+    distinct = [("x" * 999) + str(i) for i in range(2)]
+    self.assertLess(
+      footprint(_group([shared, shared])).classes["Context"].value_bytes,
+      footprint(_group(distinct)).classes["Context"].value_bytes - 900,
+    )
+    group = _group(["a.c"])
+    self.assertEqual(footprint([group, group]).classes["ContextGroup"].instances, 1)
+
+  def test_source_elements(self) -> None:
+    objects = load(_DOCUMENT)
+    report = footprint(objects)
+    self.assertEqual(
+      set(report.classes), {"ContextGroup", "Context", "CountGroup", "Count"}
+    )
+    for name, class_footprint in report.classes.items():
+      with self.subTest(name=name):
+        self.assertEqual(class_footprint.source_elements, class_footprint.instances)
+        self.assertGreater(class_footprint.source_bytes, 0)
+    self.assertEqual(report.documents, 1)
+    # The document also holds the elements the library doesn't model
+    self.assertGreater(
+      report.document_bytes,
+      sum(footprint.source_bytes for footprint in report.classes.values()) // 2,
+    )
+    self.assertEqual(report.total, report.python_bytes + report.document_bytes)
+
+  def test_profile_load(self) -> None:
+    objects, report = profile_load(_DOCUMENT)
+    self.assertEqual([type(obj) for obj in objects], [ContextGroup, CountGroup])
+    self.assertEqual(list(report.phases), ["parse", "construct"])
+    construct = report.phases["construct"]
+    self.assertIsInstance(construct, PhaseMemory)
+    self.assertGreater(construct.allocated, 0)
+    self.assertGreaterEqual(construct.peak, construct.allocated)
+    self.assertTrue(any(name.endswith("named_groups.py") for name in construct.by_file))
+    self.assertEqual(report.classes, footprint(objects).classes)
+    self.assertFalse(tracemalloc.is_tracing())
+
+  def test_profile_load_keeps_tracing(self) -> None:
+    tracemalloc.start()
+    try:
+      profile_load(_DOCUMENT)
+      self.assertTrue(tracemalloc.is_tracing())
+    finally:
+      tracemalloc.stop()
+
+  def test_baselines(self) -> None:
+    report = footprint(load(_DOCUMENT))
+    baseline = json.loads(json.dumps(report.to_dict()))
+    self.assertEqual(report.regressions(baseline), [])
+    stored = MemoryReport.from_dict(baseline)
+    self.assertEqual(stored.classes, report.classes)
+    self.assertEqual(stored.total, report.total)
+    bigger = footprint(load(_DOCUMENT) + load(_DOCUMENT))
+    found = bigger.regressions(baseline)
+    self.assertIn("Context.instances grew from 2 to 4", found)
+    self.assertIn("documents grew from 1 to 2", found)
+    self.assertEqual(bigger.regressions(baseline, tolerance=1.5), [])
+
+  def test_format(self) -> None:
+    report = MemoryReport(
+      {
+        "Context": ClassFootprint(2, 10, 20, 0, 0),
+        "Count": ClassFootprint(1, 1, 1, 1, 1),
+      }
+    )
+    lines = report.format().splitlines()
+    self.assertEqual(
+      lines[0].split(), ["class", "instances", "objects", "values", "sources", "total"]
+    )
+    self.assertEqual(lines[1].split(), ["Context", "2", "10", "20", "0", "30"])
+    self.assertEqual(lines[2].split(), ["Count", "1", "1", "1", "1", "3"])
+    self.assertEqual(lines[3], "0 documents retained, 0 bytes, 33 bytes in total")
+    self.assertEqual(repr(report), "<MemoryReport 3 objects, 33 bytes>")
+
+  def test_empty(self) -> None:
+    report = footprint([])
+    self.assertEqual((report.classes, report.total), ({}, 0))
@@ -0,0 +1,205 @@
+import unittest
+from io import BytesIO
+from unittest import mock
+from xliff import fuzzy
+from xliff.fuzzy import NO_MATCH, FuzzyIndex, bounded_distance, leverage
+import lxml.etree as let
+
+MEMORY = b"""<xliff version="1.2">
+  <file original="app.rc" source-language="en" target-language="fr">
+    <body>
+      <trans-unit id="1"><source>Open the file</source><target>Ouvrir le fichier</target></trans-unit>
+      <trans-unit id="2"><source>Open the files</source><target>Ouvrir les fichiers</target></trans-unit>
+      <trans-unit id="3"><source>Open  the file</source><target>Ouvrir le fichier</target></trans-unit>
+      <trans-unit id="4"><source>Close the window</source><target>Fermer la fenetre</target></trans-unit>
+      <trans-unit id="5"><source>Untranslated</source></trans-unit>
+    </body>
+  </file>
+</xliff>"""
+
+DOCUMENT = b"""<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">
+  <file original="new.rc" source-language="en" target-language="fr">
+    <body>
+      <group id="g">
+        <trans-unit id="a"><source>Open the file</source></trans-unit>
+      </group>
+      <trans-unit id="b"><source>Open the fil</source></trans-unit>
+      <trans-unit id="c"><source>Something else entirely</source></trans-unit>
+    </body>
+  </file>
+</xliff>"""
+
+NS = "{urn:oasis:names:tc:xliff:document:1.2}"
+
+
+def distance(first: str, second: str) -> int:
+  previous = list(range(len(second) + 1))
+  for i, char in enumerate(first, 1):
+    current = [i]
+    for j, other in enumerate(second, 1):
+      current.append(
+        min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+      )
+    previous = current
+  return previous[-1]
+
+
+class TestFuzzyIndex(unittest.TestCase):
+  def test_bounded_distance(self) -> None:
+    pairs = [("", ""), ("", "abc"), ("kitten", "sitting"), ("abc", "cab")]
+    pairs += [("flaw", "lawn"), ("same", "same"), ("a" * 10, "b" * 10)]
+    for first, second in pairs:
+      expected = distance(first, second)
+      for bound in range(8):
+        with self.subTest(first=first, second=second, bound=bound):
+          self.assertEqual(
+            bounded_distance(first, second, bound), min(expected, bound + 1)
+          )
+
+  def test_add_document_and_search(self) -> None:
+    index = FuzzyIndex()
+    self.assertEqual(index.add_document(MEMORY), 3)
+    self.assertEqual(len(index), 3)
+    matches = index.search("Open the file", threshold=0.75)
+    self.assertEqual(
+      [(m.source, m.target) for m in matches],
+      [
+        ("Open the file", "Ouvrir le fichier"),
+        ("Open the files", "Ouvrir les fichiers"),
+      ],
+    )
+    self.assertEqual(matches[0].similarity, 1)
+    self.assertAlmostEqual(matches[1].similarity, 13 / 14)
+    self.assertEqual(matches[0].origin, "app.rc")
+    self.assertEqual(len(index.search("Open the file", limit=1)), 1)
+    self.assertEqual(index.search("Print", threshold=0.5), [])
+
+  def test_add_document_releases_groups(self) -> None:
+    groups = "".join(
+      f'<group id="g{index}"><trans-unit id="{index}"><source>Unit {index}</source>'
+      f"<target>Unite {index}</target></trans-unit></group>"
+      for index in range(200)
+    )
+    document = (
+      f'<xliff version="1.2"><file original="a"><body>{groups}</body></file></xliff>'
+    ).encode()
+    sizes, released = [], fuzzy.release
+
+    def release(element) -> None:
+      # The elements parsed ahead are not held yet, only the previous ones count
+      sizes.append(element.xpath("count(preceding::*)"))
+      released(element)
+
+    with mock.patch.object(fuzzy, "release", release):
+      self.assertEqual(FuzzyIndex().add_document(document), 200)
+    self.assertLess(max(sizes), 10)
+
+  def test_search_matches_brute_force(self) -> None:
+    words = "open save close file edit view help".split()
+    sources = [
+      " ".join(words[(i * 7 + j * 3) % len(words)] for j in range(2 + i % 4))
+      for i in range(60)
+    ]
+    index = FuzzyIndex()
+    for source in sources:
+      index.add(source, source.upper())
+    for query in ("open save close", "edit view", "help file open save"):
+      expected = sorted(
+        {
+          (1 - distance(query, s) / max(len(query), len(s)), s)
+          for s in sources
+          if 1 - distance(query, s) / max(len(query), len(s)) >= 0.6
+        },
+        key=lambda pair: -pair[0],
+      )
+      found = index.search(query, threshold=0.6, limit=100)
+      self.assertEqual(
+        [round(m.similarity, 9) for m in found],
+        [round(similarity, 9) for similarity, _ in expected],
+      )
+
+  def test_short_queries(self) -> None:
+    sources = ["a", "as", "ask", "was", "bs", "is", "xyz", "asks", "basket"]
+    index = FuzzyIndex()
+    for source in sources:
+      index.add(source, source.upper())
+    self.assertEqual(
+      {m.source for m in index.search("as", threshold=0.5, limit=100)},
+      {"a", "as", "ask", "was", "bs", "is", "asks"},
+    )
+    for query in sources + ["s", "sa", "xy"]:
+      for threshold in (0.3, 0.5, 0.75):
+        with self.subTest(query=query, threshold=threshold):
+          expected = sorted(
+            similarity
+            for s in sources
+            if (similarity := 1 - distance(query, s) / max(len(query), len(s)))
+            >= threshold
+          )
+          found = index.search(query, threshold=threshold, limit=100, candidates=None)
+          self.assertEqual(
+            sorted(round(m.similarity, 9) for m in found),
+            [round(similarity, 9) for similarity in expected],
+          )
+
+  def test_search_many(self) -> None:
+    index = FuzzyIndex()
+    index.add_document(MEMORY)
+    queries = ["Open the file", "Close the windows", "Nothing"] * 30
+    expected = [index.search(query) for query in queries]
+    self.assertEqual(index.search_many(queries, processes=1), expected)
+    self.assertEqual(index.search_many(queries, processes=2, chunk_size=8), expected)
+
+  def test_leverage(self) -> None:
+    index = FuzzyIndex()
+    index.add_document(MEMORY)
+    output = BytesIO()
+    totals = leverage(DOCUMENT, output, index, limit=2, processes=1, batch_size=2)
+    self.assertEqual(
+      {count.count_type: count.value for count in totals.counts},
+      {
+        "x-fuzzy-100": 3,
+        "x-fuzzy-95-99": 0,
+        "x-fuzzy-85-94": 3,
+        "x-fuzzy-75-84": 0,
+        NO_MATCH: 3,
+      },
+    )
+    root = let.fromstring(output.getvalue())
+    units = {unit.get("id"): unit for unit in root.iter(f"{NS}trans-unit")}
+    self.assertEqual(list(units), ["a", "b", "c"])
+    alt_trans = units["a"].findall(f"{NS}alt-trans")
+    self.assertEqual([alt.get("match-quality") for alt in alt_trans], ["100", "92"])
+    self.assertEqual(alt_trans[0].get("origin"), "app.rc")
+    self.assertEqual(alt_trans[0].findtext(f"{NS}target"), "Ouvrir le fichier")
+    count = units["b"].find(f"{NS}count-group/{NS}count")
+    self.assertEqual((count.get("count-type"), count.text), ("x-fuzzy-85-94", "3"))
+    self.assertEqual(units["c"].findall(f"{NS}alt-trans"), [])
+    self.assertEqual(root.find(f".//{NS}group").get("id"), "g")
+
+  def test_leverage_starts_the_pool_once(self) -> None:
+    index = FuzzyIndex()
+    index.add_document(MEMORY)
+    units = "".join(
+      f'<trans-unit id="{i}"><source>Open the file {i}</source></trans-unit>'
+      for i in range(200)
+    )
+    document = (
+      f'<xliff version="1.2"><file original="a"><body>{units}</body></file></xliff>'
+    ).encode()
+    expected, output = BytesIO(), BytesIO()
+    leverage(document, expected, index, processes=1, batch_size=70)
+    with mock.patch.object(fuzzy, "Pool", wraps=fuzzy.Pool) as pool:
+      leverage(document, output, index, processes=2, batch_size=70)
+    self.assertEqual(pool.call_count, 1)
+    self.assertEqual(output.getvalue(), expected.getvalue())
+
+
+class TestFuzzyIndexMalformedData(unittest.TestCase):
+  def test_invalid_arguments(self) -> None:
+    with self.assertRaises(ValueError):
+      FuzzyIndex(n=0)
+    with self.assertRaises(ValueError):
+      FuzzyIndex().search("text", threshold=0)
+    with self.assertRaises(ValueError):
+      FuzzyIndex().search("text", threshold=1.5)
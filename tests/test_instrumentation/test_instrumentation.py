@@ -0,0 +1,139 @@
+import sys
+import threading
+import unittest
+from xliff import helpers, instrumentation, named_groups, objects
+from xliff.instrumentation import (
+  Measure,
+  add_hook,
+  disable,
+  enable,
+  enabled,
+  instrumented,
+  remove_hook,
+  reset,
+  stats,
+)
+from xliff.named_groups import Context, ContextGroup, Count, CountGroup
+import lxml.etree as let
+
+
+def _work() -> None:
+  group = ContextGroup(
+    name="g",
+    purpose="location",
+    contexts=[Context(value=f"{i}.c", context_type="sourcefile") for i in range(3)],
+  )
+  group.to_element()
+
+
+class TestInstrumentation(unittest.TestCase):
+  def tearDown(self) -> None:
+    disable()
+    reset()
+
+  def test_stats(self) -> None:
+    with instrumented():
+      _work()
+    counted = stats()
+    self.assertEqual(counted["construct:Context"].calls, 3)
+    self.assertEqual(counted["construct:ContextGroup"].calls, 1)
+    self.assertEqual(counted["enum:CONTEXT_TYPE"].calls, 3)
+    self.assertEqual(counted["enum:PURPOSE"].calls, 1)
+    # Checked once when built and once when serialized
+    self.assertEqual(counted["validate:Context.context_type"].calls, 6)
+    self.assertEqual(counted["validate:ContextGroup.purpose"].calls, 2)
+    self.assertEqual(counted["stringify:CONTEXT_TYPE"].calls, 3)
+    self.assertEqual(counted["to_element:ContextGroup"].calls, 1)
+    self.assertEqual(counted["to_element:Context"].calls, 3)
+    self.assertEqual(counted["to_element.depth:1"].calls, 1)
+    self.assertEqual(counted["to_element.depth:2"].calls, 3)
+    self.assertNotIn("to_element.depth:3", counted)
+    self.assertIsInstance(counted["construct:Context"], Measure)
+    self.assertTrue(all(measure.seconds >= 0 for measure in counted.values()))
+    self.assertEqual(list(counted), sorted(counted))
+
+  def test_disabled_costs_nothing(self) -> None:
+    originals = (
+      Count.__init__,
+      CountGroup.__init__,
+      objects.stringify,
+      objects.is_valid_value,
+      named_groups.try_convert_to_enum,
+      objects.BaseXliffElement._serialize,
+    )
+    enable()
+    self.assertTrue(enabled())
+    self.assertIsNot(objects.stringify, helpers.stringify)
+    self.assertIs(helpers.stringify, originals[2])
+    disable()
+    self.assertFalse(enabled())
+    self.assertEqual(
+      (
+        Count.__init__,
+        CountGroup.__init__,
+        objects.stringify,
+        objects.is_valid_value,
+        named_groups.try_convert_to_enum,
+        objects.BaseXliffElement._serialize,
+      ),
+      originals,
+    )
+    for cls in instrumentation.CLASSES:
+      self.assertNotIn("__wrapped__", vars(cls.__init__))
+    _work()
+    self.assertEqual(stats(), {})
+
+  def test_hooks(self) -> None:
+    calls = []
+
+    def hook(key: str, seconds: float) -> None:
+      calls.append(key)
+
+    add_hook(hook)
+    try:
+      with instrumented():
+        Count(value=1, count_type="total")
+    finally:
+      remove_hook(hook)
+    self.assertIn("construct:Count", calls)
+    self.assertEqual(calls.count("enum:COUNT_TYPE"), 1)
+
+  def test_nested_blocks(self) -> None:
+    with instrumented():
+      with instrumented(reset_stats=False):
+        _work()
+      self.assertTrue(enabled())
+      _work()
+    self.assertFalse(enabled())
+    self.assertEqual(stats()["construct:ContextGroup"].calls, 2)
+
+  def test_threads_lose_no_call(self) -> None:
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+      with instrumented():
+        threads = [
+          threading.Thread(
+            target=lambda: [Count(value=1, count_type="total") for _ in range(2000)]
+          )
+          for _ in range(8)
+        ]
+        for thread in threads:
+          thread.start()
+        for thread in threads:
+          thread.join()
+    finally:
+      sys.setswitchinterval(interval)
+    self.assertEqual(stats()["construct:Count"].calls, 16000)
+
+  def test_errors_are_counted(self) -> None:
+    with instrumented():
+      with self.assertRaises(ValueError):
+        Count(source_element=let.Element("nope"))
+    self.assertEqual(stats()["construct:Count"].calls, 1)
+
+
+class TestInstrumentationMalformedData(unittest.TestCase):
+  def test_remove_unknown_hook(self) -> None:
+    with self.assertRaises(ValueError):
+      remove_hook(print)
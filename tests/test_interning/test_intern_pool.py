@@ -0,0 +1,69 @@
+import unittest
+from xliff.interning import InternPool, active_pool, interning
+from xliff.named_groups import ContextGroup, PropGroup
+import lxml.etree as let
+
+GROUPS = b"""<body>
+  <context-group name="a"><context context-type="sourcefile">src/main.c</context></context-group>
+  <context-group name="b"><context context-type="sourcefile">src/main.c</context></context-group>
+  <prop-group name="p"><prop prop-type="x-author">Jane</prop></prop-group>
+  <prop-group name="q"><prop prop-type="x-author">Jane</prop></prop-group>
+</body>"""
+
+
+def _build() -> tuple[list[ContextGroup], list[PropGroup]]:
+  root = let.fromstring(GROUPS)
+  return (
+    [ContextGroup(source_element=element) for element in root[:2]],
+    [PropGroup(source_element=element) for element in root[2:]],
+  )
+
+
+class TestInternPool(unittest.TestCase):
+  def test_strings_are_shared(self) -> None:
+    with interning() as pool:
+      contexts, props = _build()
+    first, second = contexts[0].contexts[0], contexts[1].contexts[0]
+    self.assertIsNot(first, second)
+    self.assertIs(first.value, second.value)
+    self.assertIs(props[0].props[0].prop_type, props[1].props[0].prop_type)
+    self.assertIs(pool.string("src/main.c"), first.value)
+    self.assertIsNone(active_pool())
+
+  def test_objects_are_shared(self) -> None:
+    with interning(share_objects=True):
+      contexts, props = _build()
+    self.assertIs(contexts[0].contexts[0], contexts[1].contexts[0])
+    self.assertIs(props[0].props[0], props[1].props[0])
+    self.assertEqual(contexts[1].to_element()[0].text, "src/main.c")
+
+  def test_shared_objects_are_frozen_and_detached(self) -> None:
+    with interning(share_objects=True):
+      contexts, _ = _build()
+    shared = contexts[0].contexts[0]
+    self.assertTrue(shared.frozen)
+    self.assertIsNone(shared.source_element)
+    with self.assertRaises(AttributeError):
+      shared.value = "src/other.c"
+    self.assertEqual(contexts[1].contexts[0].value, "src/main.c")
+    # The groups holding them can still change
+    contexts[0].name = "c"
+    self.assertEqual(contexts[1].name, "b")
+
+  def test_without_pool(self) -> None:
+    contexts, _ = _build()
+    self.assertIsNot(contexts[0].contexts[0].value, contexts[1].contexts[0].value)
+
+  def test_reused_and_nested_pools(self) -> None:
+    pool = InternPool(share_objects=True)
+    with interning(pool):
+      first, _ = _build()
+      with interning() as inner:
+        self.assertIs(active_pool(), inner)
+      self.assertIs(active_pool(), pool)
+    with interning(pool):
+      second, _ = _build()
+    self.assertIs(first[0].contexts[0], second[0].contexts[0])
+    self.assertGreater(len(pool), 0)
+    pool.clear()
+    self.assertEqual(len(pool), 0)
@@ -0,0 +1,89 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+from xliff import memory as memory_module
+from xliff.memory import NO_CONTEXT, TranslationMemory, context_key
+from xliff.named_groups import Context, ContextGroup
+
+DOCUMENT = b"""<xliff version="1.2">
+  <file original="app.rc" source-language="en" target-language="fr">
+    <body>
+      <trans-unit id="1">
+        <source>Open  file</source>
+        <target>Ouvrir le fichier</target>
+        <context-group>
+          <context context-type="element" match-mandatory="yes">Menu</context>
+          <context context-type="linenumber">3</context>
+        </context-group>
+      </trans-unit>
+      <trans-unit id="2"><source>Open file</source><target>Ouvrir</target></trans-unit>
+      <trans-unit id="3"><source>Untranslated</source></trans-unit>
+    </body>
+  </file>
+</xliff>"""
+
+
+class TestTranslationMemory(unittest.TestCase):
+  def test_add_document_and_lookup(self) -> None:
+    with TranslationMemory() as memory:
+      self.assertEqual(memory.add_document(DOCUMENT), 2)
+      self.assertEqual(len(memory), 1)
+      exact = memory.exact("Open file")
+      self.assertEqual(
+        (exact.target, exact.in_context, exact.origin), ("Ouvrir", False, "app.rc")
+      )
+      menu = [Context(value="Menu", context_type="element", match_mandatory=True)]
+      match = memory.lookup(" Open file ", menu)
+      self.assertEqual((match.target, match.in_context), ("Ouvrir le fichier", True))
+      self.assertIsNone(memory.in_context("Open file", [("element", "Dialog")]))
+      self.assertEqual(
+        memory.lookup("Open file", [("element", "Dialog")]).target, "Ouvrir"
+      )
+      self.assertIsNone(memory.lookup("Untranslated"))
+
+  def test_add_document_releases_groups(self) -> None:
+    groups = "".join(
+      f'<group id="g{index}"><trans-unit id="{index}"><source>Unit {index}</source>'
+      f"<target>Unite {index}</target></trans-unit></group>"
+      for index in range(200)
+    )
+    document = (
+      f'<xliff version="1.2"><file original="a"><body>{groups}</body></file></xliff>'
+    ).encode()
+    sizes, released = [], memory_module.release
+
+    def release(element) -> None:
+      # The elements parsed ahead are not held yet, only the previous ones count
+      sizes.append(element.xpath("count(preceding::*)"))
+      released(element)
+
+    with TranslationMemory() as memory:
+      with mock.patch.object(memory_module, "release", release):
+        self.assertEqual(memory.add_document(document), 200)
+    self.assertLess(max(sizes), 10)
+
+  def test_context_key(self) -> None:
+    group = ContextGroup(
+      contexts=[
+        Context(value="b", context_type="element", match_mandatory=True),
+        Context(value="a", context_type="sourcefile", match_mandatory=True),
+        Context(value="3", context_type="linenumber"),
+      ]
+    )
+    self.assertEqual(
+      context_key([group]), context_key([("sourcefile", "a"), ("element", "b")])
+    )
+    self.assertEqual(
+      context_key([Context(value="3", context_type="linenumber")]), NO_CONTEXT
+    )
+
+  def test_persistence(self) -> None:
+    with TemporaryDirectory() as directory:
+      path = Path(directory) / "memory.sqlite"
+      with TranslationMemory(path) as memory:
+        memory.add("Cancel", "Annuler", origin="manual")
+      with TranslationMemory(path) as memory:
+        self.assertEqual(memory.exact("Cancel").origin, "manual")
+        memory.add("Cancel", "Abandonner")
+        self.assertEqual(memory.exact("Cancel").target, "Abandonner")
@@ -0,0 +1,97 @@
+import unittest
+from lxml.etree import fromstring, tostring
+from xliff.constants import COUNT_TYPE, UNIT
+from xliff.errors import ValidationError
+from xliff.named_groups import ColumnarCountGroup, Count, CountGroup
+
+
+def make_counts() -> list[Count]:
+  return [
+    Count(value=10, count_type="total", unit="word"),
+    Count(value=4, count_type="repetition", unit="word", phase_name="p1"),
+    Count(value=55, count_type="total", unit="character"),
+    Count(value=6, count_type="total", unit="word", phase_name="p1"),
+  ]
+
+
+class TestColumnarCountGroup(unittest.TestCase):
+  def test_same_xml_as_count_group(self) -> None:
+    columnar = ColumnarCountGroup(name="stats", counts=make_counts())
+    regular = CountGroup(name="stats", counts=make_counts())
+    self.assertEqual(tostring(columnar.to_element()), tostring(regular.to_element()))
+
+  def test_round_trip_through_element(self) -> None:
+    element = CountGroup(name="stats", counts=make_counts()).to_element()
+    columnar = ColumnarCountGroup(source_element=element)
+    self.assertEqual(columnar.name, "stats")
+    self.assertEqual(list(columnar.values), [10, 4, 55, 6])
+    self.assertEqual(
+      columnar.decode_count_type(columnar.count_type_codes[1]), COUNT_TYPE.REPETITION
+    )
+    self.assertEqual(tostring(columnar.to_element()), tostring(element))
+
+  def test_conversions(self) -> None:
+    regular = CountGroup(name="stats", counts=make_counts())
+    columnar = ColumnarCountGroup.from_count_group(regular)
+    self.assertEqual(len(columnar), 4)
+    back = columnar.to_count_group()
+    self.assertEqual(
+      [(c.value, c.count_type, c.phase_name, c.unit) for c in back.counts],
+      [(c.value, c.count_type, c.phase_name, c.unit) for c in regular.counts],
+    )
+
+  def test_aggregations(self) -> None:
+    columnar = ColumnarCountGroup(name="stats", counts=make_counts())
+    self.assertEqual(
+      columnar.sum_by_count_type(), {COUNT_TYPE.TOTAL: 71, COUNT_TYPE.REPETITION: 4}
+    )
+    self.assertEqual(columnar.sum_by_unit(), {UNIT.WORD: 20, UNIT.CHARACTER: 55})
+    self.assertEqual(columnar.sum_by_phase(), {None: 65, "p1": 10})
+    self.assertEqual(columnar.total(), 75)
+    self.assertEqual(columnar.total(count_type="total", unit=UNIT.WORD), 16)
+    self.assertEqual(columnar.total(phase_name="p2"), 0)
+
+  def test_append(self) -> None:
+    columnar = ColumnarCountGroup(name="stats")
+    columnar.append(3, "total")
+    columnar.append(2, COUNT_TYPE.TOTAL, unit="word")
+    self.assertEqual(columnar.total(count_type=COUNT_TYPE.TOTAL), 5)
+    self.assertEqual(list(columnar.unit_codes), [0, 1])
+
+
+class TestColumnarCountGroupMalformedData(unittest.TestCase):
+  def test_non_int_value_raises(self) -> None:
+    with self.assertRaises(TypeError):
+      ColumnarCountGroup(name="stats").append("3", "total")  # type: ignore
+
+  def test_invalid_count_type_fails_validation(self) -> None:
+    columnar = ColumnarCountGroup(name="stats")
+    columnar.append(3, "not-a-type")
+    with self.assertRaises(ValidationError):
+      columnar.validate()
+
+  def test_comments_are_skipped(self) -> None:
+    element = fromstring(
+      '<count-group name="stats"><!-- counted by hand -->'
+      '<count count-type="total">3</count><?pi?><count count-type="total">4</count>'
+      "</count-group>"
+    )
+    columnar = ColumnarCountGroup(source_element=element)
+    self.assertEqual(list(columnar.values), [3, 4])
+    self.assertEqual(columnar.total(), 7)
+
+  def test_missing_value(self) -> None:
+    element = fromstring(
+      '<count-group name="stats"><count count-type="total">3</count>'
+      '<count count-type="total" unit="word"/></count-group>'
+    )
+    with self.assertWarnsRegex(UserWarning, "Missing a value for attribute 'value'"):
+      columnar = ColumnarCountGroup(source_element=element)
+    self.assertEqual([count.value for count in columnar.counts], [3, None])
+    self.assertEqual(columnar.total(), 3)
+    self.assertEqual(columnar.sum_by_unit(), {None: 3, UNIT.WORD: 0})
+    with self.assertRaises(ValidationError):
+      columnar.validate()
+    # Frozen, and serialized without validation, it gives back its source
+    columnar.freeze()
+    self.assertEqual(tostring(columnar.to_element(validation="off")), tostring(element))
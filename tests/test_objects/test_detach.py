@@ -0,0 +1,181 @@
+import pickle
+import threading
+import unittest
+from xliff.footprint import footprint
+from xliff.named_groups import (
+  ColumnarCountGroup,
+  Context,
+  ContextGroup,
+  CountGroup,
+  PropGroup,
+)
+from xliff.policy import retains_sources, set_source_retention, source_retention
+from xliff.streaming import load
+import lxml.etree as let
+
+_DOCUMENT = (
+  b'<xliff version="1.2"><file original="a" datatype="plaintext"><body>'
+  b'<trans-unit id="1"><source>Open</source>'
+  b'<context-group name="a"><context context-type="sourcefile">a.c</context>'
+  b'<context context-type="linenumber">3</context></context-group>'
+  b'<count-group name="c"><count count-type="total">1</count></count-group>'
+  b'<prop-group name="p"><prop prop-type="author">Jane</prop></prop-group>'
+  b"</trans-unit></body></file></xliff>"
+)
+
+_CONTEXT_GROUP = (
+  '<context-group name="a"><context context-type="sourcefile">a.c</context>'
+  '<context context-type="linenumber">3</context></context-group>'
+)
+
+
+def _sources(obj) -> list:
+  found, stack = [], [obj]
+  while stack:
+    node = stack.pop()
+    found.append(node.source_element)
+    stack.extend(node._children)
+  return found
+
+
+class TestDetach(unittest.TestCase):
+  def tearDown(self) -> None:
+    set_source_retention(True)
+
+  def test_detach(self) -> None:
+    element = let.fromstring(_CONTEXT_GROUP)
+    group = ContextGroup(source_element=element)
+    self.assertIs(group.source_element, element)
+    self.assertIs(group.contexts[1].source_element, element[1])
+    serialized = let.tostring(group.to_element())
+    self.assertIs(group.detach(), group)
+    self.assertEqual(_sources(group), [None, None, None])
+    self.assertEqual(let.tostring(group.to_element()), serialized)
+    self.assertEqual(group.contexts[0].value, "a.c")
+
+  def test_detach_only_the_object(self) -> None:
+    group = ContextGroup(source_element=let.fromstring(_CONTEXT_GROUP))
+    group.detach(recurse=False)
+    self.assertIsNone(group.source_element)
+    self.assertIsNotNone(group.contexts[0].source_element)
+
+  def test_documents_are_released(self) -> None:
+    objects = load(_DOCUMENT)
+    self.assertEqual(footprint(objects).documents, 1)
+    for obj in objects:
+      obj.detach()
+    self.assertEqual(footprint(objects).documents, 0)
+
+  def test_frozen_objects(self) -> None:
+    element = let.fromstring(_CONTEXT_GROUP)
+    group = ContextGroup(source_element=element).freeze()
+    hashed = hash(group)
+    group.detach()
+    self.assertEqual(_sources(group), [None, None, None])
+    group.reattach(element)
+    self.assertIs(group.contexts[0].source_element, element[0])
+    self.assertEqual(hash(group), hashed)
+    self.assertTrue(group.frozen)
+
+  def test_reattach(self) -> None:
+    objects = load(_DOCUMENT, retain_source=False)
+    context_group, count_group, prop_group = objects
+    root = let.fromstring(_DOCUMENT)
+    unit = root.find("file/body/trans-unit")
+    context_group.reattach(unit.find("context-group"))
+    self.assertEqual(
+      _sources(context_group),
+      [unit.find("context-group"), *reversed(unit.findall("context-group/context"))],
+    )
+    count_group.reattach(unit.find("count-group"), recurse=False)
+    self.assertIs(count_group.source_element, unit.find("count-group"))
+    self.assertIsNone(count_group.counts[0].source_element)
+    prop_group.reattach(unit.find("prop-group"))
+    self.assertIs(prop_group.props[0].source_element, unit.find("prop-group/prop"))
+
+  def test_columnar_group(self) -> None:
+    element = let.fromstring(
+      '<count-group name="c"><count count-type="total">1</count></count-group>'
+    )
+    group = ColumnarCountGroup(source_element=element).detach()
+    self.assertIsNone(group.source_element)
+    self.assertIs(group.reattach(element).source_element, element)
+
+  def test_pickled_objects_are_detached(self) -> None:
+    group = ContextGroup(source_element=let.fromstring(_CONTEXT_GROUP))
+    self.assertEqual(_sources(pickle.loads(pickle.dumps(group))), [None, None, None])
+
+
+class TestSourceRetention(unittest.TestCase):
+  def tearDown(self) -> None:
+    set_source_retention(True)
+
+  def test_default(self) -> None:
+    self.assertTrue(retains_sources())
+    self.assertNotIn(None, _sources(load(_DOCUMENT)[0]))
+
+  def test_block(self) -> None:
+    element = let.fromstring(_CONTEXT_GROUP)
+    with source_retention(False) as retain:
+      self.assertFalse(retain)
+      group = ContextGroup(source_element=element)
+      with source_retention(True):
+        kept = ContextGroup(source_element=element)
+    self.assertEqual(_sources(group), [None, None, None])
+    self.assertEqual([context.value for context in group.contexts], ["a.c", "3"])
+    self.assertIs(kept.source_element, element)
+    self.assertTrue(retains_sources())
+
+  def test_global(self) -> None:
+    set_source_retention(False)
+    found = []
+    thread = threading.Thread(
+      target=lambda: found.append(
+        CountGroup(
+          source_element=let.fromstring(
+            '<count-group name="c"><count count-type="total">1</count></count-group>'
+          )
+        )
+      )
+    )
+    thread.start()
+    thread.join()
+    self.assertEqual(_sources(found[0]), [None, None])
+    self.assertEqual(found[0].counts[0].value, 1)
+
+  def test_load(self) -> None:
+    objects = load(_DOCUMENT, retain_source=False)
+    self.assertEqual(
+      [type(obj) for obj in objects], [ContextGroup, CountGroup, PropGroup]
+    )
+    for obj in objects:
+      self.assertEqual(set(_sources(obj)), {None})
+    self.assertEqual(footprint(objects).documents, 0)
+    with source_retention(False):
+      self.assertIsNotNone(load(_DOCUMENT, retain_source=True)[0].source_element)
+
+
+class TestDetachMalformedData(unittest.TestCase):
+  def test_wrong_tag(self) -> None:
+    group = ContextGroup(source_element=let.fromstring(_CONTEXT_GROUP)).detach()
+    with self.assertRaises(ValueError):
+      group.reattach(let.fromstring('<prop-group name="a"/>'))
+    self.assertIsNone(group.source_element)
+
+  def test_children_mismatch(self) -> None:
+    group = ContextGroup(source_element=let.fromstring(_CONTEXT_GROUP)).detach()
+    element = let.fromstring(
+      '<context-group name="a"><context context-type="sourcefile">a.c</context>'
+      "</context-group>"
+    )
+    with self.assertRaises(ValueError):
+      group.reattach(element)
+    # Nothing is bound
+    self.assertEqual(_sources(group), [None, None, None])
+    group.reattach(element, recurse=False)
+    self.assertIs(group.source_element, element)
+
+  def test_not_an_element(self) -> None:
+    context = Context(value="a.c", context_type="sourcefile")
+    with self.assertRaises(TypeError):
+      context.reattach("<context/>")  # type: ignore
@@ -0,0 +1,89 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from xliff.constants import CONTEXT_TYPE
+from xliff.interning import interning
+from xliff.named_groups import (
+  ColumnarCountGroup,
+  Context,
+  ContextGroup,
+  Count,
+  CountGroup,
+  Prop,
+  PropGroup,
+)
+import lxml.etree as let
+
+
+def _context_group(value: str = "main.c") -> ContextGroup:
+  return ContextGroup(
+    name="location",
+    contexts=[
+      Context(value=value, context_type=CONTEXT_TYPE.SOURCEFILE),
+      Context(value="12", context_type=CONTEXT_TYPE.LINENUMBER),
+    ],
+  )
+
+
+class TestFreeze(unittest.TestCase):
+  def test_freeze_makes_the_tree_immutable(self) -> None:
+    group = _context_group()
+    self.assertFalse(group.frozen)
+    self.assertIs(group.freeze(), group)
+    self.assertTrue(group.frozen)
+    self.assertTrue(group.contexts[0].frozen)
+    self.assertIsInstance(group, ContextGroup)
+    with self.assertRaises(AttributeError):
+      group.name = "other"
+    with self.assertRaises(AttributeError):
+      del group.contexts[0].value
+    with self.assertRaises(TypeError):
+      group.contexts.append(Context(value="x", context_type="element"))
+    self.assertEqual(group.by_type[CONTEXT_TYPE.LINENUMBER].value, "12")
+    self.assertEqual(
+      let.tostring(group.to_element()), let.tostring(_context_group().to_element())
+    )
+
+  def test_hash_and_equality(self) -> None:
+    first, second = _context_group().freeze(), _context_group().freeze()
+    self.assertEqual(first, second)
+    self.assertEqual(hash(first), hash(second))
+    self.assertNotEqual(first, _context_group("other.c").freeze())
+    self.assertEqual(len({first, second, _context_group("other.c").freeze()}), 2)
+    self.assertNotEqual(_context_group(), _context_group())
+
+  def test_sequences_become_tuples(self) -> None:
+    group = CountGroup(name="counts", counts=[Count(value=1, count_type="total")])
+    group.freeze()
+    self.assertIsInstance(group.counts, tuple)
+    props = PropGroup(name="meta", props=[Prop(value="Jane", prop_type="x-author")])
+    props.freeze()
+    self.assertTrue(props.props.frozen)
+    self.assertEqual(props.by_type["x-author"].value, "Jane")
+
+  def test_columnar_count_group(self) -> None:
+    counts = [Count(value=3, count_type="total", unit="word")]
+    group = ColumnarCountGroup(name="counts", counts=counts).freeze()
+    self.assertEqual(group.total(unit="word"), 3)
+    self.assertEqual(group, ColumnarCountGroup(name="counts", counts=counts).freeze())
+    with self.assertRaises(AttributeError):
+      group.append(1, "total")
+
+  def test_shared_objects(self) -> None:
+    element = let.fromstring(
+      '<context-group><context context-type="element">Menu</context>'
+      '<context context-type="element">Menu</context></context-group>'
+    )
+    with interning(share_objects=True):
+      group = ContextGroup(source_element=element)
+    self.assertIs(group.contexts[0], group.contexts[1])
+    group.freeze()
+    self.assertTrue(group.contexts[1].frozen)
+
+  def test_parallel_reads(self) -> None:
+    groups = [_context_group(f"file{index}.c").freeze() for index in range(200)]
+
+    def read(_: int) -> int:
+      return sum(len(group.by_type["sourcefile"].value) for group in groups)
+
+    with ThreadPoolExecutor(4) as executor:
+      self.assertEqual(len(set(executor.map(read, range(16)))), 1)
@@ -0,0 +1,97 @@
+import unittest
+from io import BytesIO
+from lxml.etree import fromstring, tostring
+from xliff.patching import apply_translations
+
+DOCUMENT = b"""<?xml version='1.0' encoding='UTF-8'?>
+<xliff version="1.2">
+  <file original="app.rc" source-language="en" target-language="fr">
+    <body>
+      <group id="g1">
+        <trans-unit id="1">
+          <source>OK</source>
+          <target state="new">Ok <g id="b">old</g></target>
+        </trans-unit>
+        <trans-unit id="2">
+          <source>Cancel</source>
+        </trans-unit>
+      </group>
+      <!-- kept as is -->
+      <trans-unit id="3"><source>Help</source><target state="final">Aide</target></trans-unit>
+    </body>
+  </file>
+</xliff>"""
+
+
+def patch(translations: dict, **kwargs) -> tuple:
+  output = BytesIO()
+  report = apply_translations(DOCUMENT, output, translations, **kwargs)
+  return output.getvalue(), report
+
+
+class TestApplyTranslations(unittest.TestCase):
+  def test_no_translations_copies_the_document(self) -> None:
+    data, report = patch({})
+    self.assertEqual(
+      data, tostring(fromstring(DOCUMENT), xml_declaration=True, encoding="UTF-8")
+    )
+    self.assertEqual((report.units, report.patched), (3, 0))
+
+  def test_replaces_existing_target(self) -> None:
+    data, report = patch({"1": "D'accord"})
+    target = fromstring(data).find(".//trans-unit[@id='1']/target")
+    self.assertEqual(target.text, "D'accord")
+    self.assertEqual(len(target), 0)
+    self.assertEqual(target.get("state"), "translated")
+    self.assertEqual(report.patched, 1)
+
+  def test_creates_missing_target_after_source(self) -> None:
+    data, _ = patch({"2": "Annuler"})
+    unit = fromstring(data).find(".//trans-unit[@id='2']")
+    self.assertEqual([child.tag for child in unit], ["source", "target"])
+    self.assertEqual(unit[1].text, "Annuler")
+
+  def test_explicit_and_untouched_state(self) -> None:
+    data, _ = patch({"1": ("Oui", "needs-review-translation"), "3": ("Aide", None)})
+    root = fromstring(data)
+    self.assertEqual(
+      root.find(".//trans-unit[@id='1']/target").get("state"),
+      "needs-review-translation",
+    )
+    self.assertEqual(root.find(".//trans-unit[@id='3']/target").get("state"), "final")
+
+  def test_reports_unmatched_ids(self) -> None:
+    data, report = patch({"3": "Aide", "4": "Rien", "5": "Non"})
+    self.assertEqual(report.unmatched, {"4", "5"})
+    self.assertIn(b"<!-- kept as is -->", data)
+
+  def test_keeps_the_xml_declaration(self) -> None:
+    body = b'<xliff version="1.2"><file original="a"><body/></file></xliff>'
+    for prolog in (
+      b'<?xml version="1.0" encoding="UTF-8"?>\n',
+      b'\xef\xbb\xbf<?xml version="1.0" encoding="utf-8" standalone="yes"?>\r\n',
+      b"",
+    ):
+      with self.subTest(prolog=prolog):
+        output = BytesIO()
+        apply_translations(prolog + body, output, {})
+        self.assertEqual(output.getvalue(), prolog + body)
+    # Read ahead, then from the start again
+    output = BytesIO()
+    apply_translations(BytesIO(b'<?xml version="1.0"?>' + body), output, {})
+    self.assertTrue(output.getvalue().startswith(b'<?xml version="1.0"?><xliff'))
+
+  def test_patches_the_units_of_bin_units(self) -> None:
+    document = (
+      b'<xliff version="1.2"><file original="a"><body><bin-unit id="b" mime-type="x">'
+      b'<bin-source><external-file href="a.png"/></bin-source>'
+      b'<trans-unit id="1"><source>Logo</source></trans-unit></bin-unit>'
+      b"</body></file></xliff>"
+    )
+    output = BytesIO()
+    report = apply_translations(document, output, {"1": "Logo FR"})
+    self.assertEqual((report.units, report.patched, report.unmatched), (1, 1, set()))
+    self.assertEqual(
+      fromstring(output.getvalue()).findtext(".//bin-unit/trans-unit/target"),
+      "Logo FR",
+    )
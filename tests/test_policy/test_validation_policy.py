@@ -0,0 +1,148 @@
+import threading
+import unittest
+import warnings
+from unittest import mock
+from xliff.constants import VALIDATION_LEVEL
+from xliff.errors import ValidationError
+from xliff.named_groups import Context, ContextGroup
+from xliff.objects import BaseXliffElement
+from xliff.policy import set_validation_level, validation_level, validation_policy
+from xliff.serialization import to_bytes
+import lxml.etree as let
+
+
+def _build() -> tuple[ContextGroup, list[warnings.WarningMessage]]:
+  element = let.fromstring(
+    '<context-group purpose="nowhere"><context context-type="sourcefile">a.c'
+    '</context><context context-type="bogus"/></context-group>'
+  )
+  with warnings.catch_warnings(record=True) as caught:
+    warnings.simplefilter("always")
+    group = ContextGroup(source_element=element)
+  return group, caught
+
+
+class TestValidationPolicy(unittest.TestCase):
+  def tearDown(self) -> None:
+    set_validation_level(VALIDATION_LEVEL.STRICT)
+
+  def test_levels(self) -> None:
+    # Level, warns when built, raises when serialized
+    for level, warns, raises in (
+      (VALIDATION_LEVEL.STRICT, True, True),
+      (VALIDATION_LEVEL.CONSTRUCT_ONLY, True, False),
+      (VALIDATION_LEVEL.SERIALIZE_ONLY, False, True),
+      (VALIDATION_LEVEL.LAZY, False, True),
+      (VALIDATION_LEVEL.OFF, False, False),
+    ):
+      with self.subTest(level=level), validation_policy(level):
+        group, caught = _build()
+        self.assertEqual(bool(caught), warns)
+        if raises:
+          with self.assertRaises(ValidationError):
+            group.to_element()
+        else:
+          element = group.to_element()
+          self.assertEqual(element.get("purpose"), "nowhere")
+          self.assertEqual(len(element), 2)
+
+  def test_default(self) -> None:
+    self.assertIs(validation_level(), VALIDATION_LEVEL.STRICT)
+    _, caught = _build()
+    self.assertEqual(len(caught), 4)
+
+  def test_lazy_raises_the_same_error(self) -> None:
+    group, _ = _build()
+    group.purpose = None
+    with self.assertRaises(ValidationError) as strict:
+      group.to_element()
+    with self.assertRaises(ValidationError) as lazy:
+      group.to_element(validation="lazy")
+    self.assertEqual(str(lazy.exception), str(strict.exception))
+
+  def test_objects_are_validated_once(self) -> None:
+    group = ContextGroup(
+      contexts=[Context(value="a", context_type="sourcefile") for _ in range(5)]
+    )
+    for level in ("strict", "lazy"):
+      with self.subTest(level=level):
+        with mock.patch.object(
+          BaseXliffElement,
+          "_attribute_issues",
+          autospec=True,
+          side_effect=lambda obj: iter(()),
+        ) as issues:
+          group.to_element(validation=level)
+        self.assertEqual(issues.call_count, 6)
+
+  def test_off_skips_validate(self) -> None:
+    group, _ = _build()
+    group.validate(validation="off")
+    with validation_policy("off"):
+      group.validate()
+      with self.assertRaises(ValidationError):
+        group.validate(validation="strict")
+
+  def test_precedence(self) -> None:
+    set_validation_level("off")
+    self.assertIs(validation_level(), VALIDATION_LEVEL.OFF)
+    with validation_policy("lazy") as level:
+      self.assertIs(level, VALIDATION_LEVEL.LAZY)
+      self.assertIs(validation_level(), VALIDATION_LEVEL.LAZY)
+      self.assertIs(validation_level("strict"), VALIDATION_LEVEL.STRICT)
+      with validation_policy(VALIDATION_LEVEL.SERIALIZE_ONLY):
+        self.assertIs(validation_level(), VALIDATION_LEVEL.SERIALIZE_ONLY)
+      self.assertIs(validation_level(), VALIDATION_LEVEL.LAZY)
+    self.assertIs(validation_level(), VALIDATION_LEVEL.OFF)
+
+  def test_threads(self) -> None:
+    seen = []
+    set_validation_level("construct-only")
+    with validation_policy("lazy"):
+      thread = threading.Thread(target=lambda: seen.append(validation_level()))
+      thread.start()
+      thread.join()
+    # Blocks are local to a thread, the global level is not
+    self.assertEqual(seen, [VALIDATION_LEVEL.CONSTRUCT_ONLY])
+
+  def test_to_bytes(self) -> None:
+    group, _ = _build()
+    for workers in (None, 2):
+      with self.subTest(workers=workers):
+        with self.assertRaises(ValidationError):
+          to_bytes(group, workers=workers)
+        with validation_policy("lazy"):
+          self.assertEqual(
+            to_bytes(group, workers=workers, validation="off"),
+            to_bytes(group, validation="construct-only"),
+          )
+
+  def test_to_bytes_level_overrides_off(self) -> None:
+    set_validation_level("off")
+    # Only the group itself is invalid, its children are valid
+    group = ContextGroup(
+      source_element=let.fromstring(
+        '<context-group purpose="nowhere"><context context-type="sourcefile">a.c'
+        '</context><context context-type="linenumber">1</context></context-group>'
+      )
+    )
+    for workers in (None, 2):
+      with self.subTest(workers=workers):
+        to_bytes(group, workers=workers)
+        with self.assertRaises(ValidationError):
+          to_bytes(group, workers=workers, validation="strict")
+
+
+class TestValidationPolicyMalformedData(unittest.TestCase):
+  def test_invalid_level(self) -> None:
+    group, _ = _build()
+    with self.assertRaises(ValueError):
+      validation_level("sometimes")
+    with self.assertRaises(ValueError):
+      set_validation_level("sometimes")
+    with self.assertRaises(ValueError):
+      with validation_policy("sometimes"):
+        pass
+    with self.assertRaises(ValueError):
+      group.to_element(validation="sometimes")
+    self.assertIs(validation_level(), VALIDATION_LEVEL.STRICT)
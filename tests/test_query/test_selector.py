@@ -0,0 +1,168 @@
+import unittest
+from xliff.constants import CONTEXT_TYPE
+from xliff.named_groups import Context, ContextGroup, Count, CountGroup
+from xliff.query import compile, select
+from xliff.streaming import XLIFF_NAMESPACE, materialize
+import lxml.etree as let
+
+DOCUMENT = b"""<xliff version="1.2">
+  <file original="app.rc" source-language="en" datatype="winres">
+    <body>
+      <group id="g1" restype="dialog">
+        <trans-unit id="1">
+          <source>OK</source>
+          <context-group purpose="location">
+            <context context-type="sourcefile">dialog.rc</context>
+            <context context-type="linenumber">12</context>
+          </context-group>
+        </trans-unit>
+        <group id="g2">
+          <context-group>
+            <context context-type="sourcefile" match-mandatory="yes">nested.rc</context>
+          </context-group>
+        </group>
+      </group>
+      <group id="g3" restype="menu">
+        <context-group>
+          <context context-type="sourcefile">menu.rc</context>
+        </context-group>
+      </group>
+    </body>
+  </file>
+</xliff>"""
+
+
+class TestSelector(unittest.TestCase):
+  def setUp(self) -> None:
+    self.location = ContextGroup(
+      name="location",
+      purpose="location",
+      contexts=[
+        Context(value="main.c", context_type="sourcefile"),
+        Context(value="42", context_type="linenumber"),
+      ],
+    )
+    self.other = ContextGroup(
+      name="other",
+      contexts=[Context(value="other.c", context_type="sourcefile", crc="ab")],
+    )
+
+  def test_select_with_enum_predicates(self) -> None:
+    selector = compile(
+      "context-group[purpose=location]/context[context_type=SOURCEFILE]"
+    )
+    found = list(selector.select([self.location, self.other]))
+    self.assertEqual([context.value for context in found], ["main.c"])
+    self.assertEqual(found[0].context_type, CONTEXT_TYPE.SOURCEFILE)
+
+  def test_select_negation_and_alternatives(self) -> None:
+    roots = [self.location, self.other]
+    self.assertEqual(
+      [c.value for c in select("context[context_type!=sourcefile]", roots)], ["42"]
+    )
+    self.assertEqual(
+      [c.value for c in select("context[value=main.c|'other.c']", roots)],
+      ["main.c", "other.c"],
+    )
+
+  def test_select_existence_predicate(self) -> None:
+    roots = [self.location, self.other]
+    self.assertEqual([c.value for c in select("//context[crc]", roots)], ["other.c"])
+
+  def test_select_matches_root(self) -> None:
+    self.assertEqual(
+      list(select("/context-group[name=other]", self.other)), [self.other]
+    )
+    self.assertEqual(list(select("/context", self.other)), [])
+
+  def test_select_int_values(self) -> None:
+    group = CountGroup(
+      name="counts",
+      counts=[Count(value=3, count_type="total"), Count(value=7, count_type="total")],
+    )
+    self.assertEqual([c.value for c in select("count[value=7]", group)], [7])
+
+  def test_first(self) -> None:
+    selector = compile("context")
+    self.assertIs(selector.first(self.location), self.location.contexts[0])
+    self.assertIsNone(compile("count").first(self.location))
+
+  def test_iterselect_materializes_matches(self) -> None:
+    selector = compile("//group[restype=dialog]//context[context_type=sourcefile]")
+    found = list(selector.iterselect(DOCUMENT))
+    self.assertTrue(all(isinstance(context, Context) for context in found))
+    self.assertEqual([context.value for context in found], ["dialog.rc", "nested.rc"])
+
+  def test_iterselect_checks_last_step_on_complete_element(self) -> None:
+    selector = compile("context[match_mandatory=true][value=nested.rc]")
+    found = list(selector.iterselect(DOCUMENT))
+    self.assertEqual(len(found), 1)
+    self.assertTrue(found[0].match_mandatory)
+
+  def test_iterselect_raw_elements(self) -> None:
+    found = list(
+      compile("/xliff/file/body/group").iterselect(DOCUMENT, materialize_results=False)
+    )
+    self.assertEqual([element.get("id") for element in found], ["g1", "g3"])
+
+  def test_iterselect_groups(self) -> None:
+    # Group can't be built, groups are yielded as elements
+    found = list(compile("//group[restype=dialog]").iterselect(DOCUMENT))
+    self.assertEqual([element.get("id") for element in found], ["g1"])
+    self.assertTrue(all(isinstance(element, let._Element) for element in found))
+
+  def test_iterselect_namespaced_document(self) -> None:
+    document = DOCUMENT.replace(
+      b'<xliff version="1.2">',
+      f'<xliff version="1.2" xmlns="{XLIFF_NAMESPACE}">'.encode(),
+    )
+    selector = compile("//group[restype=dialog]//context[context_type=sourcefile]")
+    found = list(selector.iterselect(document))
+    self.assertTrue(all(isinstance(context, Context) for context in found))
+    self.assertEqual([context.value for context in found], ["dialog.rc", "nested.rc"])
+    groups = list(compile("context-group").iterselect(document))
+    self.assertTrue(all(isinstance(group, ContextGroup) for group in groups))
+    self.assertEqual(
+      [c.value for c in compile("context-group/context").select(groups)],
+      [c.value for c in compile("context-group/context").iterselect(DOCUMENT)],
+    )
+
+  def test_materialize_leaves_the_document_untouched(self) -> None:
+    element = let.fromstring(
+      f'<context xmlns="{XLIFF_NAMESPACE}" context-type="sourcefile">a.c</context>'
+    )
+    context = materialize(element)
+    self.assertIsInstance(context, Context)
+    self.assertEqual(context.value, "a.c")
+    self.assertEqual(element.tag, f"{{{XLIFF_NAMESPACE}}}context")
+    other = let.fromstring('<context xmlns="urn:other">a.c</context>')
+    self.assertIs(materialize(other), other)
+
+  def test_object_and_streaming_modes_agree(self) -> None:
+    selector = compile("context-group/context[context_type=sourcefile]")
+    streamed = [c.value for c in selector.iterselect(DOCUMENT)]
+    groups = list(compile("context-group").iterselect(DOCUMENT))
+    loaded = [c.value for c in selector.select(groups)]
+    self.assertEqual(streamed, loaded)
+
+
+class TestSelectorMalformed(unittest.TestCase):
+  def test_unknown_attribute_raises(self) -> None:
+    with self.assertRaises(ValueError):
+      compile("context[purpose=location]")
+
+  def test_syntax_errors_raise(self) -> None:
+    for selector in (
+      "",
+      "context/",
+      "context context",
+      "[crc]",
+      "context[crc",
+      "a///b",
+    ):
+      with self.subTest(selector=selector), self.assertRaises(ValueError):
+        compile(selector)
+
+  def test_value_predicate_on_inner_step_in_streaming_raises(self) -> None:
+    with self.assertRaises(ValueError):
+      next(compile("context[value=a]/x").iterselect(DOCUMENT))
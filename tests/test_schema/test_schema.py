@@ -0,0 +1,218 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from xliff.constants import CONTEXT_TYPE, COUNT_TYPE, PURPOSE, UNIT
+from xliff.named_groups import Context, ContextGroup
+from xliff.schema import (
+  SCHEMA_PATH,
+  XLIFF_NAMESPACE,
+  is_schema_valid,
+  load_schema,
+  schema_errors,
+)
+from xliff.validation import is_valid_document, iter_document_errors
+import lxml.etree as let
+
+_UNITS = (
+  '<trans-unit id="1"><source>Open</source>'
+  '<context-group name="a" purpose="location">'
+  '<context context-type="sourcefile">a.c</context>'
+  '<context context-type="linenumber" match-mandatory="yes">3</context>'
+  "</context-group></trans-unit>",
+  '<trans-unit id="2"><source>Save</source>'
+  '<context-group purpose="nowhere" crc="1">'
+  '<context context-type="bogus" match-mandatory="maybe">a.c</context>'
+  '<context context-type="x-custom"/>'
+  "</context-group>"
+  '<count-group name="counts"><count count-type="total" unit="word">3</count>'
+  '<count count-type="bogus" unit="x-unit" phase-name="p">4</count>'
+  '<count unit="parsec">5</count><count count-type="total">many</count>'
+  "</count-group></trans-unit>",
+  '<trans-unit id="3"><source>Close</source>'
+  '<prop-group><prop prop-type="author" xml:lang="fr">Jane</prop>'
+  "<prop>Nobody</prop><prop prop-type='empty'/></prop-group>"
+  '<prop-group name="ok"><prop prop-type="x">y</prop></prop-group></trans-unit>',
+)
+
+CORPUS = {
+  "valid": _UNITS[0],
+  "dirty": "".join(_UNITS),
+  "groups": f'<group id="g">{_UNITS[1]}<group id="i">{_UNITS[2]}</group></group>',
+}
+
+
+def _document(units: str, namespace: str = "") -> bytes:
+  xmlns = f' xmlns="{namespace}"' if namespace else ""
+  return (
+    f'<xliff version="1.2"{xmlns}><file original="a" datatype="plaintext">'
+    f'<header><count-group name="n"><count count-type="total">1</count>'
+    f"</count-group></header><body>{units}</body></file></xliff>"
+  ).encode()
+
+
+def _located(records) -> set:
+  return {
+    (record.path, record.tag, record.attribute, record.value) for record in records
+  }
+
+
+class TestSchema(unittest.TestCase):
+  def test_enumerations_match_the_library(self) -> None:
+    schema = let.parse(SCHEMA_PATH)
+    namespaces = {"xs": "http://www.w3.org/2001/XMLSchema"}
+    for name, enum in (
+      ("count-type", COUNT_TYPE),
+      ("unit", UNIT),
+      ("context-type", CONTEXT_TYPE),
+      ("purpose", PURPOSE),
+    ):
+      with self.subTest(name=name):
+        values = schema.xpath(
+          f"//xs:simpleType[@name='AttrType_{name}']//xs:enumeration/@value",
+          namespaces=namespaces,
+        )
+        self.assertEqual(sorted(values), sorted(member.value for member in enum))
+
+  def test_agrees_with_the_validators(self) -> None:
+    for name, units in CORPUS.items():
+      for namespace in ("", XLIFF_NAMESPACE):
+        with self.subTest(name=name, namespace=namespace):
+          document = _document(units, namespace)
+          self.assertEqual(
+            _located(schema_errors(document)),
+            _located(iter_document_errors(document)),
+          )
+          self.assertEqual(is_schema_valid(document), name == "valid")
+          self.assertEqual(
+            is_valid_document(document, schema_first=True),
+            is_valid_document(document),
+          )
+
+  def test_schema_first(self) -> None:
+    for name, units in CORPUS.items():
+      with self.subTest(name=name):
+        document = _document(units)
+        self.assertEqual(
+          list(iter_document_errors(io.BytesIO(document), schema_first=True)),
+          list(iter_document_errors(document)),
+        )
+
+  def test_mixed_namespaces(self) -> None:
+    invalid = '<count count-type="bogus">many</count>'
+    for namespace, units in (
+      (XLIFF_NAMESPACE, f'<count-group name="c" xmlns="">{invalid}</count-group>'),
+      (
+        XLIFF_NAMESPACE,
+        '<o:count-group name="c" xmlns:o="urn:other">'
+        '<o:count count-type="bogus">many</o:count></o:count-group>',
+      ),
+      (
+        "",
+        f'<o:count-group name="c" xmlns:o="{XLIFF_NAMESPACE}">'
+        '<o:count count-type="bogus">many</o:count></o:count-group>',
+      ),
+    ):
+      with self.subTest(namespace=namespace, units=units):
+        document = _document(f'<trans-unit id="1">{units}</trans-unit>', namespace)
+        self.assertEqual(len(list(iter_document_errors(document))), 2)
+        self.assertEqual(
+          list(iter_document_errors(document, schema_first=True)),
+          list(iter_document_errors(document)),
+        )
+        self.assertFalse(is_valid_document(document, schema_first=True))
+
+  def test_records(self) -> None:
+    records = schema_errors(_document(_UNITS[2], XLIFF_NAMESPACE))
+    self.assertEqual(
+      [(record.path, record.attribute, record.value) for record in records],
+      [
+        ("xliff[1]/file[1]/body[1]/trans-unit[1]/prop-group[1]", "name", None),
+        (
+          "xliff[1]/file[1]/body[1]/trans-unit[1]/prop-group[1]/prop[2]",
+          "prop_type",
+          None,
+        ),
+        ("xliff[1]/file[1]/body[1]/trans-unit[1]/prop-group[1]/prop[3]", "value", None),
+      ],
+    )
+    self.assertEqual(records[0].expected, "str")
+    self.assertEqual(records[0].kind, "SCHEMAV_CVC_COMPLEX_TYPE_4")
+    self.assertIn("'name' is required", records[0].reason)
+
+  def test_sources(self) -> None:
+    document = _document(_UNITS[1])
+    with tempfile.TemporaryDirectory() as directory:
+      path = Path(directory) / "document.xlf"
+      path.write_bytes(document)
+      expected = schema_errors(document)
+      self.assertTrue(expected)
+      self.assertEqual(schema_errors(path), expected)
+      self.assertEqual(schema_errors(str(path)), expected)
+      self.assertEqual(schema_errors(io.BytesIO(document)), expected)
+      self.assertEqual(schema_errors(let.parse(path)), expected)
+
+  def test_elements(self) -> None:
+    group = ContextGroup(
+      name="g", contexts=[Context(value="a.c", context_type="sourcefile")]
+    )
+    self.assertTrue(is_schema_valid(group.to_element()))
+    element = let.fromstring(_document(_UNITS[1]))
+    (context_group,) = element.iter("context-group")
+    self.assertEqual(
+      [record.path for record in schema_errors(context_group)],
+      [
+        "context-group[1]",
+        "context-group[1]/context[1]",
+        "context-group[1]/context[1]",
+        "context-group[1]/context[2]",
+      ],
+    )
+
+  def test_schemas_are_loaded_once(self) -> None:
+    self.assertIs(load_schema(), load_schema())
+    self.assertIsNot(load_schema(), load_schema(namespaced=False))
+
+
+class TestSchemaMalformedData(unittest.TestCase):
+  def test_unexpected_child(self) -> None:
+    (record,) = schema_errors(
+      b'<count-group name="a"><count count-type="total">1</count><foo/></count-group>'
+    )
+    self.assertEqual((record.path, record.tag), ("count-group[1]/foo[1]", "foo"))
+    self.assertEqual((record.attribute, record.value), ("", None))
+    self.assertEqual(record.kind, "SCHEMAV_ELEMENT_CONTENT")
+
+  def test_malformed_xml(self) -> None:
+    with self.assertRaises(let.XMLSyntaxError):
+      schema_errors(b"<xliff><file></xliff>")
+
+  def test_padded_values(self) -> None:
+    document = _document(
+      '<trans-unit id="1"><source>Open</source><context-group name="a">'
+      '<context context-type="sourcefile" match-mandatory=" yes ">a.c</context>'
+      "</context-group></trans-unit>"
+    )
+    errors = list(iter_document_errors(document))
+    self.assertEqual(
+      [(record.attribute, record.value) for record in errors],
+      [("match_mandatory", " yes ")],
+    )
+    self.assertEqual(_located(schema_errors(document)), _located(errors))
+    self.assertEqual(list(iter_document_errors(document, schema_first=True)), errors)
+    self.assertFalse(is_valid_document(document, schema_first=True))
+    # No simple type collapses whitespace
+    bases = let.parse(SCHEMA_PATH).xpath(
+      "//xs:simpleType/xs:restriction/@base",
+      namespaces={"xs": "http://www.w3.org/2001/XMLSchema"},
+    )
+    self.assertEqual(set(bases), {"xs:string"})
+
+  def test_numbers_the_schema_rejects(self) -> None:
+    document = _document(
+      '<trans-unit id="1"><source>Open</source><count-group name="c">'
+      '<count count-type="total">1_000</count></count-group></trans-unit>'
+    )
+    self.assertTrue(schema_errors(document))
+    self.assertEqual(list(iter_document_errors(document, schema_first=True)), [])
+    self.assertTrue(is_valid_document(document, schema_first=True))
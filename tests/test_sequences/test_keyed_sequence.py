@@ -0,0 +1,110 @@
+import unittest
+import warnings
+from xliff.constants import CONTEXT_TYPE
+from xliff.named_groups import Context, ContextGroup, Prop, PropGroup
+from xliff.sequences import KeyedSequence
+import lxml.etree as let
+
+
+class TestKeyedSequence(unittest.TestCase):
+  def setUp(self) -> None:
+    self.sequence = KeyedSequence(["apple", "avocado", "banana"], key=lambda s: s[0])
+
+  def test_lookup(self) -> None:
+    self.assertEqual(self.sequence.by_key["a"], "apple")
+    self.assertEqual(self.sequence.by_key.getall("a"), ["apple", "avocado"])
+    self.assertEqual(self.sequence.by_key.getall("z"), [])
+    self.assertIsNone(self.sequence.by_key.get("z"))
+    self.assertEqual(list(self.sequence.by_key), ["a", "b"])
+
+  def test_mutations_keep_the_index_consistent(self) -> None:
+    by_key = self.sequence.by_key
+    self.assertEqual(by_key["b"], "banana")
+    self.sequence.append("blueberry")
+    self.assertEqual(by_key.getall("b"), ["banana", "blueberry"])
+    self.sequence.insert(0, "bilberry")
+    self.assertEqual(by_key["b"], "bilberry")
+    del self.sequence[0]
+    self.sequence.remove("apple")
+    self.assertEqual(by_key["a"], "avocado")
+    self.sequence[0] = "cherry"
+    self.assertNotIn("a", by_key)
+    self.sequence.extend(["date", "apricot"])
+    self.sequence.reverse()
+    self.assertEqual(
+      self.sequence, ["apricot", "date", "blueberry", "banana", "cherry"]
+    )
+    self.assertEqual(by_key.getall("b"), ["blueberry", "banana"])
+    self.sequence.pop()
+    self.assertNotIn("c", by_key)
+    self.sequence.clear()
+    self.assertEqual(len(by_key), 0)
+
+  def test_reindex(self) -> None:
+    items = [["a"], ["b"]]
+    sequence = KeyedSequence(items, key=lambda item: item[0])
+    self.assertEqual(sequence.by_key["a"], ["a"])
+    items[0][0] = "c"
+    sequence.reindex()
+    self.assertEqual(sequence.by_key["c"], ["c"])
+    self.assertNotIn("a", sequence.by_key)
+
+
+class TestGroupsByType(unittest.TestCase):
+  def test_context_group(self) -> None:
+    group = ContextGroup(
+      contexts=[
+        Context(value="main.c", context_type=CONTEXT_TYPE.SOURCEFILE),
+        Context(value="12", context_type="linenumber"),
+        Context(value="other.c", context_type="sourcefile"),
+      ]
+    )
+    self.assertEqual(group.by_type[CONTEXT_TYPE.SOURCEFILE].value, "main.c")
+    self.assertEqual(group.by_type["linenumber"].value, "12")
+    self.assertEqual(
+      [context.value for context in group.by_type.getall("sourcefile")],
+      ["main.c", "other.c"],
+    )
+    group.contexts.insert(0, Context(value="x", context_type="x-custom"))
+    self.assertEqual(group.by_type["x-custom"].value, "x")
+    self.assertEqual(
+      [element.text for element in group.to_element()], ["x", "main.c", "12", "other.c"]
+    )
+
+  def test_parsed_context_group(self) -> None:
+    element = let.fromstring(
+      '<context-group><context context-type="element">Menu</context></context-group>'
+    )
+    group = ContextGroup(source_element=element)
+    self.assertEqual(group.by_type[CONTEXT_TYPE.ELEMENT].value, "Menu")
+    group.contexts = []
+    self.assertNotIn("element", group.by_type)
+
+  def test_prop_group(self) -> None:
+    group = PropGroup(
+      name="meta",
+      props=[
+        Prop(value="Jane", prop_type="x-author"),
+        Prop(value="2024", prop_type="x-year"),
+      ],
+    )
+    self.assertEqual(group.by_type["x-author"].value, "Jane")
+    group.props.remove(group.by_type["x-author"])
+    self.assertNotIn("x-author", group.by_type)
+    group.props.append(Prop(value="John", prop_type="x-author"))
+    self.assertEqual(group.by_type["x-author"].value, "John")
+    self.assertEqual(
+      [prop.get("prop-type") for prop in group.to_element()], ["x-year", "x-author"]
+    )
+
+
+class TestGroupsByTypeMalformedData(unittest.TestCase):
+  def test_missing_type(self) -> None:
+    with warnings.catch_warnings():
+      warnings.simplefilter("ignore")
+      group = PropGroup(
+        source_element=let.fromstring("<prop-group><prop>value</prop></prop-group>")
+      )
+    self.assertEqual(group.by_type[None].value, "value")
+    with self.assertRaises(KeyError):
+      group.by_type["x-author"]
@@ -0,0 +1,74 @@
+import unittest
+from xliff.errors import ValidationError
+from xliff.named_groups import Context, ContextGroup, Count, CountGroup, Prop, PropGroup
+from xliff.serialization import to_bytes
+import lxml.etree as let
+
+
+def _context_group(contexts: int) -> ContextGroup:
+  return ContextGroup(
+    name="location",
+    purpose="location",
+    contexts=[
+      Context(value=f"fichier-é-{index} & <co>", context_type="sourcefile")
+      for index in range(contexts)
+    ],
+  )
+
+
+class TestToBytes(unittest.TestCase):
+  def test_sequential(self) -> None:
+    group = _context_group(3)
+    self.assertEqual(
+      to_bytes(group), let.tostring(group.to_element(), encoding="UTF-8")
+    )
+
+  def test_parallel_output_is_identical(self) -> None:
+    objects = [
+      _context_group(50),
+      CountGroup(
+        name="counts",
+        counts=[Count(value=index, count_type="total") for index in range(17)],
+      ),
+      PropGroup(
+        name="meta",
+        props=[Prop(value="Jane", prop_type="x-author", lang="fr")] * 5,
+      ),
+      _context_group(0),
+      _context_group(1),
+      Context(value="main.c", context_type="sourcefile"),
+    ]
+    for obj in objects:
+      for encoding in ("UTF-8", "ISO-8859-1", "ASCII", "UTF-16", "UTF-32"):
+        expected = to_bytes(obj, encoding=encoding)
+        for workers, chunk_size in ((2, None), (4, 1), (3, 7)):
+          with self.subTest(obj=obj, encoding=encoding, workers=workers):
+            self.assertEqual(
+              to_bytes(obj, workers=workers, chunk_size=chunk_size, encoding=encoding),
+              expected,
+            )
+
+  def test_parallel_utf_16(self) -> None:
+    group = _context_group(20)
+    serialized = to_bytes(group, workers=4, chunk_size=3, encoding="UTF-16")
+    self.assertEqual(serialized, to_bytes(group, encoding="UTF-16"))
+    # A single byte order mark, for the whole document
+    self.assertEqual(
+      serialized.decode("UTF-16"), to_bytes(group, workers=4).decode("UTF-8")
+    )
+
+
+class TestToBytesMalformedData(unittest.TestCase):
+  def test_invalid_child(self) -> None:
+    group = _context_group(10)
+    group.contexts[7].value = 7  # type: ignore
+    for workers in (None, 4):
+      with self.subTest(workers=workers):
+        with self.assertRaises(ValidationError):
+          to_bytes(group, workers=workers)
+
+  def test_invalid_arguments(self) -> None:
+    with self.assertRaises(ValueError):
+      to_bytes(_context_group(2), workers=0)
+    with self.assertRaises(ValueError):
+      to_bytes(_context_group(2), workers=2, chunk_size=0)
@@ -0,0 +1,103 @@
+import tempfile
+import unittest
+from io import BytesIO
+from pathlib import Path
+from lxml.etree import fromstring, parse, tostring
+from xliff.sharding import merge, split, unit_word_count
+
+DOCUMENT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2">
+  <file original="a.rc" source-language="en"><header><note>Header</note></header>
+    <body>
+      <group id="g1" restype="dialog">
+        <context-group name="ctx"><context context-type="sourcefile">a.rc</context></context-group>
+        <trans-unit id="1"><source>One two three</source></trans-unit>
+        <trans-unit id="2"><source>One two three four</source></trans-unit>
+        <group id="empty"/>
+        <group id="g2">
+          <prop-group name="props"><prop prop-type="x-author">Me</prop></prop-group>
+          <trans-unit id="3"><source>Short</source><count-group name="words"><count count-type="total" unit="word">9</count></count-group></trans-unit>
+          <trans-unit id="4"><source>Five words are in here</source></trans-unit>
+        </group>
+      </group>
+      <trans-unit id="5"><source>Last unit of the file</source></trans-unit>
+    </body>
+  </file>
+  <file original="b.rc"><body><trans-unit id="6"><source>Other file</source></trans-unit></body></file>
+</xliff>"""
+
+
+def ids(path: Path) -> list[str]:
+  return [unit.get("id") for unit in parse(str(path)).iter("{*}trans-unit")]
+
+
+class TestUnitWordCount(unittest.TestCase):
+  def test_uses_count_when_present(self) -> None:
+    unit = fromstring(
+      b'<trans-unit id="1"><source>Short</source><count-group name="c">'
+      b'<count count-type="total">9</count></count-group></trans-unit>'
+    )
+    self.assertEqual(unit_word_count(unit), 9)
+
+  def test_estimates_from_source(self) -> None:
+    unit = fromstring(
+      b'<trans-unit id="1"><source>A <g id="1">b</g> c</source></trans-unit>'
+    )
+    self.assertEqual(unit_word_count(unit), 3)
+
+
+class TestSplitMerge(unittest.TestCase):
+  def setUp(self) -> None:
+    self.directory = tempfile.TemporaryDirectory()
+    self.path = Path(self.directory.name)
+    self.expected = tostring(
+      parse(BytesIO(DOCUMENT)), xml_declaration=True, encoding="UTF-8"
+    )
+
+  def tearDown(self) -> None:
+    self.directory.cleanup()
+
+  def test_round_trip_is_lossless(self) -> None:
+    for shards in (1, 2, 3, 4, 10):
+      with self.subTest(shards=shards):
+        paths = split(DOCUMENT, shards, self.path / str(shards), name="{index}.xlf")
+        output = BytesIO()
+        merge(paths, output)
+        self.assertEqual(output.getvalue(), self.expected)
+
+  def test_shards_are_contiguous_and_balanced(self) -> None:
+    paths = split(DOCUMENT, 3, self.path)
+    self.assertEqual(len(paths), 3)
+    units = [ids(path) for path in paths]
+    self.assertEqual(sum(units, []), ["1", "2", "3", "4", "5", "6"])
+    self.assertEqual(units[0], ["1", "2"])
+
+  def test_shards_keep_hierarchy_and_named_groups(self) -> None:
+    paths = split(DOCUMENT, 3, self.path)
+    for path in paths:
+      for file in parse(str(path)).iterfind("{*}file[@original='a.rc']"):
+        self.assertIsNotNone(file.find("{*}header"))
+    second = parse(str(paths[1]))
+    self.assertIsNotNone(second.find(".//{*}group[@id='g1']/{*}context-group"))
+    self.assertIsNotNone(second.find(".//{*}group[@id='g2']/{*}prop-group"))
+
+  def test_merge_keeps_modifications(self) -> None:
+    paths = split(DOCUMENT, 2, self.path)
+    tree = parse(str(paths[1]))
+    unit = tree.find(".//{*}trans-unit[@id='5']")
+    target = unit.makeelement(unit.tag.replace("trans-unit", "target"), {})
+    target.text = "Dernière unité"
+    unit.append(target)
+    tree.write(str(paths[1]), xml_declaration=True, encoding="UTF-8")
+    output = BytesIO()
+    merge(paths, output)
+    merged = fromstring(output.getvalue())
+    self.assertEqual(
+      merged.find(".//{*}trans-unit[@id='5']/{*}target").text, "Dernière unité"
+    )
+    self.assertEqual(len(merged.findall(".//{*}trans-unit")), 6)
+    self.assertEqual(len(merged.findall(".//{*}group")), 3)
+
+  def test_invalid_shard_count_raises(self) -> None:
+    with self.assertRaises(ValueError):
+      split(DOCUMENT, 0, self.path)
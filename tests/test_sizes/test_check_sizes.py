@@ -0,0 +1,69 @@
+import unittest
+from xliff.sizes import Violation, check_sizes
+
+DOCUMENT = """<xliff version="1.2">
+  <file original="app.rc" source-language="en">
+    <body>
+      <group id="g1" maxbytes="6" size-unit="char" maxwidth="5">
+        <trans-unit id="1"><source>a</source><target>Annuler</target></trans-unit>
+        <trans-unit id="2"><source>b</source><target>été</target></trans-unit>
+        <group id="g2" maxbytes="20" minbytes="4">
+          <trans-unit id="3"><source>c</source><target>Oui</target></trans-unit>
+          <trans-unit id="4" maxwidth="10"><source>d</source><target>Fermer</target></trans-unit>
+        </group>
+      </group>
+      <trans-unit id="5"><source>e</source><target>Not checked at all</target></trans-unit>
+      <group id="g3" size-unit="row" maxheight="1" maxwidth="1">
+        <trans-unit id="6"><source>f</source><target>One
+Two</target></trans-unit>
+      </group>
+      <group id="g4" size-unit="glyph" maxwidth="3">
+        <trans-unit id="7"><source>g</source><target>été</target></trans-unit>
+        <trans-unit id="8"><source>h</source><target>abcd</target></trans-unit>
+      </group>
+      <group id="g5" maxwidth="1">
+        <trans-unit id="9"><source>i</source><target>In pixels</target></trans-unit>
+      </group>
+    </body>
+  </file>
+</xliff>""".encode()
+
+
+class TestCheckSizes(unittest.TestCase):
+  def test_inherited_limits(self) -> None:
+    self.assertEqual(
+      check_sizes(DOCUMENT),
+      [
+        Violation("app.rc", "1", "maxbytes", 6, 7, "utf-8"),
+        Violation("app.rc", "1", "maxwidth", 5, 7),
+        Violation("app.rc", "3", "minbytes", 4, 3, "utf-8"),
+        Violation("app.rc", "6", "maxheight", 1, 2),
+        Violation("app.rc", "8", "maxwidth", 3, 4),
+      ],
+    )
+
+  def test_several_encodings(self) -> None:
+    violations = check_sizes(DOCUMENT, encodings=("latin-1", "utf-16-le", "ascii"))
+    found = {(v.id, v.constraint, v.encoding): v.actual for v in violations}
+    self.assertNotIn(("2", "maxbytes", "utf-16-le"), found)
+    self.assertNotIn(("2", "maxbytes", "latin-1"), found)
+    self.assertIn(("2", "encoding", "ascii"), found)
+    self.assertEqual(found[("1", "maxbytes", "utf-16-le")], 14)
+
+  def test_batches_give_the_same_result(self) -> None:
+    self.assertEqual(check_sizes(DOCUMENT, batch_size=1), check_sizes(DOCUMENT))
+
+
+class TestCheckSizesMalformedData(unittest.TestCase):
+  def test_invalid_arguments_raise(self) -> None:
+    with self.assertRaises(ValueError):
+      check_sizes(DOCUMENT, encodings=())
+    with self.assertRaises(ValueError):
+      check_sizes(DOCUMENT, batch_size=0)
+
+  def test_invalid_limit_is_ignored(self) -> None:
+    document = (
+      b'<xliff><file original="a"><body><trans-unit id="1" maxbytes="many">'
+      b"<source>a</source><target>b</target></trans-unit></body></file></xliff>"
+    )
+    self.assertEqual(check_sizes(document), [])
@@ -0,0 +1,71 @@
+import unittest
+from io import BytesIO
+from lxml.etree import parse, tostring
+from xliff.streaming import XliffWriter, iter_sections
+
+DOCUMENT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<!-- leading comment -->
+<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:x="urn:x" version="1.2">
+  <file original="a&amp;b" x:extra="1"><header><note>Header</note></header>
+    <body>
+      <group id="g1">
+        <context-group><context context-type="sourcefile">a&lt;b</context></context-group>
+        <trans-unit id="1" xml:space="preserve"><source>A &gt; B</source></trans-unit>
+        <!-- between units -->
+        <group id="empty"/>
+      </group>
+    </body>
+  </file>
+</xliff>
+<?trailing pi?>"""
+
+
+def copy(document: bytes) -> bytes:
+  output = BytesIO()
+  with XliffWriter(output) as writer:
+    for event, value in iter_sections(document):
+      writer.write_event(event, value)
+  return output.getvalue()
+
+
+class TestIterSections(unittest.TestCase):
+  def test_events(self) -> None:
+    events = [
+      (event, value if event == "text" else value.get("id") or value.get("original"))
+      for event, value in iter_sections(DOCUMENT)
+      if event != "text" or value.strip()
+    ]
+    opened = [value for event, value in events if event == "open"]
+    self.assertEqual(opened, [None, "a&b", None, "g1", "empty"])
+    leaves = [value for event, value in events if event == "leaf"]
+    self.assertIn("1", leaves)
+    self.assertEqual(len([event for event, _ in events if event == "close"]), 5)
+
+  def test_copy_is_identical_to_lxml_serialization(self) -> None:
+    expected = tostring(
+      parse(BytesIO(DOCUMENT)), xml_declaration=True, encoding="UTF-8"
+    )
+    self.assertEqual(copy(DOCUMENT), expected)
+
+  def test_leaves_do_not_redeclare_namespaces(self) -> None:
+    self.assertNotIn(b'<trans-unit xmlns="', copy(DOCUMENT))
+
+
+class TestXliffWriter(unittest.TestCase):
+  def test_write_from_scratch(self) -> None:
+    output = BytesIO()
+    with XliffWriter(output, xml_declaration=False) as writer:
+      writer.open("xliff", {"version": "1.2"}, {None: "urn:x"})
+      writer.open("{urn:x}file", {"original": 'a"b'})
+      writer.text("\n")
+      writer.open("{urn:x}body")
+      writer.close()
+    self.assertEqual(
+      output.getvalue(),
+      b'<xliff xmlns="urn:x" version="1.2"><file original="a&quot;b">\n<body/>'
+      b"</file></xliff>",
+    )
+
+  def test_undeclared_namespace_raises(self) -> None:
+    with self.assertRaises(ValueError), XliffWriter(BytesIO()) as writer:
+      writer.open("{urn:unknown}xliff")
@@ -0,0 +1,205 @@
+import io
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from xliff.constants import VALIDATION_LEVEL
+from xliff.errors import ValidationError
+from xliff.named_groups import Context, ContextGroup, CountGroup
+from xliff.serialization import to_bytes
+from xliff.streaming import XLIFF_NAMESPACE, load
+from xliff.tracing import (
+  JsonLinesTracer,
+  Span,
+  Tracer,
+  get_tracer,
+  set_tracer,
+  span,
+  tracing,
+)
+import warnings
+
+_DOCUMENT = (
+  b'<xliff version="1.2"><file original="a" datatype="plaintext"><body>'
+  b'<group id="g"><trans-unit id="1"><source>Open</source>'
+  b'<context-group name="a"><context context-type="sourcefile">a.c</context>'
+  b'<context context-type="linenumber">3</context></context-group></trans-unit>'
+  b"</group>"
+  b'<count-group name="c"><count count-type="total">1</count></count-group>'
+  b"</body></file></xliff>"
+)
+
+
+class _Collector(Tracer):
+  recording = True
+
+  def __init__(self) -> None:
+    self.spans: list[Span] = []
+
+  def export(self, span: Span) -> None:
+    self.spans.append(span)
+
+  def named(self, name: str) -> list[Span]:
+    return [span for span in self.spans if span.name == name]
+
+
+def _group(contexts: int = 3) -> ContextGroup:
+  return ContextGroup(
+    name="g",
+    contexts=[
+      Context(value=f"{i}.c", context_type="sourcefile") for i in range(contexts)
+    ],
+  )
+
+
+class TestTracing(unittest.TestCase):
+  def test_not_traced_by_default(self) -> None:
+    self.assertFalse(get_tracer().recording)
+    with span("parse") as current:
+      self.assertFalse(current.recording)
+      current.set("bytes", 1)
+
+  def test_load(self) -> None:
+    collector = _Collector()
+    with tracing(collector):
+      objects = load(_DOCUMENT)
+    self.assertEqual([type(obj) for obj in objects], [ContextGroup, CountGroup])
+    self.assertEqual(
+      [span.name for span in collector.spans], ["parse", "construct", "load"]
+    )
+    parse, construct, root = collector.spans
+    self.assertEqual(parse.attributes, {"bytes": len(_DOCUMENT), "elements": 11})
+    self.assertEqual(construct.attributes, {"objects": 2})
+    self.assertEqual((parse.parent_id, construct.parent_id), (root.span_id,) * 2)
+    self.assertIsNone(root.parent_id)
+    self.assertEqual({span.trace_id for span in collector.spans}, {root.span_id})
+    self.assertGreaterEqual(root.duration, parse.duration + construct.duration)
+
+  def test_load_namespaced_document(self) -> None:
+    document = _DOCUMENT.replace(
+      b'<xliff version="1.2">',
+      f'<xliff version="1.2" xmlns="{XLIFF_NAMESPACE}">'.encode(),
+    )
+    objects = load(document)
+    self.assertEqual([type(obj) for obj in objects], [ContextGroup, CountGroup])
+    self.assertEqual(
+      [obj.to_element().tag for obj in objects], ["context-group", "count-group"]
+    )
+    self.assertEqual(
+      [context.value for context in objects[0].contexts],
+      [context.value for context in load(_DOCUMENT)[0].contexts],
+    )
+    # Elements in another namespace are not built
+    other = _DOCUMENT.replace(b'<xliff version="1.2">', b'<xliff xmlns="urn:other">')
+    self.assertEqual(load(other), [])
+
+  def test_load_sources(self) -> None:
+    collector = _Collector()
+    with tempfile.TemporaryDirectory() as directory:
+      path = Path(directory) / "document.xlf"
+      path.write_bytes(_DOCUMENT)
+      with tracing(collector):
+        load(path)
+        load(str(path))
+        load(io.BytesIO(_DOCUMENT))
+    self.assertEqual(
+      [span.attributes["bytes"] for span in collector.named("parse")],
+      [len(_DOCUMENT)] * 3,
+    )
+
+  def test_serialize_is_traced_once(self) -> None:
+    collector = _Collector()
+    with tracing(collector):
+      _group().to_element()
+    self.assertEqual([span.name for span in collector.spans], ["validate", "serialize"])
+    validate, serialize = collector.spans
+    self.assertEqual(serialize.attributes, {"object": "ContextGroup", "elements": 4})
+    self.assertEqual(validate.attributes, {"object": "ContextGroup", "recurse": True})
+    self.assertEqual(validate.parent_id, serialize.span_id)
+
+  def test_lazy_validation_is_not_traced_per_object(self) -> None:
+    collector = _Collector()
+    with tracing(collector):
+      _group().to_element(validation=VALIDATION_LEVEL.LAZY)
+    self.assertEqual([span.name for span in collector.spans], ["serialize"])
+
+  def test_to_bytes_in_threads(self) -> None:
+    collector = _Collector()
+    group = _group(20)
+    with tracing(collector):
+      serialized = to_bytes(group, workers=4, chunk_size=2)
+    self.assertEqual(serialized, to_bytes(group))
+    (serialize,) = collector.named("serialize")
+    self.assertEqual(serialize.attributes["bytes"], len(serialized))
+    self.assertEqual(serialize.attributes["workers"], 4)
+    self.assertEqual(
+      {span.parent_id for span in collector.named("validate")}, {serialize.span_id}
+    )
+
+  def test_global_tracer(self) -> None:
+    collector = _Collector()
+    set_tracer(collector)
+    try:
+      thread = threading.Thread(target=_group().validate)
+      thread.start()
+      thread.join()
+    finally:
+      set_tracer(None)
+    self.assertEqual([span.name for span in collector.spans], ["validate"])
+    self.assertFalse(get_tracer().recording)
+
+  def test_nested_blocks(self) -> None:
+    outer, inner = _Collector(), _Collector()
+    with tracing(outer):
+      with tracing(inner):
+        _group().validate()
+      _group().validate()
+    self.assertEqual((len(outer.spans), len(inner.spans)), (1, 1))
+
+  def test_json_lines(self) -> None:
+    output = io.StringIO()
+    with tracing(JsonLinesTracer(output)) as tracer:
+      load(_DOCUMENT)
+    tracer.close()
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    self.assertEqual([line["name"] for line in lines], ["parse", "construct", "load"])
+    self.assertEqual(
+      set(lines[0]),
+      {
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "duration",
+        "attributes",
+        "error",
+      },
+    )
+    self.assertEqual(lines[0]["attributes"]["elements"], 11)
+
+  def test_json_lines_to_a_path(self) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+      path = Path(directory) / "spans.jsonl"
+      for _ in range(2):
+        with JsonLinesTracer(path) as tracer, tracing(tracer):
+          _group().validate()
+      self.assertEqual(len(path.read_text().splitlines()), 2)
+
+
+class TestTracingMalformedData(unittest.TestCase):
+  def test_failed_phase(self) -> None:
+    collector = _Collector()
+    with warnings.catch_warnings():
+      warnings.simplefilter("ignore")
+      group = ContextGroup(
+        name="g", contexts=[Context(value="a.c", context_type="bogus")]
+      )
+    with tracing(collector), self.assertRaises(ValidationError):
+      group.to_element()
+    self.assertEqual(
+      [(span.name, span.error) for span in collector.spans],
+      [("validate", "ValidationError"), ("serialize", "ValidationError")],
+    )
+    self.assertTrue(all(span.duration is not None for span in collector.spans))
@@ -0,0 +1,134 @@
+import io
+import unittest
+import warnings
+from xliff.errors import ValidationErrorGroup
+from xliff.streaming import ELEMENT_CLASSES
+from xliff.validation import is_valid_document, iter_document_errors, validate_stream
+import lxml.etree as let
+
+_UNITS = (
+  '<trans-unit id="1"><source>Open</source>'
+  '<context-group name="a" purpose="location">'
+  '<context context-type="sourcefile">a.c</context>'
+  '<context context-type="linenumber" match-mandatory="yes">3</context>'
+  "</context-group></trans-unit>",
+  '<trans-unit id="2"><source>Save</source>'
+  '<context-group purpose="nowhere" crc="1">'
+  '<context context-type="bogus" match-mandatory="maybe">a.c</context>'
+  '<context context-type="x-custom"/>'
+  "</context-group>"
+  '<count-group name="counts"><count count-type="total" unit="word">3</count>'
+  '<count count-type="bogus" unit="x-unit" phase-name="p">4</count>'
+  '<count unit="parsec">5</count></count-group></trans-unit>',
+  '<trans-unit id="3"><source>Close</source>'
+  '<prop-group><prop prop-type="author" xml:lang="fr">Jane</prop>'
+  "<prop>Nobody</prop><prop prop-type='empty'/></prop-group>"
+  '<prop-group name="ok"><prop prop-type="x">y</prop></prop-group></trans-unit>',
+)
+
+CORPUS = {
+  "valid": _UNITS[0],
+  "dirty": "".join(_UNITS),
+  "repeated": "".join(_UNITS * 5),
+  "groups": f'<group id="g" restype="bogus">{_UNITS[1]}</group>'
+  f'<group id="h">{"".join(_UNITS)}<group id="i">{_UNITS[2]}</group></group>',
+}
+
+
+def _document(units: str, namespace: str = "") -> bytes:
+  xmlns = f' xmlns="{namespace}"' if namespace else ""
+  return (
+    f'<xliff version="1.2"{xmlns}><file original="a" datatype="plaintext">'
+    f"<header><count-group><count count-type='total'>1</count></count-group>"
+    f"</header><body>{units}</body></file></xliff>"
+  ).encode()
+
+
+class TestDocumentValidation(unittest.TestCase):
+  def test_agrees_with_validate_stream(self) -> None:
+    for name, units in CORPUS.items():
+      for namespace in ("", "urn:oasis:names:tc:xliff:document:1.2"):
+        with self.subTest(name=name, namespace=namespace):
+          document = _document(units, namespace)
+          self.assertEqual(
+            list(iter_document_errors(io.BytesIO(document))),
+            validate_stream(io.BytesIO(document), workers=1),
+          )
+
+  def test_agrees_with_validate(self) -> None:
+    for name, units in CORPUS.items():
+      with self.subTest(name=name):
+        document = _document(units)
+        expected = []
+        root = let.fromstring(document)
+        # Only the outermost objects, validate recurses into the others
+        for element in root.iter(*ELEMENT_CLASSES):
+          if element.getparent().tag in ELEMENT_CLASSES or element.tag == "group":
+            continue
+          with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            obj = ELEMENT_CLASSES[element.tag](source_element=element)
+          try:
+            obj.validate(gather_all_errors=True)
+          except ValidationErrorGroup as e:
+            expected.extend(
+              (error.details["attribute"], error.details["value"])
+              for _, error in e.errors
+            )
+        self.assertEqual(
+          [
+            (record.attribute, record.value)
+            for record in iter_document_errors(document)
+          ],
+          expected,
+        )
+
+  def test_records(self) -> None:
+    records = list(iter_document_errors(_document(_UNITS[1])))
+    self.assertEqual(
+      [(record.path, record.attribute, record.kind) for record in records[:4]],
+      [
+        (
+          "xliff[1]/file[1]/header[1]/count-group[1]",
+          "name",
+          "TypeError",
+        ),
+        (
+          "xliff[1]/file[1]/body[1]/trans-unit[1]/context-group[1]",
+          "purpose",
+          "ValueError",
+        ),
+        (
+          "xliff[1]/file[1]/body[1]/trans-unit[1]/context-group[1]/context[1]",
+          "context_type",
+          "ValueError",
+        ),
+        (
+          "xliff[1]/file[1]/body[1]/trans-unit[1]/context-group[1]/context[1]",
+          "match_mandatory",
+          "TypeError",
+        ),
+      ],
+    )
+    self.assertEqual(records[3].value, "maybe")
+    self.assertEqual(records[3].tag, "context")
+
+  def test_is_valid_document(self) -> None:
+    valid = _document(_UNITS[0]).replace(b"<count-group>", b'<count-group name="n">')
+    self.assertTrue(is_valid_document(valid))
+    self.assertFalse(is_valid_document(_document(_UNITS[0])))
+
+
+class TestDocumentValidationMalformedData(unittest.TestCase):
+  def test_count_value_is_not_a_number(self) -> None:
+    document = _document(
+      '<trans-unit id="1"><source>a</source><count-group name="c">'
+      '<count count-type="total">many</count></count-group></trans-unit>'
+    )
+    (*_, record) = iter_document_errors(document)
+    self.assertEqual((record.attribute, record.value), ("value", "many"))
+    self.assertEqual(record.kind, "TypeError")
+
+  def test_malformed_xml(self) -> None:
+    with self.assertRaises(let.XMLSyntaxError):
+      list(iter_document_errors(b"<xliff><file></xliff>"))
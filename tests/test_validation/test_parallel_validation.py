@@ -0,0 +1,172 @@
+import io
+import pickle
+import unittest
+from xliff.errors import ValidationErrorGroup
+from xliff.named_groups import (
+  Context,
+  ContextGroup,
+  Count,
+  CountGroup,
+  ColumnarCountGroup,
+  Prop,
+  PropGroup,
+)
+from xliff.validation import (
+  ErrorRecord,
+  collect_errors,
+  validate_parallel,
+  validate_stream,
+)
+
+
+def _context_group(contexts: int, *, invalid_every: int = 3) -> ContextGroup:
+  return ContextGroup(
+    name="location",
+    purpose="location",
+    contexts=[
+      Context(
+        value=f"file-{index}.c",
+        context_type="bogus"
+        if invalid_every and index % invalid_every == 0
+        else "sourcefile",
+      )
+      for index in range(contexts)
+    ],
+  )
+
+
+def _document(units: int) -> bytes:
+  parts = ['<xliff version="1.2"><file original="a" datatype="plaintext"><body>']
+  for index in range(units):
+    context_type = "bogus" if index % 4 == 0 else "sourcefile"
+    parts.append(
+      f'<trans-unit id="{index}"><source>Hello</source>'
+      f'<context-group name="g{index}" purpose="nope">'
+      f'<context context-type="{context_type}">a.c</context>'
+      f'<context context-type="linenumber">{index}</context>'
+      "</context-group>"
+      f'<count-group name="c{index}"><count count-type="total">3</count>'
+      "</count-group></trans-unit>"
+    )
+  parts.append("</body></file></xliff>")
+  return "".join(parts).encode()
+
+
+class TestCollectErrors(unittest.TestCase):
+  def test_matches_validate(self) -> None:
+    group = _context_group(10)
+    group.purpose = "nope"  # type: ignore
+    with self.assertRaises(ValidationErrorGroup) as caught:
+      group.validate(gather_all_errors=True)
+    records = collect_errors(group)
+    self.assertEqual(len(records), len(caught.exception.errors))
+    for record, (_, error) in zip(records, caught.exception.errors):
+      self.assertEqual(record.attribute, error.details["attribute"])
+      self.assertEqual(record.value, error.details["value"])
+      self.assertEqual(record.reason, str(error.error))
+
+  def test_paths(self) -> None:
+    groups = [
+      _context_group(4),
+      PropGroup(
+        name="meta",
+        props=[Prop(value="v", prop_type="x-a"), Prop(value=1, prop_type="x-b")],
+      ),  # type: ignore
+      _context_group(1),
+    ]
+    self.assertEqual(
+      [record.path for record in collect_errors(groups)],
+      [
+        "context-group[1]/context[1]",
+        "context-group[1]/context[4]",
+        "prop-group[1]/prop[2]",
+        "context-group[2]/context[1]",
+      ],
+    )
+
+  def test_valid(self) -> None:
+    self.assertEqual(collect_errors(_context_group(5, invalid_every=0)), [])
+    self.assertEqual(collect_errors([]), [])
+
+  def test_record(self) -> None:
+    (record,) = collect_errors(Context(value="a.c", context_type=5))  # type: ignore
+    self.assertEqual(record.path, "context[1]")
+    self.assertEqual(record.tag, "context")
+    self.assertEqual(record.kind, "TypeError")
+    self.assertEqual(record.expected, "CONTEXT_TYPE")
+    self.assertIn("context[1]: TypeError for attribute 'context_type'", record.message)
+    self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+  def test_columnar_children_are_reported_on_the_group(self) -> None:
+    group = ColumnarCountGroup(
+      name="counts",
+      counts=[Count(value=1, count_type="bogus"), Count(value=2, count_type="total")],
+    )
+    (record,) = collect_errors(group)
+    self.assertEqual(record.path, "count-group[1]")
+    self.assertEqual(record.attribute, "count_type")
+
+
+class TestValidateParallel(unittest.TestCase):
+  def test_same_as_serial(self) -> None:
+    group = _context_group(50)
+    group.name = 5  # type: ignore
+    roots = [
+      _context_group(7),
+      CountGroup(name="c", counts=[Count(value=1, count_type="bogus")] * 3),
+      ColumnarCountGroup(name="c", counts=[Count(value=1, count_type="bogus")]),
+      _context_group(0),
+    ]
+    for obj in (group, roots, _context_group(0)):
+      expected = collect_errors(obj)
+      for workers, chunk_size in ((1, None), (2, None), (2, 1), (3, 7)):
+        with self.subTest(obj=obj, workers=workers, chunk_size=chunk_size):
+          self.assertEqual(
+            validate_parallel(obj, workers=workers, chunk_size=chunk_size), expected
+          )
+
+  def test_stream_same_as_serial(self) -> None:
+    document = _document(30)
+    expected = validate_stream(io.BytesIO(document), workers=1)
+    self.assertEqual(len(expected), 30 + 30 // 4 + 1)
+    self.assertEqual(
+      expected[0].path,
+      "xliff[1]/file[1]/body[1]/trans-unit[1]/context-group[1]",
+    )
+    self.assertEqual(
+      expected[1].path,
+      "xliff[1]/file[1]/body[1]/trans-unit[1]/context-group[1]/context[1]",
+    )
+    for workers, chunk_size in ((1, 1), (2, 1), (2, 4)):
+      with self.subTest(workers=workers, chunk_size=chunk_size):
+        self.assertEqual(
+          validate_stream(io.BytesIO(document), workers=workers, chunk_size=chunk_size),
+          expected,
+        )
+
+  def test_stream_ignores_namespaces(self) -> None:
+    document = _document(2).replace(
+      b'<xliff version="1.2">',
+      b'<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">',
+    )
+    self.assertEqual(
+      validate_stream(io.BytesIO(document), workers=1),
+      validate_stream(io.BytesIO(_document(2)), workers=1),
+    )
+
+
+class TestValidateParallelMalformedData(unittest.TestCase):
+  def test_invalid_arguments(self) -> None:
+    group = _context_group(2)
+    for kwargs in ({"workers": 0}, {"chunk_size": 0}):
+      with self.subTest(**kwargs):
+        with self.assertRaises(ValueError):
+          validate_parallel(group, **kwargs)
+        with self.assertRaises(ValueError):
+          validate_stream(io.BytesIO(_document(1)), **kwargs)
+
+  def test_records_are_plain_values(self) -> None:
+    (record,) = collect_errors(Prop(value=object(), prop_type="x-a"))  # type: ignore
+    self.assertIsInstance(record, ErrorRecord)
+    self.assertIsInstance(record.value, str)
+    self.assertTrue(record.value.startswith("<object object"))
@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+from xliff.constants import CONTEXT_TYPE
+from xliff.errors import (
+  ValidationError,
+  ValidationErrorGroup,
+  ValidationIssue,
+  ValidationResult,
+)
+from xliff.helpers import is_valid_value
+from xliff.named_groups import (
+  ColumnarCountGroup,
+  Context,
+  ContextGroup,
+  Count,
+  CountGroup,
+)
+
+
+def _dirty_group() -> ContextGroup:
+  group = ContextGroup(
+    name="location",
+    contexts=[
+      Context(value="a.c", context_type="bogus"),
+      Context(value="b.c", context_type="sourcefile"),
+      Context(value=3, context_type=4),  # type: ignore
+    ],
+  )
+  group.purpose = "nope"  # type: ignore
+  return group
+
+
+class TestValidationResult(unittest.TestCase):
+  def test_valid(self) -> None:
+    group = ContextGroup(
+      name="location", contexts=[Context(value="a.c", context_type="sourcefile")]
+    )
+    result = group.check()
+    self.assertTrue(result)
+    self.assertTrue(result.valid)
+    self.assertEqual(len(result), 0)
+    self.assertEqual(result.errors, [])
+    self.assertTrue(group.is_valid())
+    result.raise_for_errors()
+
+  def test_issues_match_validate(self) -> None:
+    group = _dirty_group()
+    result = group.check()
+    self.assertFalse(result)
+    self.assertFalse(group.is_valid())
+    with self.assertRaises(ValidationErrorGroup) as caught:
+      group.validate(gather_all_errors=True)
+    self.assertEqual(len(result), len(caught.exception.errors))
+    for issue, (source, error) in zip(result, caught.exception.errors):
+      self.assertIs(issue.source, source)
+      self.assertEqual(issue.details, error.details)
+      self.assertEqual(issue.message, str(error))
+    self.assertEqual(
+      [(issue.source, issue.attribute) for issue in result],
+      [
+        (group, "purpose"),
+        (group.contexts[0], "context_type"),
+        (group.contexts[2], "value"),
+        (group.contexts[2], "context_type"),
+      ],
+    )
+
+  def test_recurse(self) -> None:
+    group = _dirty_group()
+    self.assertEqual(len(group.check(recurse=False)), 1)
+    self.assertTrue(group.contexts[1].check(recurse=False))
+
+  def test_no_exception_is_created(self) -> None:
+    group = _dirty_group()
+    with mock.patch.object(ValidationError, "__init__", side_effect=AssertionError):
+      result = group.check()
+      self.assertFalse(group.is_valid())
+    self.assertEqual(len(result), 4)
+
+  def test_raise_for_errors(self) -> None:
+    group = _dirty_group()
+    result = group.check()
+    with self.assertRaises(ValidationErrorGroup) as caught:
+      result.raise_for_errors()
+    self.assertEqual(len(caught.exception.errors), 4)
+    with self.assertRaises(ValidationError) as first:
+      result.raise_for_errors(gather_all_errors=False)
+    self.assertEqual(first.exception.details["attribute"], "purpose")
+    with self.assertRaises(ValidationError) as raised:
+      group.validate()
+    self.assertEqual(str(raised.exception), str(first.exception))
+
+  def test_columnar_count_group(self) -> None:
+    counts = [Count(value=1, count_type="bogus"), Count(value=2, count_type="total")]
+    columnar = ColumnarCountGroup(name="counts", counts=counts)
+    plain = CountGroup(name="counts", counts=counts)
+    self.assertEqual(
+      [issue.attribute for issue in columnar.check()],
+      [issue.attribute for issue in plain.check()],
+    )
+    self.assertIs(columnar.check().issues[0].source, columnar)
+
+  def test_repr(self) -> None:
+    self.assertEqual(repr(ValidationResult()), "ValidationResult(valid=True, issues=0)")
+
+
+class TestIsValidValue(unittest.TestCase):
+  def test_agrees_with_validators(self) -> None:
+    values = (None, "a", "x-a", "sourcefile", CONTEXT_TYPE.SOURCEFILE, 1, True, [])
+    for cls in (Context, Count, ContextGroup):
+      for attribute, validator in cls._validators.items():
+        for value in values:
+          with self.subTest(cls=cls, attribute=attribute, value=value):
+            try:
+              validator(value)
+              expected = True
+            except (TypeError, ValueError):
+              expected = False
+            self.assertIs(is_valid_value(validator, value), expected)
+
+
+class TestValidationResultMalformedData(unittest.TestCase):
+  def test_valid_value_has_no_exception(self) -> None:
+    issue = ValidationIssue(None, "value", "a.c", Context._validators["value"])
+    with self.assertRaises(RuntimeError):
+      issue.exception